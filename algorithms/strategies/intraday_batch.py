@@ -0,0 +1,262 @@
+"""
+Intraday Batch Scan
+
+Vectorized counterpart of IntradayOrchestrator.analyze_symbol for many symbols.
+
+Symbols are stacked into one panel per OHLCV field (bars x symbols) aligned on
+their latest bar, so shorter histories are NaN padded at the top and every
+rolling window sees exactly the bars the single-symbol path would. Each
+strategy's signal rules then run once over the whole panel, and the latest
+signal row per symbol is found with one reverse argmax.
+
+analyze(strategy_type='both') merges its two rule sets with DataFrame.update.
+The second frame's Signal column has no NaNs, so it replaces the first one
+entirely: only gap continuation, momentum scalps and S/R bounces can fire.
+The batch rules reproduce that so both paths return the same signals.
+"""
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .support_resistance import SupportResistanceStrategy
+
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+STRATEGY_NAMES = {
+    'gap_trading': 'Gap_Continuation',
+    'scalping': 'Momentum',
+    'support_resistance': 'Bounce',
+}
+
+
+def build_panel(stock_data, symbols, min_bars=50):
+    """
+    Stack symbols into bar x symbol arrays aligned on the latest bar
+
+    Returns:
+        (symbols kept, dict of field -> 2D array, bars per symbol)
+    """
+    kept = [s for s in symbols if s in stock_data and len(stock_data[s]) >= min_bars]
+    lengths = np.array([len(stock_data[s]) for s in kept], dtype=int)
+    rows = int(lengths.max()) if len(kept) else 0
+
+    panel = {field: np.full((rows, len(kept)), np.nan) for field in FIELDS}
+    for col, symbol in enumerate(kept):
+        df = stock_data[symbol]
+        for field in FIELDS:
+            panel[field][rows - len(df):, col] = df[field].values
+    return kept, panel, lengths
+
+
+# Rolling helpers - NaN until a full window is available, like pandas rolling(window)
+
+def _shift(values, periods=1):
+    shifted = np.full_like(values, np.nan)
+    shifted[periods:] = values[:-periods]
+    return shifted
+
+
+def _rolling(values, window, reducer, **kwargs):
+    result = np.full_like(values, np.nan)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window, axis=0)
+        result[window - 1:] = reducer(windows, axis=-1, **kwargs)
+    return result
+
+
+def _rolling_mean(values, window):
+    return _rolling(values, window, np.mean)
+
+
+def _rolling_std(values, window):
+    return _rolling(values, window, np.std, ddof=1)
+
+
+def _ewm(values, span):
+    """ewm(span, adjust=False).mean() down every column"""
+    alpha = 2.0 / (span + 1)
+    result = np.full_like(values, np.nan)
+    previous = np.full(values.shape[1], np.nan)
+    for i in range(len(values)):
+        current = values[i]
+        previous = np.where(np.isnan(previous), current,
+                            np.where(np.isnan(current), previous, (1 - alpha) * previous + alpha * current))
+        result[i] = previous
+    return result
+
+
+def latest_signal_rows(signal):
+    """Row of the last non-zero signal in every column, -1 where there is none"""
+    nonzero = signal[::-1] != 0
+    found = nonzero.any(axis=0)
+    rows = len(signal) - 1 - nonzero.argmax(axis=0)
+    return np.where(found, rows, -1)
+
+
+# =====================================================================
+# Strategy rules
+# =====================================================================
+
+def gap_trading_columns(strategy, panel):
+    """GapTradingStrategy.analyze over the panel - continuation rules"""
+    open_, high, low, close, volume = (panel[f] for f in FIELDS)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        prev_close = _shift(close)
+        gap_pct = ((open_ - prev_close) / prev_close) * 100
+        volume_ratio = volume / _rolling_mean(volume, 20)
+        open_close_change = ((close - open_) / open_) * 100
+
+    gap_up = (gap_pct > strategy.gap_threshold_pct) & (volume_ratio > strategy.volume_threshold) \
+        & (open_close_change > 0.3) & (close > _shift(high))
+    gap_down = (gap_pct < -strategy.gap_threshold_pct) & (volume_ratio > strategy.volume_threshold) \
+        & (open_close_change < -0.3) & (close < _shift(low))
+    signal = np.where(gap_down, -1, np.where(gap_up, 1, 0))
+
+    return signal, {
+        'Gap_Pct': gap_pct,
+        'Gap_Fill_Target': prev_close,
+        'Target_Long': close * (1 + strategy.target_pct / 100),
+        'Target_Short': close * (1 - strategy.target_pct / 100),
+        'StopLoss_Long': close * (1 - strategy.stop_loss_pct / 100),
+        'StopLoss_Short': close * (1 + strategy.stop_loss_pct / 100),
+    }
+
+
+def scalping_columns(strategy, panel, tail=50):
+    """ScalpingStrategy.analyze over the last ``tail`` bars - momentum rules"""
+    open_, high, low, close, volume = (panel[f][-tail:] for f in FIELDS)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ema_5 = _ewm(close, 5)
+        ema_10 = _ewm(close, 10)
+        bb_middle = _rolling_mean(close, strategy.bollinger_period)
+        volume_ratio = volume / _rolling_mean(volume, 10)
+        prev_close = _shift(close)
+        price_change = (close / prev_close - 1) * 100
+
+        true_range = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+        true_range[np.isnan(high) | np.isnan(low)] = np.nan
+        atr = _rolling_mean(true_range, 10)
+        volatility = _rolling_std(close, 10)
+        resistance = _shift(_rolling(high, 20, np.max))
+        support = _shift(_rolling(low, 20, np.min))
+
+    common = (volume_ratio > strategy.volume_threshold) & (atr > volatility)
+    momentum_long = (close > ema_5) & (ema_5 > ema_10) & (price_change > 0.2) & (close > resistance) & common
+    momentum_short = (close < ema_5) & (ema_5 < ema_10) & (price_change < -0.2) & (close < support) & common
+    signal = np.where(momentum_short, -1, np.where(momentum_long, 1, 0))
+
+    # Scalping needs 25 bars of the tail
+    signal[:, np.isnan(close).sum(axis=0) > tail - 25] = 0
+
+    return signal, {
+        'Price_Change': price_change,
+        'Volume_Ratio': volume_ratio,
+        'MeanReversion_Target': bb_middle,
+        'Target_Long': close * (1 + strategy.target_pct / 100),
+        'Target_Short': close * (1 - strategy.target_pct / 100),
+        'StopLoss_Long': close * (1 - strategy.stop_loss_pct / 100),
+        'StopLoss_Short': close * (1 + strategy.stop_loss_pct / 100),
+    }
+
+
+def support_resistance_columns(strategy, panel, levels):
+    """SupportResistanceStrategy.analyze over the panel - bounce rules
+
+    Args:
+        levels: Per-symbol S/R levels, in panel column order
+    """
+    open_, high, low, close, volume = (panel[f] for f in FIELDS)
+
+    width = max([len(l['support']) for l in levels] + [len(l['resistance']) for l in levels] + [0])
+    supports = np.full((width, len(levels)), np.nan)
+    resistances = np.full((width, len(levels)), np.nan)
+    for col, symbol_levels in enumerate(levels):
+        supports[:len(symbol_levels['support']), col] = symbol_levels['support']
+        resistances[:len(symbol_levels['resistance']), col] = symbol_levels['resistance']
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        volume_ratio = volume / _rolling_mean(volume, 20)
+        # delta.where(delta > 0, 0) turns the first bar's NaN into 0; padding stays NaN
+        delta = close - _shift(close)
+        padding = np.where(np.isnan(close), np.nan, 0.0)
+        gain = _rolling_mean(np.where(delta > 0, delta, padding), 14)
+        loss = _rolling_mean(np.where(delta < 0, -delta, padding), 14)
+        rsi = 100 - (100 / (1 + gain / loss))
+
+        # Nearest levels for every bar - the few levels per symbol are broadcast
+        nearest_resistance = np.full_like(close, np.inf)
+        nearest_support = np.zeros_like(close)
+        for k in range(width):
+            resistance, support = resistances[k], supports[k]
+            nearest_resistance = np.where(resistance >= close, np.fmin(nearest_resistance, resistance),
+                                          nearest_resistance)
+            nearest_support = np.where(support <= close, np.fmax(nearest_support, support), nearest_support)
+        resistance_distance = ((nearest_resistance - close) / close) * 100
+        support_distance = ((close - nearest_support) / close) * 100
+
+    signal = np.zeros(close.shape, dtype=int)
+    level = np.full_like(close, np.nan)
+    bullish, bearish = close > open_, close < open_
+    for k in range(width):
+        support = supports[k]
+        bounce = (low <= support * 1.005) & bullish & (close > support) & (volume_ratio > 1.2) \
+            & (rsi < 40) & (support_distance < 1.0)
+        signal[bounce] = 1
+        level = np.where(bounce, support, level)
+    for k in range(width):
+        resistance = resistances[k]
+        rejection = (high >= resistance * 0.995) & bearish & (close < resistance) & (volume_ratio > 1.2) \
+            & (rsi > 60) & (resistance_distance < 1.0)
+        signal[rejection] = -1
+        level = np.where(rejection, resistance, level)
+
+    return signal, {
+        'Level': level,
+        'RSI': rsi,
+        'Target_Long': close * (1 + strategy.target_pct / 100),
+        'Target_Short': close * (1 - strategy.target_pct / 100),
+        'StopLoss_Long': close * (1 - strategy.stop_loss_pct / 100),
+        'StopLoss_Short': close * (1 + strategy.stop_loss_pct / 100),
+    }
+
+
+def describe(strategy, strategy_name, columns, row, col):
+    """The strategy's own signal description for one panel cell"""
+    signal_row = {name: values[row, col] for name, values in columns.items()}
+    signal_row['Signal'] = columns['Signal'][row, col]
+    signal_row['Strategy'] = STRATEGY_NAMES[strategy_name]
+    return strategy.get_signal_description(signal_row)
+
+
+# =====================================================================
+# S/R levels - the per-symbol part
+# =====================================================================
+
+def _levels_chunk(params, chunk):
+    """Process pool worker: S/R levels for (highs, lows) pairs"""
+    strategy = SupportResistanceStrategy(**params)
+    return [strategy.levels_from_arrays(highs, lows, np.sort(highs), np.sort(lows)) for highs, lows in chunk]
+
+
+def find_levels(strategy, stock_data, symbols, pool=None, chunks=8):
+    """S/R levels per symbol, via the incremental trackers or a process pool"""
+    if pool is None:
+        return [strategy.find_support_resistance_levels(stock_data[s], s) for s in symbols]
+
+    params = {
+        'lookback_period': strategy.lookback_period,
+        'min_touches': strategy.min_touches,
+        'level_tolerance': strategy.level_tolerance,
+    }
+    arrays = [(stock_data[s]['High'].values.astype(float), stock_data[s]['Low'].values.astype(float))
+              for s in symbols]
+    size = max(1, -(-len(arrays) // chunks))
+    futures = [pool.submit(_levels_chunk, params, arrays[i:i + size]) for i in range(0, len(arrays), size)]
+    return [levels for future in futures for levels in future.result()]
+
+
+def create_pool(workers):
+    return ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
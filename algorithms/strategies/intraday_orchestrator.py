@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from .gap_trading import GapTradingStrategy
 from .scalping_strategy import ScalpingStrategy
 from .support_resistance import SupportResistanceStrategy
+from . import intraday_batch
 
 class IntradayOrchestrator:
     """
@@ -36,6 +37,10 @@ class IntradayOrchestrator:
             'scalping': 1           # Lowest priority for scalps
         }
         
+        # Process pool for batch scans (created on first use)
+        self._batch_pool = None
+        self._batch_workers = None
+        
         # Time-based filters for intraday trading
         self.trading_hours = {
             'market_open': '09:15',
@@ -228,7 +233,7 @@ class IntradayOrchestrator:
         
         return result
     
-    def scan_multiple_symbols(self, stock_data, symbols, portfolio_value=1000000):
+    def scan_multiple_symbols(self, stock_data, symbols, portfolio_value=1000000, batch=False, workers=None):
         """
         Scan multiple symbols and return prioritized opportunities
         
@@ -236,7 +241,12 @@ class IntradayOrchestrator:
             stock_data: Dict of symbol -> DataFrame
             symbols: List of symbols to scan
             portfolio_value: Portfolio value for position sizing
+            batch: Evaluate all symbols at once (see scan_multiple_symbols_batch)
+            workers: Process pool size for the batch mode's per-symbol work
         """
+        if batch:
+            return self.scan_multiple_symbols_batch(stock_data, symbols, portfolio_value, workers)
+        
         opportunities = []
         
         for symbol in symbols:
@@ -257,6 +267,128 @@ class IntradayOrchestrator:
         # Limit to max positions
         return opportunities[:self.max_positions]
     
+    def scan_multiple_symbols_batch(self, stock_data, symbols, portfolio_value=1000000, workers=None):
+        """
+        Batch mode of scan_multiple_symbols
+        
+        Aligns the symbols into one bar x symbol panel and evaluates every
+        strategy's signal rules across all of them with array operations
+        (see intraday_batch). Liquidity and trading-time validation are
+        vectorized too, and a single global top-k picks the opportunities
+        before any per-symbol result is built. S/R level discovery, the only
+        per-symbol step left, runs in a process pool when workers > 1.
+        Returns the same opportunities as the per-symbol scan.
+        
+        Args:
+            stock_data: Dict of symbol -> DataFrame
+            symbols: List of symbols to scan
+            portfolio_value: Portfolio value for position sizing
+            workers: Process pool size for S/R level discovery (None = in process)
+        """
+        if not self.is_trading_time():
+            return []
+        
+        kept, panel, _ = intraday_batch.build_panel(stock_data, symbols, min_bars=50)
+        if not kept:
+            return []
+        
+        # Liquidity (filter_by_liquidity) for every symbol at once
+        avg_volume = panel['Volume'][-20:].mean(axis=0)
+        recent_volume = panel['Volume'][-5:].mean(axis=0)
+        liquid = ~(avg_volume < self.min_volume) & ~(recent_volume < avg_volume * 0.5)
+        if not liquid.any():
+            return []
+        
+        kept = [symbol for symbol, ok in zip(kept, liquid) if ok]
+        panel = {field: values[:, liquid] for field, values in panel.items()}
+        
+        # Signal rules across the panel, strategy by strategy
+        evaluated = {}
+        for strategy_name, strategy in self.strategies.items():
+            if strategy_name == 'gap_trading':
+                signal, columns = intraday_batch.gap_trading_columns(strategy, panel)
+            elif strategy_name == 'scalping':
+                signal, columns = intraday_batch.scalping_columns(strategy, panel, tail=50)
+            elif strategy_name == 'support_resistance':
+                levels = intraday_batch.find_levels(strategy, stock_data, kept, self._get_batch_pool(workers))
+                signal, columns = intraday_batch.support_resistance_columns(strategy, panel, levels)
+            else:
+                continue
+            columns['Signal'] = signal
+            evaluated[strategy_name] = (strategy, columns, intraday_batch.latest_signal_rows(signal))
+        
+        # Highest priority signal per symbol
+        by_priority = sorted(evaluated, key=lambda name: self.strategy_priorities[name], reverse=True)
+        candidates = []
+        for col, symbol in enumerate(kept):
+            triggered = [name for name in by_priority if evaluated[name][2][col] >= 0]
+            if not triggered:
+                continue
+            
+            best = triggered[0]
+            strategy, columns, rows = evaluated[best]
+            signal = intraday_batch.describe(strategy, best, columns, rows[col], col)
+            if signal is None:
+                continue
+            
+            entry_price = panel['Close'][-1, col]
+            stop_loss = signal.get('stop_loss', entry_price * 0.995)
+            candidates.append({
+                'symbol': symbol,
+                'strategy': best,
+                'signal': signal,
+                'entry_price': entry_price,
+                'stop_loss': stop_loss,
+                'priority': self.strategy_priorities[best],
+                'risk_reward_ratio': abs(signal['target'] - entry_price) / abs(entry_price - stop_loss),
+                'all_signals': [name for name in evaluated if evaluated[name][2][col] >= 0]
+            })
+        
+        # Global top-k, then build full results only for the winners
+        candidates.sort(key=lambda x: (x['priority'], x['risk_reward_ratio']), reverse=True)
+        opportunities = []
+        for candidate in candidates[:self.max_positions]:
+            df = stock_data[candidate['symbol']]
+            signal = candidate['signal']
+            entry_price, stop_loss = candidate['entry_price'], candidate['stop_loss']
+            position_size = self.calculate_position_size(entry_price, stop_loss, portfolio_value)
+            
+            opportunities.append({
+                'symbol': candidate['symbol'],
+                'strategy': candidate['strategy'],
+                'signal_type': signal['type'],
+                'reason': signal['reason'],
+                'entry_price': entry_price,
+                'target_price': signal['target'],
+                'stop_loss': stop_loss,
+                'position_size': position_size,
+                'risk_amount': abs(entry_price - stop_loss) * position_size,
+                'potential_profit': abs(signal['target'] - entry_price) * position_size,
+                'risk_reward_ratio': candidate['risk_reward_ratio'],
+                'timestamp': datetime.now(),
+                'priority': candidate['priority'],
+                'all_signals': candidate['all_signals'],
+                'market_data': {
+                    'volume': df['Volume'].iloc[-1],
+                    'avg_volume': df['Volume'].tail(20).mean(),
+                    'price_change_pct': ((df['Close'].iloc[-1] - df['Close'].iloc[-2]) / df['Close'].iloc[-2]) * 100,
+                    'volatility': df['Close'].tail(20).std()
+                }
+            })
+        
+        return opportunities
+    
+    def _get_batch_pool(self, workers):
+        """Process pool for batch scans, kept across scans"""
+        if not workers or workers <= 1:
+            return None
+        if self._batch_pool is None or self._batch_workers != workers:
+            if self._batch_pool is not None:
+                self._batch_pool.shutdown(wait=False)
+            self._batch_pool = intraday_batch.create_pool(workers)
+            self._batch_workers = workers
+        return self._batch_pool
+    
     def get_market_summary(self, opportunities):
         """Generate market summary from opportunities"""
         if not opportunities:
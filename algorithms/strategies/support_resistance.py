@@ -2,6 +2,148 @@ import pandas as pd
 import numpy as np
 from scipy.signal import find_peaks
 
+
+def nearest_levels(closes, levels):
+    """Nearest resistance at/above and support at/below every close.
+
+    Binary search over the sorted level arrays; no resistance above gives
+    inf and no support below gives 0.
+    """
+    closes = np.asarray(closes, dtype=float)
+    resistance = np.sort(np.asarray(levels['resistance'], dtype=float))
+    support = np.sort(np.asarray(levels['support'], dtype=float))
+    
+    # Smallest resistance >= close
+    idx = np.searchsorted(resistance, closes, side='left')
+    padded = np.append(resistance, np.inf)
+    nearest_resistance = padded[idx]
+    
+    # Largest support <= close
+    idx = np.searchsorted(support, closes, side='right') - 1
+    padded = np.insert(support, 0, 0.0)
+    nearest_support = padded[idx + 1]
+    
+    # NaN closes compare false in the scalar version
+    nearest_resistance[np.isnan(closes)] = np.inf
+    nearest_support[np.isnan(closes)] = 0.0
+    return nearest_resistance, nearest_support
+
+
+class LevelTracker:
+    """
+    Incrementally maintained S/R state for one symbol
+    
+    Keeps the bars seen so far together with sorted copies of the highs and
+    lows. Each update drops bars that slid out of the window, replaces the
+    last (possibly still forming) bar and merges the new ones into the
+    sorted arrays, so touch counts stay binary searches. Any other change
+    (different timestamps, revised highs/lows of already tracked bars such as
+    a split re-adjustment, non-datetime index) rebuilds from scratch.
+    """
+    
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.timestamps = np.empty(0, dtype='int64')
+        self.highs = np.empty(0)
+        self.lows = np.empty(0)
+        self.sorted_highs = np.empty(0)
+        self.sorted_lows = np.empty(0)
+        self.levels = None
+        self.rebuilds = 0
+    
+    def update(self, df):
+        """Levels for df, reusing the bars already tracked"""
+        if not isinstance(df.index, pd.DatetimeIndex):
+            self._rebuild(np.empty(0, dtype='int64'), df)
+            return self.levels
+        
+        timestamps = df.index.asi8
+        keep = self._overlap(timestamps)
+        if keep is None:
+            self._rebuild(timestamps, df)
+            return self.levels
+        
+        start, overlap = keep
+        highs = df['High'].values.astype(float)
+        lows = df['Low'].values.astype(float)
+        # Completed bars must be unchanged; the last tracked bar may still be forming
+        settled = slice(start, len(self.timestamps) - 1)
+        if not (np.array_equal(self.highs[settled], highs[:overlap - 1], equal_nan=True)
+                and np.array_equal(self.lows[settled], lows[:overlap - 1], equal_nan=True)):
+            self._rebuild(timestamps, df)
+            return self.levels
+        if start > len(self.timestamps) // 2:
+            # Most of the window moved on - cheaper to sort again
+            self._rebuild(timestamps, df)
+            return self.levels
+        if start == 0 and overlap == len(timestamps) and len(timestamps) == len(self.timestamps) \
+                and self.levels is not None and self.highs[-1] == highs[-1] \
+                and self.lows[-1] == lows[-1]:
+            return self.levels  # Nothing new
+        
+        # Bars that left the window, plus the last tracked bar (re-read below)
+        drop_highs = np.concatenate([self.highs[:start], self.highs[-1:]])
+        drop_lows = np.concatenate([self.lows[:start], self.lows[-1:]])
+        self.sorted_highs = _remove_sorted(self.sorted_highs, drop_highs)
+        self.sorted_lows = _remove_sorted(self.sorted_lows, drop_lows)
+        
+        self.timestamps = timestamps
+        self.highs = highs
+        self.lows = lows
+        
+        added = slice(overlap - 1, None)
+        self.sorted_highs = _insert_sorted(self.sorted_highs, self.highs[added])
+        self.sorted_lows = _insert_sorted(self.sorted_lows, self.lows[added])
+        
+        self.levels = self.strategy.levels_from_arrays(self.highs, self.lows, self.sorted_highs, self.sorted_lows)
+        return self.levels
+    
+    def _overlap(self, timestamps):
+        """(bars dropped from the head, tracked bars still present) or None"""
+        if not len(self.timestamps) or not len(timestamps):
+            return None
+        start = int(np.searchsorted(self.timestamps, timestamps[0]))
+        if start >= len(self.timestamps) or self.timestamps[start] != timestamps[0]:
+            return None
+        overlap = len(self.timestamps) - start
+        if overlap > len(timestamps) or not np.array_equal(self.timestamps[start:], timestamps[:overlap]):
+            return None
+        return start, overlap
+    
+    def _rebuild(self, timestamps, df):
+        self.rebuilds += 1
+        self.timestamps = timestamps
+        self.highs = df['High'].values.astype(float)
+        self.lows = df['Low'].values.astype(float)
+        self.sorted_highs = np.sort(self.highs)
+        self.sorted_lows = np.sort(self.lows)
+        self.levels = self.strategy.levels_from_arrays(self.highs, self.lows, self.sorted_highs, self.sorted_lows)
+
+
+def _insert_sorted(sorted_values, values):
+    values = np.sort(values)
+    return np.insert(sorted_values, np.searchsorted(sorted_values, values), values)
+
+
+def _remove_sorted(sorted_values, values):
+    if not len(values):
+        return sorted_values
+    # NaN never equals itself, so NaN bars are located from the end
+    positions = []
+    taken = set()
+    for value in values:
+        if np.isnan(value):
+            pos = len(sorted_values) - 1
+            while pos in taken:
+                pos -= 1
+        else:
+            pos = int(np.searchsorted(sorted_values, value, side='left'))
+            while pos in taken:
+                pos += 1
+        taken.add(pos)
+        positions.append(pos)
+    return np.delete(sorted_values, positions)
+
 class SupportResistanceStrategy:
     """
     Support and Resistance Trading Strategy
@@ -20,57 +162,60 @@ class SupportResistanceStrategy:
         self.lookback_period = lookback_period
         self.min_touches = min_touches  # Minimum touches to confirm S/R level
         self.level_tolerance = level_tolerance  # % tolerance for level matching
+        self._trackers = {}  # symbol -> LevelTracker
         
-    def find_support_resistance_levels(self, df):
-        """Find significant support and resistance levels"""
+    def find_support_resistance_levels(self, df, symbol=None):
+        """Find significant support and resistance levels
+
+        With a symbol, levels come from that symbol's LevelTracker, which only
+        folds in the bars added since the previous call.
+        """
+        if symbol is not None:
+            tracker = self._trackers.get(symbol)
+            if tracker is None:
+                tracker = self._trackers[symbol] = LevelTracker(self)
+            return tracker.update(df)
+
         highs = df['High'].values
         lows = df['Low'].values
-        
+        return self.levels_from_arrays(highs, lows, np.sort(highs), np.sort(lows))
+    
+    def levels_from_arrays(self, highs, lows, sorted_highs, sorted_lows):
+        """Levels from bar arrays plus the same values pre-sorted for touch counts"""
         # Find peaks (resistance) and valleys (support)
         resistance_peaks, _ = find_peaks(highs, distance=5, prominence=np.std(highs)*0.5)
         support_valleys, _ = find_peaks(-lows, distance=5, prominence=np.std(lows)*0.5)
         
-        # Get resistance levels
-        resistance_levels = []
-        if len(resistance_peaks) > 0:
-            resistance_prices = highs[resistance_peaks]
-            for price in resistance_prices:
-                # Count how many times price tested this level
-                touches = self.count_level_touches(df, price, 'resistance')
-                if touches >= self.min_touches:
-                    resistance_levels.append(price)
-        
-        # Get support levels
-        support_levels = []
-        if len(support_valleys) > 0:
-            support_prices = lows[support_valleys]
-            for price in support_prices:
-                # Count how many times price tested this level
-                touches = self.count_level_touches(df, price, 'support')
-                if touches >= self.min_touches:
-                    support_levels.append(price)
+        # Keep levels tested at least min_touches times
+        resistance_prices = highs[resistance_peaks]
+        resistance_levels = resistance_prices[
+            self.count_level_touches_sorted(sorted_highs, resistance_prices) >= self.min_touches
+        ]
+        support_prices = lows[support_valleys]
+        support_levels = support_prices[
+            self.count_level_touches_sorted(sorted_lows, support_prices) >= self.min_touches
+        ]
         
         return {
-            'resistance': sorted(set(resistance_levels), reverse=True)[:5],  # Top 5
-            'support': sorted(set(support_levels))[:5]  # Bottom 5
+            'resistance': sorted(set(resistance_levels.tolist()), reverse=True)[:5],  # Top 5
+            'support': sorted(set(support_levels.tolist()))[:5]  # Bottom 5
         }
     
     def count_level_touches(self, df, level, level_type):
         """Count how many times price touched a support/resistance level"""
-        tolerance = level * (self.level_tolerance / 100)
-        
-        if level_type == 'resistance':
-            # Count touches at resistance (highs near the level)
-            touches = ((df['High'] >= level - tolerance) & 
-                      (df['High'] <= level + tolerance)).sum()
-        else:  # support
-            # Count touches at support (lows near the level)
-            touches = ((df['Low'] >= level - tolerance) & 
-                      (df['Low'] <= level + tolerance)).sum()
-        
-        return touches
+        column = 'High' if level_type == 'resistance' else 'Low'
+        values = np.sort(df[column].values)
+        return int(self.count_level_touches_sorted(values, np.array([level]))[0])
     
-    def calculate_indicators(self, df):
+    def count_level_touches_sorted(self, sorted_values, levels):
+        """Touches of every level at once: values within tolerance, by binary search"""
+        levels = np.asarray(levels, dtype=float)
+        tolerance = levels * (self.level_tolerance / 100)
+        upper = np.searchsorted(sorted_values, levels + tolerance, side='right')
+        lower = np.searchsorted(sorted_values, levels - tolerance, side='left')
+        return upper - lower
+    
+    def calculate_indicators(self, df, symbol=None):
         """Calculate technical indicators"""
         # Volume indicators
         df['Volume_SMA'] = df['Volume'].rolling(window=20).mean()
@@ -85,17 +230,12 @@ class SupportResistanceStrategy:
         df['EMA_50'] = df['Close'].ewm(span=50, adjust=False).mean()
         
         # Find S/R levels and add to dataframe
-        levels = self.find_support_resistance_levels(df)
+        levels = self.find_support_resistance_levels(df, symbol)
         
         # Find nearest support and resistance for each candle
-        df['Nearest_Resistance'] = df['Close'].apply(
-            lambda x: min([r for r in levels['resistance'] if r >= x], 
-                         default=float('inf'))
-        )
-        df['Nearest_Support'] = df['Close'].apply(
-            lambda x: max([s for s in levels['support'] if s <= x], 
-                         default=0)
-        )
+        nearest_resistance, nearest_support = nearest_levels(df['Close'].values, levels)
+        df['Nearest_Resistance'] = nearest_resistance
+        df['Nearest_Support'] = nearest_support
         
         # Distance to nearest levels
         df['Resistance_Distance'] = ((df['Nearest_Resistance'] - df['Close']) / df['Close']) * 100
@@ -210,7 +350,7 @@ class SupportResistanceStrategy:
             return pd.DataFrame()
         
         # Calculate indicators and find S/R levels
-        df, levels = self.calculate_indicators(df)
+        df, levels = self.calculate_indicators(df, symbol)
         
         # Generate signals based on strategy type
         if strategy_type == 'breakout':
@@ -296,6 +436,38 @@ class SupportResistanceStrategy:
         
         return None
     
+    def scan_levels(self, stock_data):
+        """
+        S/R levels and nearest levels to the latest close for many symbols
+        
+        Args:
+            stock_data: Dict of symbol -> OHLCV DataFrame
+        
+        Returns:
+            Dict of symbol -> levels, nearest_resistance, nearest_support
+        """
+        results = {}
+        for symbol, df in stock_data.items():
+            if len(df) < self.lookback_period:
+                continue
+            levels = self.find_support_resistance_levels(df, symbol)
+            nearest_resistance, nearest_support = nearest_levels(df['Close'].values[-1:], levels)
+            results[symbol] = {
+                'levels': levels,
+                'nearest_resistance': float(nearest_resistance[0]),
+                'nearest_support': float(nearest_support[0])
+            }
+        return results
+    
+    def get_current_signals(self, stock_data):
+        """Latest S/R signal for each symbol in a Dict of symbol -> DataFrame"""
+        signals = {}
+        for symbol, df in stock_data.items():
+            signal = self.get_current_signal(df, symbol)
+            if signal is not None:
+                signals[symbol] = signal
+        return signals
+    
     def get_current_signal(self, df, symbol):
         """Get the latest S/R trading signal"""
         try:
@@ -25,7 +25,7 @@ import json
 # Import configurations and models
 from config import app_settings as settings, server_config
 from api.models.stock_models import (
-    StockData, TechnicalIndicators, TradingSignal, Portfolio,
+    StockData, TechnicalIndicators, TradingSignal, Portfolio, MarketSentiment,
     IntradaySignal, IntradayMomentum, IntradayScreenerResult, VWAPData, IntradayAlert
 )
 
@@ -38,9 +38,11 @@ from api.services.intraday_service import IntradayService
 from api.services.swing_trading_service import SwingTradingService
 from api.services.long_term_service import LongTermInvestmentService
 from api.services.config_manager import config_manager
+from utils.tracing import install_metrics
 
 # Order Management System imports
 from order.order_manager import OrderManager
+from order.journal import OrderJournal, ORDER_JOURNAL_ENABLED
 from order.risk_manager import RiskManager
 from order.position_manager import PositionManager
 from order.notification_service import NotificationService
@@ -77,8 +79,9 @@ _last_scan_time = None
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
-    global data_service, intraday_service, swing_trading_service, long_term_service, scheduler_service, websocket_manager
+    global data_service, analysis_engine, intraday_service, swing_trading_service, long_term_service, scheduler_service, websocket_manager
     global order_manager, risk_manager, position_manager, notification_service, order_validator, execution_engine
+    breadth_seed = None
     
     try:
         logger.info("🚀 Starting AlgoDiscovery Trading API...")
@@ -91,6 +94,8 @@ async def lifespan(app: FastAPI):
         
         # Initialize analysis engine
         analysis_engine = AnalysisEngine(data_service)
+        # Load the NIFTY 500 breadth panels in the background
+        breadth_seed = asyncio.create_task(analysis_engine.breadth.seed())
         
         # Initialize WebSocket manager
         websocket_manager = WebSocketManager()
@@ -135,7 +140,8 @@ async def lifespan(app: FastAPI):
             position_manager=position_manager,
             risk_manager=risk_manager,
             validator=order_validator,
-            notification_service=notification_service
+            notification_service=notification_service,
+            journal=OrderJournal() if ORDER_JOURNAL_ENABLED else None
         )
         await order_manager.start()
         logger.info("✅ Order manager initialized")
@@ -175,6 +181,8 @@ async def lifespan(app: FastAPI):
                 logger.info("🛑 Notification service stopped")
             
             # Stop core services
+            if breadth_seed and not breadth_seed.done():
+                breadth_seed.cancel()
             if scheduler_service:
                 await scheduler_service.stop()
             if config_manager:
@@ -202,6 +210,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage latency histograms on /metrics (recorded when TRACING_ENABLED=true)
+install_metrics(app, "app")
+
 # Include order management router
 app.include_router(order_routes.router, prefix="/api/v1")
 
@@ -244,6 +255,13 @@ async def health_check():
             "timestamp": datetime.utcnow().isoformat()
         }
 
+@app.get("/api/market/sentiment", response_model=MarketSentiment)
+async def get_market_sentiment():
+    """Market sentiment and breadth over the NIFTY 500, served from memory"""
+    if not analysis_engine:
+        raise HTTPException(status_code=503, detail="Analysis engine not available")
+    return await analysis_engine.get_market_sentiment(analysis_engine.breadth.universe)
+
 # Import all route modules
 from api.routes import intraday, swing, longterm, stock_data, signals, portfolio, websocket, admin, yahoo_finance
 
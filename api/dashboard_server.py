@@ -46,6 +46,7 @@ import uvicorn
 # Import dashboard components
 from dashboard.routes import dashboard_router
 from dashboard.analytics import analytics_service
+from utils.tracing import install_metrics
 
 # Create FastAPI app
 app = FastAPI(
@@ -65,6 +66,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage latency histograms on /metrics (recorded when TRACING_ENABLED=true)
+install_metrics(app, "dashboard")
+
 # Include dashboard routes
 app.include_router(dashboard_router)
 
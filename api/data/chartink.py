@@ -7,9 +7,11 @@ from bs4 import BeautifulSoup as bs
 import pandas as pd
 import time
 import json
+import threading
 from datetime import datetime
-from shared.config.settings import CHARTINK_URL, CHARTINK_REFERER
+from shared.config.settings import CHARTINK_BASE_URL, CHARTINK_URL, CHARTINK_REFERER
 from utils.logger import get_logger
+from utils.health_oracle import health_oracle
 from config.queries import SWING_QUERIES
 
 logger = get_logger(__name__, group="api", service="data_chartink")
@@ -17,69 +19,23 @@ logger = get_logger(__name__, group="api", service="data_chartink")
 # Track API calls to avoid rate limiting
 LAST_API_CALL = None
 MIN_CALL_INTERVAL = 2  # seconds
+_RATE_LOCK = threading.Lock()  # Combination tests query in parallel
 
 # Cache for recent query results to avoid duplicate calls
 QUERY_CACHE = {}
 CACHE_EXPIRY = 30  # seconds (5 minutes)
 
-# Track connectivity status
-CONNECTIVITY_STATUS = {
-    "last_check": 0,
-    "status": False,
-    "check_interval": 300  # 5 minutes
-}
-
 def check_chartink_connectivity():
     """
-    Check ChartInk connectivity by verifying we can access the site
+    Check ChartInk connectivity from the shared health oracle
+    
+    Reads the status published by the oracle's prober instead of probing
+    here, so it costs no network call while a prober is running.
     
     Returns:
-        bool: True if connection successful, False otherwise
+        bool: True if ChartInk is reachable, False otherwise
     """
-    global CONNECTIVITY_STATUS
-    
-    current_time = time.time()
-    time_since_last_check = current_time - CONNECTIVITY_STATUS["last_check"]
-    
-    # If we checked recently, return cached status
-    if time_since_last_check < CONNECTIVITY_STATUS["check_interval"]:
-        logger.debug(f"Using cached connectivity status (age: {time_since_last_check:.1f}s)")
-        return CONNECTIVITY_STATUS["status"]
-    
-    logger.info("Checking ChartInk connectivity")
-    
-    try:
-        # Just check if we can access the site and get a 200 response
-        with requests.Session() as session:
-            session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36',
-            })
-            
-            start_time = time.time()
-            response = session.get(CHARTINK_REFERER)
-            elapsed = time.time() - start_time
-            
-            status_code = response.status_code
-            
-            # Update connectivity status
-            CONNECTIVITY_STATUS["last_check"] = current_time
-            CONNECTIVITY_STATUS["status"] = (status_code == 200)
-            
-            if status_code == 200:
-                logger.info(f"✅ ChartInk connectivity check SUCCESS: HTTP {status_code} in {elapsed:.2f}s")
-                return True
-            else:
-                logger.error(f"❌ ChartInk connectivity check FAILED: HTTP {status_code} in {elapsed:.2f}s")
-                return False
-                
-    except Exception as e:
-        logger.error(f"❌ ChartInk connectivity check FAILED: {str(e)}")
-        
-        # Update connectivity status
-        CONNECTIVITY_STATUS["last_check"] = current_time
-        CONNECTIVITY_STATUS["status"] = False
-        
-        return False
+    return health_oracle.is_healthy("chartink")
 
 def get_chartink_data(query):
     """
@@ -148,13 +104,16 @@ def get_chartink_scans(query, debug=True, use_cache=True):
     
     logger.info(f"[CHARTINK-{request_id}] 🚀 Preparing ChartInk API request")
     
-    # Check if we need to throttle API calls
-    if LAST_API_CALL is not None:
-        elapsed = time.time() - LAST_API_CALL
-        if elapsed < MIN_CALL_INTERVAL:
-            sleep_time = MIN_CALL_INTERVAL - elapsed
-            logger.info(f"[CHARTINK-{request_id}] Rate limiting: Sleeping for {sleep_time:.2f}s")
-            time.sleep(sleep_time)
+    # Check if we need to throttle API calls - reserve the next free slot so
+    # concurrent callers are spaced MIN_CALL_INTERVAL apart
+    with _RATE_LOCK:
+        now = time.time()
+        call_at = now if LAST_API_CALL is None else max(now, LAST_API_CALL + MIN_CALL_INTERVAL)
+        LAST_API_CALL = call_at
+    sleep_time = call_at - now
+    if sleep_time > 0:
+        logger.info(f"[CHARTINK-{request_id}] Rate limiting: Sleeping for {sleep_time:.2f}s")
+        time.sleep(sleep_time)
     
     try:
         # Create a session for maintaining cookies and headers
@@ -195,7 +154,7 @@ def get_chartink_scans(query, debug=True, use_cache=True):
                 'X-Requested-With': 'XMLHttpRequest',
                 'Content-Type': 'application/x-www-form-urlencoded; charset=UTF-8',
                 'Referer': CHARTINK_REFERER,
-                'Origin': 'https://chartink.com'
+                'Origin': CHARTINK_BASE_URL
             })
             
             # Log the request details
@@ -204,8 +163,9 @@ def get_chartink_scans(query, debug=True, use_cache=True):
                 query_log = query.replace('\n', ' ').strip()
                 logger.info(f"[CHARTINK-{request_id}] Query: {query_log}")
             
-            # Record the API call time
-            LAST_API_CALL = time.time()
+            # Record the API call time (never earlier than a slot already reserved)
+            with _RATE_LOCK:
+                LAST_API_CALL = max(LAST_API_CALL, time.time())
             start_time = time.time()
             
             # Make the request
@@ -346,7 +306,7 @@ class EnhancedChartinkClient:
     """Enhanced ChartInk client with HTTP 419 error fixes"""
     
     def __init__(self):
-        self.base_url = "https://chartink.com"
+        self.base_url = CHARTINK_BASE_URL
         self.screener_url = f"{self.base_url}/screener/process"
         self.referer_url = f"{self.base_url}/screener"
         
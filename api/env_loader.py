@@ -15,6 +15,8 @@ from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
 
+from utils.async_logging import enable_async_logging
+
 logger = logging.getLogger(__name__)
 
 class EnvironmentLoader:
@@ -137,7 +139,14 @@ def load_server_environment(server_type: str) -> Optional[dict]:
         dict: Server configuration if successful, None otherwise
     """
     loader = EnvironmentLoader(server_type)
-    if loader.load_environment():
+    loaded = loader.load_environment()
+    
+    # Load tests point yfinance at a local stand-in server
+    if os.getenv('YAHOO_BASE_URL'):
+        from shared.data.market_endpoints import redirect_yfinance
+        redirect_yfinance(os.getenv('YAHOO_BASE_URL'))
+    
+    if loaded:
         return loader.get_server_config()
     return None
 
@@ -165,6 +174,8 @@ def setup_logging(server_type: str):
             logging.StreamHandler(sys.stdout)
         ]
     )
+    # Move file/console I/O off the event loop onto the background writer
+    enable_async_logging()
     
     logger.info(f"🚀 {server_type.title()} server logging configured")
     logger.info(f"📁 Log file: {config['log_file']}")
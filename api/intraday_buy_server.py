@@ -24,6 +24,7 @@ from pydantic import BaseModel, Field
 from env_loader import load_server_environment, setup_logging
 from api.services.data_service import RealTimeDataService
 from api.services.intraday_service import IntradayService
+from utils.tracing import install_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +62,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage latency histograms on /metrics (recorded when TRACING_ENABLED=true)
+install_metrics(app, "intraday_buy")
+
 # ---------------------------------------------------------------------------
 # Globals
 # ---------------------------------------------------------------------------
@@ -32,6 +32,9 @@ from pydantic import BaseModel, Field
 from env_loader import load_server_environment, setup_logging
 from api.services.data_service import RealTimeDataService
 from api.services.intraday_service import IntradayService
+from utils.tracing import install_metrics
+from utils.lazy import lazy_import, warm
+from utils.health_oracle import health_oracle
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +76,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage latency histograms on /metrics (recorded when TRACING_ENABLED=true)
+install_metrics(app, "intraday")
+
 # ---------------------------------------------------------------------------
 # Global service instances – initialised on application startup
 # ---------------------------------------------------------------------------
@@ -233,6 +239,8 @@ async def startup_event():
     try:
         data_service = RealTimeDataService()
         intraday_service = IntradayService(data_service)
+        warm(lazy_import("yfinance"), background=True)
+        health_oracle.start()
         logger.info("✅ Intraday service initialised")
     except Exception as exc:
         logger.exception("Failed to start services: %s", exc)
@@ -244,7 +252,7 @@ async def shutdown_event():
     """Graceful shutdown – release resources."""
 
     logger.info("🛑 Shutting down Intraday Trading Server…")
-    # No explicit teardown required yet – placeholder for future cleanup
+    await health_oracle.stop()
 
 
 # ---------------------------------------------------------------------------
@@ -40,6 +40,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Load environment configuration for longterm server
 from api.env_loader import load_server_environment, setup_logging
+from utils.async_logging import enable_async_logging
 
 # Setup environment and logging
 server_config = load_server_environment('longterm')
@@ -51,6 +52,7 @@ else:
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
+    enable_async_logging()
 
 from api.services.long_term_service import LongTermInvestmentService
 from api.services.data_service import RealTimeDataService
@@ -67,6 +69,10 @@ from models.recommendation_history_models import (
     RecommendationSource
 )
 from api.services.market_timer import market_timer
+from api.services.config_snapshot import SnapshotFileWatcher, SnapshotHolder
+from utils.tracing import install_metrics, span
+from utils.lazy import lazy_import, warm
+from utils.health_oracle import health_oracle
 
 # Import combination testing and query functions
 from api.tests.test_queries import test_query_silent
@@ -80,10 +86,15 @@ long_term_service: Optional[LongTermInvestmentService] = None
 # Initialize API logger
 api_logger = APILogger("longterm")
 
+LONG_TERM_CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config', 'long_term_config.json')
+
+# Immutable long-term config snapshot (swapped atomically on reload)
+config_snapshots = SnapshotHolder("long_term_config")
+config_watcher = SnapshotFileWatcher(config_snapshots, LONG_TERM_CONFIG_PATH)
+
 def load_long_term_config():
     """Load the long term config with all query variants"""
-    config_path = os.path.join(os.path.dirname(__file__), 'config', 'long_term_config.json')
-    with open(config_path, 'r') as f:
+    with open(LONG_TERM_CONFIG_PATH, 'r') as f:
         return json.load(f)
 
 @asynccontextmanager
@@ -99,8 +110,15 @@ async def lifespan(app: FastAPI):
         long_term_service = LongTermInvestmentService(data_service)
         
         # Load configuration
-        config = load_long_term_config()
-        app.state.config = config
+        config = config_snapshots.publish(load_long_term_config())
+        app.state.config = config.to_dict()
+        config_snapshots.add_listener(lambda snapshot: setattr(app.state, 'config', snapshot.to_dict()))
+        # Hot-reload the config snapshot when the JSON file changes
+        config_watcher.start()
+        
+        warm(recommendation_cache, recommendation_history_storage)
+        warm(lazy_import("yfinance"), background=True)
+        health_oracle.start()
         
         logger.info("✅ Long-term investment service initialized")
         yield
@@ -109,6 +127,8 @@ async def lifespan(app: FastAPI):
         logger.error(f"Error initializing long-term investment service: {e}")
         raise
     finally:
+        config_watcher.stop()
+        await health_oracle.stop()
         logger.info("🛑 Shutting down Long-Term Investment Service")
 
 # Get server configuration
@@ -136,6 +156,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage latency histograms on /metrics (recorded when TRACING_ENABLED=true)
+install_metrics(app, "longterm")
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -331,14 +354,14 @@ async def get_long_buy_recommendations(request: LongBuyRequest, raw_request: Req
         raw_body = await raw_request.body()
         try:
             raw_json = raw_body.decode()
-            logger.info(f"RAW REQUEST BODY: {raw_json}")
+            logger.debug(f"RAW REQUEST BODY: {raw_json}")
             api_logger.log_request(json.loads(raw_json), '/api/longterm/long-buy-recommendations')
         except Exception as e:
             logger.warning(f"Could not decode raw request body: {e}")
             api_logger.log_request(str(raw_body), '/api/longterm/long-buy-recommendations')
 
         # Get configuration
-        config = app.state.config
+        config = config_snapshots.current.data
         
         # Default combination - use all four pillars of long-term investing
         default_combination = {
@@ -365,10 +388,11 @@ async def get_long_buy_recommendations(request: LongBuyRequest, raw_request: Req
         # Check cache first (unless force_refresh is True)
         if not request.force_refresh:
             logger.info("🔍 Checking cache for recent recommendations...")
-            cached_result = await recommendation_cache.get_cached_recommendation(
-                RecommendationType.LONG_TERM, 
-                cache_request
-            )
+            with span("cache.lookup"):
+                cached_result = await recommendation_cache.get_cached_recommendation(
+                    RecommendationType.LONG_TERM, 
+                    cache_request
+                )
             
             if cached_result:
                 processing_time = time.time() - start_time
@@ -395,14 +419,15 @@ async def get_long_buy_recommendations(request: LongBuyRequest, raw_request: Req
         logger.info(f"🎯 Running combination analysis: F={fundamental_v}, M={momentum_v}, V={value_v}, Q={quality_v}")
         
         # Run the comprehensive analysis
-        result = await run_combination_analysis(
-            config, 
-            fundamental_v, 
-            momentum_v, 
-            value_v, 
-            quality_v, 
-            limit=request.limit_per_query or 50
-        )
+        with span("analysis.combination"):
+            result = await run_combination_analysis(
+                config, 
+                fundamental_v, 
+                momentum_v, 
+                value_v, 
+                quality_v, 
+                limit=request.limit_per_query or 50
+            )
         
         # Get top stocks
         top_stocks = result.get('top_stocks', [])
@@ -484,12 +509,13 @@ async def get_long_buy_recommendations(request: LongBuyRequest, raw_request: Req
         
         # Always cache the results after fresh analysis (regardless of market hours when force_refresh is used)
         try:
-            await recommendation_cache.store_recommendation(
-                RecommendationType.LONG_TERM,
-                cache_request,
-                recommendations,
-                metadata
-            )
+            with span("cache.write"):
+                await recommendation_cache.store_recommendation(
+                    RecommendationType.LONG_TERM,
+                    cache_request,
+                    recommendations,
+                    metadata
+                )
             if request.force_refresh:
                 logger.info(f"✅ Force refresh: Updated cache with {len(recommendations)} long-term recommendations")
             else:
@@ -503,40 +529,41 @@ async def get_long_buy_recommendations(request: LongBuyRequest, raw_request: Req
                 execution_id = f"api_longterm_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
                 market_info = market_timer.get_market_session_info()
                 
-                batch_id = await recommendation_history_storage.store_recommendation_batch(
-                    execution_id=execution_id,
-                    cron_job_id="api_longterm_force_refresh",
-                    strategy=RecommendationStrategy.LONGTERM,
-                    recommendations=recommendations,
-                    metadata={
-                        "algorithm_info": metadata.get("algorithm_info", {}),
-                        "performance_metrics": {
-                            "api_response_time_ms": processing_time * 1000,
-                            "total_processing_time_seconds": processing_time,
-                            "cache_bypassed": True,
+                with span("history.store"):
+                    batch_id = await recommendation_history_storage.store_recommendation_batch(
+                        execution_id=execution_id,
+                        cron_job_id="api_longterm_force_refresh",
+                        strategy=RecommendationStrategy.LONGTERM,
+                        recommendations=recommendations,
+                        metadata={
+                            "algorithm_info": metadata.get("algorithm_info", {}),
+                            "performance_metrics": {
+                                "api_response_time_ms": processing_time * 1000,
+                                "total_processing_time_seconds": processing_time,
+                                "cache_bypassed": True,
+                                "force_refresh": True
+                            },
+                            "source_info": {
+                                "trigger": "api_force_refresh",
+                                "endpoint": "/api/longterm/long-buy-recommendations",
+                                "user_agent": "API_Client"
+                            }
+                        },
+                        request_parameters={
+                            "combination": combination,
+                            "limit_per_query": request.limit_per_query or 50,
+                            "min_score": request.min_score or 25.0,
+                            "top_recommendations": request.top_recommendations or 20,
                             "force_refresh": True
                         },
-                        "source_info": {
-                            "trigger": "api_force_refresh",
-                            "endpoint": "/api/longterm/long-buy-recommendations",
-                            "user_agent": "API_Client"
+                        market_context={
+                            "market_condition": market_info.get('session', 'unknown'),
+                            "trading_session": market_info.get('session_id', ''),
+                            "market_open": market_info.get('is_open', False),
+                            "timestamp": datetime.now(),
+                            "source": "api_request"
                         }
-                    },
-                    request_parameters={
-                        "combination": combination,
-                        "limit_per_query": request.limit_per_query or 50,
-                        "min_score": request.min_score or 25.0,
-                        "top_recommendations": request.top_recommendations or 20,
-                        "force_refresh": True
-                    },
-                    market_context={
-                        "market_condition": market_info.get('session', 'unknown'),
-                        "trading_session": market_info.get('session_id', ''),
-                        "market_open": market_info.get('is_open', False),
-                        "timestamp": datetime.now(),
-                        "source": "api_request"
-                    }
-                )
+                    )
                 logger.info(f"✅ Stored long-term recommendations batch in history: {batch_id}")
                 
                 # Add historical storage info to response metadata
@@ -944,10 +971,9 @@ async def get_fundamental_analysis(symbol: str = Query(..., description="Stock s
     
     try:
         # Get fundamental analysis from the reranker
-        from api.services.fundamental_reranker import FundamentalReranker
-        reranker = FundamentalReranker()
+        from api.services.fundamental_reranker import fundamental_reranker
         
-        report = await reranker.get_stock_report(symbol)
+        report = await fundamental_reranker.get_stock_report(symbol)
         
         if "error" in report:
             raise HTTPException(
@@ -998,7 +1024,7 @@ async def debug_test_simple_query():
 async def get_available_variants():
     """Get all available query variants by category for combination building."""
     try:
-        config = app.state.config
+        config = config_snapshots.current.data
         variants_summary = {}
         
         for category, variants in config['sub_algorithm_variants'].items():
@@ -1034,18 +1060,19 @@ async def test_combination(request: CombinationTestRequest):
     performance metrics for analysis.
     """
     try:
-        config = app.state.config
+        config = config_snapshots.current.data
         
         logger.info(f"🧪 Testing combination: F:{request.fundamental_version} M:{request.momentum_version} V:{request.value_version} Q:{request.quality_version}")
         
-        result = await run_combination_analysis(
-            config,
-            request.fundamental_version,
-            request.momentum_version,
-            request.value_version,
-            request.quality_version,
-            request.limit_per_query or 50
-        )
+        with span("analysis.combination"):
+            result = await run_combination_analysis(
+                config,
+                request.fundamental_version,
+                request.momentum_version,
+                request.value_version,
+                request.quality_version,
+                request.limit_per_query or 50
+            )
         
         return {
             "status": "success",
@@ -1089,7 +1116,8 @@ async def run_combination_analysis(config, fundamental_v, momentum_v, value_v, q
             logger.info(f"  🔍 {category.capitalize()} ({version}): {name}")
             
             # Run the query
-            results = test_query_silent(query, limit=limit)
+            with span("chartink.query"):
+                results = test_query_silent(query, limit=limit)
             
             if results and 'data' in results and results.get('success', False):
                 stocks = results['data']
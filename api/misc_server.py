@@ -21,6 +21,7 @@ from enum import Enum
 
 # Add API logger
 from utils.api_logger import APILogger
+from utils.tracing import install_metrics
 logger = APILogger(__name__, service="misc")
 
 class AlgorithmVariant(BaseModel):
@@ -110,6 +111,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage latency histograms on /metrics (recorded when TRACING_ENABLED=true)
+install_metrics(app, "misc")
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
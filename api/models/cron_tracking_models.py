@@ -5,24 +5,54 @@ Cron Job Execution Tracking Models
 
 Database models for tracking and analyzing cron job executions in the trading system.
 Provides comprehensive logging of job performance, outcomes, and system health metrics.
+
+Analytics are served from pre-aggregated rollups: every completed execution
+increments per-job hourly, daily and all-time counters (executions, failures,
+duration histogram, stocks produced) in ``cron_rollups`` (or
+``api/cron_logs/rollups/cron_rollups.json`` with file storage), so dashboards
+never scan raw execution documents.
+
+MongoDB rollups are only ever changed with ``$inc`` / ``$max`` upserts, so
+concurrent cron processes never lose an increment. The rollup file is shared
+by separate processes too; every read-modify-write of it holds an exclusive
+lock on ``cron_rollups.json.lock``, polled without blocking the event loop. Existing execution history is backfilled
+into empty rollups on ``initialize``.
 """
 
+import asyncio
 import json
 import logging
+import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Union
 from enum import Enum
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import uuid
+from contextlib import asynccontextmanager
 
-import motor.motor_asyncio
-from pymongo import MongoClient, ASCENDING, DESCENDING
-from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from utils.lazy import LazySingleton, lazy_import
+
+# Imported on first client construction, not at server start
+motor_asyncio = lazy_import("motor.motor_asyncio")
+pymongo = lazy_import("pymongo")
+
+try:
+    import fcntl
+except ImportError:  # Windows - single cron process assumed
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# Rollup settings
+ROLLUP_BUCKET_FORMATS = {"hour": "%Y-%m-%dT%H", "day": "%Y-%m-%d", "all": "all"}
+DURATION_BUCKETS = (5, 15, 30, 60, 120, 300, 600)  # Histogram upper bounds (seconds)
+HOURLY_ROLLUP_RETENTION_DAYS = int(os.getenv("CRON_HOURLY_ROLLUP_RETENTION_DAYS", "14"))
+FAILURE_STATUSES = ("failed", "timeout")
+ROLLUP_LOCK_POLL_SECONDS = 0.01  # Retry interval while another process holds the rollup file lock
+
 class CronJobStatus(Enum):
     """Cron job execution status."""
     PENDING = "pending"
@@ -39,6 +69,7 @@ class CronJobType(Enum):
     SWING_ANALYSIS = "swing_analysis"
     LONGTERM_ANALYSIS = "longterm_analysis"
     CACHE_CLEANUP = "cache_cleanup"
+    OUTCOME_EVALUATION = "outcome_evaluation"
     SYSTEM_HEALTH_CHECK = "system_health_check"
     DATA_BACKUP = "data_backup"
 
@@ -172,6 +203,76 @@ class SystemHealthMetrics(BaseModel):
     average_response_time: float = Field(..., description="Average job response time")
     error_rate: float = Field(..., description="Error rate percentage")
 
+def duration_bucket(duration_seconds: Optional[float]) -> str:
+    """Histogram bucket label for an execution duration."""
+    if duration_seconds is None:
+        return "unknown"
+    for bound in DURATION_BUCKETS:
+        if duration_seconds <= bound:
+            return f"le_{bound}s"
+    return f"gt_{DURATION_BUCKETS[-1]}s"
+
+def rollup_bucket(timestamp: datetime, granularity: str) -> str:
+    """Sortable bucket key (``2024-01-05T09`` / ``2024-01-05`` / ``all``)."""
+    return timestamp.strftime(ROLLUP_BUCKET_FORMATS[granularity])
+
+def stocks_produced(output_summary: Optional[Dict[str, Any]],
+                    performance_metrics: Optional[Dict[str, Any]] = None) -> int:
+    """Number of stocks/recommendations an execution produced."""
+    for source in (output_summary or {}, performance_metrics or {}):
+        for key in ("recommendations_generated", "recommendations_count", "total_recommendations"):
+            value = source.get(key)
+            if isinstance(value, (int, float)):
+                return int(value)
+    return 0
+
+def rollup_increments(status: str,
+                      duration_seconds: Optional[float],
+                      stocks: int) -> Dict[str, float]:
+    """Counter increments one completed execution adds to each rollup bucket."""
+    increments = {
+        "count": 1,
+        "successes": int(status == CronJobStatus.SUCCESS.value),
+        "failures": int(status in FAILURE_STATUSES),
+        f"statuses.{status}": 1,
+        f"duration_histogram.{duration_bucket(duration_seconds)}": 1,
+        "stocks_produced": stocks,
+    }
+    if duration_seconds is not None:
+        increments["duration_sum"] = duration_seconds
+        increments["duration_count"] = 1
+    return increments
+
+def merge_rollup(doc: Dict[str, Any], increments: Dict[str, float], maxima: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply ``$inc`` / ``$max`` style updates to an in-memory rollup document."""
+    for path, value in increments.items():
+        target = doc
+        *parents, leaf = path.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = target.get(leaf, 0) + value
+    for field_name, value in maxima.items():
+        if value is not None and (doc.get(field_name) is None or str(value) > str(doc[field_name])):
+            doc[field_name] = value
+    return doc
+
+def combine_rollups(rollups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum a list of rollup buckets into one."""
+    combined: Dict[str, Any] = {}
+    for rollup in rollups:
+        increments = {
+            key: rollup.get(key, 0)
+            for key in ("count", "successes", "failures", "stocks_produced", "duration_sum", "duration_count")
+        }
+        for group in ("statuses", "duration_histogram"):
+            for label, value in (rollup.get(group) or {}).items():
+                increments[f"{group}.{label}"] = value
+        merge_rollup(combined, increments, {
+            "last_execution": rollup.get("last_execution"),
+            "last_success": rollup.get("last_success"),
+        })
+    return combined
+
 class CronExecutionTracker:
     """Database manager for cron job execution tracking."""
     
@@ -180,15 +281,23 @@ class CronExecutionTracker:
         self.db_name = db_name
         
         if use_mongodb:
-            self.client = motor.motor_asyncio.AsyncIOMotorClient(mongodb_url)
+            self.client = motor_asyncio.AsyncIOMotorClient(mongodb_url)
             self.db = self.client[db_name]
             self.executions_collection = self.db.cron_executions
             self.summaries_collection = self.db.cron_summaries
             self.health_collection = self.db.system_health
+            self.rollups_collection = self.db.cron_rollups
+            # Held by completions and by the rebuild's catch-up -> swap -> replay window
+            self._rollup_swap = asyncio.Lock()
         else:
             # Fallback to file-based storage
             self.storage_dir = Path("api/cron_logs")
             self.storage_dir.mkdir(exist_ok=True)
+
+    @property
+    def rollup_file(self) -> Path:
+        """Rollup store for file-based storage (kept out of the execution glob)."""
+        return self.storage_dir / "rollups" / "cron_rollups.json"
     
     async def initialize(self):
         """Initialize the tracking system and create indexes."""
@@ -199,23 +308,30 @@ class CronExecutionTracker:
                 
                 # Create indexes for efficient querying
                 await self.executions_collection.create_index([
-                    ("job_type", ASCENDING),
-                    ("scheduled_time", DESCENDING)
+                    ("job_type", pymongo.ASCENDING),
+                    ("scheduled_time", pymongo.DESCENDING)
                 ])
                 await self.executions_collection.create_index([
-                    ("status", ASCENDING),
-                    ("actual_start_time", DESCENDING)
+                    ("status", pymongo.ASCENDING),
+                    ("actual_start_time", pymongo.DESCENDING)
                 ])
                 await self.executions_collection.create_index([
-                    ("market_condition", ASCENDING),
-                    ("trading_session", ASCENDING)
+                    ("market_condition", pymongo.ASCENDING),
+                    ("trading_session", pymongo.ASCENDING)
                 ])
                 await self.executions_collection.create_index([
-                    ("success", ASCENDING),
-                    ("job_type", ASCENDING),
-                    ("created_at", DESCENDING)
+                    ("success", pymongo.ASCENDING),
+                    ("job_type", pymongo.ASCENDING),
+                    ("created_at", pymongo.DESCENDING)
                 ])
-                
+                await self.rollups_collection.create_index([
+                    ("job_type", pymongo.ASCENDING),
+                    ("granularity", pymongo.ASCENDING),
+                    ("bucket", pymongo.ASCENDING)
+                ], unique=True)
+                # Hourly rollups expire; daily and all-time rollups are kept
+                await self.rollups_collection.create_index("expires_at", expireAfterSeconds=0)
+
                 logger.info("✅ Cron execution tracker initialized with MongoDB")
             else:
                 logger.info("✅ Cron execution tracker initialized with file storage")
@@ -225,6 +341,25 @@ class CronExecutionTracker:
             self.use_mongodb = False
             self.storage_dir = Path("api/cron_logs")
             self.storage_dir.mkdir(parents=True, exist_ok=True)
+        
+        await self.backfill_rollups()
+
+    async def backfill_rollups(self) -> int:
+        """Build rollups from the execution history if none exist yet."""
+        try:
+            if self.use_mongodb:
+                if await self.rollups_collection.estimated_document_count():
+                    return 0
+                if not await self.executions_collection.estimated_document_count():
+                    return 0
+            elif self.rollup_file.exists() or not any(self.storage_dir.glob("*.json")):
+                return 0
+        except Exception as e:
+            logger.warning(f"⚠️ Could not check cron rollups for backfill: {e}")
+            return 0
+        
+        logger.info("📊 No cron rollups yet, backfilling from execution history...")
+        return await self.rebuild_rollups()
 
     async def close(self):
         """Close database connections."""
@@ -265,7 +400,7 @@ class CronExecutionTracker:
                 # File-based storage
                 file_path = self.storage_dir / f"{execution.execution_id}.json"
                 with open(file_path, 'w') as f:
-                    json.dump(execution.dict(), f, default=str, indent=2)
+                    json.dump(execution.dict_for_db(), f, default=str, indent=2)
                 return execution.execution_id
                 
         except Exception as e:
@@ -297,9 +432,13 @@ class CronExecutionTracker:
             if error_details:
                 update_data["error_details"] = error_details
             
+            stocks = stocks_produced(output_summary, performance_metrics)
+            update_data["recommendations_count"] = stocks
+            
             if self.use_mongodb:
                 # Calculate duration if we have start time
                 existing = await self.executions_collection.find_one({"execution_id": execution_id})
+                start_time = None
                 if existing and existing.get("actual_start_time"):
                     start_time = existing["actual_start_time"]
                     if isinstance(start_time, str):
@@ -307,16 +446,27 @@ class CronExecutionTracker:
                     duration = (end_time - start_time).total_seconds()
                     update_data["duration_seconds"] = duration
                 
-                result = await self.executions_collection.update_one(
-                    {"execution_id": execution_id},
-                    {"$set": update_data}
-                )
+                # Completion and increment stay on one side of a rollup swap in
+                # this process (see ``rebuild_rollups``)
+                async with self._rollup_swap:
+                    result = await self.executions_collection.update_one(
+                        {"execution_id": execution_id},
+                        {"$set": update_data}
+                    )
+                    if result.modified_count > 0:
+                        await self._record_rollups(
+                            job_type=existing.get("job_type"),
+                            status=status.value,
+                            started_at=start_time or end_time,
+                            duration_seconds=update_data.get("duration_seconds"),
+                            stocks=stocks
+                        )
                 
                 if result.modified_count > 0:
                     logger.info(f"✅ Completed job execution tracking: {execution_id} - {status.value}")
                     
                     # Update summary statistics
-                    await self._update_job_summary(execution_id)
+                    await self._update_job_summary(existing.get("job_type"), existing.get("job_name", ""))
                     return True
                 else:
                     logger.warning(f"⚠️ No execution found to update: {execution_id}")
@@ -331,14 +481,25 @@ class CronExecutionTracker:
                     data.update(update_data)
                     
                     # Calculate duration
+                    start_time = None
                     if data.get("actual_start_time"):
                         start_time = datetime.fromisoformat(data["actual_start_time"])
                         duration = (end_time - start_time).total_seconds()
                         data["duration_seconds"] = duration
                     
-                    with open(file_path, 'w') as f:
-                        json.dump(data, f, default=str, indent=2)
-                    
+                    # The completed record and its increment land together, so a
+                    # concurrent rebuild counts the execution exactly once
+                    async with self._rollup_file_lock():
+                        with open(file_path, 'w') as f:
+                            json.dump(data, f, default=str, indent=2)
+                        
+                        await self._record_rollups(
+                            job_type=data.get("job_type"),
+                            status=status.value,
+                            started_at=start_time or end_time,
+                            duration_seconds=data.get("duration_seconds"),
+                            stocks=stocks
+                        )
                     return True
                 return False
                 
@@ -346,6 +507,262 @@ class CronExecutionTracker:
             logger.error(f"❌ Failed to complete job execution tracking: {e}")
             return False
 
+    async def _record_rollups(self,
+                              job_type: Optional[str],
+                              status: str,
+                              started_at: datetime,
+                              duration_seconds: Optional[float],
+                              stocks: int) -> None:
+        """Increment the hourly, daily and all-time rollups for one execution.
+        
+        With file storage the caller holds ``_rollup_file_lock``.
+        """
+        if not job_type:
+            return
+        
+        increments = rollup_increments(status, duration_seconds, stocks)
+        maxima = {"last_execution": started_at}
+        if status == CronJobStatus.SUCCESS.value:
+            maxima["last_success"] = started_at
+        
+        try:
+            if self.use_mongodb:
+                operations = []
+                for granularity in ROLLUP_BUCKET_FORMATS:
+                    update = {"$inc": increments, "$max": maxima}
+                    if granularity == "hour":
+                        update["$setOnInsert"] = {
+                            "expires_at": started_at + timedelta(days=HOURLY_ROLLUP_RETENTION_DAYS)
+                        }
+                    operations.append(pymongo.UpdateOne(
+                        {"job_type": job_type, "granularity": granularity,
+                         "bucket": rollup_bucket(started_at, granularity)},
+                        update,
+                        upsert=True
+                    ))
+                await self.rollups_collection.bulk_write(operations, ordered=False)
+            else:
+                rollups = self._load_rollup_file()
+                file_maxima = {key: value.isoformat() for key, value in maxima.items()}
+                for granularity in ROLLUP_BUCKET_FORMATS:
+                    bucket = rollup_bucket(started_at, granularity)
+                    key = f"{job_type}|{granularity}|{bucket}"
+                    doc = rollups.setdefault(key, {"job_type": job_type, "granularity": granularity, "bucket": bucket})
+                    merge_rollup(doc, increments, file_maxima)
+                
+                # Prune expired hourly buckets
+                cutoff = rollup_bucket(datetime.now() - timedelta(days=HOURLY_ROLLUP_RETENTION_DAYS), "hour")
+                rollups = {
+                    key: doc for key, doc in rollups.items()
+                    if doc["granularity"] != "hour" or doc["bucket"] >= cutoff
+                }
+                self._save_rollup_file(rollups)
+        except Exception as e:
+            logger.error(f"❌ Failed to update cron rollups: {e}")
+
+    @asynccontextmanager
+    async def _rollup_file_lock(self):
+        """Exclusive lock for read-modify-write of the rollup file across processes.
+        
+        Taken with ``LOCK_NB`` and retried after a short sleep, so waiting on
+        another process never blocks the event loop.
+        """
+        if fcntl is None:
+            yield
+            return
+        self.rollup_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(f"{self.rollup_file}.lock", 'a') as lock_file:
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    await asyncio.sleep(ROLLUP_LOCK_POLL_SECONDS)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_rollup_file(self) -> Dict[str, Dict[str, Any]]:
+        if not self.rollup_file.exists():
+            return {}
+        with open(self.rollup_file, 'r') as f:
+            return json.load(f)
+
+    def _save_rollup_file(self, rollups: Dict[str, Dict[str, Any]]) -> None:
+        # Write-then-rename so lock-free readers never see a partial file
+        self.rollup_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.rollup_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(rollups, f, default=str, separators=(',', ':'))
+        tmp_path.replace(self.rollup_file)
+
+    async def get_rollups(self,
+                          job_type: Optional[CronJobType] = None,
+                          granularity: str = "day",
+                          start_date: Optional[datetime] = None,
+                          end_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get rollup buckets (oldest first) for one or all job types."""
+        
+        lower = rollup_bucket(start_date, granularity) if start_date else None
+        upper = rollup_bucket(end_date, granularity) if end_date else None
+        
+        try:
+            if self.use_mongodb:
+                query: Dict[str, Any] = {"granularity": granularity}
+                if job_type:
+                    query["job_type"] = job_type.value
+                if lower or upper:
+                    bucket_query = {}
+                    if lower:
+                        bucket_query["$gte"] = lower
+                    if upper:
+                        bucket_query["$lte"] = upper
+                    query["bucket"] = bucket_query
+                
+                cursor = self.rollups_collection.find(query, {"_id": 0, "expires_at": 0}).sort("bucket", pymongo.ASCENDING)
+                return [doc async for doc in cursor]
+            else:
+                rollups = [
+                    doc for doc in self._load_rollup_file().values()
+                    if doc["granularity"] == granularity
+                    and (not job_type or doc["job_type"] == job_type.value)
+                    and (not lower or doc["bucket"] >= lower)
+                    and (not upper or doc["bucket"] <= upper)
+                ]
+                rollups.sort(key=lambda doc: doc["bucket"])
+                return rollups
+                
+        except Exception as e:
+            logger.error(f"❌ Failed to get cron rollups: {e}")
+            return []
+
+    @staticmethod
+    def _execution_rollup(execution: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """``_record_rollups`` arguments for a finished execution (None if unfinished)."""
+        status = execution.get("status")
+        started_at = execution.get("actual_start_time")
+        if not execution.get("job_type") or not started_at or status in (None, "running", "pending"):
+            return None
+        if isinstance(started_at, str):
+            started_at = datetime.fromisoformat(started_at)
+        stocks = execution.get("recommendations_count")
+        if stocks is None:
+            stocks = stocks_produced(execution.get("output_summary"), execution.get("performance_metrics"))
+        return {
+            "job_type": execution["job_type"],
+            "status": status,
+            "started_at": started_at,
+            "duration_seconds": execution.get("duration_seconds"),
+            "stocks": int(stocks or 0),
+        }
+
+    async def rebuild_rollups(self) -> int:
+        """Recompute all rollups from the raw execution history.
+        
+        MongoDB rollups are rebuilt into a scratch collection that is renamed
+        over ``cron_rollups``, so readers never see a half-built set. Executions
+        that complete while the history is scanned are picked up by a second,
+        short catch-up pass. Completions in this process wait out the
+        catch-up -> swap window; those from other processes that land in it
+        sent their live increments to the collection being replaced, so they
+        are replayed into the new one after the swap. File storage rebuilds
+        under the rollup file lock, which completions also hold.
+        """
+        
+        rollups: Dict[str, Dict[str, Any]] = {}
+        
+        def _accumulate(execution: Dict[str, Any]) -> None:
+            rollup = self._execution_rollup(execution)
+            if rollup is None:
+                return
+            started_at = rollup["started_at"]
+            increments = rollup_increments(rollup["status"], rollup["duration_seconds"], rollup["stocks"])
+            maxima = {"last_execution": started_at}
+            if rollup["status"] == CronJobStatus.SUCCESS.value:
+                maxima["last_success"] = started_at
+            if not self.use_mongodb:
+                maxima = {key: value.isoformat() for key, value in maxima.items()}
+            for granularity in ROLLUP_BUCKET_FORMATS:
+                bucket = rollup_bucket(started_at, granularity)
+                key = f"{rollup['job_type']}|{granularity}|{bucket}"
+                doc = rollups.setdefault(key, {
+                    "job_type": rollup["job_type"], "granularity": granularity, "bucket": bucket
+                })
+                if granularity == "hour" and self.use_mongodb:
+                    doc.setdefault("expires_at", started_at + timedelta(days=HOURLY_ROLLUP_RETENTION_DAYS))
+                merge_rollup(doc, increments, maxima)
+        
+        try:
+            if self.use_mongodb:
+                projection = {
+                    "job_type": 1, "status": 1, "actual_start_time": 1, "duration_seconds": 1,
+                    "recommendations_count": 1, "output_summary": 1, "performance_metrics": 1
+                }
+                # Scratch collection ready before the scan keeps the swap window short
+                scratch = self.db[f"{self.rollups_collection.name}_rebuild_{os.getpid()}"]
+                await scratch.drop()
+                await scratch.create_index([
+                    ("job_type", pymongo.ASCENDING),
+                    ("granularity", pymongo.ASCENDING),
+                    ("bucket", pymongo.ASCENDING)
+                ], unique=True)
+                await scratch.create_index("expires_at", expireAfterSeconds=0)
+                
+                scan_started = datetime.now()
+                async for execution in self.executions_collection.find(
+                    {"$or": [{"end_time": {"$lt": scan_started}}, {"end_time": {"$exists": False}}]}, projection
+                ):
+                    _accumulate(execution)
+                
+                replayed = 0
+                async with self._rollup_swap:
+                    # Catch-up: executions completed during the scan, whose live
+                    # increments went to the collection about to be replaced
+                    caught_up = datetime.now()
+                    async for execution in self.executions_collection.find(
+                        {"end_time": {"$gte": scan_started, "$lt": caught_up}}, projection
+                    ):
+                        _accumulate(execution)
+                    
+                    if rollups:
+                        await scratch.insert_many(list(rollups.values()))
+                        await scratch.rename(self.rollups_collection.name, dropTarget=True)
+                    else:
+                        await scratch.drop()
+                        await self.rollups_collection.delete_many({})
+                    swapped = datetime.now()
+                    # Replay: other processes' executions completed between the
+                    # catch-up and the swap incremented the replaced collection
+                    async for execution in self.executions_collection.find(
+                        {"end_time": {"$gte": caught_up, "$lt": swapped}}, projection
+                    ):
+                        rollup = self._execution_rollup(execution)
+                        if rollup is not None:
+                            await self._record_rollups(**rollup)
+                            replayed += 1
+                if replayed:
+                    logger.info(f"🔁 Replayed {replayed} executions completed during the rollup swap")
+                job_types = {doc["job_type"] for doc in rollups.values()}
+                for job_type in job_types:
+                    await self._update_job_summary(job_type)
+            else:
+                async with self._rollup_file_lock():
+                    for file_path in self.storage_dir.glob("*.json"):
+                        try:
+                            with open(file_path, 'r') as f:
+                                _accumulate(json.load(f))
+                        except Exception:
+                            continue
+                    self._save_rollup_file(rollups)
+            
+            logger.info(f"✅ Rebuilt {len(rollups)} cron rollup buckets")
+            return len(rollups)
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to rebuild cron rollups: {e}")
+            return 0
+
     async def get_job_history(self, 
                               job_type: Optional[CronJobType] = None,
                               limit: int = 100,
@@ -370,7 +787,7 @@ class CronExecutionTracker:
                         date_query["$lte"] = end_date
                     query["actual_start_time"] = date_query
                 
-                cursor = self.executions_collection.find(query).sort("actual_start_time", DESCENDING).limit(limit)
+                cursor = self.executions_collection.find(query).sort("actual_start_time", pymongo.DESCENDING).limit(limit)
                 results = []
                 async for doc in cursor:
                     # Convert ObjectId to string
@@ -392,6 +809,10 @@ class CronExecutionTracker:
                             continue
                         if status_filter and data.get("status") != status_filter.value:
                             continue
+                        if start_date and data.get("actual_start_time", "") < start_date.isoformat():
+                            continue
+                        if end_date and data.get("actual_start_time", "") > end_date.isoformat():
+                            continue
                         
                         results.append(data)
                     except Exception:
@@ -408,62 +829,77 @@ class CronExecutionTracker:
     async def get_performance_analytics(self, 
                                         job_type: Optional[CronJobType] = None,
                                         days: int = 30) -> Dict[str, Any]:
-        """Get performance analytics for cron jobs."""
+        """Get performance analytics for cron jobs (served from daily/hourly rollups)."""
         
         try:
-            start_date = datetime.now() - timedelta(days=days)
+            now = datetime.now()
+            start_date = now - timedelta(days=days)
             
-            # Get recent executions
-            executions = await self.get_job_history(
-                job_type=job_type,
-                start_date=start_date,
-                limit=1000
-            )
+            daily = await self.get_rollups(job_type=job_type, granularity="day", start_date=start_date)
+            totals = combine_rollups(daily)
+            total_executions = totals.get("count", 0)
             
-            if not executions:
+            if not total_executions:
                 return {"message": "No execution data found", "executions": 0}
             
-            # Calculate analytics
-            total_executions = len(executions)
-            successful = len([e for e in executions if e.get("success", False)])
+            successful = totals.get("successes", 0)
             failed = total_executions - successful
             
-            durations = [e.get("duration_seconds", 0) for e in executions if e.get("duration_seconds")]
-            avg_duration = sum(durations) / len(durations) if durations else 0
+            duration_count = totals.get("duration_count", 0)
+            avg_duration = totals.get("duration_sum", 0) / duration_count if duration_count else 0
             
-            recommendations = [e.get("recommendations_count", 0) for e in executions if e.get("recommendations_count")]
-            total_recommendations = sum(recommendations)
-            avg_recommendations = sum(recommendations) / len(recommendations) if recommendations else 0
+            total_recommendations = totals.get("stocks_produced", 0)
+            avg_recommendations = total_recommendations / successful if successful else 0
             
-            # Performance trend analysis
+            # Recent success rate over the last 24 hourly buckets
+            hourly = await self.get_rollups(job_type=job_type, granularity="hour", start_date=now - timedelta(hours=24))
+            recent = combine_rollups(hourly)
             recent_success_rate = 0
-            if total_executions >= 10:
-                recent_executions = executions[:10]
-                recent_successful = len([e for e in recent_executions if e.get("success", False)])
-                recent_success_rate = (recent_successful / len(recent_executions)) * 100
+            if recent.get("count"):
+                recent_success_rate = (recent.get("successes", 0) / recent["count"]) * 100
             
             return {
                 "analysis_period_days": days,
+                "executions": total_executions,
                 "total_executions": total_executions,
                 "successful_executions": successful,
                 "failed_executions": failed,
-                "success_rate_percent": (successful / total_executions) * 100 if total_executions > 0 else 0,
+                "success_rate_percent": (successful / total_executions) * 100,
                 "recent_success_rate_percent": recent_success_rate,
                 "average_duration_seconds": avg_duration,
+                "duration_histogram": totals.get("duration_histogram", {}),
+                "status_breakdown": totals.get("statuses", {}),
                 "total_recommendations_generated": total_recommendations,
                 "average_recommendations_per_execution": avg_recommendations,
-                "performance_trend": "stable",  # Could be enhanced with trend analysis
+                "performance_trend": self._performance_trend(daily),
                 "execution_frequency_per_day": total_executions / days if days > 0 else 0,
-                "last_execution": executions[0].get("actual_start_time") if executions else None,
-                "last_successful_execution": next(
-                    (e.get("actual_start_time") for e in executions if e.get("success")), None
-                )
+                "last_execution": totals.get("last_execution"),
+                "last_successful_execution": totals.get("last_success")
             }
             
         except Exception as e:
             logger.error(f"❌ Failed to get performance analytics: {e}")
             return {"error": str(e)}
 
+    @staticmethod
+    def _performance_trend(daily_rollups: List[Dict[str, Any]]) -> str:
+        """Compare success rates of the older and newer half of the period."""
+        if len(daily_rollups) < 2:
+            return "stable"
+        
+        middle = len(daily_rollups) // 2
+        older = combine_rollups(daily_rollups[:middle])
+        newer = combine_rollups(daily_rollups[middle:])
+        if not older.get("count") or not newer.get("count"):
+            return "stable"
+        
+        change = (newer.get("successes", 0) / newer["count"] - older.get("successes", 0) / older["count"]) * 100
+        if change > 5:
+            return "improving"
+        if change < -5:
+            return "degrading"
+        return "stable"
+
     def _get_current_market_condition(self) -> MarketCondition:
         """Determine current market condition."""
         now = datetime.now()
@@ -509,54 +945,45 @@ class CronExecutionTracker:
         except Exception:
             return {"hostname": "unknown", "timestamp": datetime.now().isoformat()}
 
-    async def _update_job_summary(self, execution_id: str):
-        """Update job summary statistics."""
+    async def _update_job_summary(self, job_type: Optional[str], job_name: str = ""):
+        """Update job summary statistics from the all-time rollup."""
         try:
-            if not self.use_mongodb:
+            if not self.use_mongodb or not job_type:
                 return  # Skip for file storage
             
-            # Get the execution details
-            execution = await self.executions_collection.find_one({"execution_id": execution_id})
-            if not execution:
+            rollup = await self.rollups_collection.find_one(
+                {"job_type": job_type, "granularity": "all", "bucket": "all"}
+            )
+            if not rollup:
                 return
             
-            job_type = execution.get("job_type")
+            total_executions = rollup.get("count", 0)
+            successful_executions = rollup.get("successes", 0)
+            duration_count = rollup.get("duration_count", 0)
             
-            # Calculate summary statistics
-            pipeline = [
-                {"$match": {"job_type": job_type}},
-                {"$group": {
-                    "_id": "$job_type",
-                    "total_executions": {"$sum": 1},
-                    "successful_executions": {"$sum": {"$cond": ["$success", 1, 0]}},
-                    "total_duration": {"$sum": "$duration_seconds"},
-                    "total_recommendations": {"$sum": "$recommendations_count"},
-                    "last_execution": {"$max": "$actual_start_time"},
-                    "avg_duration": {"$avg": "$duration_seconds"}
-                }}
-            ]
+            summary = {
+                "job_type": job_type,
+                "total_executions": total_executions,
+                "successful_executions": successful_executions,
+                "failed_executions": total_executions - successful_executions,
+                "success_rate": (successful_executions / max(total_executions, 1)) * 100,
+                "average_duration_seconds": rollup.get("duration_sum", 0) / duration_count if duration_count else 0,
+                "total_recommendations": rollup.get("stocks_produced", 0),
+                "last_execution": rollup.get("last_execution"),
+                "last_success": rollup.get("last_success"),
+                "last_updated": datetime.now()
+            }
+            if job_name:
+                summary["job_name"] = job_name
             
-            async for result in self.executions_collection.aggregate(pipeline):
-                summary = {
-                    "job_type": job_type,
-                    "job_name": execution.get("job_name", ""),
-                    "total_executions": result.get("total_executions", 0),
-                    "successful_executions": result.get("successful_executions", 0),
-                    "failed_executions": result.get("total_executions", 0) - result.get("successful_executions", 0),
-                    "success_rate": (result.get("successful_executions", 0) / result.get("total_executions", 1)) * 100,
-                    "average_duration_seconds": result.get("avg_duration", 0),
-                    "total_recommendations": result.get("total_recommendations", 0),
-                    "last_updated": datetime.now()
-                }
-                
-                await self.summaries_collection.replace_one(
-                    {"job_type": job_type},
-                    summary,
-                    upsert=True
-                )
+            await self.summaries_collection.update_one(
+                {"job_type": job_type},
+                {"$set": summary},
+                upsert=True
+            )
                 
         except Exception as e:
             logger.error(f"❌ Failed to update job summary: {e}")
 
 # Global instance
-cron_execution_tracker = CronExecutionTracker() 
\ No newline at end of file
+cron_execution_tracker = LazySingleton(CronExecutionTracker, "cron_execution_tracker") 
\ No newline at end of file
@@ -0,0 +1,238 @@
+"""
+Recommendation History Export Writers
+=====================================
+
+Incremental file writers for ``RecommendationHistoryStorage.export_recommendations``.
+Each writer takes record batches as they come off the cursor and appends
+them to the file, so an export holds one batch in memory however long the
+date range is.
+
+Formats
+-------
+csv       one row per record; nested values as JSON text
+jsonl     one JSON document per line
+json      ``{"recommendations": [...], "export_metadata": {...}}`` streamed
+parquet   one row group per batch (needs the optional ``pyarrow`` package)
+
+Columns
+-------
+Columns are ``fields`` when given, else every key of every record in
+first-seen order, so a sparse field first appearing in a late batch is
+still exported. CSV without ``fields`` and Parquet need the whole column
+set (Parquet also each column's type) before the first row, so they spool
+batches to a temporary file and write the output on ``close``.
+"""
+
+import csv
+import json
+import os
+import pickle
+import tempfile
+from collections import defaultdict
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from utils.lazy import lazy_import
+
+pa = lazy_import("pyarrow")
+pq = lazy_import("pyarrow.parquet")
+
+EXPORT_FORMATS = ("csv", "jsonl", "json", "parquet")
+
+
+def _scalar(value: Any) -> Any:
+    """Flatten a Mongo value for tabular output."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (dict, list, tuple, set)):
+        return json.dumps(value, default=str)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)  # ObjectId, Decimal128, ...
+
+
+def _kind(value: Any) -> str:
+    if isinstance(value, datetime):
+        return "timestamp"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "number"
+    return "string"
+
+
+def column_kind(kinds: Set[str]) -> str:
+    """Parquet kind of a column from the kinds of its non-null values.
+
+    Ints widen to float; mixed kinds (and all-null columns) become strings.
+    """
+    return next(iter(kinds)) if len(kinds) == 1 else "string"
+
+
+class ExportWriter:
+    """Base writer: ``write_batch`` per cursor batch, ``close`` once.
+
+    Writers with ``spool`` set keep batches in a temporary file and get them
+    back from ``_spooled()`` once every column has been seen.
+    """
+
+    spool = False
+
+    def __init__(self, path: str, fields: Optional[List[str]] = None):
+        self.path = path
+        self.fields = list(fields) if fields else None
+        self.columns: List[str] = list(self.fields or ())
+        self.records = 0
+        self._seen = dict.fromkeys(self.columns)
+        self._spool = tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(path))) \
+            if self.spool else None
+
+    def write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        if self.fields is None:
+            for record in batch:
+                self._seen.update(dict.fromkeys(record))
+            if len(self._seen) != len(self.columns):
+                self.columns = list(self._seen)
+        if self._spool is not None:
+            pickle.dump(batch, self._spool, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            self._write(batch)
+        self.records += len(batch)
+
+    def _spooled(self) -> Iterator[List[Dict[str, Any]]]:
+        self._spool.seek(0)
+        while True:
+            try:
+                yield pickle.load(self._spool)
+            except EOFError:
+                return
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def close(self, metadata: Optional[Dict[str, Any]] = None) -> None:
+        if self._spool is not None:
+            self._spool.close()
+
+
+class CsvExportWriter(ExportWriter):
+    """Rows stream straight to the file when ``fields`` is given, else are spooled."""
+
+    def __init__(self, path: str, fields: Optional[List[str]] = None):
+        self.spool = not fields
+        super().__init__(path, fields)
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = None
+
+    def _write(self, batch):
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction='ignore')
+            self._writer.writeheader()
+        self._writer.writerows({k: _scalar(v) for k, v in record.items()} for record in batch)
+
+    def close(self, metadata=None):
+        try:
+            if self._spool is not None:
+                for batch in self._spooled():
+                    self._write(batch)
+            if self._writer is None and self.columns:
+                csv.DictWriter(self._file, fieldnames=self.columns).writeheader()
+        finally:
+            self._file.close()
+            super().close(metadata)
+
+
+class JsonLinesExportWriter(ExportWriter):
+    def __init__(self, path: str, fields: Optional[List[str]] = None):
+        super().__init__(path, fields)
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def _write(self, batch):
+        self._file.writelines(json.dumps(record, default=str) + "\n" for record in batch)
+
+    def close(self, metadata=None):
+        self._file.close()
+
+
+class JsonExportWriter(ExportWriter):
+    """Single JSON document; the metadata goes last so records can stream."""
+
+    def __init__(self, path: str, fields: Optional[List[str]] = None):
+        super().__init__(path, fields)
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write('{\n  "recommendations": [')
+
+    def _write(self, batch):
+        body = ",\n    ".join(json.dumps(record, default=str) for record in batch)
+        self._file.write((",\n    " if self.records else "\n    ") + body)
+
+    def close(self, metadata=None):
+        self._file.write("\n  ]" if self.records else "]")
+        metadata = dict(metadata or {}, total_records=self.records)
+        self._file.write(',\n  "export_metadata": ' + json.dumps(metadata, default=str) + "\n}\n")
+        self._file.close()
+
+
+class ParquetExportWriter(ExportWriter):
+    """Schema comes from every batch (see ``column_kind``); one row group per batch."""
+
+    spool = True
+
+    def __init__(self, path: str, fields: Optional[List[str]] = None):
+        try:
+            pq.ParquetWriter
+        except ImportError as e:
+            raise ValueError("Parquet export needs the optional 'pyarrow' package") from e
+        super().__init__(path, fields)
+        self._kinds: Dict[str, Set[str]] = defaultdict(set)
+
+    def write_batch(self, batch):
+        for record in batch:
+            for field, value in record.items():
+                if value is not None:
+                    self._kinds[field].add(_kind(value))
+        super().write_batch(batch)
+
+    def close(self, metadata=None):
+        try:
+            if not self.records:
+                return
+            kinds = {field: column_kind(self._kinds.get(field, set())) for field in self.columns}
+            types = {"timestamp": pa.timestamp("us"), "bool": pa.bool_(),
+                     "number": pa.float64(), "string": pa.string()}
+            schema = pa.schema([pa.field(field, types[kinds[field]]) for field in self.columns])
+            convert = {
+                "timestamp": lambda value: value,
+                "bool": lambda value: value,
+                "number": float,
+                "string": lambda value: str(_scalar(value)),
+            }
+            with pq.ParquetWriter(self.path, schema) as writer:
+                for batch in self._spooled():
+                    rows = [{field: None if record.get(field) is None
+                             else convert[kinds[field]](record[field]) for field in self.columns}
+                            for record in batch]
+                    writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+        finally:
+            super().close(metadata)
+
+
+WRITERS = {
+    "csv": CsvExportWriter,
+    "jsonl": JsonLinesExportWriter,
+    "json": JsonExportWriter,
+    "parquet": ParquetExportWriter,
+}
+
+
+def open_export_writer(path: str, format: str, fields: Optional[Iterable[str]] = None) -> ExportWriter:
+    """Writer for ``format`` (one of ``EXPORT_FORMATS``)."""
+    writer_class = WRITERS.get(format.lower())
+    if writer_class is None:
+        raise ValueError(f"Unsupported export format: {format} (expected one of {', '.join(EXPORT_FORMATS)})")
+    return writer_class(path, list(fields) if fields else None)
@@ -10,19 +10,26 @@ Provides comprehensive tracking of all recommendations for analysis, backtesting
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 from enum import Enum
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import uuid
 
-import motor.motor_asyncio
-from pymongo import MongoClient, ASCENDING, DESCENDING
-from bson import ObjectId
 from pydantic import BaseModel, Field
 
+from utils.lazy import LazySingleton, lazy_import
+from .history_export import open_export_writer
+
+# Imported on first client construction, not at server start
+motor_asyncio = lazy_import("motor.motor_asyncio")
+pymongo = lazy_import("pymongo")
+
 logger = logging.getLogger(__name__)
 
+# Records per cursor round trip / per export write
+EXPORT_BATCH_SIZE = 2000
+
 class RecommendationSource(Enum):
     """Source of recommendation generation."""
     CRON_SCHEDULED = "cron_scheduled"
@@ -217,7 +224,7 @@ class RecommendationHistoryStorage:
         self.db_name = db_name
         
         if use_mongodb:
-            self.client = motor.motor_asyncio.AsyncIOMotorClient(mongodb_url)
+            self.client = motor_asyncio.AsyncIOMotorClient(mongodb_url)
             self.db = self.client[db_name]
             self.batches_collection = self.db.recommendation_batches
             self.recommendations_collection = self.db.individual_recommendations
@@ -238,41 +245,52 @@ class RecommendationHistoryStorage:
                 # Create indexes for efficient querying
                 # Batch collection indexes
                 await self.batches_collection.create_index([
-                    ("strategy", ASCENDING),
-                    ("generated_at", DESCENDING)
+                    ("strategy", pymongo.ASCENDING),
+                    ("generated_at", pymongo.DESCENDING)
                 ])
                 await self.batches_collection.create_index([
-                    ("execution_id", ASCENDING)
+                    ("execution_id", pymongo.ASCENDING)
                 ])
                 await self.batches_collection.create_index([
-                    ("market_condition", ASCENDING),
-                    ("trading_session", ASCENDING)
+                    ("market_condition", pymongo.ASCENDING),
+                    ("trading_session", pymongo.ASCENDING)
                 ])
                 
                 # Individual recommendations indexes
                 await self.recommendations_collection.create_index([
-                    ("symbol", ASCENDING),
-                    ("generated_at", DESCENDING)
+                    ("symbol", pymongo.ASCENDING),
+                    ("generated_at", pymongo.DESCENDING)
+                ])
+                await self.recommendations_collection.create_index([
+                    ("strategy", pymongo.ASCENDING),
+                    ("recommendation_action", pymongo.ASCENDING),
+                    ("generated_at", pymongo.DESCENDING)
                 ])
                 await self.recommendations_collection.create_index([
-                    ("strategy", ASCENDING),
-                    ("recommendation_action", ASCENDING),
-                    ("generated_at", DESCENDING)
+                    ("overall_score", pymongo.DESCENDING),
+                    ("confidence_score", pymongo.DESCENDING)
                 ])
                 await self.recommendations_collection.create_index([
-                    ("overall_score", DESCENDING),
-                    ("confidence_score", DESCENDING)
+                    ("batch_id", pymongo.ASCENDING),
+                    ("symbol", pymongo.ASCENDING)
+                ])
+                await self.recommendations_collection.create_index([
+                    ("generated_at", pymongo.ASCENDING)
                 ])
                 
                 # Performance collection indexes
                 await self.performance_collection.create_index([
-                    ("symbol", ASCENDING),
-                    ("recommended_at", DESCENDING)
+                    ("symbol", pymongo.ASCENDING),
+                    ("recommended_at", pymongo.DESCENDING)
                 ])
                 await self.performance_collection.create_index([
-                    ("strategy", ASCENDING),
-                    ("status", ASCENDING),
-                    ("recommended_at", DESCENDING)
+                    ("strategy", pymongo.ASCENDING),
+                    ("status", pymongo.ASCENDING),
+                    ("recommended_at", pymongo.DESCENDING)
+                ])
+                await self.performance_collection.create_index([
+                    ("status", pymongo.ASCENDING),
+                    ("symbol", pymongo.ASCENDING)
                 ])
                 
                 logger.info("✅ Recommendation history storage initialized with MongoDB")
@@ -426,21 +444,8 @@ class RecommendationHistoryStorage:
         
         try:
             if self.use_mongodb:
-                # Build query
-                query = {}
-                if symbol:
-                    query["symbol"] = symbol
-                if strategy:
-                    query["strategy"] = strategy.value
-                if start_date or end_date:
-                    date_query = {}
-                    if start_date:
-                        date_query["$gte"] = start_date
-                    if end_date:
-                        date_query["$lte"] = end_date
-                    query["generated_at"] = date_query
-                
-                cursor = self.recommendations_collection.find(query).sort("generated_at", DESCENDING).limit(limit)
+                query = self._history_query(symbol, strategy, start_date, end_date)
+                cursor = self.recommendations_collection.find(query).sort("generated_at", pymongo.DESCENDING).limit(limit)
                 results = []
                 async for doc in cursor:
                     if "_id" in doc:
@@ -474,6 +479,113 @@ class RecommendationHistoryStorage:
             logger.error(f"❌ Failed to get recommendation history: {e}")
             return []
 
+    def _history_query(self, symbol: Optional[str], strategy: Optional[RecommendationStrategy],
+                       start_date: Optional[datetime], end_date: Optional[datetime]) -> Dict[str, Any]:
+        query: Dict[str, Any] = {}
+        if symbol:
+            query["symbol"] = symbol
+        if strategy:
+            query["strategy"] = strategy.value
+        if start_date or end_date:
+            date_query = {}
+            if start_date:
+                date_query["$gte"] = start_date
+            if end_date:
+                date_query["$lte"] = end_date
+            query["generated_at"] = date_query
+        return query
+
+    async def iter_recommendation_history(self,
+                                          symbol: Optional[str] = None,
+                                          strategy: Optional[RecommendationStrategy] = None,
+                                          start_date: Optional[datetime] = None,
+                                          end_date: Optional[datetime] = None,
+                                          fields: Optional[Iterable[str]] = None,
+                                          batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream recommendations in batches, oldest first, with no overall limit.
+
+        MongoDB is read through one server-side cursor projected to ``fields``
+        (``_id`` only when asked for). File storage is filtered file by file
+        in file-name order.
+        """
+        fields = list(fields) if fields else None
+
+        if self.use_mongodb:
+            query = self._history_query(symbol, strategy, start_date, end_date)
+            projection = None
+            if fields:
+                projection = {field: 1 for field in fields}
+                projection.setdefault("_id", 0)
+            cursor = (self.recommendations_collection.find(query, projection)
+                      .sort("generated_at", pymongo.ASCENDING)
+                      .batch_size(batch_size))
+            batch = []
+            async for doc in cursor:
+                if "_id" in doc:
+                    doc["_id"] = str(doc["_id"])
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            return
+
+        start = start_date.isoformat() if start_date else None
+        end = end_date.isoformat() if end_date else None
+        batch = []
+        for file_path in sorted(self.storage_dir.glob("rec_*.json")):
+            try:
+                with open(file_path, 'r') as f:
+                    data = json.load(f)
+            except Exception:
+                continue
+            generated_at = str(data.get("generated_at", ""))
+            if symbol and data.get("symbol") != symbol:
+                continue
+            if strategy and data.get("strategy") != strategy.value:
+                continue
+            if (start and generated_at < start) or (end and generated_at > end):
+                continue
+            batch.append({field: data.get(field) for field in fields} if fields else data)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def export_recommendations(self,
+                                     path: str,
+                                     format: str = "csv",
+                                     fields: Optional[Iterable[str]] = None,
+                                     symbol: Optional[str] = None,
+                                     strategy: Optional[RecommendationStrategy] = None,
+                                     start_date: Optional[datetime] = None,
+                                     end_date: Optional[datetime] = None,
+                                     batch_size: int = EXPORT_BATCH_SIZE) -> int:
+        """Write matching recommendations to ``path`` batch by batch.
+
+        ``format`` is csv, jsonl, json or parquet (see ``history_export``).
+        Returns the number of records written.
+        """
+        fields = list(fields) if fields else None
+        writer = open_export_writer(path, format, fields)
+        try:
+            async for batch in self.iter_recommendation_history(symbol, strategy, start_date, end_date,
+                                                                fields, batch_size):
+                writer.write_batch(batch)
+        finally:
+            writer.close({
+                'export_date': datetime.now().isoformat(),
+                'date_range': {
+                    'start': start_date.isoformat() if start_date else None,
+                    'end': end_date.isoformat() if end_date else None
+                },
+                'fields': writer.columns
+            })
+        logger.info(f"✅ Exported {writer.records} recommendations to {path} ({format})")
+        return writer.records
+
     async def get_batch_analytics(self,
                                   strategy: Optional[RecommendationStrategy] = None,
                                   days: int = 30) -> Dict[str, Any]:
@@ -646,4 +758,4 @@ class RecommendationHistoryStorage:
             logger.error(f"❌ Failed to initialize performance tracking: {e}")
 
 # Global instance
-recommendation_history_storage = RecommendationHistoryStorage() 
\ No newline at end of file
+recommendation_history_storage = LazySingleton(RecommendationHistoryStorage, "recommendation_history_storage")
\ No newline at end of file
@@ -15,9 +15,10 @@ from enum import Enum
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
-import motor.motor_asyncio
-from pymongo import MongoClient
-from bson import ObjectId
+from utils.lazy import LazySingleton, lazy_import
+
+# Imported on first client construction, not at server start
+motor_asyncio = lazy_import("motor.motor_asyncio")
 
 logger = logging.getLogger(__name__)
 
@@ -98,7 +99,7 @@ class RecommendationCache:
         self.db_name = db_name
         
         if use_mongodb:
-            self.client = motor.motor_asyncio.AsyncIOMotorClient(mongodb_url)
+            self.client = motor_asyncio.AsyncIOMotorClient(mongodb_url)
             self.db = self.client[db_name]
             self.collection = self.db.recommendations
         else:
@@ -469,4 +470,4 @@ class RecommendationCache:
             }
 
 # Global cache instance
-recommendation_cache = RecommendationCache() 
\ No newline at end of file
+recommendation_cache = LazySingleton(RecommendationCache, "recommendation_cache")
\ No newline at end of file
@@ -224,6 +224,8 @@ class MarketSentiment(BaseModel):
     market_trend: str = Field(..., description="Overall market trend")
     volatility_index: float = Field(..., description="Market volatility index")
     volume_trend: str = Field(..., description="Volume trend")
+    symbols_analyzed: int = Field(0, description="Number of symbols in the breadth universe")
+    breadth: Dict[str, float] = Field(default_factory=dict, description="Breadth ratios (advancers, % above SMA, ...)")
     last_updated: datetime = Field(default_factory=datetime.now)
 
 class StockAnalysis(BaseModel):
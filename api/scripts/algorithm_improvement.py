@@ -17,12 +17,15 @@ from typing import Dict, Any
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.seed_algorithm_manager import SeedAlgorithmManager
+from services.combination_search import CombinationSearch, VariantSnapshot
 import logging
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'results', 'variant_snapshot.json')
+
 class AlgorithmImprovementTool:
     """Interactive tool for improving seed algorithms"""
     
@@ -49,6 +52,8 @@ class AlgorithmImprovementTool:
         print("12. ⚖️ Compare Sub-Algorithm Variants")
         print("13. 🎯 Create Algorithm with Custom Sub-Algorithms")
         print("14. 🔬 Test Individual Sub-Algorithm")
+        print("15. 📸 Record Variant Snapshot")
+        print("16. 🔎 Search Combinations Offline")
         print("0. 🚪 Exit")
         print("="*60)
         
@@ -602,6 +607,44 @@ class AlgorithmImprovementTool:
         except Exception as e:
             print(f"❌ Error testing variant: {e}")
 
+    def record_variant_snapshot(self):
+        """Execute every sub-algorithm variant once and store the result sets"""
+        print(f"\n📸 Recording variant snapshot to {SNAPSHOT_PATH}")
+        try:
+            summary = self.manager.record_variant_snapshot(SNAPSHOT_PATH)
+            print(f"✅ Recorded {summary['variants']} variants covering {summary['symbols']} symbols")
+        except Exception as e:
+            print(f"❌ Error recording snapshot: {e}")
+
+    def search_combinations_offline(self):
+        """Rank variant combinations against the recorded snapshot"""
+        if not os.path.exists(SNAPSHOT_PATH):
+            print("❌ No snapshot found. Record one first (option 15)")
+            return
+        
+        snapshot = VariantSnapshot.load(SNAPSHOT_PATH)
+        search = CombinationSearch(snapshot)
+        print(f"\n📁 Snapshot from {snapshot.recorded_at} - {search.total_combinations()} combinations")
+        
+        strategy = input("Search strategy (grid/random/greedy) [grid]: ").strip().lower() or 'grid'
+        top_n = input("How many results to show? [10]: ").strip()
+        top_n = int(top_n) if top_n.isdigit() else 10
+        
+        try:
+            results = search.run(strategy=strategy, top_n=top_n)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        
+        print(f"\n🏆 Top {len(results)} combinations ({strategy}):")
+        for result in results:
+            combo = ', '.join(f"{c}:{v}" for c, v in result['combination'].items())
+            metrics = result['metrics']
+            print(f"{result['rank']:2d}. {combo}")
+            print(f"    Performance: {metrics['performance_score']:.1f} | "
+                  f"Diversity: {metrics['diversity_score']:.1f}% | "
+                  f"Stocks: {metrics['unique_stocks']}")
+
     def run(self):
         """Run the interactive improvement tool"""
         print("🚀 Starting Algorithm Improvement Tool...")
@@ -642,6 +685,10 @@ class AlgorithmImprovementTool:
                     self.create_algorithm_with_custom_sub_algorithms()
                 elif choice == '14':
                     self.test_individual_sub_algorithm()
+                elif choice == '15':
+                    self.record_variant_snapshot()
+                elif choice == '16':
+                    self.search_combinations_offline()
                 else:
                     print("❌ Invalid choice. Please try again.")
                 
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Multi-Worker Serving
+====================
+
+Runs one of the API servers with N uvicorn worker processes behind a single
+listening socket. The socket is bound once by the supervisor process and
+inherited by every worker.
+
+Workers keep their own in-process caches but share the upstream-facing
+state through the local Redis (see ``api/services/shared_tier.py``):
+
+- ChartInk request slots across all workers and servers (``SharedRateLimiter``)
+- ChartInk result sets, with one worker per query hitting ChartInk
+  (``SharedQueryCache``)
+- Config snapshots, so a reload or toggle in one worker reaches the others
+  (``RedisSnapshotChannel``)
+
+Recommendation caches already live in MongoDB (or the shared file store).
+
+Usage::
+
+    python api/serve.py swing --workers 4
+    API_WORKERS=4 python api/serve.py shortterm --port 8003
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = API_DIR.parent
+
+# server name -> (ASGI app, default port)
+SERVERS = {
+    "longterm": ("longterm_server:app", 8001),
+    "swing": ("swing_server:app", 8002),
+    "shortterm": ("shortterm_server:app", 8003),
+}
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an API server with multiple workers")
+    parser.add_argument("server", choices=sorted(SERVERS), help="Server to run")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("API_WORKERS", "1")),
+                        help="Worker processes (default: API_WORKERS or 1)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, help="Port (default: the server's usual port)")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    app, default_port = SERVERS[args.server]
+    workers = max(1, args.workers)
+
+    # Read at import time by every worker (shared_tier, config_snapshot)
+    os.environ["API_WORKERS"] = str(workers)
+    # Workers are spawned, so the import path has to come through the environment
+    python_path = [str(PROJECT_ROOT), str(API_DIR)]
+    if os.getenv("PYTHONPATH"):
+        python_path.append(os.environ["PYTHONPATH"])
+    os.environ["PYTHONPATH"] = os.pathsep.join(python_path)
+    sys.path[:0] = [str(PROJECT_ROOT), str(API_DIR)]
+
+    logger.info(f"🚀 Starting {args.server} server with {workers} worker(s) on port {args.port or default_port}")
+
+    import uvicorn
+    uvicorn.run(
+        app,
+        host=args.host,
+        port=args.port or default_port,
+        workers=workers,
+        app_dir=str(API_DIR),
+        log_level=args.log_level
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ from api.models.stock_models import (
     Portfolio, LiveDataUpdate
 )
 from api.services.data_service import RealTimeDataService
+from api.services.market_breadth import MarketBreadthEngine, empty_sentiment
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -326,6 +327,7 @@ class AnalysisEngine:
         self.signal_cache: Dict[str, TradingSignal] = {}
         self.analysis_cache: Dict[str, StockAnalysis] = {}
         self._cache_lock = threading.Lock()
+        self.breadth = MarketBreadthEngine()
         
         # Initialize strategies
         self._initialize_strategies()
@@ -597,87 +599,18 @@ class AnalysisEngine:
             return "WEAK"
     
     async def get_market_sentiment(self, symbols: List[str]) -> MarketSentiment:
-        """Analyze overall market sentiment."""
+        """Analyze overall market sentiment across the whole universe.
+
+        Served from the in-memory breadth engine, which classifies every
+        symbol in one vectorized pass (see ``market_breadth``).
+        """
         try:
-            # Analyze multiple stocks
-            analyses = []
-            for symbol in symbols[:20]:  # Limit to 20 stocks for performance
-                analysis = await self.analyze_stock(symbol)
-                if analysis:
-                    analyses.append(analysis)
-            
-            if not analyses:
-                return MarketSentiment(
-                    sentiment_score=0,
-                    sentiment_label="NEUTRAL",
-                    bullish_stocks=0,
-                    bearish_stocks=0,
-                    neutral_stocks=0,
-                    market_trend="UNKNOWN",
-                    volatility_index=0,
-                    volume_trend="UNKNOWN"
-                )
-            
-            # Count recommendations
-            bullish_count = sum(1 for a in analyses if a.recommendation == "BUY")
-            bearish_count = sum(1 for a in analyses if a.recommendation == "SELL")
-            neutral_count = len(analyses) - bullish_count - bearish_count
-            
-            # Calculate sentiment score
-            total_stocks = len(analyses)
-            sentiment_score = (bullish_count - bearish_count) / total_stocks
-            
-            # Determine sentiment label
-            if sentiment_score >= 0.3:
-                sentiment_label = "BULLISH"
-            elif sentiment_score <= -0.3:
-                sentiment_label = "BEARISH"
-            else:
-                sentiment_label = "NEUTRAL"
-            
-            # Market trend
-            uptrend_count = sum(1 for a in analyses if a.price_trend == "Uptrend")
-            if uptrend_count > total_stocks * 0.6:
-                market_trend = "BULLISH"
-            elif uptrend_count < total_stocks * 0.4:
-                market_trend = "BEARISH"
-            else:
-                market_trend = "MIXED"
-            
-            # Volatility index (simplified)
-            high_risk_count = sum(1 for a in analyses if a.risk_level == "High")
-            volatility_index = high_risk_count / total_stocks * 100
-            
-            # Volume trend
-            high_volume_count = sum(1 for a in analyses if a.volume_trend == "High")
-            if high_volume_count > total_stocks * 0.5:
-                volume_trend = "INCREASING"
-            else:
-                volume_trend = "NORMAL"
-            
-            return MarketSentiment(
-                sentiment_score=sentiment_score,
-                sentiment_label=sentiment_label,
-                bullish_stocks=bullish_count,
-                bearish_stocks=bearish_count,
-                neutral_stocks=neutral_count,
-                market_trend=market_trend,
-                volatility_index=volatility_index,
-                volume_trend=volume_trend
-            )
-            
+            if not symbols:
+                return empty_sentiment()
+            return await self.breadth.get_sentiment(symbols)
         except Exception as e:
             logger.error(f"Error calculating market sentiment: {str(e)}")
-            return MarketSentiment(
-                sentiment_score=0,
-                sentiment_label="ERROR",
-                bullish_stocks=0,
-                bearish_stocks=0,
-                neutral_stocks=0,
-                market_trend="UNKNOWN",
-                volatility_index=0,
-                volume_trend="UNKNOWN"
-            )
+            return empty_sentiment("ERROR")
     
     def get_cached_signals(self, symbol: Optional[str] = None) -> List[TradingSignal]:
         """Get cached signals."""
@@ -714,7 +647,8 @@ class AnalysisEngine:
                 "active_strategies": len(self.strategies),
                 "cached_signals": len(self.signal_cache),
                 "cached_analyses": len(self.analysis_cache),
-                "strategies": [s.name for s in self.strategies]
+                "strategies": [s.name for s in self.strategies],
+                "market_breadth": self.breadth.stats()
             }
             
         except Exception as e:
@@ -11,6 +11,9 @@ from typing import Dict, List, Any, Optional
 import asyncio
 import time
 
+from .shared_tier import SharedRateLimiter
+from utils.health_oracle import health_oracle
+
 # Get the project root directory (go up from api/services to project root)
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 patterns_path = os.path.join(project_root, 'patterns')
@@ -20,7 +23,7 @@ if patterns_path not in sys.path:
     sys.path.insert(0, patterns_path)
 
 try:
-    from data.chartink import get_chartink_scans, check_chartink_connectivity
+    from data.chartink import get_chartink_scans
     from config.queries import LONG_TERM_QUERIES
     CHARTINK_AVAILABLE = True
     logger = logging.getLogger(__name__)
@@ -69,8 +72,8 @@ class ChartinkService:
     """Real Chartink service for long-term investment analysis"""
     
     def __init__(self):
-        self.last_request_time = 0
         self.min_request_interval = 2.0  # 2 seconds between requests
+        self.rate_limiter = SharedRateLimiter("chartink", self.min_request_interval)
         self.connectivity_checked = False
         self.is_connected = False
         
@@ -91,29 +94,23 @@ class ChartinkService:
         logger.info(f"📊 Loaded {len(self.long_term_queries)} long-term queries: {list(map(lambda q: q['name'], self.long_term_queries))}")
 
     def _check_connectivity(self):
-        """Check Chartink connectivity"""
+        """Check Chartink connectivity (read from the shared health oracle)"""
         try:
-            self.is_connected = check_chartink_connectivity()
+            status = health_oracle.status("chartink") or {}
+            was_connected = self.is_connected
+            self.is_connected = bool(status.get("healthy"))
             self.connectivity_checked = True
-            if self.is_connected:
-                logger.info("🌐 Chartink connectivity verified")
-            else:
-                logger.warning("⚠️ Chartink connectivity failed")
+            if self.is_connected and not was_connected:
+                logger.info(f"🌐 Chartink connectivity verified ({status.get('latency_ms_p50')} ms p50)")
+            elif not self.is_connected:
+                logger.warning(f"⚠️ Chartink unreachable ({status.get('consecutive_failures', 0)} failed probe rounds)")
         except Exception as e:
             logger.error(f"❌ Error checking Chartink connectivity: {e}")
             self.is_connected = False
 
     async def _rate_limit(self):
-        """Rate limiting to avoid overwhelming Chartink API"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f}s")
-            await asyncio.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        """Rate limiting to avoid overwhelming Chartink API (shared by all workers)"""
+        await self.rate_limiter.wait()
 
     def get_stocks_by_filter(self, filter_query: str, trading_theme: str = 'long_term_investment') -> pd.DataFrame:
         """
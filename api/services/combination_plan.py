@@ -0,0 +1,238 @@
+"""
+Combination Query Plans
+=======================
+
+Compiled, cached execution plans for multi-category ChartInk combination
+analysis (swing / short-term / long-term servers and the combination tester).
+
+- ``CombinationPlan.compile`` resolves a ``{category: version}`` combination
+  into query steps (query text + weight) once, up front.
+- ``ResultSetCache`` stores normalized result sets per (category, version,
+  limit) with a TTL and de-duplicates in-flight requests, so overlapping
+  combinations evaluated concurrently share a single ChartInk round trip.
+- ``normalize_symbols`` resolves the symbol column and strips exchange
+  suffixes for a whole result set in one vectorized pass.
+- ``merge_category_frames`` scores the combination with a single groupby.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Symbol fields in priority order - nsecode is the actual trading symbol
+SYMBOL_FIELDS = ['nsecode', 'symbol', 'stock', 'ticker', 'name']
+
+NORMALIZED_COLUMNS = ['symbol', 'name', 'price', 'volume', 'per_change']
+
+QueryRunner = Callable[[str, int], Awaitable[List[Dict[str, Any]]]]
+
+
+# =====================================================================
+# SYMBOL NORMALIZATION
+# =====================================================================
+
+def normalize_symbols(stocks: List[Dict[str, Any]], upper: bool = False) -> pd.DataFrame:
+    """Normalize a raw ChartInk result set into a frame keyed by ``symbol``.
+
+    The first non-empty field of ``SYMBOL_FIELDS`` is used as the symbol,
+    ``.NS`` / ``.BO`` suffixes are stripped and rows without a symbol are
+    dropped. Duplicate symbols keep their first (highest-ranked) row.
+    """
+    if not stocks:
+        return pd.DataFrame(columns=NORMALIZED_COLUMNS)
+
+    raw = pd.DataFrame.from_records(stocks)
+
+    present = [f for f in SYMBOL_FIELDS if f in raw.columns]
+    if not present:
+        return pd.DataFrame(columns=NORMALIZED_COLUMNS)
+    candidates = raw[present].astype('string').replace('', pd.NA)
+    symbol = candidates.bfill(axis=1).iloc[:, 0]
+    symbol = symbol.str.replace(r'\.(NS|BO)$', '', regex=True).str.strip()
+    if upper:
+        symbol = symbol.str.upper()
+
+    def _numeric(*columns: str) -> pd.Series:
+        result = pd.Series(0.0, index=raw.index)
+        for column in reversed(columns):
+            if column in raw.columns:
+                values = pd.to_numeric(raw[column], errors='coerce')
+                result = values.where(values.notna() & (values != 0), result)
+        return result.fillna(0.0)
+
+    frame = pd.DataFrame({
+        'symbol': symbol,
+        'name': raw['name'].where(raw['name'].notna(), symbol) if 'name' in raw.columns else symbol,
+        'price': _numeric('close'),
+        'volume': _numeric('volume').astype('int64'),
+        'per_change': _numeric('per_chg', 'per_change'),
+    })
+    has_symbol = frame['symbol'].notna() & (frame['symbol'] != '')
+    if not has_symbol.all():
+        logger.warning(f"⚠️ No valid symbol found in {int((~has_symbol).sum())} rows of stock data, "
+                       f"e.g. {stocks[int((~has_symbol).to_numpy().argmax())]}")
+    frame = frame[has_symbol]
+    return frame.drop_duplicates('symbol').reset_index(drop=True)
+
+
+# =====================================================================
+# RESULT SET CACHE
+# =====================================================================
+
+class ResultSetCache:
+    """TTL cache of normalized result sets keyed by (category, version, limit).
+
+    Concurrent requests for the same key await one shared task instead of
+    issuing duplicate ChartInk queries.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 512):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, str, int], Tuple[float, pd.DataFrame]] = {}
+        self._inflight: Dict[Tuple[str, str, int], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str, int]) -> Optional[pd.DataFrame]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, frame = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            self._entries.pop(key, None)
+            return None
+        return frame
+
+    def put(self, key: Tuple[str, str, int], frame: pd.DataFrame) -> None:
+        if len(self._entries) >= self.max_entries:
+            oldest = min(self._entries, key=lambda k: self._entries[k][0])
+            self._entries.pop(oldest, None)
+        self._entries[key] = (time.monotonic(), frame)
+
+    async def get_or_fetch(self, key: Tuple[str, str, int],
+                           fetch: Callable[[], Awaitable[pd.DataFrame]]) -> pd.DataFrame:
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.ensure_future(fetch())
+        self._inflight[key] = future
+        try:
+            frame = await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+        # Empty results are usually transient failures - don't pin them
+        if not frame.empty:
+            self.put(key, frame)
+        return frame
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._entries),
+            'inflight': len(self._inflight),
+            'hits': self.hits,
+            'misses': self.misses,
+            'ttl_seconds': self.ttl_seconds,
+        }
+
+
+# =====================================================================
+# COMPILED PLAN
+# =====================================================================
+
+@dataclass(frozen=True)
+class PlanStep:
+    """One category query of a combination."""
+    category: str
+    version: str
+    query: str
+    weight: float
+
+
+@dataclass
+class CombinationPlan:
+    """A combination resolved to its executable query steps."""
+    combination: Dict[str, str]
+    steps: List[PlanStep] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+
+    @classmethod
+    def compile(cls, combination: Dict[str, str],
+                query_lookup: Callable[[str, str], Optional[str]],
+                weights: Dict[str, float],
+                default_weight: float = 25) -> 'CombinationPlan':
+        plan = cls(combination=dict(combination))
+        for category, version in combination.items():
+            query = query_lookup(category, version)
+            if not query:
+                plan.missing.append(category)
+                continue
+            plan.steps.append(PlanStep(category, version, query, weights.get(category, default_weight)))
+        return plan
+
+    async def execute(self, runner: QueryRunner, cache: ResultSetCache,
+                      limit_per_query: int, upper: bool = False) -> Dict[str, pd.DataFrame]:
+        """Run all steps concurrently and return ``{category: frame}``."""
+
+        async def _run(step: PlanStep) -> pd.DataFrame:
+            async def _fetch() -> pd.DataFrame:
+                with span("chartink.query", category=step.category, version=step.version):
+                    stocks = await runner(step.query, limit_per_query)
+                with span("symbols.normalize"):
+                    return normalize_symbols(stocks, upper=upper)
+            key = (step.category, step.version, limit_per_query)
+            return await cache.get_or_fetch(key, _fetch)
+
+        frames = await asyncio.gather(*(_run(step) for step in self.steps), return_exceptions=True)
+        results: Dict[str, pd.DataFrame] = {}
+        for step, frame in zip(self.steps, frames):
+            if isinstance(frame, Exception):
+                logger.error(f"❌ {step.category} {step.version} query failed: {frame}")
+                frame = pd.DataFrame(columns=NORMALIZED_COLUMNS)
+            results[step.category] = frame
+        return results
+
+
+def merge_category_frames(plan: CombinationPlan,
+                          frames: Dict[str, pd.DataFrame]) -> Tuple[pd.Series, pd.DataFrame]:
+    """Score a combination in one pass.
+
+    Returns ``(scores, details)``: ``scores`` is the summed category weight per
+    symbol sorted descending; ``details`` holds the first-seen row per symbol
+    plus a ``categories`` list column.
+    """
+    tagged = []
+    for step in plan.steps:
+        frame = frames.get(step.category)
+        if frame is None or frame.empty:
+            continue
+        tagged.append(frame.assign(category=step.category, weight=float(step.weight)))
+
+    if not tagged:
+        return pd.Series(dtype='float64'), pd.DataFrame(columns=NORMALIZED_COLUMNS + ['categories'])
+
+    combined = pd.concat(tagged, ignore_index=True)
+    grouped = combined.groupby('symbol', sort=False)
+    scores = grouped['weight'].sum().sort_values(ascending=False, kind='stable')
+    details = grouped[NORMALIZED_COLUMNS[1:]].first()
+    details['categories'] = grouped['category'].agg(list)
+    return scores, details.reset_index()
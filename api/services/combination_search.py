@@ -0,0 +1,314 @@
+"""
+Offline Combination Search
+==========================
+
+Explores the sub-algorithm variant space locally instead of re-running
+ChartInk for every combination.
+
+1. ``VariantSnapshot.record`` executes each (category, version) sub-query
+   once and stores its symbol set, together with weights and expected
+   results, in a JSON snapshot file.
+2. Symbols are mapped to integer IDs and every result set becomes a bitset
+   (a Python ``int``), so scoring a combination is a handful of ``|`` / ``&``
+   operations and popcounts.
+3. ``CombinationSearch`` runs grid, random or greedy search across a process
+   pool and ranks combinations by ``performance_score`` then
+   ``diversity_score`` - the same metrics ``run_combination_analysis``
+   reports for the swing server.
+
+Usage::
+
+    snapshot = VariantSnapshot.record(manager.sub_algorithm_variants,
+                                      manager.execute_chartink_query)
+    snapshot.save("results/variant_snapshot.json")
+    top = CombinationSearch(snapshot).run(strategy="greedy", top_n=10)
+"""
+
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import product
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SYMBOL_FIELDS = ['nsecode', 'symbol', 'stock', 'ticker', 'name']
+
+Combination = Tuple[Tuple[str, str], ...]  # ((category, version), ...)
+
+
+def _extract_symbols(result: Any) -> List[str]:
+    """Pull clean symbols out of a query result (DataFrame or list of dicts)."""
+    if result is None:
+        return []
+    if hasattr(result, 'to_dict'):
+        rows = result.to_dict('records')
+    else:
+        rows = list(result)
+
+    symbols = []
+    for row in rows:
+        for field_name in SYMBOL_FIELDS:
+            value = row.get(field_name)
+            if value:
+                symbols.append(str(value).replace('.NS', '').replace('.BO', '').strip().upper())
+                break
+    return symbols
+
+
+# =====================================================================
+# SNAPSHOT
+# =====================================================================
+
+@dataclass
+class VariantSnapshot:
+    """Recorded result sets of every sub-algorithm variant."""
+    symbols: List[str] = field(default_factory=list)
+    result_sets: Dict[str, Dict[str, List[int]]] = field(default_factory=dict)
+    weights: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    expected: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    recorded_at: str = ''
+
+    @classmethod
+    def record(cls, variants: Dict[str, Dict[str, Dict[str, Any]]],
+               runner: Callable[[str], Any],
+               delay_seconds: float = 1.0) -> 'VariantSnapshot':
+        """Execute each variant query once via *runner* and record its symbols."""
+        snapshot = cls(recorded_at=datetime.now().isoformat())
+        symbol_ids: Dict[str, int] = {}
+
+        for category, versions in variants.items():
+            for version, variant in versions.items():
+                query = variant.get('query')
+                if not query:
+                    continue
+                logger.info(f"📸 Recording {category} {version}")
+                symbols = _extract_symbols(runner(query))
+                ids = []
+                for symbol in dict.fromkeys(symbols):
+                    if symbol not in symbol_ids:
+                        symbol_ids[symbol] = len(snapshot.symbols)
+                        snapshot.symbols.append(symbol)
+                    ids.append(symbol_ids[symbol])
+
+                snapshot.result_sets.setdefault(category, {})[version] = ids
+                snapshot.weights.setdefault(category, {})[version] = float(variant.get('weight', 0.25))
+                snapshot.expected.setdefault(category, {})[version] = int(variant.get('expected_results', 0))
+                if delay_seconds:
+                    time.sleep(delay_seconds)  # Rate limiting
+
+        logger.info(f"✅ Snapshot recorded: {len(snapshot.symbols)} symbols, "
+                    f"{sum(len(v) for v in snapshot.result_sets.values())} variants")
+        return snapshot
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({
+                'recorded_at': self.recorded_at,
+                'symbols': self.symbols,
+                'result_sets': self.result_sets,
+                'weights': self.weights,
+                'expected': self.expected,
+            }, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path: str) -> 'VariantSnapshot':
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return cls(
+            symbols=data['symbols'],
+            result_sets=data['result_sets'],
+            weights=data.get('weights', {}),
+            expected=data.get('expected', {}),
+            recorded_at=data.get('recorded_at', ''),
+        )
+
+    def categories(self) -> Dict[str, List[str]]:
+        return {category: sorted(versions) for category, versions in self.result_sets.items()}
+
+    def bitsets(self) -> Dict[Tuple[str, str], int]:
+        """Result set of every (category, version) as an integer bitset."""
+        masks = {}
+        for category, versions in self.result_sets.items():
+            for version, ids in versions.items():
+                mask = 0
+                for symbol_id in ids:
+                    mask |= 1 << symbol_id
+                masks[(category, version)] = mask
+        return masks
+
+
+# =====================================================================
+# SCORING
+# =====================================================================
+
+def score_combination(combination: Combination,
+                      masks: Dict[Tuple[str, str], int],
+                      weights: Dict[Tuple[str, str], float]) -> Dict[str, Any]:
+    """Score one combination from its bitsets.
+
+    Weights are on the 0-1 variant scale and are converted to the 0-100
+    scoring scale used by the servers.
+    """
+    seen = 0
+    multi = 0
+    total = 0
+    weighted_hits = 0.0
+    for key in combination:
+        mask = masks.get(key, 0)
+        count = mask.bit_count()
+        multi |= seen & mask
+        seen |= mask
+        total += count
+        weighted_hits += weights.get(key, 0.25) * 100 * count
+
+    unique = seen.bit_count()
+    multi_category = multi.bit_count()
+    if unique:
+        avg_score = weighted_hits / unique
+        performance_score = min(100.0, avg_score + (multi_category / unique) * 20)
+    else:
+        avg_score = 0.0
+        performance_score = 0.0
+
+    return {
+        'combination': {category: version for category, version in combination},
+        'metrics': {
+            'unique_stocks': unique,
+            'total_stocks_across_categories': total,
+            'avg_score': round(avg_score, 2),
+            'multi_category_stocks': multi_category,
+            'performance_score': round(performance_score, 2),
+            'diversity_score': round(unique / max(total, 1) * 100, 2),
+        },
+    }
+
+
+def _rank_key(result: Dict[str, Any]) -> Tuple[float, float]:
+    metrics = result['metrics']
+    return metrics['performance_score'], metrics['diversity_score']
+
+
+# Process-pool worker state (populated once per worker by the initializer)
+_worker_masks: Dict[Tuple[str, str], int] = {}
+_worker_weights: Dict[Tuple[str, str], float] = {}
+
+
+def _init_worker(masks: Dict[Tuple[str, str], int], weights: Dict[Tuple[str, str], float]) -> None:
+    global _worker_masks, _worker_weights
+    _worker_masks = masks
+    _worker_weights = weights
+
+
+def _score_chunk(chunk: List[Combination]) -> List[Dict[str, Any]]:
+    return [score_combination(c, _worker_masks, _worker_weights) for c in chunk]
+
+
+# =====================================================================
+# SEARCH
+# =====================================================================
+
+class CombinationSearch:
+    """Grid / random / greedy search over a recorded variant snapshot."""
+
+    def __init__(self, snapshot: VariantSnapshot, workers: Optional[int] = None, chunk_size: int = 256):
+        self.snapshot = snapshot
+        self.space = snapshot.categories()
+        self.masks = snapshot.bitsets()
+        self.weights = {
+            (category, version): weight
+            for category, versions in snapshot.weights.items()
+            for version, weight in versions.items()
+        }
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+    def total_combinations(self) -> int:
+        total = 1
+        for versions in self.space.values():
+            total *= len(versions) or 1
+        return total
+
+    def evaluate(self, combinations: Iterable[Combination]) -> List[Dict[str, Any]]:
+        """Score *combinations*, fanning out to a process pool for large batches."""
+        combinations = list(combinations)
+        if self.workers <= 1 or len(combinations) <= self.chunk_size:
+            return [score_combination(c, self.masks, self.weights) for c in combinations]
+
+        chunks = [combinations[i:i + self.chunk_size] for i in range(0, len(combinations), self.chunk_size)]
+        results: List[Dict[str, Any]] = []
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.masks, self.weights)) as pool:
+            for chunk_results in pool.map(_score_chunk, chunks):
+                results.extend(chunk_results)
+        return results
+
+    def _grid(self) -> Iterable[Combination]:
+        categories = list(self.space)
+        for versions in product(*(self.space[c] for c in categories)):
+            yield tuple(zip(categories, versions))
+
+    def _random(self, samples: int, seed: Optional[int]) -> List[Combination]:
+        rng = random.Random(seed)
+        categories = list(self.space)
+        picked = {
+            tuple((c, rng.choice(self.space[c])) for c in categories)
+            for _ in range(samples)
+        }
+        return list(picked)
+
+    def _greedy(self, start: Optional[Dict[str, str]], max_rounds: int) -> List[Dict[str, Any]]:
+        """Coordinate ascent: improve one category at a time until stable."""
+        order = list(self.space)
+
+        def as_combination(choice: Dict[str, str]) -> Combination:
+            return tuple((c, choice[c]) for c in order)
+
+        current = dict(start or {c: versions[0] for c, versions in self.space.items()})
+        evaluated: Dict[Combination, Dict[str, Any]] = {}
+
+        for _ in range(max_rounds):
+            improved = False
+            for category in order:
+                candidates = [
+                    as_combination(dict(current, **{category: version}))
+                    for version in self.space[category]
+                ]
+                pending = [c for c in candidates if c not in evaluated]
+                for combination, result in zip(pending, self.evaluate(pending)):
+                    evaluated[combination] = result
+
+                best = max(candidates, key=lambda c: _rank_key(evaluated[c]))
+                if _rank_key(evaluated[best]) > _rank_key(evaluated[as_combination(current)]):
+                    current[category] = dict(best)[category]
+                    improved = True
+            if not improved:
+                break
+        return list(evaluated.values())
+
+    def run(self, strategy: str = 'grid', top_n: int = 10, samples: int = 500,
+            seed: Optional[int] = None, start: Optional[Dict[str, str]] = None,
+            max_rounds: int = 10) -> List[Dict[str, Any]]:
+        """Search the variant space and return the *top_n* ranked combinations."""
+        started = time.time()
+        if strategy == 'grid':
+            results = self.evaluate(self._grid())
+        elif strategy == 'random':
+            results = self.evaluate(self._random(samples, seed))
+        elif strategy == 'greedy':
+            results = self._greedy(start, max_rounds)
+        else:
+            raise ValueError(f"Unknown search strategy: {strategy}")
+
+        results.sort(key=_rank_key, reverse=True)
+        logger.info(f"🔎 {strategy} search evaluated {len(results)} combinations "
+                    f"in {time.time() - started:.2f}s")
+        for rank, result in enumerate(results[:top_n], start=1):
+            result['rank'] = rank
+        return results[:top_n]
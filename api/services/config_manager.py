@@ -6,33 +6,110 @@ Manages loading and updating of seed algorithms and strategy parameters
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Mapping, Tuple
 from datetime import datetime
 import asyncio
 from dataclasses import dataclass
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+from .config_snapshot import ConfigSnapshot, SnapshotHolder, EMPTY_MAPPING, freeze, thaw
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+ALGORITHM_TYPES = ('chartink_themes', 'custom_scanners')
+
+@dataclass(frozen=True)
 class SeedAlgorithm:
     """Represents a seed algorithm configuration"""
     name: str
     weight: float
     limit: int
-    filters: Dict[str, Any]
+    frozen_filters: Mapping[str, Any]
     enabled: bool = True
 
-@dataclass
+    @property
+    def filters(self) -> Dict[str, Any]:
+        """Plain-dict copy of the algorithm's filters"""
+        return thaw(self.frozen_filters)
+
+@dataclass(frozen=True)
 class StrategyConfig:
     """Represents a complete strategy configuration"""
     name: str
     timeframe: str
     target_return: float
     stop_loss: float
-    seed_algorithms: Dict[str, List[SeedAlgorithm]]
-    analysis_criteria: Dict[str, Any]
+    seed_algorithms: Mapping[str, Tuple[SeedAlgorithm, ...]]
+    analysis_criteria: Mapping[str, Any]
+
+def parse_strategy_config(config_data: Mapping[str, Any]) -> StrategyConfig:
+    """Parse strategy configuration from dictionary"""
+    seed_config = config_data.get('seed_algorithms', EMPTY_MAPPING)
+    
+    # Parse Chartink themes
+    chartink_themes = tuple(
+        SeedAlgorithm(
+            name=theme_data['name'],
+            weight=theme_data['weight'],
+            limit=theme_data['limit'],
+            frozen_filters=freeze(theme_data.get('filters', {})),
+            enabled=theme_data.get('enabled', True)
+        )
+        for theme_data in seed_config.get('chartink_themes', ())
+    )
+    
+    # Parse custom scanners
+    custom_scanners = tuple(
+        SeedAlgorithm(
+            name=scanner_data['name'],
+            weight=scanner_data['weight'],
+            limit=scanner_data.get('limit', 10),
+            frozen_filters=freeze(scanner_data.get('parameters', {})),
+            enabled=scanner_data.get('enabled', True)
+        )
+        for scanner_data in seed_config.get('custom_scanners', ())
+    )
+    
+    return StrategyConfig(
+        name=config_data['name'],
+        timeframe=config_data['timeframe'],
+        target_return=config_data['target_return'],
+        stop_loss=config_data['stop_loss'],
+        seed_algorithms=freeze({'chartink_themes': chartink_themes, 'custom_scanners': custom_scanners}),
+        analysis_criteria=freeze(config_data.get('analysis_criteria', {}))
+    )
+
+@dataclass(frozen=True)
+class StrategySnapshot(ConfigSnapshot):
+    """Trading strategies config with per-strategy / per-algorithm-type indexes"""
+    strategies: Mapping[str, StrategyConfig]
+    enabled_algorithms: Mapping[Tuple[str, str], Tuple[SeedAlgorithm, ...]]
+    global_settings: Mapping[str, Any]
+    experimental_features: Mapping[str, Any]
+    fallback_symbols: Tuple[str, ...]
+    
+    @classmethod
+    def _index(cls, data: Mapping[str, Any]) -> Dict[str, Any]:
+        indexes = super()._index(data)
+        strategies = {
+            name: parse_strategy_config(strategy_data)
+            for name, strategy_data in data.get('strategies', EMPTY_MAPPING).items()
+        }
+        enabled = {
+            (name, algorithm_type): tuple(algo for algo in algorithms if algo.enabled)
+            for name, strategy in strategies.items()
+            for algorithm_type, algorithms in strategy.seed_algorithms.items()
+        }
+        global_settings = data.get('global_settings', EMPTY_MAPPING)
+        indexes.update(
+            strategies=freeze(strategies),
+            enabled_algorithms=freeze(enabled),
+            global_settings=global_settings,
+            experimental_features=data.get('experimental_features', EMPTY_MAPPING),
+            fallback_symbols=tuple(global_settings.get('fallback_symbols', ())),
+        )
+        return indexes
 
 class ConfigFileWatcher(FileSystemEventHandler):
     """Watches for changes in configuration files"""
@@ -41,19 +118,39 @@ class ConfigFileWatcher(FileSystemEventHandler):
         self.config_manager = config_manager
         
     def on_modified(self, event):
-        if event.src_path.endswith('trading_strategies.json'):
+        if event.src_path.endswith(self.config_manager.config_path.name):
             logger.info("🔄 Trading strategies config file changed, reloading...")
-            asyncio.create_task(self.config_manager.reload_config())
+            # Runs on the watchdog thread; the snapshot swap is a single reference assignment
+            self.config_manager.reload_config_sync()
 
 class TradingConfigManager:
-    """Manages trading strategy configurations with hot-reload capability"""
+    """Manages trading strategy configurations with hot-reload capability.
+    
+    The parsed configuration lives in an immutable ``StrategySnapshot``; reloads
+    and edits publish a new snapshot instead of mutating the current one. Hot
+    paths should grab ``config_manager.snapshot`` once and read from it.
+    """
     
     def __init__(self, config_path: str = "config/trading_strategies.json"):
         self.config_path = Path(config_path)
-        self.config: Dict[str, Any] = {}
-        self.strategies: Dict[str, StrategyConfig] = {}
+        self.holder = SnapshotHolder("trading_strategies", StrategySnapshot)
         self.last_loaded: Optional[datetime] = None
         self.observer: Optional[Observer] = None
+    
+    @property
+    def snapshot(self) -> Optional[StrategySnapshot]:
+        """Current config snapshot (None until loaded)"""
+        return self.holder.current
+    
+    @property
+    def config(self) -> Mapping[str, Any]:
+        snapshot = self.holder.current
+        return snapshot.data if snapshot else EMPTY_MAPPING
+    
+    @property
+    def strategies(self) -> Mapping[str, StrategyConfig]:
+        snapshot = self.holder.current
+        return snapshot.strategies if snapshot else EMPTY_MAPPING
         
     async def initialize(self):
         """Initialize the configuration manager"""
@@ -68,174 +165,120 @@ class TradingConfigManager:
     
     async def load_config(self):
         """Load configuration from JSON file"""
+        if not self.config_path.exists():
+            logger.warning(f"⚠️ Config file not found: {self.config_path}")
+            await self.create_default_config()
+            return
+        self.reload_config_sync(raise_errors=True)
+    
+    def reload_config_sync(self, raise_errors: bool = False):
+        """Read the JSON file and publish it as a new snapshot.
+        
+        On a parse error (e.g. a half-written file) the previous snapshot stays
+        current, so in-flight and new requests keep a consistent view.
+        """
         try:
-            if not self.config_path.exists():
-                logger.warning(f"⚠️ Config file not found: {self.config_path}")
-                await self.create_default_config()
-                return
-                
             with open(self.config_path, 'r') as file:
-                self.config = json.load(file)
-                
-            # Parse strategies
-            self.strategies = {}
-            for strategy_name, strategy_data in self.config.get('strategies', {}).items():
-                self.strategies[strategy_name] = self._parse_strategy_config(strategy_name, strategy_data)
-                
+                data = json.load(file)
+            snapshot = self.holder.publish(data)
             self.last_loaded = datetime.utcnow()
-            logger.info(f"📋 Loaded config v{self.config.get('version', 'unknown')} with {len(self.strategies)} strategies")
-            
+            logger.info(f"📋 Loaded config v{snapshot.data.get('version', 'unknown')} with {len(snapshot.strategies)} strategies")
         except Exception as e:
             logger.error(f"❌ Error loading config: {e}")
-            raise
+            if raise_errors:
+                raise
     
     async def reload_config(self):
         """Reload configuration from file"""
-        try:
-            await self.load_config()
-            logger.info("🔄 Configuration reloaded successfully")
-        except Exception as e:
-            logger.error(f"❌ Error reloading config: {e}")
+        self.reload_config_sync()
     
     def _parse_strategy_config(self, name: str, config_data: Dict[str, Any]) -> StrategyConfig:
         """Parse strategy configuration from dictionary"""
-        seed_algorithms = {}
-        
-        # Parse Chartink themes
-        chartink_themes = []
-        for theme_data in config_data.get('seed_algorithms', {}).get('chartink_themes', []):
-            chartink_themes.append(SeedAlgorithm(
-                name=theme_data['name'],
-                weight=theme_data['weight'],
-                limit=theme_data['limit'],
-                filters=theme_data.get('filters', {}),
-                enabled=theme_data.get('enabled', True)
-            ))
-        seed_algorithms['chartink_themes'] = chartink_themes
-        
-        # Parse custom scanners
-        custom_scanners = []
-        for scanner_data in config_data.get('seed_algorithms', {}).get('custom_scanners', []):
-            custom_scanners.append(SeedAlgorithm(
-                name=scanner_data['name'],
-                weight=scanner_data['weight'],
-                limit=scanner_data.get('limit', 10),
-                filters=scanner_data.get('parameters', {}),
-                enabled=scanner_data.get('enabled', True)
-            ))
-        seed_algorithms['custom_scanners'] = custom_scanners
-        
-        return StrategyConfig(
-            name=config_data['name'],
-            timeframe=config_data['timeframe'],
-            target_return=config_data['target_return'],
-            stop_loss=config_data['stop_loss'],
-            seed_algorithms=seed_algorithms,
-            analysis_criteria=config_data.get('analysis_criteria', {})
-        )
+        return parse_strategy_config(config_data)
     
     def get_strategy_config(self, strategy_name: str) -> Optional[StrategyConfig]:
         """Get configuration for a specific strategy"""
         return self.strategies.get(strategy_name)
     
-    def get_all_strategies(self) -> Dict[str, StrategyConfig]:
+    def get_all_strategies(self) -> Mapping[str, StrategyConfig]:
         """Get all strategy configurations"""
         return self.strategies
     
-    def get_seed_algorithms(self, strategy_name: str, algorithm_type: str = 'chartink_themes') -> List[SeedAlgorithm]:
-        """Get seed algorithms for a specific strategy and type"""
-        strategy = self.strategies.get(strategy_name)
-        if not strategy:
-            return []
-        
-        algorithms = strategy.seed_algorithms.get(algorithm_type, [])
-        # Return only enabled algorithms
-        return [algo for algo in algorithms if algo.enabled]
+    def get_seed_algorithms(self, strategy_name: str, algorithm_type: str = 'chartink_themes') -> Tuple[SeedAlgorithm, ...]:
+        """Get enabled seed algorithms for a specific strategy and type"""
+        snapshot = self.holder.current
+        if not snapshot:
+            return ()
+        return snapshot.enabled_algorithms.get((strategy_name, algorithm_type), ())
     
     def get_analysis_criteria(self, strategy_name: str) -> Dict[str, Any]:
         """Get analysis criteria for a strategy"""
         strategy = self.strategies.get(strategy_name)
-        return strategy.analysis_criteria if strategy else {}
+        return thaw(strategy.analysis_criteria) if strategy else {}
     
     def get_global_settings(self) -> Dict[str, Any]:
         """Get global settings"""
-        return self.config.get('global_settings', {})
+        snapshot = self.holder.current
+        return thaw(snapshot.global_settings) if snapshot else {}
+    
+    def get_fallback_symbols(self) -> Tuple[str, ...]:
+        """Get the global fallback symbol universe"""
+        snapshot = self.holder.current
+        return snapshot.fallback_symbols if snapshot else ()
     
     def get_experimental_features(self) -> Dict[str, Any]:
         """Get experimental features configuration"""
-        return self.config.get('experimental_features', {})
+        snapshot = self.holder.current
+        return thaw(snapshot.experimental_features) if snapshot else {}
+    
+    def _update_algorithm(self, strategy_name: str, algorithm_name: str, update) -> Optional[Dict[str, Any]]:
+        """Copy-on-write edit of one algorithm entry; publishes a new snapshot."""
+        if strategy_name not in self.strategies:
+            return None
+        
+        data = thaw(self.config)
+        seed_config = data['strategies'][strategy_name].get('seed_algorithms', {})
+        for algorithm_type in ALGORITHM_TYPES:
+            for algorithm in seed_config.get(algorithm_type, []):
+                if algorithm.get('name') == algorithm_name:
+                    update(algorithm)
+                    self.holder.publish(data)
+                    return algorithm
+        return None
     
     def update_strategy_weight(self, strategy_name: str, algorithm_name: str, new_weight: float):
         """Update weight of a specific algorithm (for experimentation)"""
-        strategy = self.strategies.get(strategy_name)
-        if not strategy:
+        updated = self._update_algorithm(
+            strategy_name, algorithm_name, lambda algorithm: algorithm.update(weight=new_weight)
+        )
+        if updated is None:
             return False
-            
-        for algorithm_type in strategy.seed_algorithms:
-            for algorithm in strategy.seed_algorithms[algorithm_type]:
-                if algorithm.name == algorithm_name:
-                    algorithm.weight = new_weight
-                    logger.info(f"🔧 Updated {algorithm_name} weight to {new_weight} for {strategy_name}")
-                    return True
-        return False
+        logger.info(f"🔧 Updated {algorithm_name} weight to {new_weight} for {strategy_name}")
+        return True
     
     def toggle_algorithm(self, strategy_name: str, algorithm_name: str) -> bool:
         """Enable/disable a specific algorithm"""
-        strategy = self.strategies.get(strategy_name)
-        if not strategy:
+        updated = self._update_algorithm(
+            strategy_name, algorithm_name,
+            lambda algorithm: algorithm.update(enabled=not algorithm.get('enabled', True))
+        )
+        if updated is None:
             return False
-            
-        for algorithm_type in strategy.seed_algorithms:
-            for algorithm in strategy.seed_algorithms[algorithm_type]:
-                if algorithm.name == algorithm_name:
-                    algorithm.enabled = not algorithm.enabled
-                    status = "enabled" if algorithm.enabled else "disabled"
-                    logger.info(f"🔧 {algorithm_name} {status} for {strategy_name}")
-                    return True
-        return False
+        status = "enabled" if updated['enabled'] else "disabled"
+        logger.info(f"🔧 {algorithm_name} {status} for {strategy_name}")
+        return True
     
     async def save_config(self):
         """Save current configuration back to file"""
         try:
-            # Convert strategies back to dictionary format
-            config_to_save = self.config.copy()
-            strategies_dict = {}
-            
-            for name, strategy in self.strategies.items():
-                strategy_dict = {
-                    "name": strategy.name,
-                    "timeframe": strategy.timeframe,
-                    "target_return": strategy.target_return,
-                    "stop_loss": strategy.stop_loss,
-                    "seed_algorithms": {
-                        "chartink_themes": [
-                            {
-                                "name": algo.name,
-                                "weight": algo.weight,
-                                "limit": algo.limit,
-                                "filters": algo.filters,
-                                "enabled": algo.enabled
-                            } for algo in strategy.seed_algorithms.get('chartink_themes', [])
-                        ],
-                        "custom_scanners": [
-                            {
-                                "name": algo.name,
-                                "weight": algo.weight,
-                                "limit": algo.limit,
-                                "parameters": algo.filters,
-                                "enabled": algo.enabled
-                            } for algo in strategy.seed_algorithms.get('custom_scanners', [])
-                        ]
-                    },
-                    "analysis_criteria": strategy.analysis_criteria
-                }
-                strategies_dict[name] = strategy_dict
-            
-            config_to_save['strategies'] = strategies_dict
+            config_to_save = thaw(self.config)
             config_to_save['last_updated'] = datetime.utcnow().isoformat() + 'Z'
             
-            with open(self.config_path, 'w') as file:
+            # Write-then-rename so watchers never observe a partial file
+            tmp_path = self.config_path.with_suffix('.json.tmp')
+            with open(tmp_path, 'w') as file:
                 json.dump(config_to_save, file, indent=2)
+            tmp_path.replace(self.config_path)
                 
             logger.info("💾 Configuration saved successfully")
             
@@ -277,7 +320,7 @@ class TradingConfigManager:
         """Load minimal default configuration as fallback"""
         logger.warning("⚠️ Loading fallback configuration")
         
-        self.config = {
+        fallback_config = {
             "strategies": {
                 "swing_buy": {
                     "name": "Swing Trading Buy Strategy",
@@ -316,15 +359,15 @@ class TradingConfigManager:
             }
         }
         
-        # Parse the fallback config
-        self.strategies = {}
-        for strategy_name, strategy_data in self.config['strategies'].items():
-            self.strategies[strategy_name] = self._parse_strategy_config(strategy_name, strategy_data)
+        self.holder.publish(fallback_config)
     
     def get_config_summary(self) -> Dict[str, Any]:
         """Get a summary of current configuration"""
+        snapshot = self.holder.current
         return {
             "version": self.config.get('version', 'unknown'),
+            "snapshot_version": snapshot.version if snapshot else None,
+            "snapshot_digest": snapshot.digest if snapshot else None,
             "last_loaded": self.last_loaded.isoformat() if self.last_loaded else None,
             "total_strategies": len(self.strategies),
             "strategies": {
@@ -341,7 +384,7 @@ class TradingConfigManager:
             },
             "experimental_features_enabled": sum(
                 1 for feature in self.get_experimental_features().values() 
-                if isinstance(feature, dict) and feature.get('enabled', False)
+                if isinstance(feature, Mapping) and feature.get('enabled', False)
             )
         }
     
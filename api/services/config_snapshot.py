@@ -0,0 +1,314 @@
+"""
+Configuration Snapshots
+=======================
+
+Immutable, versioned views of the JSON strategy configs used on the request
+path by the swing / short-term / long-term servers and the
+``TradingConfigManager``.
+
+- ``ConfigSnapshot.build`` parses a config dict once, deep-freezes it
+  (mappings become read-only proxies, lists become tuples) and pre-indexes
+  the lookups the servers need: variant query by ``(category, version)``,
+  category scoring weights and the current algorithm block.
+- ``SnapshotHolder`` publishes a new snapshot by swapping a single reference.
+  Readers grab ``holder.current`` once per request and keep using that object,
+  so a config push mid-request never yields a half-old / half-new view.
+  Unchanged content (same digest) does not bump the version.
+- ``SnapshotFileWatcher`` re-reads a JSON config file into its holder when
+  the file changes on disk (watchdog), keeping the current snapshot when the
+  new content does not parse.
+- ``RedisSnapshotChannel`` shares snapshots between server processes: the
+  process that (re)loads a config publishes the canonical JSON blob, the
+  others rebuild the same snapshot from it.
+
+Snapshot data is frozen; use ``snapshot.to_dict()`` / ``thaw()`` for anything
+that leaves the snapshot (responses, ``json.dumps``, cache keys, storage).
+
+Env
+---
+CONFIG_SNAPSHOT_REDIS   true/false - share snapshots via Redis (default true when
+                        API_WORKERS > 1, else false)
+REDIS_URL               Redis connection URL (default redis://localhost:6379/0)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Type, Union
+
+from utils.lazy import lazy_import
+
+watchdog_observers = lazy_import("watchdog.observers")
+
+logger = logging.getLogger(__name__)
+
+# Multi-worker servers (API_WORKERS > 1) share snapshots by default
+SNAPSHOT_REDIS_ENABLED = os.getenv(
+    "CONFIG_SNAPSHOT_REDIS", "true" if int(os.getenv("API_WORKERS", "1")) > 1 else "false"
+).lower() == "true"
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+
+
+# =====================================================================
+# FREEZING
+# =====================================================================
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Inverse of :func:`freeze` - plain dicts/lists for JSON responses or edits."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def config_digest(data: Mapping[str, Any]) -> str:
+    """Content hash of a config (key order independent)."""
+    canonical = json.dumps(thaw(data), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+# =====================================================================
+# SNAPSHOT
+# =====================================================================
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable, pre-indexed view of one config file."""
+    name: str
+    version: int
+    digest: str
+    loaded_at: datetime
+    data: Mapping[str, Any]
+    variant_queries: Mapping[Tuple[str, str], str]
+    scoring_weights: Mapping[str, Any]
+    current_algorithm: Mapping[str, Any]
+
+    @classmethod
+    def build(cls, name: str, data: Mapping[str, Any], version: int = 1,
+              digest: Optional[str] = None) -> 'ConfigSnapshot':
+        frozen = freeze(data)
+        return cls(
+            name=name,
+            version=version,
+            digest=digest or config_digest(frozen),
+            loaded_at=datetime.utcnow(),
+            data=frozen,
+            **cls._index(frozen)
+        )
+
+    @classmethod
+    def _index(cls, data: Mapping[str, Any]) -> Dict[str, Any]:
+        """Pre-computed lookups; subclasses extend this with their own indexes."""
+        variants = data.get('sub_algorithm_variants', EMPTY_MAPPING)
+        queries = {
+            (category, version): variant['query']
+            for category, versions in variants.items()
+            for version, variant in versions.items()
+            if isinstance(variant, Mapping) and variant.get('query')
+        }
+        current_version = data.get('current_version', 'v1.0.0')
+        return {
+            'variant_queries': MappingProxyType(queries),
+            'scoring_weights': data.get('scoring_system', EMPTY_MAPPING).get('category_weights', EMPTY_MAPPING),
+            'current_algorithm': data.get('algorithms', EMPTY_MAPPING).get(current_version, EMPTY_MAPPING),
+        }
+
+    def get_variant_query(self, category: str, version: str) -> Optional[str]:
+        return self.variant_queries.get((category, version))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return thaw(self.data)
+
+
+# =====================================================================
+# HOLDER
+# =====================================================================
+
+class SnapshotHolder:
+    """Owns the current snapshot of one config and swaps it atomically."""
+
+    def __init__(self, name: str, snapshot_cls: Type[ConfigSnapshot] = ConfigSnapshot,
+                 share: Optional[bool] = None):
+        self.name = name
+        self.snapshot_cls = snapshot_cls
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._listeners: list = []
+        self.channel: Optional[RedisSnapshotChannel] = None
+        if SNAPSHOT_REDIS_ENABLED if share is None else share:
+            self.channel = RedisSnapshotChannel(name)
+            self.channel.subscribe(self._on_remote_blob)
+
+    @property
+    def current(self) -> Optional[ConfigSnapshot]:
+        """The snapshot to use for the rest of the caller's request."""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def add_listener(self, callback: Callable[[ConfigSnapshot], None]) -> None:
+        """Call *callback* with every newly published snapshot."""
+        self._listeners.append(callback)
+
+    def publish(self, data: Mapping[str, Any], broadcast: bool = True) -> ConfigSnapshot:
+        """Build a snapshot from *data* and make it current (no-op if unchanged)."""
+        digest = config_digest(data)
+        with self._lock:
+            if self._snapshot is not None and self._snapshot.digest == digest:
+                return self._snapshot
+            self._version += 1
+            snapshot = self.snapshot_cls.build(self.name, data, version=self._version, digest=digest)
+            self._snapshot = snapshot
+
+        logger.info(f"📋 Config snapshot {self.name} v{snapshot.version} published ({digest[:8]})")
+        if broadcast and self.channel:
+            self.channel.publish(snapshot)
+        for callback in self._listeners:
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"❌ Config snapshot listener failed: {e}")
+        return snapshot
+
+    def _on_remote_blob(self, blob: Dict[str, Any]) -> None:
+        current = self._snapshot
+        if current is not None and current.digest == blob.get('digest'):
+            return
+        logger.info(f"📡 Received config snapshot {self.name} from another server")
+        self.publish(blob['data'], broadcast=False)
+
+
+# =====================================================================
+# FILE WATCHING
+# =====================================================================
+
+class SnapshotFileWatcher:
+    """Publishes a JSON config file into a ``SnapshotHolder`` whenever it changes."""
+
+    def __init__(self, holder: SnapshotHolder, path: Union[str, Path]):
+        self.holder = holder
+        self.path = Path(path).resolve()
+        self._observer = None
+
+    def reload(self) -> Optional[ConfigSnapshot]:
+        """Re-read the file and publish it (no-op if unchanged).
+
+        A file that fails to parse (e.g. half-written by an editor) keeps the
+        current snapshot.
+        """
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+        except Exception as e:
+            logger.error(f"❌ Could not reload config {self.path}, keeping v{self.holder.version}: {e}")
+            return self.holder.current
+        return self.holder.publish(data)
+
+    def dispatch(self, event) -> None:
+        """watchdog event callback (runs on the observer thread)."""
+        if getattr(event, 'is_directory', False):
+            return
+        paths = (getattr(event, 'src_path', None), getattr(event, 'dest_path', None))
+        # Editors often save by writing a temp file and renaming it over the config
+        if any(path and Path(path).resolve() == self.path for path in paths):
+            logger.info(f"🔄 Config file {self.path.name} changed, reloading...")
+            self.reload()
+
+    def start(self) -> None:
+        """Watch the config file's directory (idempotent)."""
+        if self._observer is not None:
+            return
+        try:
+            observer = watchdog_observers.Observer()
+            observer.schedule(self, str(self.path.parent), recursive=False)
+            observer.daemon = True
+            observer.start()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not watch config file {self.path}: {e}")
+            return
+        self._observer = observer
+        logger.info(f"👁️ Watching {self.path} for config changes")
+
+    def stop(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+
+
+# =====================================================================
+# REDIS SHARING
+# =====================================================================
+
+class RedisSnapshotChannel:
+    """Publishes snapshots as a Redis blob + notification for other processes."""
+
+    def __init__(self, name: str, redis_url: Optional[str] = None):
+        self.key = f"alg:config:{name}"
+        self.redis_url = redis_url or REDIS_URL
+        self._client = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _get_client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.redis_url, socket_timeout=2)
+        return self._client
+
+    def publish(self, snapshot: ConfigSnapshot) -> None:
+        try:
+            blob = json.dumps({'digest': snapshot.digest, 'data': snapshot.to_dict()},
+                              separators=(',', ':'), default=str)
+            client = self._get_client()
+            client.set(self.key, blob)
+            client.publish(self.key, snapshot.digest)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not publish config snapshot {self.key}: {e}")
+
+    def fetch(self) -> Optional[Dict[str, Any]]:
+        try:
+            blob = self._get_client().get(self.key)
+            return json.loads(blob) if blob else None
+        except Exception as e:
+            logger.warning(f"⚠️ Could not fetch config snapshot {self.key}: {e}")
+            return None
+
+    def subscribe(self, on_blob: Callable[[Dict[str, Any]], None]) -> None:
+        """Listen for snapshot notifications on a daemon thread."""
+        if self._thread is not None:
+            return
+
+        def _listen():
+            try:
+                pubsub = self._get_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.key)
+                for message in pubsub.listen():
+                    blob = self.fetch()
+                    if blob:
+                        on_blob(blob)
+            except Exception as e:
+                logger.warning(f"⚠️ Config snapshot subscription {self.key} stopped: {e}")
+
+        self._thread = threading.Thread(target=_listen, name=f"config-snapshot-{self.key}", daemon=True)
+        self._thread.start()
@@ -14,7 +14,6 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import aiohttp
 import pandas as pd
-import yfinance as yf
 from dataclasses import dataclass
 import threading
 from concurrent.futures import ThreadPoolExecutor
@@ -22,6 +21,10 @@ from concurrent.futures import ThreadPoolExecutor
 from api.models.stock_models import (
     StockData, StockPrice, TechnicalIndicators, LiveDataUpdate
 )
+from shared.data import get_bar_store
+from utils.lazy import lazy_import
+
+yf = lazy_import("yfinance")
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -484,10 +487,9 @@ class RealTimeDataService:
         
         try:
             loop = asyncio.get_event_loop()
-            ticker = await loop.run_in_executor(self.executor, yf.Ticker, symbol)
             history = await loop.run_in_executor(
                 self.executor,
-                lambda: ticker.history(period=period, interval=interval)
+                lambda: get_bar_store().get_period(symbol, period, interval)
             )
             
             if history.empty:
@@ -16,10 +16,12 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 from datetime import datetime, timedelta
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import random
+from utils.lazy import LazySingleton, lazy_import
+
+yf = lazy_import("yfinance")
 
 logger = logging.getLogger(__name__)
 
@@ -897,4 +899,8 @@ class FundamentalReranker:
         else:
             thesis += ". Limited data availability affects confidence in analysis."
         
-        return thesis 
\ No newline at end of file
+        return thesis
+
+
+# Shared instance - keeps one fundamentals cache per process
+fundamental_reranker = LazySingleton(FundamentalReranker, "fundamental_reranker")
@@ -16,7 +16,6 @@ from typing import Dict, List, Optional, Tuple, Any
 import numpy as np
 import pandas as pd
 from dataclasses import asdict
-import yfinance as yf
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import os
@@ -28,6 +27,10 @@ from api.models.stock_models import (
 from api.services.data_service import RealTimeDataService
 from shared.config import load_config
 from shared.config.settings import INTRADAY_CONFIG
+from utils.tracing import span
+from utils.lazy import lazy_import
+
+yf = lazy_import("yfinance")
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -266,7 +269,8 @@ class IntradayScreener:
                 symbols = custom_symbols
                 logger.info(f"Using {len(symbols)} custom symbols for screening")
             else:
-                symbols = await self.chartink.get_stocks_from_chartink(theme=chartink_theme, limit=100)
+                with span("chartink.query"):
+                    symbols = await self.chartink.get_stocks_from_chartink(theme=chartink_theme, limit=100)
                 logger.info(f"Using {len(symbols)} symbols from Chartink theme: {chartink_theme}")
             
             screening_params = self.screening_criteria.get(criteria, self.screening_criteria["momentum_breakout"])
@@ -274,7 +278,8 @@ class IntradayScreener:
             logger.info(f"Screening {len(symbols)} stocks with criteria: {criteria}")
             
             # Get data for all symbols concurrently
-            stock_data_map = await self.data_service.get_multiple_stocks(symbols, use_cache=True)
+            with span("market_data.fetch"):
+                stock_data_map = await self.data_service.get_multiple_stocks(symbols, use_cache=True)
             
             # Screen each stock
             screening_tasks = []
@@ -283,7 +288,8 @@ class IntradayScreener:
                     task = self._screen_individual_stock(symbol, stock_data, screening_params)
                     screening_tasks.append(task)
             
-            screening_results = await asyncio.gather(*screening_tasks, return_exceptions=True)
+            with span("scoring.screen"):
+                screening_results = await asyncio.gather(*screening_tasks, return_exceptions=True)
             
             # Filter and sort results
             valid_results = []
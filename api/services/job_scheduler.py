@@ -123,6 +123,15 @@ class JobScheduler:
             enabled=True
         )
         
+        # Market breadth refresh job (live quotes update it in between)
+        self.add_job(
+            job_id="market_breadth_refresh",
+            name="Market Breadth Refresh",
+            func=self._refresh_market_breadth,
+            interval=300,  # 5 minutes
+            enabled=True
+        )
+        
         # Market status update job
         self.add_job(
             job_id="market_status_update",
@@ -345,12 +354,18 @@ class JobScheduler:
             
             # Fetch updated data
             updated_count = 0
+            breadth_updates = 0
             for symbol in active_symbols:
                 live_update = await self.data_service.get_live_price(symbol)
                 if live_update:
                     # Send update via WebSocket
                     await self.websocket_manager.send_price_update(live_update)
                     updated_count += 1
+                    if self.analysis_engine.breadth.on_live_update(live_update):
+                        breadth_updates += 1
+            
+            if breadth_updates:
+                self.analysis_engine.breadth.compute()
             
             return {"updated_symbols": updated_count, "total_symbols": len(active_symbols)}
             
@@ -385,6 +400,18 @@ class JobScheduler:
             logger.error(f"Error in signal generation: {str(e)}")
             raise
     
+    async def _refresh_market_breadth(self):
+        """Refresh the market breadth panels for the tracked universe."""
+        try:
+            breadth = self.analysis_engine.breadth
+            # Seeds the NIFTY 500 universe if startup could not
+            sentiment = await (breadth.refresh() if breadth.universe else breadth.seed())
+            return {"symbols": sentiment.symbols_analyzed, "sentiment": sentiment.sentiment_label}
+            
+        except Exception as e:
+            logger.error(f"Error in market breadth refresh: {str(e)}")
+            raise
+    
     async def _update_market_status(self):
         """Update market status and broadcast to clients."""
         try:
@@ -13,14 +13,19 @@ import logging
 import time
 import random
 import pandas as pd
-import yfinance as yf
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 
+from shared.data import get_bar_store
+
+from .shared_tier import SharedRateLimiter
 from .data_service import RealTimeDataService
 from .seed_algorithm_manager import SeedAlgorithmManager
-from .fundamental_reranker import FundamentalReranker
+from .fundamental_reranker import fundamental_reranker
 from .chartink_service import ChartinkService
+from utils.lazy import lazy_import
+
+yf = lazy_import("yfinance")
 
 logger = logging.getLogger(__name__)
 
@@ -95,9 +100,9 @@ class LongTermInvestmentService:
             "^NSEAUTO"  # Nifty Auto
         ]
         
-        # Rate limiting
-        self.last_request_time = 0
+        # Rate limiting (Yahoo Finance, shared by all workers)
         self.min_request_interval = 0.5  # 500ms between requests
+        self.rate_limiter = SharedRateLimiter("yahoo", self.min_request_interval)
         
         # Re-ranking factors (now primary focus since seed algorithms are managed separately)
         self.reranking_factors = {
@@ -108,7 +113,7 @@ class LongTermInvestmentService:
             "peer_comparison": 0.10
         }
 
-        self.fundamental_reranker = FundamentalReranker()
+        self.fundamental_reranker = fundamental_reranker
         self.logger.info("✅ Long-term Investment Service initialized with fundamental re-ranker")
 
     def _load_long_term_config(self) -> Dict[str, Any]:
@@ -162,12 +167,8 @@ class LongTermInvestmentService:
         }
 
     async def _rate_limit(self):
-        """Implement rate limiting to avoid 429 errors."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        if time_since_last < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - time_since_last)
-        self.last_request_time = time.time()
+        """Implement rate limiting to avoid 429 errors (shared by all workers)."""
+        await self.rate_limiter.wait()
 
     def _convert_to_indian_symbol(self, symbol: str) -> str:
         """Convert symbol to NSE format if needed."""
@@ -203,14 +204,15 @@ class LongTermInvestmentService:
             await self._rate_limit()
             
             indian_symbol = self._convert_to_indian_symbol(symbol)
-            ticker = yf.Ticker(indian_symbol)
+            bar_store = get_bar_store()
             
-            # Try different periods if the requested one fails
+            # Try different periods if the requested one fails; shorter periods
+            # are served from the bars already stored for the longer one
             periods_to_try = [period, "1y", "6mo", "3mo"]
             
             for p in periods_to_try:
                 try:
-                    hist = ticker.history(period=p)
+                    hist = bar_store.get_period(indian_symbol, p)
                     if not hist.empty and len(hist) > 30:  # Minimum 30 days of data
                         return hist
                     await asyncio.sleep(0.1)  # Brief pause between attempts
@@ -0,0 +1,462 @@
+"""
+Market Breadth Engine
+=====================
+
+Market sentiment, trend, volume and volatility breadth over a whole symbol
+universe (e.g. the NIFTY 500), served from memory.
+
+The universe is held as wide panels (bars x symbols) per OHLCV field, loaded
+in one batched pull through the shared bar store. Indicators and the
+per-stock classification of ``AnalysisEngine.analyze_stock`` (RSI / MACD /
+Bollinger strategies, price and volume trend, risk level) are evaluated for
+every symbol at once with whole-panel numpy/pandas operations.
+
+The universe is the NIFTY 500, read from NSE's constituent list
+(``load_universe``, cached on disk) when the engine is seeded at startup.
+
+Updates are incremental:
+
+- ``on_live_update`` folds a live quote into the forming bar of one symbol
+- ``refresh`` re-reads the universe from the bar store, which only downloads
+  the tail segment each symbol is missing
+
+and both recompute the snapshot from the in-memory panels.
+
+Env
+---
+BREADTH_PERIOD          history loaded per symbol (default 6mo)
+BREADTH_INTERVAL        bar interval (default 1d)
+BREADTH_FETCH_WORKERS   parallel bar store reads on refresh (default 16)
+BREADTH_MAX_AGE_SECONDS snapshot age before a read triggers a refresh (default 300)
+BREADTH_UNIVERSE_URL    constituent CSV with a Symbol column (default NSE's NIFTY 500 list)
+BREADTH_UNIVERSE_PATH   local copy of the list (default <project>/cache/universe/nifty500.csv)
+BREADTH_UNIVERSE_MAX_AGE_DAYS  re-download the list after this many days (default 7)
+"""
+
+import asyncio
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from api.models.stock_models import LiveDataUpdate, MarketSentiment
+from shared.data import get_bar_store
+from utils.lazy import lazy_import
+
+requests = lazy_import("requests")
+
+logger = logging.getLogger(__name__)
+
+BREADTH_PERIOD = os.getenv("BREADTH_PERIOD", "6mo")
+BREADTH_INTERVAL = os.getenv("BREADTH_INTERVAL", "1d")
+BREADTH_FETCH_WORKERS = int(os.getenv("BREADTH_FETCH_WORKERS", "16"))
+BREADTH_MAX_AGE_SECONDS = float(os.getenv("BREADTH_MAX_AGE_SECONDS", "300"))
+BREADTH_UNIVERSE_URL = os.getenv("BREADTH_UNIVERSE_URL",
+                                 "https://archives.nseindia.com/content/indices/ind_nifty500list.csv")
+BREADTH_UNIVERSE_PATH = Path(os.getenv(
+    "BREADTH_UNIVERSE_PATH",
+    str(Path(__file__).resolve().parent.parent.parent / "cache" / "universe" / "nifty500.csv")
+))
+BREADTH_UNIVERSE_MAX_AGE_DAYS = float(os.getenv("BREADTH_UNIVERSE_MAX_AGE_DAYS", "7"))
+
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36')
+
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+# Bars kept per symbol - enough for SMA 50 and a settled MACD signal line
+WINDOW_BARS = 130
+
+# Strategy thresholds, as configured in AnalysisEngine._initialize_strategies
+RSI_MIN_CONFIDENCE = 0.7
+MACD_MIN_CONFIDENCE = 0.75
+BOLLINGER_MIN_CONFIDENCE = 0.7
+
+
+def empty_sentiment(label: str = "NEUTRAL") -> MarketSentiment:
+    return MarketSentiment(
+        sentiment_score=0,
+        sentiment_label=label,
+        bullish_stocks=0,
+        bearish_stocks=0,
+        neutral_stocks=0,
+        market_trend="UNKNOWN",
+        volatility_index=0,
+        volume_trend="UNKNOWN"
+    )
+
+
+def _universe_symbols(frame: pd.DataFrame) -> List[str]:
+    symbols = frame["Symbol"].dropna().astype(str).str.strip()
+    return [f"{symbol}.NS" for symbol in symbols if symbol]
+
+
+def load_universe(path: Optional[Path] = None, url: Optional[str] = None,
+                  max_age_days: Optional[float] = None) -> List[str]:
+    """Yahoo symbols of the universe (NIFTY 500 by default).
+
+    The constituent CSV is re-downloaded when the local copy is older than
+    ``max_age_days``; if the download fails the local copy is used as is.
+    """
+    path = Path(path or BREADTH_UNIVERSE_PATH)
+    max_age = BREADTH_UNIVERSE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+    if not path.exists() or time.time() - path.stat().st_mtime > max_age * 86400:
+        try:
+            response = requests.get(url or BREADTH_UNIVERSE_URL, headers={"User-Agent": USER_AGENT}, timeout=10)
+            response.raise_for_status()
+            if not _universe_symbols(pd.read_csv(io.BytesIO(response.content))):
+                raise ValueError("no symbols in the constituent list")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(response.content)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"⚠️ Breadth: could not download the universe list: {e}")
+    try:
+        return _universe_symbols(pd.read_csv(path))
+    except Exception as e:
+        logger.error(f"❌ Breadth: no universe list available at {path}: {e}")
+        return []
+
+
+def latest_bars(panels: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """Shift each symbol so its latest bar is in the last row.
+
+    A quote opening a new bar adds a row for every symbol; symbols without a
+    quote yet are left out of that forming bar and evaluated on their last
+    complete bar, rather than on a row that only has a close.
+    """
+    valid = panels["Close"].notna().to_numpy()
+    rows = len(valid)
+    lag = np.where(valid.any(axis=0), np.argmax(valid[::-1], axis=0), 0)
+    if not lag.any():
+        return panels
+
+    shifted = {}
+    for field, frame in panels.items():
+        values = frame.to_numpy(dtype=float, copy=True)
+        for k in np.unique(lag[lag > 0]):
+            columns = lag == k
+            values[k:, columns] = values[:rows - k, columns]
+            values[:k, columns] = np.nan
+        shifted[field] = pd.DataFrame(values, index=frame.index, columns=frame.columns)
+    return shifted
+
+
+def _tail_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Per-column mean of the last ``window`` rows, NaN unless all are present.
+
+    Same as ``rolling(window).mean().iloc[-1]``, without evaluating every row.
+    """
+    if len(values) < window:
+        return np.full(values.shape[1], np.nan)
+    return values[-window:].mean(axis=0)
+
+
+def compute_indicators(panels: Dict[str, pd.DataFrame]) -> Dict[str, np.ndarray]:
+    """Latest indicator values for every symbol, one array entry per column.
+
+    Mirrors ``RealTimeDataService._calculate_indicators``. Only the EMAs need
+    the full history; the windowed means are taken over the tail rows.
+    """
+    close_frame = panels["Close"]
+    close = close_frame.to_numpy(dtype=float)
+    volume = panels["Volume"].to_numpy(dtype=float)
+    bars = np.isfinite(close).sum(axis=0)
+
+    delta = np.diff(close, axis=0)
+    gain = _tail_mean(np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0)), 14)
+    loss = _tail_mean(np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0)), 14)
+
+    macd_line = close_frame.ewm(span=12).mean() - close_frame.ewm(span=26).mean()
+    macd_signal = macd_line.ewm(span=9).mean()
+
+    last_close = close[-1]
+    prev_close = close[-2] if len(close) > 1 else np.full_like(last_close, np.nan)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = 100 - (100 / (1 + gain / loss))
+        change_percent = (last_close - prev_close) / prev_close * 100
+
+    sma_20 = _tail_mean(close, 20)
+    std_20 = close[-20:].std(axis=0, ddof=1) if len(close) >= 20 else np.full_like(last_close, np.nan)
+    return {
+        "close": last_close,
+        "volume": volume[-1],
+        "change_percent": change_percent,
+        "rsi": rsi,
+        "sma_20": sma_20,
+        "sma_50": _tail_mean(close, 50),
+        "macd": np.where(bars >= 26, macd_line.iloc[-1].to_numpy(dtype=float), np.nan),
+        "macd_signal": np.where(bars >= 26, macd_signal.iloc[-1].to_numpy(dtype=float), np.nan),
+        "bollinger_upper": sma_20 + 2 * std_20,
+        "bollinger_lower": sma_20 - 2 * std_20,
+        "volume_sma": _tail_mean(volume, 20),
+    }
+
+
+def classify(ind: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Per-symbol recommendation, trends and risk level for the whole universe.
+
+    Vectorized port of ``AnalysisEngine.analyze_stock``: the three strategy
+    signals (strength, confidence, min-confidence gate), the strength-weighted
+    BUY / SELL / HOLD vote and the price trend, volume trend and risk rules.
+    Missing indicators (NaN) contribute nothing, as ``None`` does there.
+    """
+    price = ind["close"]
+    sma_20, sma_50 = ind["sma_20"], ind["sma_50"]
+    rsi = ind["rsi"]
+    has_sma_20, has_sma_50 = ~np.isnan(sma_20), ~np.isnan(sma_50)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # RSI momentum
+        rsi_side = np.where(rsi < 30, 1, np.where(rsi > 70, -1, 0))
+        rsi_strength = np.where(rsi_side == 1, (30 - rsi) * 2, (rsi - 70) * 2)
+        avg_volume = np.where(np.isnan(ind["volume_sma"]), ind["volume"], ind["volume_sma"])
+        volume_ratio = np.where(avg_volume > 0, ind["volume"] / avg_volume, 1.0)
+        volume_factor = np.where(ind["volume"] > 0, np.minimum(volume_ratio, 2.0) / 2.0 + 0.5, 0.8)
+        trend_factor = np.where(has_sma_20, np.where(price > sma_20, 1.2, 0.8), 1.0)
+        rsi_conf = np.clip(np.minimum(rsi_strength / 100.0, 1.0) * volume_factor * trend_factor, 0, 1)
+        rsi_side = np.where(rsi_conf >= RSI_MIN_CONFIDENCE, rsi_side, 0)
+
+        # MACD trend
+        macd_diff = ind["macd"] - ind["macd_signal"]
+        macd_side = np.where(macd_diff > 0.1, 1, np.where(macd_diff < -0.1, -1, 0))
+        macd_strength = np.minimum(np.abs(macd_diff) * 50, 80)
+        macd_trend = np.where(has_sma_20 & has_sma_50, np.where(sma_20 > sma_50, 1.2, 0.8), 1.0)
+        macd_conf = np.clip(np.minimum(macd_strength / 100.0, 1.0) * macd_trend, 0, 1)
+        macd_side = np.where(macd_conf >= MACD_MIN_CONFIDENCE, macd_side, 0)
+
+        # Bollinger mean reversion
+        band_width = ind["bollinger_upper"] - ind["bollinger_lower"]
+        position = (price - ind["bollinger_lower"]) / band_width
+        bb_side = np.where(position <= 0.1, 1, np.where(position >= 0.9, -1, 0))
+        bb_strength = np.where(bb_side == 1, (0.1 - position) * 500, (position - 0.9) * 500)
+        bb_conf = np.clip(np.minimum(bb_strength / 100.0, 1.0), 0, 1)
+        bb_side = np.where(bb_conf >= BOLLINGER_MIN_CONFIDENCE, bb_side, 0)
+
+    buy_strength = np.zeros_like(price)
+    sell_strength = np.zeros_like(price)
+    for side, strength, conf in ((rsi_side, rsi_strength, rsi_conf),
+                                 (macd_side, macd_strength, macd_conf),
+                                 (bb_side, bb_strength, bb_conf)):
+        weighted = np.nan_to_num(strength * conf)
+        buy_strength += np.where(side == 1, weighted, 0)
+        sell_strength += np.where(side == -1, weighted, 0)
+    recommendation = np.where(buy_strength > sell_strength * 1.2, 1,
+                              np.where(sell_strength > buy_strength * 1.2, -1, 0))
+
+    # Price trend: close vs SMA 20 / SMA 50 and SMA 20 vs SMA 50
+    up = ((price > sma_20) & has_sma_20).astype(int) + ((price > sma_50) & has_sma_50).astype(int) \
+        + ((sma_20 > sma_50) & has_sma_20 & has_sma_50).astype(int)
+    down = ((price < sma_20) & has_sma_20).astype(int) + ((price < sma_50) & has_sma_50).astype(int) \
+        + ((sma_20 < sma_50) & has_sma_20 & has_sma_50).astype(int)
+    price_trend = np.sign(up - down)
+
+    volume_sma = ind["volume_sma"]
+    high_volume = ~np.isnan(volume_sma) & (ind["volume"] > volume_sma * 1.2)
+
+    change = np.nan_to_num(ind["change_percent"])
+    risk_score = np.where(change > 5, 2, np.where(change > 2, 1, 0)) \
+        + np.where((rsi > 80) | (rsi < 20), 2, np.where((rsi > 70) | (rsi < 30), 1, 0)) \
+        + high_volume.astype(int)
+
+    return {
+        "recommendation": recommendation,
+        "price_trend": price_trend,
+        "high_volume": high_volume,
+        "high_risk": risk_score >= 4,
+    }
+
+
+def summarize(ind: Dict[str, np.ndarray], cls: Dict[str, np.ndarray]) -> MarketSentiment:
+    """Aggregate per-symbol classes into a ``MarketSentiment`` with breadth ratios."""
+    valid = ~np.isnan(ind["close"])
+    total = int(valid.sum())
+    if total == 0:
+        return empty_sentiment()
+
+    recommendation = cls["recommendation"][valid]
+    bullish = int((recommendation == 1).sum())
+    bearish = int((recommendation == -1).sum())
+    sentiment_score = (bullish - bearish) / total
+
+    if sentiment_score >= 0.3:
+        sentiment_label = "BULLISH"
+    elif sentiment_score <= -0.3:
+        sentiment_label = "BEARISH"
+    else:
+        sentiment_label = "NEUTRAL"
+
+    uptrend = int((cls["price_trend"][valid] == 1).sum())
+    if uptrend > total * 0.6:
+        market_trend = "BULLISH"
+    elif uptrend < total * 0.4:
+        market_trend = "BEARISH"
+    else:
+        market_trend = "MIXED"
+
+    high_volume = int(cls["high_volume"][valid].sum())
+    change = ind["change_percent"][valid]
+    advancers = int((change > 0).sum())
+    decliners = int((change < 0).sum())
+    pct = lambda count: round(count / total * 100, 2)  # noqa: E731
+
+    return MarketSentiment(
+        sentiment_score=sentiment_score,
+        sentiment_label=sentiment_label,
+        bullish_stocks=bullish,
+        bearish_stocks=bearish,
+        neutral_stocks=total - bullish - bearish,
+        market_trend=market_trend,
+        volatility_index=cls["high_risk"][valid].sum() / total * 100,
+        volume_trend="INCREASING" if high_volume > total * 0.5 else "NORMAL",
+        symbols_analyzed=total,
+        breadth={
+            "advancers": advancers,
+            "decliners": decliners,
+            "advance_decline_ratio": round(advancers / decliners, 3) if decliners else float(advancers),
+            "pct_uptrend": pct(uptrend),
+            "pct_above_sma20": pct(int((ind["close"] > ind["sma_20"])[valid].sum())),
+            "pct_above_sma50": pct(int((ind["close"] > ind["sma_50"])[valid].sum())),
+            "pct_high_volume": pct(high_volume),
+            "median_change_percent": round(float(np.nanmedian(change)), 3) if advancers + decliners else 0.0,
+        }
+    )
+
+
+class MarketBreadthEngine:
+    """In-memory breadth panels for one symbol universe."""
+
+    def __init__(self, bar_store=None, period: str = BREADTH_PERIOD, interval: str = BREADTH_INTERVAL,
+                 max_workers: int = BREADTH_FETCH_WORKERS):
+        self.bar_store = bar_store or get_bar_store()
+        self.period = period
+        self.interval = interval
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.universe: List[str] = []
+        self.panels: Dict[str, pd.DataFrame] = {}
+        self.snapshot: Optional[MarketSentiment] = None
+        self.refreshed_at = 0.0
+        self.last_compute_ms = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    # -----------------------------------------------------------------
+    # Loading
+    # -----------------------------------------------------------------
+
+    def _read(self, symbol: str) -> Optional[pd.DataFrame]:
+        try:
+            bars = self.bar_store.get_period(symbol, self.period, self.interval)
+            return bars[list(FIELDS)].tail(WINDOW_BARS) if not bars.empty else None
+        except Exception as e:
+            logger.warning(f"⚠️ Breadth: no bars for {symbol}: {e}")
+            return None
+
+    def load(self, symbols: Sequence[str]) -> None:
+        """Pull bars for every symbol and rebuild the panels."""
+        frames = dict(zip(symbols, self.executor.map(self._read, symbols)))
+        frames = {symbol: frame for symbol, frame in frames.items() if frame is not None}
+        if frames:
+            wide = pd.concat(frames, axis=1).sort_index().tail(WINDOW_BARS)
+            # Columns are (symbol, field) - split into one frame per field
+            panels = {field: wide.xs(field, axis=1, level=1).reindex(columns=list(symbols)) for field in FIELDS}
+        else:
+            panels = {}
+        with self._lock:
+            self.universe = list(symbols)
+            self.panels = panels
+        logger.info(f"📊 Breadth panels loaded: {len(frames)}/{len(symbols)} symbols")
+
+    # -----------------------------------------------------------------
+    # Incremental updates
+    # -----------------------------------------------------------------
+
+    def on_live_update(self, update: LiveDataUpdate) -> bool:
+        """Fold a live quote into the symbol's forming bar; False if not tracked."""
+        with self._lock:
+            if not self.panels or update.symbol not in self.panels["Close"].columns:
+                return False
+            close = self.panels["Close"]
+            bar_time = pd.Timestamp(update.timestamp)
+            if bar_time.tzinfo is None and close.index.tz is not None:
+                bar_time = bar_time.tz_localize(close.index.tz)
+            if self.interval == "1d":
+                bar_time = bar_time.normalize()
+
+            if bar_time > close.index[-1]:
+                # First quote of a new bar - open a row for every symbol
+                for field in FIELDS:
+                    frame = self.panels[field]
+                    frame.loc[bar_time] = np.nan
+                    self.panels[field] = frame.iloc[-WINDOW_BARS:]
+
+            row, col = self.panels["Close"].index[-1], update.symbol
+            high, low = self.panels["High"].at[row, col], self.panels["Low"].at[row, col]
+            self.panels["Close"].at[row, col] = update.price
+            self.panels["High"].at[row, col] = update.price if np.isnan(high) else max(high, update.price)
+            self.panels["Low"].at[row, col] = update.price if np.isnan(low) else min(low, update.price)
+            self.panels["Volume"].at[row, col] = float(update.volume)
+            if np.isnan(self.panels["Open"].at[row, col]):
+                self.panels["Open"].at[row, col] = update.price
+        return True
+
+    def compute(self) -> MarketSentiment:
+        """Recompute the snapshot from the in-memory panels."""
+        started = time.perf_counter()
+        with self._lock:
+            if not self.panels:
+                return empty_sentiment()
+            panels = {field: frame.copy() for field, frame in self.panels.items()}
+
+        indicators = compute_indicators(latest_bars(panels))
+        snapshot = summarize(indicators, classify(indicators))
+
+        self.snapshot = snapshot
+        self.last_compute_ms = (time.perf_counter() - started) * 1000
+        return snapshot
+
+    async def refresh(self, symbols: Optional[Sequence[str]] = None) -> MarketSentiment:
+        """Reload the universe (tails only, via the bar store) and recompute."""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.load, list(symbols or self.universe))
+            snapshot = await loop.run_in_executor(None, self.compute)
+            self.refreshed_at = time.monotonic()
+            logger.info(f"📊 Breadth refreshed: {snapshot.symbols_analyzed} symbols, "
+                        f"{snapshot.sentiment_label} ({self.last_compute_ms:.1f} ms compute)")
+            return snapshot
+
+    async def seed(self) -> MarketSentiment:
+        """Load the universe list and build the first snapshot."""
+        symbols = await asyncio.get_running_loop().run_in_executor(None, load_universe)
+        if not symbols:
+            return empty_sentiment()
+        return await self.refresh(symbols)
+
+    async def get_sentiment(self, symbols: Sequence[str], max_age: float = BREADTH_MAX_AGE_SECONDS) -> MarketSentiment:
+        """Snapshot for ``symbols``, refreshed when stale or for a new universe."""
+        fresh = time.monotonic() - self.refreshed_at < max_age
+        if self.snapshot is None or list(symbols) != self.universe or not fresh:
+            return await self.refresh(symbols)
+        return self.snapshot
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "symbols": len(self.universe),
+            "bars": len(self.panels["Close"]) if self.panels else 0,
+            "interval": self.interval,
+            "last_compute_ms": round(self.last_compute_ms, 2),
+            "age_seconds": round(time.monotonic() - self.refreshed_at, 1) if self.refreshed_at else None,
+            "computed_at": self.snapshot.last_updated.isoformat() if self.snapshot else None,
+        }
@@ -0,0 +1,391 @@
+"""
+Recommendation Outcome Evaluator
+================================
+
+Nightly batch evaluation of the ``recommendation_performance`` trackers
+created by ``RecommendationHistoryStorage``: returns at each horizon, target
+and stop-loss hits, maximum favourable / adverse excursion and the final
+outcome of every active recommendation.
+
+- Active trackers are streamed from MongoDB with a projection and grouped by
+  symbol.
+- Each symbol's daily bars are pulled once, through the shared bar store,
+  covering its oldest open recommendation; fetches run on a thread pool.
+- The bars are packed into flat arrays with per-symbol offsets. Tracking
+  windows of all recommendations are gathered from them into
+  (recommendations x bars) matrices, a chunk of rows at a time, and hits,
+  excursions and horizon returns come out of whole-matrix numpy operations.
+- Results go back with unordered ``bulk_write`` batches, to the tracker and
+  to the matching ``individual_recommendations`` document
+  (``performance_1d`` ... ``performance_3m``, ``max_gain`` / ``max_loss``,
+  ``target_achieved`` / ``stop_loss_hit``).
+
+Windows start at the first bar after the recommendation and last
+``max(HORIZONS)`` bars; a recommendation whose window is complete without a
+target or stop hit is closed as ``expired``. When target and stop fall on the
+same bar the stop is assumed to have hit first. SELL / AVOID recommendations
+are evaluated as short positions.
+
+Env
+---
+OUTCOME_FETCH_WORKERS   parallel bar store reads (default 16)
+OUTCOME_WRITE_BATCH     updates per bulk_write (default 1000)
+"""
+
+import asyncio
+import logging
+import os
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from api.models.recommendation_history_models import RecommendationAction, pymongo
+from shared.data import get_bar_store
+from shared.data.bar_store import DEFAULT_TZ
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Horizon name -> trading days after the recommendation
+HORIZONS = {"1d": 1, "1w": 5, "1m": 21, "3m": 63}
+
+OUTCOME_FETCH_WORKERS = int(os.getenv("OUTCOME_FETCH_WORKERS", "16"))
+OUTCOME_WRITE_BATCH = int(os.getenv("OUTCOME_WRITE_BATCH", "1000"))
+
+SHORT_ACTIONS = {RecommendationAction.SELL.value, RecommendationAction.AVOID.value}
+
+TRACKER_FIELDS = ["_id", "recommendation_id", "symbol", "batch_id", "recommended_at",
+                  "recommended_price", "target_price", "stop_loss", "recommendation_action"]
+
+
+def _yahoo_symbol(symbol: str) -> str:
+    return symbol if "." in symbol else f"{symbol}.NS"
+
+
+def _to_utc(values) -> pd.Series:
+    """Stored datetimes are naive exchange time."""
+    stamps = pd.to_datetime(pd.Series(values))
+    if stamps.dt.tz is None:
+        stamps = stamps.dt.tz_localize(DEFAULT_TZ)
+    return stamps.dt.tz_convert("UTC")
+
+
+def _first_true(mask: np.ndarray) -> np.ndarray:
+    """Column of the first True per row, ``mask.shape[1]`` where there is none."""
+    first = mask.argmax(axis=1)
+    return np.where(mask.any(axis=1), first, mask.shape[1])
+
+
+class PricePanel:
+    """Daily bars of many symbols as flat arrays plus per-symbol offsets."""
+
+    def __init__(self, bars: Dict[str, pd.DataFrame]):
+        frames = {symbol: frame for symbol, frame in bars.items() if frame is not None and not frame.empty}
+        self.symbols = list(frames)
+        lengths = np.array([len(frame) for frame in frames.values()], dtype="int64")
+        self.hi = np.cumsum(lengths)
+        self.lo = self.hi - lengths
+        if frames:
+            self.ts = np.concatenate([f.index.tz_convert("UTC").as_unit("ns").asi8 for f in frames.values()])
+            self.high, self.low, self.close = (
+                np.concatenate([f[field].to_numpy(dtype="f8") for f in frames.values()])
+                for field in ("High", "Low", "Close"))
+        else:
+            self.ts = np.empty(0, dtype="int64")
+            self.high = self.low = self.close = np.empty(0)
+
+    def locate(self, symbols: np.ndarray, timestamps: np.ndarray):
+        """Per row: (first bar after ``timestamps``, end of the symbol's bars).
+
+        Unknown symbols get an empty range.
+        """
+        start = np.zeros(len(symbols), dtype="int64")
+        end = np.zeros(len(symbols), dtype="int64")
+        position = {symbol: i for i, symbol in enumerate(self.symbols)}
+        codes, uniques = pd.factorize(symbols)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        for code, symbol in enumerate(uniques):
+            rows = order[bounds[code]:bounds[code + 1]]
+            i = position.get(symbol)
+            if i is None:
+                continue
+            lo, hi = self.lo[i], self.hi[i]
+            start[rows] = lo + np.searchsorted(self.ts[lo:hi], timestamps[rows], side="right")
+            end[rows] = hi
+        return start, end
+
+
+def evaluate_outcomes(bars: Dict[str, pd.DataFrame], trackers: pd.DataFrame,
+                      horizons: Dict[str, int] = HORIZONS, chunk_size: int = 20000) -> pd.DataFrame:
+    """Evaluate trackers against ``{symbol: daily bars}``.
+
+    ``trackers`` needs ``symbol``, ``recommended_at``, ``recommended_price``,
+    ``target_price``, ``stop_loss`` and ``recommendation_action`` columns.
+    Returns one row per tracker (same index) with horizon returns,
+    excursions, current price / return, volatility, ``bars_seen`` and the
+    outcome (``None`` while still open). Rows are processed ``chunk_size`` at
+    a time to bound the (rows x window) matrices.
+    """
+    n = len(trackers)
+    window = max(horizons.values())
+    panel = PricePanel(bars)
+
+    rec_ts = _to_utc(trackers["recommended_at"]).dt.as_unit("ns").astype("int64").to_numpy()
+    price = pd.to_numeric(trackers["recommended_price"], errors="coerce").to_numpy(dtype="f8")
+    price = np.where(price > 0, price, np.nan)
+    target = pd.to_numeric(trackers["target_price"], errors="coerce").to_numpy(dtype="f8")
+    stop = pd.to_numeric(trackers["stop_loss"], errors="coerce").to_numpy(dtype="f8")
+    sign = np.where(trackers["recommendation_action"].isin(SHORT_ACTIONS).to_numpy(), -1.0, 1.0)
+
+    start, end = panel.locate(trackers["symbol"].to_numpy(), rec_ts)
+    available = np.where(np.isnan(price), 0, np.clip(end - start, 0, window))
+    # Latest close of each row's symbol
+    has_bars = end > 0
+    current_price = np.where(has_bars, panel.close[np.maximum(end - 1, 0)] if len(panel.ts) else np.nan, np.nan)
+
+    out = {f"return_{name}": np.full(n, np.nan) for name in horizons}
+    for column in ("max_favorable_excursion", "max_adverse_excursion", "volatility", "final_return"):
+        out[column] = np.full(n, np.nan)
+    out["target_hit"] = np.zeros(n, dtype=bool)
+    out["stop_hit"] = np.zeros(n, dtype=bool)
+    out["outcome"] = np.full(n, None, dtype=object)
+    outcome_at = np.zeros(n, dtype="int64")
+    resolved = np.zeros(n, dtype=bool)
+
+    cols = np.arange(window)
+    for begin in range(0, n if len(panel.ts) else 0, chunk_size):
+        rows = slice(begin, begin + chunk_size)
+        s, a, p, sg = start[rows], available[rows], price[rows], sign[rows][:, None]
+
+        # (rows x window) index matrix into the flat bar arrays
+        in_window = cols[None, :] < a[:, None]
+        idx = np.clip(s[:, None] + cols[None, :], 0, len(panel.ts) - 1)
+        H = np.where(in_window, panel.high[idx], np.nan)
+        L = np.where(in_window, panel.low[idx], np.nan)
+        C = np.where(in_window, panel.close[idx], np.nan)
+        favourable = np.where(sg > 0, H, L)
+        adverse = np.where(sg > 0, L, H)
+
+        def pct(values):
+            base = p[:, None] if values.ndim == 2 else p
+            return (sg if values.ndim == 2 else sg[:, 0]) * (values / base - 1.0) * 100.0
+
+        t, st = target[rows], stop[rows]
+        with np.errstate(invalid="ignore"):
+            target_hit = ~np.isnan(t)[:, None] & (sg * (favourable - t[:, None]) >= 0)
+            stop_hit = ~np.isnan(st)[:, None] & (sg * (adverse - st[:, None]) <= 0)
+        first_target, first_stop = _first_true(target_hit), _first_true(stop_hit)
+
+        stopped = (first_stop < window) & (first_stop <= first_target)
+        targeted = (first_target < window) & ~stopped
+        expired = ~stopped & ~targeted & (a >= window)
+        last_col = np.select([stopped, targeted], [first_stop, first_target], a - 1)
+
+        # Excursions and volatility only count bars up to the outcome
+        through_outcome = cols[None, :] <= last_col[:, None]
+        with warnings.catch_warnings():
+            # Rows without bars yet reduce to NaN
+            warnings.simplefilter("ignore", RuntimeWarning)
+            out["max_favorable_excursion"][rows] = np.nanmax(np.where(through_outcome, pct(favourable), np.nan), axis=1)
+            out["max_adverse_excursion"][rows] = np.nanmin(np.where(through_outcome, pct(adverse), np.nan), axis=1)
+            path = np.where(through_outcome, C, np.nan)
+            out["volatility"][rows] = np.nanstd(np.diff(path, axis=1) / path[:, :-1], axis=1, ddof=1) * 100.0
+
+        for name, days in horizons.items():
+            out[f"return_{name}"][rows] = np.where(a >= days, pct(C[:, days - 1]), np.nan)
+
+        final_price = np.select([stopped, targeted, expired], [st, t, C[:, window - 1]], np.nan)
+        out["final_return"][rows] = pct(final_price)
+        out["target_hit"][rows], out["stop_hit"][rows] = targeted, stopped
+        outcome = out["outcome"][rows]
+        outcome[expired], outcome[targeted], outcome[stopped] = "expired", "target_hit", "stop_loss"
+        resolved[rows] = stopped | targeted | expired
+        outcome_at[rows] = panel.ts[np.clip(s + np.maximum(last_col, 0), 0, len(panel.ts) - 1)]
+
+    with np.errstate(invalid="ignore"):
+        current_return = sign * (current_price / price - 1.0) * 100.0
+    result = pd.DataFrame(out, index=trackers.index)
+    result["bars_seen"] = available
+    result["current_price"] = current_price
+    result["current_return"] = current_return
+    result["outcome_date"] = pd.to_datetime(outcome_at, utc=True).where(resolved)
+    return result
+
+
+def _bson_column(values: pd.Series) -> List[Any]:
+    """Column -> list of BSON-friendly values (NaN -> None, floats rounded)."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        naive = values.dt.tz_convert(DEFAULT_TZ).dt.tz_localize(None)
+        return pd.Series(naive.dt.to_pydatetime(), dtype=object).where(naive.notna().to_numpy(), None).tolist()
+    if pd.api.types.is_float_dtype(values):
+        rounded = values.round(4)
+        return rounded.astype(object).where(rounded.notna(), None).tolist()
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+class OutcomeEvaluator:
+    """Evaluates all active recommendation trackers in bulk."""
+
+    def __init__(self, storage=None, bar_store=None, horizons: Dict[str, int] = HORIZONS,
+                 max_workers: int = OUTCOME_FETCH_WORKERS, write_batch: int = OUTCOME_WRITE_BATCH):
+        if storage is None:
+            from api.models.recommendation_history_models import recommendation_history_storage
+            storage = recommendation_history_storage
+        self.storage = storage
+        self.bar_store = bar_store or get_bar_store()
+        self.horizons = dict(horizons)
+        self.max_workers = max_workers
+        self.write_batch = write_batch
+
+    # -----------------------------------------------------------------
+    # Loading
+    # -----------------------------------------------------------------
+
+    async def load_active(self, strategy: Optional[str] = None) -> pd.DataFrame:
+        """Stream active trackers into one frame (projected fields only)."""
+        query: Dict[str, Any] = {"status": "active"}
+        if strategy:
+            query["strategy"] = strategy
+        columns: Dict[str, List[Any]] = {field: [] for field in TRACKER_FIELDS}
+        cursor = self.storage.performance_collection.find(
+            query, {field: 1 for field in TRACKER_FIELDS}).batch_size(5000)
+        async for doc in cursor:
+            for field, values in columns.items():
+                values.append(doc.get(field))
+        return pd.DataFrame(columns)
+
+    def _read_bars(self, symbol: str, start: pd.Timestamp) -> pd.DataFrame:
+        try:
+            return self.bar_store.get_bars(_yahoo_symbol(symbol), start, None, "1d")
+        except Exception as e:
+            logger.warning(f"⚠️ Outcome evaluation: no bars for {symbol}: {e}")
+            return pd.DataFrame()
+
+    async def fetch_bars(self, trackers: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """One bar range per symbol, from its oldest open recommendation."""
+        starts = _to_utc(trackers["recommended_at"]).groupby(trackers["symbol"].to_numpy()).min()
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            frames = await asyncio.gather(*(
+                loop.run_in_executor(executor, self._read_bars, symbol, start.tz_convert(DEFAULT_TZ).normalize())
+                for symbol, start in starts.items()
+            ))
+        return dict(zip(starts.index, frames))
+
+    # -----------------------------------------------------------------
+    # Evaluation
+    # -----------------------------------------------------------------
+
+    def evaluate(self, trackers: pd.DataFrame, bars: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Evaluate every tracker; the result is indexed like ``trackers``."""
+        return evaluate_outcomes(bars, trackers, self.horizons)
+
+    def build_updates(self, trackers: pd.DataFrame, results: pd.DataFrame,
+                      now: Optional[datetime] = None):
+        """``(tracker updates, recommendation updates)`` as pymongo UpdateOne lists."""
+        now = now or datetime.now()
+        evaluated = results["bars_seen"].to_numpy() > 0
+        trackers, results = trackers[evaluated], results[evaluated]
+        columns = {column: _bson_column(results[column]) for column in results.columns}
+        names = list(self.horizons)
+        tracker_ops, recommendation_ops = [], []
+
+        for i, (tracker_id, batch_id, symbol) in enumerate(trackers[["_id", "batch_id", "symbol"]].to_numpy()):
+            tracker_set = {"last_updated": now}
+            recommendation_set = {}
+            for name in names:
+                value = columns[f"return_{name}"][i]
+                if value is not None:
+                    tracker_set[f"tracking_periods.{name}"] = value
+                    recommendation_set[f"performance_{name}"] = value
+            tracker_set.update({
+                "current_price": columns["current_price"][i],
+                "current_return": columns["current_return"][i],
+                "max_favorable_excursion": columns["max_favorable_excursion"][i],
+                "max_adverse_excursion": columns["max_adverse_excursion"][i],
+                "volatility": columns["volatility"][i],
+            })
+            recommendation_set.update({
+                "current_price": tracker_set["current_price"],
+                "max_gain": tracker_set["max_favorable_excursion"],
+                "max_loss": tracker_set["max_adverse_excursion"],
+            })
+            outcome = columns["outcome"][i]
+            if outcome is not None:
+                outcome_date = columns["outcome_date"][i]
+                tracker_set.update({
+                    "status": "stopped" if outcome == "stop_loss" else "completed",
+                    "outcome": outcome,
+                    "outcome_date": outcome_date,
+                    "final_return": columns["final_return"][i],
+                })
+                recommendation_set.update({
+                    "target_achieved": columns["target_hit"][i],
+                    "stop_loss_hit": columns["stop_hit"][i],
+                    "outcome_date": outcome_date,
+                    "outcome_notes": outcome,
+                })
+
+            tracker_ops.append(pymongo.UpdateOne(
+                {"_id": tracker_id}, {"$set": tracker_set, "$inc": {"update_count": 1}}))
+            recommendation_ops.append(pymongo.UpdateOne(
+                {"batch_id": batch_id, "symbol": symbol}, {"$set": recommendation_set}))
+        return tracker_ops, recommendation_ops
+
+    async def _write(self, collection, operations: List[Any]) -> int:
+        modified = 0
+        for offset in range(0, len(operations), self.write_batch):
+            result = await collection.bulk_write(operations[offset:offset + self.write_batch], ordered=False)
+            modified += result.modified_count
+        return modified
+
+    # -----------------------------------------------------------------
+    # Nightly run
+    # -----------------------------------------------------------------
+
+    async def run(self, strategy: Optional[str] = None) -> Dict[str, Any]:
+        """Evaluate and write back every active tracker."""
+        if not self.storage.use_mongodb:
+            return {"status": "skipped", "reason": "performance tracking needs MongoDB"}
+
+        started = time.perf_counter()
+        with span("outcomes.load", group="cron"):
+            trackers = await self.load_active(strategy)
+        if trackers.empty:
+            return {"status": "completed", "evaluated": 0, "duration_ms": 0.0}
+
+        with span("outcomes.fetch_bars", group="cron"):
+            bars = await self.fetch_bars(trackers)
+        with span("outcomes.evaluate", group="cron"):
+            results = self.evaluate(trackers, bars)
+
+        # Updates are built and written a slice at a time to bound memory
+        evaluated = updated = 0
+        step = self.write_batch * 20
+        with span("outcomes.write", group="cron"):
+            for offset in range(0, len(trackers), step):
+                tracker_ops, recommendation_ops = self.build_updates(
+                    trackers.iloc[offset:offset + step], results.iloc[offset:offset + step])
+                updated += await self._write(self.storage.performance_collection, tracker_ops)
+                await self._write(self.storage.recommendations_collection, recommendation_ops)
+                evaluated += len(tracker_ops)
+
+        outcomes = results["outcome"].value_counts().to_dict() if "outcome" in results else {}
+        summary = {
+            "status": "completed",
+            "active": len(trackers),
+            "symbols": len(bars),
+            "evaluated": evaluated,
+            "updated": updated,
+            "outcomes": {str(k): int(v) for k, v in outcomes.items()},
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        logger.info(f"✅ Outcome evaluation: {summary['evaluated']}/{summary['active']} trackers "
+                    f"over {summary['symbols']} symbols in {summary['duration_ms']} ms")
+        return summary
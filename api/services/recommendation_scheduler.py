@@ -273,10 +273,10 @@ class RecommendationScheduler:
         try:
             # Import here to avoid circular imports
             from api.longterm_server import run_combination_analysis
-            from api.longterm_server import app
+            from api.longterm_server import config_snapshots
             
             request = self.default_requests[RecommendationType.LONG_TERM]
-            config = app.state.config
+            config = config_snapshots.current.data
             
             # Run analysis
             result = await run_combination_analysis(
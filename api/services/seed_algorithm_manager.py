@@ -9,7 +9,6 @@ Uses Chartink query language for stock screening with iterative improvements.
 import json
 import logging
 import requests
-from bs4 import BeautifulSoup as bs
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
@@ -18,6 +17,10 @@ import time
 import hashlib
 import os
 
+from utils.lazy import lazy_import
+
+bs4 = lazy_import("bs4")
+
 logger = logging.getLogger(__name__)
 
 class SeedAlgorithmManager:
@@ -39,6 +42,10 @@ class SeedAlgorithmManager:
         # Performance tracking
         self.ranking_history = deque(maxlen=50)  # Keep last 50 rankings
         
+        # Sub-query result memo: versions sharing a variant reuse its result set
+        self.query_cache_ttl = int(os.getenv("SEED_QUERY_CACHE_TTL_SECONDS", "900"))
+        self._query_cache: Dict[str, Tuple[float, pd.DataFrame]] = {}
+        
         # Load existing algorithms or create defaults
         self.load_algorithms()
         
@@ -164,7 +171,7 @@ class SeedAlgorithmManager:
         """Initialize Chartink session with CSRF token"""
         try:
             r = self.session.get('https://chartink.com/screener/alg-test-1')
-            soup = bs(r.content, 'html.parser')
+            soup = bs4.BeautifulSoup(r.content, 'html.parser')
             csrf_element = soup.select_one('[name=csrf-token]')
             
             if csrf_element:
@@ -209,6 +216,34 @@ class SeedAlgorithmManager:
             logger.error(f"❌ Error executing Chartink query: {e}")
             return pd.DataFrame()
 
+    def execute_cached_query(self, query: str) -> Tuple[pd.DataFrame, bool]:
+        """Execute a query once per TTL window; returns (results, cache_hit)"""
+        key = hashlib.md5(query.encode('utf-8')).hexdigest()
+        cached = self._query_cache.get(key)
+        if cached and time.time() - cached[0] < self.query_cache_ttl:
+            return cached[1].copy(), True
+        
+        df = self.execute_chartink_query(query)
+        if not df.empty:
+            self._query_cache[key] = (time.time(), df)
+        return df.copy(), False
+
+    def record_variant_snapshot(self, path: str) -> Dict[str, Any]:
+        """Record every sub-algorithm variant's result set for offline search"""
+        from api.services.combination_search import VariantSnapshot
+        
+        snapshot = VariantSnapshot.record(
+            getattr(self, 'sub_algorithm_variants', {}),
+            lambda query: self.execute_cached_query(query)[0]
+        )
+        snapshot.save(path)
+        return {
+            'path': path,
+            'recorded_at': snapshot.recorded_at,
+            'symbols': len(snapshot.symbols),
+            'variants': sum(len(v) for v in snapshot.result_sets.values())
+        }
+
     def resolve_algorithm_queries(self, algorithm_version: str) -> Dict[str, Any]:
         """
         Resolve algorithm queries by combining sub-algorithm variants
@@ -284,7 +319,7 @@ class SeedAlgorithmManager:
         for query_name, query_config in resolved_queries.items():
             logger.info(f"🔍 Executing query: {query_name} ({query_config.get('category', 'unknown')} {query_config.get('variant_version', 'unknown')})")
             
-            df = self.execute_chartink_query(query_config['query'])
+            df, cache_hit = self.execute_cached_query(query_config['query'])
             
             if not df.empty:
                 # Add weight and query info to results
@@ -312,7 +347,8 @@ class SeedAlgorithmManager:
                     'top_stocks': []
                 }
             
-            time.sleep(1)  # Rate limiting
+            if not cache_hit:
+                time.sleep(1)  # Rate limiting
         
         # Rank stocks using frequency and recency
         ranked_stocks = self.rank_algorithm_results(all_stocks)
@@ -0,0 +1,242 @@
+"""
+Shared Worker Tier
+==================
+
+State shared by the worker processes of the API servers (see ``api/serve.py``
+for the multi-worker serving mode), backed by the local Redis.
+
+- ``SharedRateLimiter`` reserves upstream request slots with one atomic
+  Redis script, so N workers - and the swing / short-term / long-term servers
+  together - keep the ChartInk spacing of a single process.
+- ``SharedQueryCache`` stores raw ChartInk result sets keyed by query text
+  with a short TTL. A fill lock makes one worker run a query while the
+  others wait for its result instead of repeating the round trip.
+
+Config snapshots are shared through ``RedisSnapshotChannel`` and
+recommendations through ``RecommendationCache`` (MongoDB / file store), both
+of which are already process independent.
+
+When Redis is unreachable every helper falls back to per-process state and
+retries Redis after ``RETRY_AFTER_SECONDS``.
+
+Env
+---
+API_WORKERS                 worker processes per server (default 1)
+SHARED_TIER_ENABLED         true/false (default true when API_WORKERS > 1)
+SHARED_RESULT_TTL_SECONDS   ChartInk result set TTL (default 120)
+REDIS_URL                   Redis connection URL (default redis://localhost:6379/0)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+SHARED_TIER_ENABLED = os.getenv("SHARED_TIER_ENABLED", "true" if API_WORKERS > 1 else "false").lower() == "true"
+SHARED_RESULT_TTL_SECONDS = float(os.getenv("SHARED_RESULT_TTL_SECONDS", "120"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+RETRY_AFTER_SECONDS = 30.0
+
+# Returns the reserved slot as a string - Lua numbers convert to integer replies
+RESERVE_SLOT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local last = tonumber(redis.call('GET', KEYS[1]) or '0')
+local slot = math.max(now, last + tonumber(ARGV[2]))
+if slot > now then
+    slot = slot + tonumber(ARGV[3])
+end
+redis.call('SET', KEYS[1], tostring(slot), 'EX', 3600)
+return tostring(slot)
+"""
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class SharedTier:
+    """Lazy async Redis connection that backs off when Redis is down."""
+
+    def __init__(self, redis_url: Optional[str] = None, enabled: Optional[bool] = None):
+        self.redis_url = redis_url or REDIS_URL
+        self.enabled = SHARED_TIER_ENABLED if enabled is None else enabled
+        self._client = None
+        self._loop = None
+        self._down_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return self.enabled and time.monotonic() >= self._down_until
+
+    def _get_client(self):
+        # Clients are bound to the event loop they were created on
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            import redis.asyncio as aioredis
+            self._client = aioredis.Redis.from_url(self.redis_url, socket_timeout=2, decode_responses=True)
+            self._loop = loop
+        return self._client
+
+    async def call(self, command: str, *args, **kwargs) -> Any:
+        """Run one Redis command; ``None`` (and a back-off) if Redis fails."""
+        if not self.available:
+            return None
+        try:
+            return await getattr(self._get_client(), command)(*args, **kwargs)
+        except Exception as e:
+            self._down_until = time.monotonic() + RETRY_AFTER_SECONDS
+            logger.warning(f"⚠️ Shared tier unavailable, using per-process state for "
+                           f"{RETRY_AFTER_SECONDS:.0f}s: {e}")
+            return None
+
+
+_default_tier: Optional[SharedTier] = None
+
+
+def get_shared_tier() -> SharedTier:
+    """Process-wide shared tier."""
+    global _default_tier
+    if _default_tier is None:
+        _default_tier = SharedTier()
+    return _default_tier
+
+
+# =====================================================================
+# RATE LIMITING
+# =====================================================================
+
+class SharedRateLimiter:
+    """Spaces upstream requests by ``min_interval`` across all workers.
+
+    Each caller reserves the next request slot (atomically in Redis, or under
+    a local lock as fallback) and then sleeps outside it, so concurrent
+    requests are spaced while their network I/O overlaps. ``jitter`` is added
+    to slots that had to wait.
+    """
+
+    def __init__(self, name: str, min_interval: float, jitter: Tuple[float, float] = (0.0, 0.0),
+                 tier: Optional[SharedTier] = None):
+        self.key = f"alg:rate:{name}"
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.tier = tier or get_shared_tier()
+        self._last_slot = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def wait(self) -> float:
+        """Wait for the next free slot; returns the seconds slept."""
+        slot = await self._reserve()
+        sleep_time = slot - time.time()
+        if sleep_time > 0:
+            logger.debug(f"⏱️ Rate limiting {self.key}: sleeping for {sleep_time:.2f}s")
+            await asyncio.sleep(sleep_time)
+            return sleep_time
+        return 0.0
+
+    async def _reserve(self) -> float:
+        now = time.time()
+        jitter = random.uniform(*self.jitter)
+
+        value = await self.tier.call('eval', RESERVE_SLOT_SCRIPT, 1, self.key, now, self.min_interval, jitter)
+        if value is not None:
+            self._last_slot = float(value)
+            return self._last_slot
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            slot = max(now, self._last_slot + self.min_interval)
+            if slot > now:
+                slot += jitter
+            self._last_slot = slot
+        return slot
+
+
+# =====================================================================
+# RESULT SETS
+# =====================================================================
+
+class SharedQueryCache:
+    """Cross-worker TTL cache of raw query results keyed by query text."""
+
+    POLL_INTERVAL = 0.25
+
+    def __init__(self, namespace: str, ttl_seconds: Optional[float] = None, lock_seconds: float = 60.0,
+                 tier: Optional[SharedTier] = None):
+        self.prefix = f"alg:results:{namespace}"
+        self.ttl_seconds = SHARED_RESULT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.lock_seconds = lock_seconds
+        self.tier = tier or get_shared_tier()
+        self.hits = 0
+        self.misses = 0
+
+    async def _key(self, query: str, limit: int) -> str:
+        generation = await self.tier.call('get', f"{self.prefix}:generation") or '0'
+        digest = hashlib.sha1(f"{limit}:{query}".encode('utf-8')).hexdigest()
+        return f"{self.prefix}:{generation}:{digest}"
+
+    async def _read(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        blob = await self.tier.call('get', key)
+        return json.loads(blob) if blob is not None else None
+
+    async def get_or_fetch(self, query: str, limit: int,
+                           fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        if not self.tier.available:
+            return await fetch()
+
+        key = await self._key(query, limit)
+        cached = await self._read(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        acquired = await self.tier.call('set', lock_key, token, nx=True, px=int(self.lock_seconds * 1000))
+        if not acquired and self.tier.available:
+            # Another worker is running this query - wait for its result
+            deadline = time.monotonic() + self.lock_seconds
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.POLL_INTERVAL)
+                cached = await self._read(key)
+                if cached is not None:
+                    self.hits += 1
+                    return cached
+                if not await self.tier.call('exists', lock_key):
+                    break  # Holder finished without a result (empty or failed)
+
+        self.misses += 1
+        try:
+            results = await fetch()
+            # Empty results are usually transient failures - don't pin them
+            if results:
+                await self.tier.call('set', key, json.dumps(results, default=str),
+                                     px=int(self.ttl_seconds * 1000))
+            return results
+        finally:
+            if acquired:
+                await self.tier.call('eval', RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+
+    async def invalidate(self) -> None:
+        """Drop every cached result set (e.g. on a forced refresh)."""
+        await self.tier.call('incr', f"{self.prefix}:generation")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'shared': self.tier.available,
+            'hits': self.hits,
+            'misses': self.misses,
+            'ttl_seconds': self.ttl_seconds,
+        }
@@ -0,0 +1,136 @@
+"""
+Stage Memoization for Cron Pipelines
+====================================
+
+Change detection for the recommendation crons (``BaseStrategyCron`` jobs),
+which re-run the same pipeline every few minutes while the inputs often have
+not moved (quiet mid-session stretches, after the close).
+
+Each pipeline stage fingerprints its inputs - scan results, config snapshot
+digest, market session - and ``StageMemo`` hands back the previous output
+when the fingerprint is unchanged:
+
+- candidate scans are reused outside market hours, when ChartInk cannot
+  return anything new until the next open (``session_fingerprint``)
+- per-symbol scoring is keyed by symbol and fingerprinted by that symbol's
+  quote, so a run where a few quotes moved rescores only those symbols
+- the final result is fingerprinted before it is cached; an unchanged result
+  skips the cache / history write
+
+Entries also expire after ``max_age_seconds`` so a stage is recomputed at
+least that often even when nothing looks different.
+
+Env
+---
+STAGE_MEMO_ENABLED       true/false (default true)
+STAGE_MEMO_MAX_AGE       seconds before an unchanged stage is recomputed anyway (default 1800)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STAGE_MEMO_ENABLED = os.getenv("STAGE_MEMO_ENABLED", "true").lower() == "true"
+STAGE_MEMO_MAX_AGE = float(os.getenv("STAGE_MEMO_MAX_AGE", "1800"))
+
+# Result fields that change on every run without the result changing
+VOLATILE_FIELDS = frozenset({"timestamp", "generated_at", "processing_time", "processing_time_seconds",
+                             "execution_time", "duration_ms"})
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in VOLATILE_FIELDS}
+    if isinstance(value, (list, tuple)):
+        return [_strip_volatile(item) for item in value]
+    return value
+
+
+def fingerprint(*parts: Any) -> str:
+    """Content hash of ``parts`` (key order independent, timestamps ignored)."""
+    canonical = json.dumps(_strip_volatile(list(parts)), sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def session_fingerprint(timer, now: Optional[datetime] = None) -> Optional[str]:
+    """Marker of the data a closed market can serve, ``None`` while it trades.
+
+    Outside regular hours ChartInk keeps returning the last close, so every
+    run between two sessions shares one marker.
+    """
+    now = now or timer.get_current_ist_time()
+    session = timer.get_market_session(now)
+    if session.value == "regular":
+        return None
+    side = "before_open" if now.time() < timer.market_open else "after_close"
+    return f"{now.date().isoformat()}:{session.value}:{side}"
+
+
+class StageMemo:
+    """Last output per key, reused while the input fingerprint is unchanged."""
+
+    def __init__(self, name: str, max_age_seconds: float = STAGE_MEMO_MAX_AGE,
+                 max_entries: int = 4096, enabled: Optional[bool] = None):
+        self.name = name
+        self.max_age_seconds = max_age_seconds
+        self.max_entries = max_entries
+        self.enabled = STAGE_MEMO_ENABLED if enabled is None else enabled
+        self._entries: "OrderedDict[Hashable, Tuple[str, float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: Hashable, fp: str) -> Tuple[bool, Any]:
+        """``(True, output)`` when ``key`` was last stored with ``fp`` and is fresh."""
+        entry = self._entries.get(key) if self.enabled else None
+        if entry is None or entry[0] != fp or time.monotonic() - entry[1] > self.max_age_seconds:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, entry[2]
+
+    def store(self, key: Hashable, fp: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (fp, time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def changed(self, key: Hashable, fp: str) -> bool:
+        """Record ``fp`` for ``key``; True unless it repeats a fresh entry."""
+        hit, _ = self.lookup(key, fp)
+        if not hit:
+            self.store(key, fp, None)
+        return not hit
+
+    async def get_or_compute(self, key: Hashable, fp: str,
+                             compute: Callable[[], Awaitable[Any]]) -> Any:
+        hit, value = self.lookup(key, fp)
+        if hit:
+            return value
+        value = await compute()
+        self.store(key, fp, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "stage": self.name,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
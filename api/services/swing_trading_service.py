@@ -12,7 +12,6 @@ from typing import Dict, List, Optional, Tuple, Any
 import numpy as np
 import pandas as pd
 from dataclasses import asdict
-import yfinance as yf
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
@@ -23,6 +22,11 @@ from api.models.stock_models import (
 from api.services.data_service import RealTimeDataService
 from api.services.intraday_service import ChartinkIntegration
 from .config_manager import config_manager, SeedAlgorithm, StrategyConfig
+from .market_timer import market_timer
+from .stage_memo import StageMemo, fingerprint, session_fingerprint
+from utils.lazy import lazy_import
+
+yf = lazy_import("yfinance")
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -53,6 +57,10 @@ class SwingTradingAnalyzer:
         self.data_service = data_service
         self.chartink = ChartinkIntegration()
         
+        # Scans are reused between sessions, scores while a symbol's quote is unchanged
+        self.candidate_memo = StageMemo("candidates")
+        self.analysis_memo = StageMemo("analysis")
+        
         # Initialize config manager if not already initialized
         if config_manager.last_loaded is None:
             import asyncio
@@ -74,16 +82,26 @@ class SwingTradingAnalyzer:
     async def get_candidates_from_config(self, strategy_name: str) -> List[str]:
         """Get stock candidates using configuration-driven seed algorithms"""
         try:
-            strategy_config = config_manager.get_strategy_config(strategy_name)
+            # One snapshot for the whole request, even if the config is pushed meanwhile
+            snapshot = config_manager.snapshot
+            strategy_config = snapshot.strategies.get(strategy_name) if snapshot else None
             if not strategy_config:
                 logger.warning(f"⚠️ No configuration found for strategy: {strategy_name}")
                 return []
             
+            session = session_fingerprint(market_timer)
+            scan_fp = fingerprint(snapshot.digest, session) if session else None
+            if scan_fp:
+                hit, cached = self.candidate_memo.lookup(strategy_name, scan_fp)
+                if hit:
+                    logger.info(f"♻️ Strategy {strategy_name}: reusing {len(cached)} candidates ({session})")
+                    return list(cached)
+            
             all_candidates = []
             total_weight = 0
             
             # Get candidates from Chartink themes
-            chartink_algorithms = config_manager.get_seed_algorithms(strategy_name, 'chartink_themes')
+            chartink_algorithms = snapshot.enabled_algorithms.get((strategy_name, 'chartink_themes'), ())
             for algorithm in chartink_algorithms:
                 try:
                     theme_candidates = await self.chartink.get_stocks_by_theme(
@@ -112,7 +130,7 @@ class SwingTradingAnalyzer:
                     continue
             
             # Get candidates from custom scanners
-            custom_algorithms = config_manager.get_seed_algorithms(strategy_name, 'custom_scanners')
+            custom_algorithms = snapshot.enabled_algorithms.get((strategy_name, 'custom_scanners'), ())
             for algorithm in custom_algorithms:
                 try:
                     scanner_candidates = await self._run_custom_scanner(algorithm)
@@ -131,20 +149,22 @@ class SwingTradingAnalyzer:
             
             # Remove duplicates and apply global limits
             unique_candidates = list(set(all_candidates))
-            global_settings = config_manager.get_global_settings()
+            global_settings = snapshot.global_settings
             max_candidates = global_settings.get('max_candidates_per_strategy', 100)
             
             final_candidates = unique_candidates[:max_candidates]
             
             logger.info(f"📊 Strategy {strategy_name}: {len(final_candidates)} final candidates from {len(unique_candidates)} unique (total weight: {total_weight:.2f})")
             
+            if scan_fp:
+                self.candidate_memo.store(strategy_name, scan_fp, tuple(final_candidates))
             return final_candidates
             
         except Exception as e:
             logger.error(f"❌ Error getting candidates for {strategy_name}: {e}")
             # Fallback to global fallback symbols
-            fallback_symbols = config_manager.get_global_settings().get('fallback_symbols', [])
-            return fallback_symbols[:20]
+            fallback_symbols = config_manager.get_fallback_symbols()
+            return list(fallback_symbols[:20])
     
     async def _apply_algorithm_filters(self, candidates: List[str], filters: Dict, algorithm_name: str) -> List[str]:
         """Apply algorithm-specific filters to candidates"""
@@ -237,7 +257,7 @@ class SwingTradingAnalyzer:
     async def _scan_bollinger_squeeze(self, params: Dict) -> List[str]:
         """Scan for Bollinger Band squeeze patterns"""
         # Get universe of stocks from fallback list for scanning
-        universe = config_manager.get_global_settings().get('fallback_symbols', [])
+        universe = config_manager.get_fallback_symbols()
         candidates = []
         
         bb_period = params.get('bb_period', 20)
@@ -275,7 +295,7 @@ class SwingTradingAnalyzer:
     
     async def _scan_ascending_triangle(self, params: Dict) -> List[str]:
         """Scan for ascending triangle patterns"""
-        universe = config_manager.get_global_settings().get('fallback_symbols', [])
+        universe = config_manager.get_fallback_symbols()
         candidates = []
         
         min_touches = params.get('min_touches', 3)
@@ -313,7 +333,7 @@ class SwingTradingAnalyzer:
     
     async def _scan_flag_pole_pattern(self, params: Dict) -> List[str]:
         """Scan for flag and pole patterns"""
-        universe = config_manager.get_global_settings().get('fallback_symbols', [])
+        universe = config_manager.get_fallback_symbols()
         candidates = []
         
         pole_strength = params.get('pole_strength', 0.05)
@@ -346,7 +366,7 @@ class SwingTradingAnalyzer:
     
     async def _scan_double_bottom(self, params: Dict) -> List[str]:
         """Scan for double bottom patterns"""
-        universe = config_manager.get_global_settings().get('fallback_symbols', [])
+        universe = config_manager.get_fallback_symbols()
         candidates = []
         
         symmetry_tolerance = params.get('symmetry_tolerance', 0.02)
@@ -402,8 +422,9 @@ class SwingTradingAnalyzer:
     async def analyze_stock_with_config(self, symbol: str, strategy_name: str) -> Optional[Dict]:
         """Analyze stock using configuration-driven criteria"""
         try:
-            analysis_criteria = config_manager.get_analysis_criteria(strategy_name)
-            strategy_config = config_manager.get_strategy_config(strategy_name)
+            snapshot = config_manager.snapshot
+            strategy_config = snapshot.strategies.get(strategy_name) if snapshot else None
+            analysis_criteria = strategy_config.analysis_criteria if strategy_config else None
             
             if not analysis_criteria or not strategy_config:
                 return None
@@ -413,88 +434,108 @@ class SwingTradingAnalyzer:
             if not stock_data:
                 return None
             
-            # Calculate technical indicators
-            indicators = await self._calculate_technical_indicators(symbol)
-            if not indicators:
-                return None
-            
-            # Apply analysis criteria from config
-            criteria_results = {}
-            
-            # RSI analysis
-            rsi = getattr(indicators, 'rsi', 50)
-            min_rsi = analysis_criteria.get('min_rsi', 0)
-            max_rsi = analysis_criteria.get('max_rsi', 100)
-            criteria_results['rsi_valid'] = min_rsi <= rsi <= max_rsi
-            
-            # Volume analysis
-            volume_ratio = getattr(stock_data, 'volume_ratio', 1.0)
-            min_volume_ratio = analysis_criteria.get('min_volume_ratio', 1.0)
-            criteria_results['volume_valid'] = volume_ratio >= min_volume_ratio
-            
-            # Momentum analysis
-            momentum_score = getattr(indicators, 'momentum_score', 0)
-            min_momentum = analysis_criteria.get('min_momentum_score', 0)
-            max_momentum = analysis_criteria.get('max_momentum_score', 100)
-            criteria_results['momentum_valid'] = min_momentum <= momentum_score <= max_momentum
-            
-            # Calculate confidence and strength based on criteria
-            passed_criteria = sum(criteria_results.values())
-            total_criteria = len(criteria_results)
-            base_confidence = (passed_criteria / total_criteria) * 100
-            
-            # Apply confidence threshold
-            confidence_threshold = analysis_criteria.get('confidence_threshold', 50.0)
-            if base_confidence < confidence_threshold:
-                return None
-            
-            # Calculate final metrics
-            entry_price = float(stock_data.current_price)
-            target_return = strategy_config.target_return
-            stop_loss_pct = strategy_config.stop_loss
-            
-            target_price = entry_price * (1 + target_return)
-            stop_loss_price = entry_price * (1 - stop_loss_pct)
-            
-            # Enhanced confidence calculation
-            confidence = min(95.0, base_confidence + (volume_ratio - 1) * 5)
-            strength = min(100.0, momentum_score + (rsi - 50) * 0.5)
-            
-            # Generate reasoning
-            reasoning_parts = []
-            reasoning_parts.append(f"RSI optimal ({rsi:.1f})")
-            
-            if volume_ratio > 1.5:
-                reasoning_parts.append(f"Volume spike {volume_ratio:.1f}x")
-            if momentum_score > 50:
-                reasoning_parts.append("Bullish trend")
-            
-            reasoning = ", ".join(reasoning_parts)
-            
-            return {
-                'symbol': symbol,
-                'entry_price': entry_price,
-                'target_price': target_price,
-                'stop_loss_price': stop_loss_price,
-                'confidence': confidence,
-                'strength': strength,
-                'reasoning': reasoning,
-                'timeframe': strategy_config.timeframe,
-                'target_return_pct': target_return * 100,
-                'stop_loss_pct': stop_loss_pct * 100,
-                'strategy_name': strategy_name,
-                'analysis_criteria': criteria_results,
-                'indicators': {
-                    'rsi': rsi,
-                    'volume_ratio': volume_ratio,
-                    'momentum_score': momentum_score,
-                    'strategy_type': strategy_name
-                }
-            }
+            # Rescore only when the quote or the config moved since the last run
+            quote_fp = fingerprint(snapshot.digest, getattr(stock_data, 'current_price', None),
+                                   getattr(stock_data, 'volume', None), getattr(stock_data, 'volume_ratio', None))
+            hit, analysis = self.analysis_memo.lookup((strategy_name, symbol), quote_fp)
+            if not hit:
+                try:
+                    analysis = await self._score_with_config(symbol, strategy_name, strategy_config,
+                                                             analysis_criteria, stock_data)
+                except LookupError:
+                    return None  # Retried on the next run
+                self.analysis_memo.store((strategy_name, symbol), quote_fp, analysis)
+            return analysis
             
         except Exception as e:
             logger.error(f"❌ Error analyzing {symbol} with config: {e}")
             return None
+    
+    async def _score_with_config(self, symbol: str, strategy_name: str, strategy_config: StrategyConfig,
+                                 analysis_criteria: Dict, stock_data) -> Optional[Dict]:
+        """Score one stock against a strategy's analysis criteria.
+
+        Returns None when the stock fails the criteria; raises LookupError
+        when its indicators are not available yet.
+        """
+        # Calculate technical indicators
+        indicators = await self._calculate_technical_indicators(symbol)
+        if not indicators:
+            raise LookupError(f"no technical indicators for {symbol}")
+        
+        # Apply analysis criteria from config
+        criteria_results = {}
+        
+        # RSI analysis
+        rsi = getattr(indicators, 'rsi', 50)
+        min_rsi = analysis_criteria.get('min_rsi', 0)
+        max_rsi = analysis_criteria.get('max_rsi', 100)
+        criteria_results['rsi_valid'] = min_rsi <= rsi <= max_rsi
+        
+        # Volume analysis
+        volume_ratio = getattr(stock_data, 'volume_ratio', 1.0)
+        min_volume_ratio = analysis_criteria.get('min_volume_ratio', 1.0)
+        criteria_results['volume_valid'] = volume_ratio >= min_volume_ratio
+        
+        # Momentum analysis
+        momentum_score = getattr(indicators, 'momentum_score', 0)
+        min_momentum = analysis_criteria.get('min_momentum_score', 0)
+        max_momentum = analysis_criteria.get('max_momentum_score', 100)
+        criteria_results['momentum_valid'] = min_momentum <= momentum_score <= max_momentum
+        
+        # Calculate confidence and strength based on criteria
+        passed_criteria = sum(criteria_results.values())
+        total_criteria = len(criteria_results)
+        base_confidence = (passed_criteria / total_criteria) * 100
+        
+        # Apply confidence threshold
+        confidence_threshold = analysis_criteria.get('confidence_threshold', 50.0)
+        if base_confidence < confidence_threshold:
+            return None
+        
+        # Calculate final metrics
+        entry_price = float(stock_data.current_price)
+        target_return = strategy_config.target_return
+        stop_loss_pct = strategy_config.stop_loss
+        
+        target_price = entry_price * (1 + target_return)
+        stop_loss_price = entry_price * (1 - stop_loss_pct)
+        
+        # Enhanced confidence calculation
+        confidence = min(95.0, base_confidence + (volume_ratio - 1) * 5)
+        strength = min(100.0, momentum_score + (rsi - 50) * 0.5)
+        
+        # Generate reasoning
+        reasoning_parts = []
+        reasoning_parts.append(f"RSI optimal ({rsi:.1f})")
+        
+        if volume_ratio > 1.5:
+            reasoning_parts.append(f"Volume spike {volume_ratio:.1f}x")
+        if momentum_score > 50:
+            reasoning_parts.append("Bullish trend")
+        
+        reasoning = ", ".join(reasoning_parts)
+        
+        return {
+            'symbol': symbol,
+            'entry_price': entry_price,
+            'target_price': target_price,
+            'stop_loss_price': stop_loss_price,
+            'confidence': confidence,
+            'strength': strength,
+            'reasoning': reasoning,
+            'timeframe': strategy_config.timeframe,
+            'target_return_pct': target_return * 100,
+            'stop_loss_pct': stop_loss_pct * 100,
+            'strategy_name': strategy_name,
+            'analysis_criteria': criteria_results,
+            'indicators': {
+                'rsi': rsi,
+                'volume_ratio': volume_ratio,
+                'momentum_score': momentum_score,
+                'strategy_type': strategy_name
+            }
+        }
 
 
 class SwingTradingService:
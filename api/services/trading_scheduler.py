@@ -32,6 +32,8 @@ from api.models.cron_tracking_models import (
     cron_execution_tracker, CronJobType, CronJobStatus
 )
 from api.models.recommendation_history_models import recommendation_history_storage, RecommendationStrategy
+from .outcome_evaluator import OutcomeEvaluator
+from utils.tracing import span, trace_headers
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -181,6 +183,22 @@ class TradingScheduler:
             max_instances=1
         )
         
+        # Outcome evaluation: nightly, after the day's bars are final
+        self.scheduler.add_job(
+            func=self._evaluate_outcomes,
+            trigger=CronTrigger(
+                hour='18',
+                minute='30',
+                day_of_week='mon-fri',
+                timezone='Asia/Kolkata'
+            ),
+            id='outcome_evaluation',
+            name='Recommendation Outcome Evaluation',
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=3600
+        )
+        
         logger.info("✅ Cron jobs configured for market hours")
         
     async def _run_shortterm_analysis(self):
@@ -238,30 +256,31 @@ class TradingScheduler:
                 # Store recommendations in history database
                 try:
                     market_info = self.market_timer.get_market_session_info()
-                    batch_id = await recommendation_history_storage.store_recommendation_batch(
-                        execution_id=execution_id,
-                        cron_job_id="shortterm_recommendations",
-                        strategy=RecommendationStrategy.SHORTTERM,
-                        recommendations=result.get('recommendations', []),
-                        metadata={
-                            "algorithm_info": {
-                                "version": "v1.0",
-                                "strategy": "momentum",
-                                "filters_applied": payload
+                    with span("history.store", group="cron"):
+                        batch_id = await recommendation_history_storage.store_recommendation_batch(
+                            execution_id=execution_id,
+                            cron_job_id="shortterm_recommendations",
+                            strategy=RecommendationStrategy.SHORTTERM,
+                            recommendations=result.get('recommendations', []),
+                            metadata={
+                                "algorithm_info": {
+                                    "version": "v1.0",
+                                    "strategy": "momentum",
+                                    "filters_applied": payload
+                                },
+                                "performance_metrics": {
+                                    "api_response_time_ms": (end_time - start_time).total_seconds() * 1000,
+                                    "total_processing_time_seconds": (end_time - start_time).total_seconds()
+                                }
                             },
-                            "performance_metrics": {
-                                "api_response_time_ms": (end_time - start_time).total_seconds() * 1000,
-                                "total_processing_time_seconds": (end_time - start_time).total_seconds()
+                            request_parameters=payload,
+                            market_context={
+                                "market_condition": market_info.get('session', 'unknown'),
+                                "trading_session": market_info.get('session_id', ''),
+                                "market_open": market_info.get('is_open', False),
+                                "timestamp": datetime.now()
                             }
-                        },
-                        request_parameters=payload,
-                        market_context={
-                            "market_condition": market_info.get('session', 'unknown'),
-                            "trading_session": market_info.get('session_id', ''),
-                            "market_open": market_info.get('is_open', False),
-                            "timestamp": datetime.now()
-                        }
-                    )
+                        )
                     logger.info(f"✅ Stored short-term recommendations batch: {batch_id}")
                 except Exception as storage_error:
                     logger.error(f"⚠️ Failed to store short-term recommendations: {storage_error}")
@@ -363,30 +382,31 @@ class TradingScheduler:
                 # Store recommendations in history database
                 try:
                     market_info = self.market_timer.get_market_session_info()
-                    batch_id = await recommendation_history_storage.store_recommendation_batch(
-                        execution_id=execution_id,
-                        cron_job_id="swing_recommendations",
-                        strategy=RecommendationStrategy.SWING,
-                        recommendations=result.get('recommendations', []),
-                        metadata={
-                            "algorithm_info": {
-                                "version": "v1.0",
-                                "strategy": "swing_momentum",
-                                "filters_applied": payload
+                    with span("history.store", group="cron"):
+                        batch_id = await recommendation_history_storage.store_recommendation_batch(
+                            execution_id=execution_id,
+                            cron_job_id="swing_recommendations",
+                            strategy=RecommendationStrategy.SWING,
+                            recommendations=result.get('recommendations', []),
+                            metadata={
+                                "algorithm_info": {
+                                    "version": "v1.0",
+                                    "strategy": "swing_momentum",
+                                    "filters_applied": payload
+                                },
+                                "performance_metrics": {
+                                    "api_response_time_ms": (end_time - start_time).total_seconds() * 1000,
+                                    "total_processing_time_seconds": (end_time - start_time).total_seconds()
+                                }
                             },
-                            "performance_metrics": {
-                                "api_response_time_ms": (end_time - start_time).total_seconds() * 1000,
-                                "total_processing_time_seconds": (end_time - start_time).total_seconds()
+                            request_parameters=payload,
+                            market_context={
+                                "market_condition": market_info.get('session', 'unknown'),
+                                "trading_session": market_info.get('session_id', ''),
+                                "market_open": market_info.get('is_open', False),
+                                "timestamp": datetime.now()
                             }
-                        },
-                        request_parameters=payload,
-                        market_context={
-                            "market_condition": market_info.get('session', 'unknown'),
-                            "trading_session": market_info.get('session_id', ''),
-                            "market_open": market_info.get('is_open', False),
-                            "timestamp": datetime.now()
-                        }
-                    )
+                        )
                     logger.info(f"✅ Stored swing recommendations batch: {batch_id}")
                 except Exception as storage_error:
                     logger.error(f"⚠️ Failed to store swing recommendations: {storage_error}")
@@ -498,31 +518,32 @@ class TradingScheduler:
                 # Store recommendations in history database
                 try:
                     market_info = self.market_timer.get_market_session_info()
-                    batch_id = await recommendation_history_storage.store_recommendation_batch(
-                        execution_id=execution_id,
-                        cron_job_id="longterm_recommendations",
-                        strategy=RecommendationStrategy.LONGTERM,
-                        recommendations=result.get('recommendations', []),
-                        metadata={
-                            "algorithm_info": {
-                                "version": "v1.0",
-                                "strategy": "combination",
-                                "combination_strategies": ["fundamental", "momentum", "value", "quality"],
-                                "filters_applied": payload
+                    with span("history.store", group="cron"):
+                        batch_id = await recommendation_history_storage.store_recommendation_batch(
+                            execution_id=execution_id,
+                            cron_job_id="longterm_recommendations",
+                            strategy=RecommendationStrategy.LONGTERM,
+                            recommendations=result.get('recommendations', []),
+                            metadata={
+                                "algorithm_info": {
+                                    "version": "v1.0",
+                                    "strategy": "combination",
+                                    "combination_strategies": ["fundamental", "momentum", "value", "quality"],
+                                    "filters_applied": payload
+                                },
+                                "performance_metrics": {
+                                    "api_response_time_ms": (end_time - start_time).total_seconds() * 1000,
+                                    "total_processing_time_seconds": (end_time - start_time).total_seconds()
+                                }
                             },
-                            "performance_metrics": {
-                                "api_response_time_ms": (end_time - start_time).total_seconds() * 1000,
-                                "total_processing_time_seconds": (end_time - start_time).total_seconds()
+                            request_parameters=payload,
+                            market_context={
+                                "market_condition": market_info.get('session', 'unknown'),
+                                "trading_session": market_info.get('session_id', ''),
+                                "market_open": market_info.get('is_open', False),
+                                "timestamp": datetime.now()
                             }
-                        },
-                        request_parameters=payload,
-                        market_context={
-                            "market_condition": market_info.get('session', 'unknown'),
-                            "trading_session": market_info.get('session_id', ''),
-                            "market_open": market_info.get('is_open', False),
-                            "timestamp": datetime.now()
-                        }
-                    )
+                        )
                     logger.info(f"✅ Stored long-term recommendations batch: {batch_id}")
                 except Exception as storage_error:
                     logger.error(f"⚠️ Failed to store long-term recommendations: {storage_error}")
@@ -574,19 +595,21 @@ class TradingScheduler:
         
         for attempt in range(self.retry_attempts):
             try:
-                async with self.session.post(
-                    url,
-                    json=payload,
-                    headers={'Content-Type': 'application/json'}
-                ) as response:
+                # The server continues this trace (X-Trace-Id) in its own spans
+                with span("cron.api_call", group="cron", strategy=strategy, attempt=attempt + 1):
+                    async with self.session.post(
+                        url,
+                        json=payload,
+                        headers={'Content-Type': 'application/json', **trace_headers()}
+                    ) as response:
                     
-                    if response.status == 200:
-                        result = await response.json()
-                        logger.info(f"✅ {strategy} API call successful (attempt {attempt + 1})")
-                        return result
-                    else:
-                        error_text = await response.text()
-                        logger.warning(f"⚠️ {strategy} API call failed (attempt {attempt + 1}): {response.status} - {error_text}")
+                        if response.status == 200:
+                            result = await response.json()
+                            logger.info(f"✅ {strategy} API call successful (attempt {attempt + 1})")
+                            return result
+                        else:
+                            error_text = await response.text()
+                            logger.warning(f"⚠️ {strategy} API call failed (attempt {attempt + 1}): {response.status} - {error_text}")
                         
             except Exception as e:
                 logger.warning(f"⚠️ {strategy} API call error (attempt {attempt + 1}): {e}")
@@ -644,6 +667,41 @@ class TradingScheduler:
                     error_details={"exception_type": type(e).__name__, "operation": "cache_cleanup"}
                 )
             
+    async def _evaluate_outcomes(self):
+        """Evaluate active recommendation trackers with execution tracking"""
+        execution_id = None
+        scheduled_time = datetime.now()
+        
+        try:
+            execution_id = await cron_execution_tracker.start_job_execution(
+                job_id="outcome_evaluation",
+                job_name="Recommendation Outcome Evaluation",
+                job_type=CronJobType.OUTCOME_EVALUATION,
+                scheduled_time=scheduled_time
+            )
+            
+            summary = await OutcomeEvaluator(recommendation_history_storage).run()
+            
+            await cron_execution_tracker.complete_job_execution(
+                execution_id=execution_id,
+                status=CronJobStatus.SUCCESS,
+                output_summary=summary,
+                performance_metrics={
+                    "evaluation_duration_seconds": summary.get("duration_ms", 0) / 1000
+                }
+            )
+            
+        except Exception as e:
+            logger.error(f"❌ Outcome evaluation failed: {e}")
+            
+            if execution_id:
+                await cron_execution_tracker.complete_job_execution(
+                    execution_id=execution_id,
+                    status=CronJobStatus.FAILED,
+                    error_message=str(e),
+                    error_details={"exception_type": type(e).__name__, "operation": "outcome_evaluation"}
+                )
+            
     def get_scheduler_status(self) -> Dict[str, Any]:
         """Get current scheduler status and job information"""
         if not self.scheduler:
@@ -27,7 +27,6 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 import numpy as np
-from bs4 import BeautifulSoup as bs
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -40,6 +39,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Load environment configuration for shortterm server
 from env_loader import load_server_environment, setup_logging
+from utils.async_logging import enable_async_logging
 
 # Setup environment and logging
 server_config = load_server_environment('shortterm')
@@ -51,6 +51,7 @@ else:
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
+    enable_async_logging()
 
 # Get logger instance
 logger = logging.getLogger(__name__)
@@ -67,6 +68,14 @@ from models.recommendation_history_models import (
 )
 from api.services.market_timer import market_timer
 from api.services.config_manager import TradingConfigManager
+from api.services.config_snapshot import ConfigSnapshot, SnapshotFileWatcher, SnapshotHolder, thaw
+from api.services.shared_tier import SharedQueryCache, SharedRateLimiter
+from shared.config.settings import CHARTINK_BASE_URL
+from utils.tracing import install_metrics, span
+from utils.lazy import lazy_import, warm
+from utils.health_oracle import health_oracle
+
+bs4 = lazy_import("bs4")
 # from api.services.analysis_engine import AnalysisEngine
 
 # --------------------------------------------------------------
@@ -91,7 +100,26 @@ class ShortTermConfigManager:
         shared_path = project_root / "shared" / "config" / "short_term_config.json"
         local_path = Path(__file__).parent / "config" / "short_term_config.json"
         self.config_path = shared_path if shared_path.exists() else local_path
-        self.config = self._load_config()
+        self.holder = SnapshotHolder("short_term_config")
+        self.holder.publish(self._load_config())
+        self.watcher = SnapshotFileWatcher(self.holder, self.config_path)
+    
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Current immutable config snapshot - grab once per request."""
+        return self.holder.current
+    
+    @property
+    def config(self):
+        return self.holder.current.data
+    
+    def reload(self) -> ConfigSnapshot:
+        """Re-read the config file and publish it (no-op if unchanged).
+
+        Called by the file watcher on every change; a file that fails to parse
+        keeps the current snapshot instead of falling back to the defaults.
+        """
+        return self.watcher.reload()
         
     def _load_config(self) -> Dict:
         """Load short-term trading configuration."""
@@ -122,25 +150,19 @@ class ShortTermConfigManager:
     
     def get_current_algorithm_config(self) -> Dict:
         """Get the current active algorithm configuration."""
-        current_version = self.config.get("current_version", "v1.0.0")
-        algorithms = self.config.get("algorithms", {})
-        return algorithms.get(current_version, {})
+        return thaw(self.holder.current.current_algorithm)
     
     def get_variant_query(self, category: str, version: str) -> Optional[str]:
         """Get the query for a specific variant."""
-        variants = self.config.get("sub_algorithm_variants", {})
-        category_variants = variants.get(category, {})
-        variant = category_variants.get(version, {})
-        return variant.get("query")
+        return self.holder.current.variant_queries.get((category, version))
     
     def get_scoring_weights(self) -> Dict[str, int]:
         """Get category weights for scoring."""
-        scoring_system = self.config.get("scoring_system", {})
-        return scoring_system.get("category_weights", {})
+        return thaw(self.holder.current.scoring_weights)
     
     def get_re_ranking_criteria(self) -> Dict:
         """Get re-ranking criteria for short-term analysis."""
-        return self.config.get("re_ranking_criteria", {})
+        return thaw(self.config.get("re_ranking_criteria", {}))
 
 # Global configuration manager
 config_manager = ShortTermConfigManager()
@@ -153,13 +175,15 @@ class ChartinkService:
     """Enhanced service for interacting with Chartink API with HTTP 419 error fixes."""
     
     def __init__(self):
-        self.base_url = "https://chartink.com"
+        self.base_url = CHARTINK_BASE_URL
         self.screener_url = f"{self.base_url}/screener/process"
         self.referer_url = f"{self.base_url}/screener"
         self.session = None
         self.csrf_token = None
-        self.last_request_time = 0
         self.min_request_interval = 3.0  # Increased to 3 seconds
+        # Slots and result sets are shared by all workers (see shared_tier)
+        self.rate_limiter = SharedRateLimiter("chartink", self.min_request_interval, jitter=(0.5, 1.5))
+        self.shared_results = SharedQueryCache("chartink")
         
         # User agents for rotation
         self.user_agents = [
@@ -237,7 +261,7 @@ class ChartinkService:
                 logger.info(f"📊 Retry - HTML content length: {len(html_content)}")
             
             # Parse HTML to find CSRF token
-            soup = bs(html_content, 'html.parser')
+            soup = bs4.BeautifulSoup(html_content, 'html.parser')
             
             # Try multiple CSRF token extraction methods
             csrf_token = None
@@ -314,19 +338,21 @@ class ChartinkService:
             return False
     
     async def _rate_limit(self):
-        """Implement rate limiting."""
-        import time, asyncio, random
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        
-        if elapsed < self.min_request_interval:
-            sleep_time = self.min_request_interval - elapsed + random.uniform(0.5, 1.5)
-            logger.info(f"⏱️ Rate limiting: sleeping for {sleep_time:.2f}s")
-            await asyncio.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        """Implement rate limiting.
+
+        Request slots are reserved through the shared limiter, so concurrent
+        queries - and every worker of every server - are spaced by
+        ``min_request_interval`` while their network I/O overlaps.
+        """
+        await self.rate_limiter.wait()
 
     async def run_query(self, query: str, max_results: int = 100, max_retries: int = 3) -> List[Dict]:
+        """Run a chartink query, sharing the result set with the other workers."""
+        return await self.shared_results.get_or_fetch(
+            query, max_results, lambda: self._run_query(query, max_results, max_retries)
+        )
+
+    async def _run_query(self, query: str, max_results: int = 100, max_retries: int = 3) -> List[Dict]:
         """Run a chartink query and return the results with enhanced error handling."""
         logger.info(f"🔍 Running Chartink query (max_results: {max_results})")
         logger.debug(f"📝 Query: {query}")
@@ -336,11 +362,13 @@ class ChartinkService:
                 logger.info(f"🔍 Scan attempt {attempt}/{max_retries}")
                 
                 # Rate limiting
-                await self._rate_limit()
+                with span("chartink.rate_limit_wait"):
+                    await self._rate_limit()
                 
                 # Ensure we have a valid CSRF token
                 if not self.csrf_token or attempt > 1:
-                    success = await self._get_csrf_token()
+                    with span("chartink.csrf_fetch"):
+                        success = await self._get_csrf_token()
                     if not success:
                         logger.error(f"❌ Failed to get CSRF token on attempt {attempt}")
                         continue
@@ -369,24 +397,26 @@ class ChartinkService:
                 logger.info(f"📊 Query length: {len(query)} characters")
                 
                 # Make the request
-                response = await session.post(
-                    self.screener_url,
-                    headers=api_headers,
-                    data=data
-                )
+                with span("chartink.scan_post", query_length=len(query)):
+                    response = await session.post(
+                        self.screener_url,
+                        headers=api_headers,
+                        data=data
+                    )
                 
                 logger.info(f"📥 Response: HTTP {response.status_code}")
                 
                 if response.status_code == 200:
                     try:
                         # Try to parse JSON directly
-                        json_data = response.json()
+                        with span("chartink.json_decode"):
+                            json_data = response.json()
                         stocks = json_data.get('data', [])
                         
                         # Debug: Log the structure of the first stock
                         if stocks:
-                            logger.info(f"🔍 Sample stock data structure: {list(stocks[0].keys())}")
-                            logger.info(f"🔍 First stock sample: {stocks[0]}")
+                            logger.debug(f"🔍 Sample stock data structure: {list(stocks[0].keys())}")
+                            logger.debug(f"🔍 First stock sample: {stocks[0]}")
                         
                         # Convert to our format and limit results
                         formatted_stocks = []
@@ -521,18 +551,21 @@ class ShortTermAnalysisEngine:
         category_results = {}
         stock_details = {}  # symbol -> stock details from ChartInk
         
-        weights = self.config_manager.get_scoring_weights()
-        logger.info(f"⚖️ Scoring weights: {weights}")
+        # One config snapshot for the whole analysis
+        snapshot = self.config_manager.snapshot
+        weights = snapshot.scoring_weights
+        logger.info(f"⚖️ Scoring weights: {dict(weights)}")
         
         for category, version in combination.items():
             logger.info(f"📊 Processing {category} v{version}...")
             
-            query = self.config_manager.get_variant_query(category, version)
+            query = snapshot.get_variant_query(category, version)
             if not query:
                 logger.warning(f"⚠️ No query found for {category} v{version}")
                 continue
             
-            stocks = await chartink_service.run_query(query, max_results=limit_per_query)
+            with span("chartink.query", category=category, version=version):
+                stocks = await chartink_service.run_query(query, max_results=limit_per_query)
             
             if stocks:
                 logger.info(f"🎯 {category} returned {len(stocks)} stocks")
@@ -669,6 +702,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage latency histograms on /metrics (recorded when TRACING_ENABLED=true)
+install_metrics(app, "shortterm")
+
 # Initialize API logger
 api_logger = APILogger("shortterm")
 
@@ -708,7 +744,9 @@ async def health_check():
             "config_loaded": config_loaded,
             "current_algorithm": current_algo.get('name', 'Unknown'),
             "categories_available": list(config_manager.get_scoring_weights().keys()),
-            "re_ranking_enabled": bool(config_manager.get_re_ranking_criteria())
+            "re_ranking_enabled": bool(config_manager.get_re_ranking_criteria()),
+            "worker_pid": os.getpid(),
+            "shared_results": chartink_service.shared_results.stats()
         }
     except Exception as e:
         return {
@@ -777,7 +815,7 @@ async def get_shortterm_buy_recommendations(request: ShortTermBuyRequest, raw_re
         raw_body = await raw_request.body()
         try:
             raw_json = raw_body.decode()
-            logger.info(f"RAW REQUEST BODY: {raw_json}")
+            logger.debug(f"RAW REQUEST BODY: {raw_json}")
             api_logger.log_request(json.loads(raw_json), '/api/shortterm/shortterm-buy-recommendations')
         except Exception as e:
             logger.warning(f"Could not decode raw request body: {e}")
@@ -808,10 +846,11 @@ async def get_shortterm_buy_recommendations(request: ShortTermBuyRequest, raw_re
         # Check cache first (unless force_refresh is True)
         if not request.force_refresh:
             logger.info("🔍 Checking cache for recent recommendations...")
-            cached_result = await recommendation_cache.get_cached_recommendation(
-                RecommendationType.SHORT_TERM, 
-                cache_request
-            )
+            with span("cache.lookup"):
+                cached_result = await recommendation_cache.get_cached_recommendation(
+                    RecommendationType.SHORT_TERM, 
+                    cache_request
+                )
             
             if cached_result:
                 processing_time = time.time() - start_time
@@ -831,12 +870,15 @@ async def get_shortterm_buy_recommendations(request: ShortTermBuyRequest, raw_re
                 logger.info("❌ CACHE MISS - Running fresh analysis...")
         else:
             logger.info("🔄 FORCE REFRESH - Bypassing cache and running fresh analysis...")
+            # Result sets shared by the other workers are stale too
+            await chartink_service.shared_results.invalidate()
         
         # Run combination analysis
-        result = await analysis_engine.run_combination_analysis(
-            combination=combination,
-            limit_per_query=request.limit_per_query or 40
-        )
+        with span("analysis.combination"):
+            result = await analysis_engine.run_combination_analysis(
+                combination=combination,
+                limit_per_query=request.limit_per_query or 40
+            )
         
         # Get stocks with scores and apply re-ranking
         stocks_with_scores = result['stocks_with_scores']
@@ -958,12 +1000,13 @@ async def get_shortterm_buy_recommendations(request: ShortTermBuyRequest, raw_re
         
         # Always cache the results after fresh analysis (regardless of market hours when force_refresh is used)
         try:
-            await recommendation_cache.store_recommendation(
-                RecommendationType.SHORT_TERM,
-                cache_request,
-                recommendations,
-                metadata
-            )
+            with span("cache.write"):
+                await recommendation_cache.store_recommendation(
+                    RecommendationType.SHORT_TERM,
+                    cache_request,
+                    recommendations,
+                    metadata
+                )
             if request.force_refresh:
                 logger.info(f"✅ Force refresh: Updated cache with {len(recommendations)} short-term recommendations")
             else:
@@ -977,40 +1020,41 @@ async def get_shortterm_buy_recommendations(request: ShortTermBuyRequest, raw_re
                 execution_id = f"api_shortterm_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
                 market_info = market_timer.get_market_session_info()
                 
-                batch_id = await recommendation_history_storage.store_recommendation_batch(
-                    execution_id=execution_id,
-                    cron_job_id="api_shortterm_force_refresh",
-                    strategy=RecommendationStrategy.SHORTTERM,
-                    recommendations=recommendations,
-                    metadata={
-                        "algorithm_info": metadata.get("algorithm_info", {}),
-                        "performance_metrics": {
-                            "api_response_time_ms": processing_time * 1000,
-                            "total_processing_time_seconds": processing_time,
-                            "cache_bypassed": True,
+                with span("history.store"):
+                    batch_id = await recommendation_history_storage.store_recommendation_batch(
+                        execution_id=execution_id,
+                        cron_job_id="api_shortterm_force_refresh",
+                        strategy=RecommendationStrategy.SHORTTERM,
+                        recommendations=recommendations,
+                        metadata={
+                            "algorithm_info": metadata.get("algorithm_info", {}),
+                            "performance_metrics": {
+                                "api_response_time_ms": processing_time * 1000,
+                                "total_processing_time_seconds": processing_time,
+                                "cache_bypassed": True,
+                                "force_refresh": True
+                            },
+                            "source_info": {
+                                "trigger": "api_force_refresh",
+                                "endpoint": "/api/shortterm/shortterm-buy-recommendations",
+                                "user_agent": "API_Client"
+                            }
+                        },
+                        request_parameters={
+                            "combination": combination,
+                            "limit_per_query": request.limit_per_query or 50,
+                            "min_score": request.min_score or 35.0,
+                            "top_recommendations": request.top_recommendations or 20,
                             "force_refresh": True
                         },
-                        "source_info": {
-                            "trigger": "api_force_refresh",
-                            "endpoint": "/api/shortterm/shortterm-buy-recommendations",
-                            "user_agent": "API_Client"
+                        market_context={
+                            "market_condition": market_info.get('session', 'unknown'),
+                            "trading_session": market_info.get('session_id', ''),
+                            "market_open": market_info.get('is_open', False),
+                            "timestamp": datetime.now(),
+                            "source": "api_request"
                         }
-                    },
-                    request_parameters={
-                        "combination": combination,
-                        "limit_per_query": request.limit_per_query or 50,
-                        "min_score": request.min_score or 35.0,
-                        "top_recommendations": request.top_recommendations or 20,
-                        "force_refresh": True
-                    },
-                    market_context={
-                        "market_condition": market_info.get('session', 'unknown'),
-                        "trading_session": market_info.get('session_id', ''),
-                        "market_open": market_info.get('is_open', False),
-                        "timestamp": datetime.now(),
-                        "source": "api_request"
-                    }
-                )
+                    )
                 logger.info(f"✅ Stored short-term recommendations batch in history: {batch_id}")
                 
                 # Add historical storage info to response metadata
@@ -1061,7 +1105,7 @@ async def get_shortterm_config():
     """Get current short-term trading configuration."""
     try:
         return {
-            "config": config_manager.config,
+            "config": config_manager.snapshot.to_dict(),
             "current_algorithm": config_manager.get_current_algorithm_config(),
             "scoring_weights": config_manager.get_scoring_weights(),
             "re_ranking_criteria": config_manager.get_re_ranking_criteria()
@@ -1080,12 +1124,20 @@ async def startup_event():
     logger.info(f"📁 Config loaded from: {config_manager.config_path}")
     logger.info(f"🎯 Current algorithm: {config_manager.get_current_algorithm_config().get('name', 'Unknown')}")
     logger.info(f"🔄 Re-ranking criteria: {len(config_manager.get_re_ranking_criteria())} factors")
+    # Clients are cheap to build; the HTML parser import goes to a background thread
+    warm(recommendation_cache, recommendation_history_storage)
+    warm(bs4, background=True)
+    health_oracle.start()
+    # Hot-reload the config snapshot when the JSON file changes
+    config_manager.watcher.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("🛑 Shutting down Short-Term Trading Server...")
+    config_manager.watcher.stop()
     await chartink_service.close()
+    await health_oracle.stop()
 
 # =====================================================================
 # MAIN ENTRY POINT
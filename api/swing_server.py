@@ -20,14 +20,12 @@ import json
 import logging
 import time
 import uuid
-from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 import numpy as np
-from bs4 import BeautifulSoup as bs
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -40,6 +38,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Load environment configuration for swing server
 from env_loader import load_server_environment, setup_logging
+from utils.async_logging import enable_async_logging
 
 # Setup environment and logging
 server_config = load_server_environment('swing')
@@ -51,6 +50,7 @@ else:
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
+    enable_async_logging()
 
 # Get logger instance
 logger = logging.getLogger(__name__)
@@ -67,6 +67,15 @@ from models.recommendation_history_models import (
 )
 from api.services.market_timer import market_timer
 from api.services.config_manager import TradingConfigManager
+from api.services.config_snapshot import ConfigSnapshot, SnapshotFileWatcher, SnapshotHolder, thaw
+from api.services.combination_plan import CombinationPlan, ResultSetCache, merge_category_frames
+from api.services.shared_tier import SharedQueryCache, SharedRateLimiter
+from shared.config.settings import CHARTINK_BASE_URL
+from utils.tracing import install_metrics, span
+from utils.lazy import lazy_import, warm
+from utils.health_oracle import health_oracle
+
+bs4 = lazy_import("bs4")
 # from api.services.analysis_engine import AnalysisEngine
 
 from api.utils.api_logger import APILogger
@@ -84,7 +93,26 @@ class SwingConfigManager:
         shared_path = project_root / "shared" / "config" / "swing_buy_config.json"
         local_path = Path(__file__).parent / "config" / "swing_config.json"
         self.config_path = shared_path if shared_path.exists() else local_path
-        self.config = self._load_config()
+        self.holder = SnapshotHolder("swing_config")
+        self.holder.publish(self._load_config())
+        self.watcher = SnapshotFileWatcher(self.holder, self.config_path)
+    
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Current immutable config snapshot - grab once per request."""
+        return self.holder.current
+    
+    @property
+    def config(self):
+        return self.holder.current.data
+    
+    def reload(self) -> ConfigSnapshot:
+        """Re-read the config file and publish it (no-op if unchanged).
+
+        Called by the file watcher on every change; a file that fails to parse
+        keeps the current snapshot instead of falling back to the defaults.
+        """
+        return self.watcher.reload()
         
     def _load_config(self) -> Dict:
         """Load swing trading configuration."""
@@ -115,21 +143,15 @@ class SwingConfigManager:
     
     def get_current_algorithm_config(self) -> Dict:
         """Get the current active algorithm configuration."""
-        current_version = self.config.get("current_version", "v1.0.0")
-        algorithms = self.config.get("algorithms", {})
-        return algorithms.get(current_version, {})
+        return thaw(self.holder.current.current_algorithm)
     
     def get_variant_query(self, category: str, version: str) -> Optional[str]:
         """Get the query for a specific variant."""
-        variants = self.config.get("sub_algorithm_variants", {})
-        category_variants = variants.get(category, {})
-        variant = category_variants.get(version, {})
-        return variant.get("query")
+        return self.holder.current.variant_queries.get((category, version))
     
     def get_scoring_weights(self) -> Dict[str, int]:
         """Get category weights for scoring."""
-        scoring_system = self.config.get("scoring_system", {})
-        return scoring_system.get("category_weights", {})
+        return thaw(self.holder.current.scoring_weights)
 
 # Global configuration manager
 config_manager = SwingConfigManager()
@@ -142,13 +164,17 @@ class ChartinkService:
     """Enhanced service for interacting with Chartink API with HTTP 419 error fixes."""
     
     def __init__(self):
-        self.base_url = "https://chartink.com"
+        self.base_url = CHARTINK_BASE_URL
         self.screener_url = f"{self.base_url}/screener/process"
         self.referer_url = f"{self.base_url}/screener"
         self.session = None
         self.csrf_token = None
-        self.last_request_time = 0
         self.min_request_interval = 3.0  # Increased to 3 seconds
+        # Slots and result sets are shared by all workers (see shared_tier)
+        self.rate_limiter = SharedRateLimiter("chartink", self.min_request_interval, jitter=(0.5, 1.5))
+        self.shared_results = SharedQueryCache("chartink")
+        # Concurrent category queries share one session: serialize the CSRF refresh
+        self._csrf_lock = asyncio.Lock()
         
         # User agents for rotation
         self.user_agents = [
@@ -226,7 +252,7 @@ class ChartinkService:
                 logger.info(f"📊 Retry - HTML content length: {len(html_content)}")
             
             # Parse HTML to find CSRF token
-            soup = bs(html_content, 'html.parser')
+            soup = bs4.BeautifulSoup(html_content, 'html.parser')
             
             # Try multiple CSRF token extraction methods
             csrf_token = None
@@ -303,19 +329,21 @@ class ChartinkService:
             return False
     
     async def _rate_limit(self):
-        """Implement rate limiting."""
-        import time, asyncio, random
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        
-        if elapsed < self.min_request_interval:
-            sleep_time = self.min_request_interval - elapsed + random.uniform(0.5, 1.5)
-            logger.info(f"⏱️ Rate limiting: sleeping for {sleep_time:.2f}s")
-            await asyncio.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        """Implement rate limiting.
+
+        Request slots are reserved through the shared limiter, so concurrent
+        queries - and every worker of every server - are spaced by
+        ``min_request_interval`` while their network I/O overlaps.
+        """
+        await self.rate_limiter.wait()
 
     async def run_query(self, query: str, max_results: int = 100, max_retries: int = 3) -> List[Dict]:
+        """Run a chartink query, sharing the result set with the other workers."""
+        return await self.shared_results.get_or_fetch(
+            query, max_results, lambda: self._run_query(query, max_results, max_retries)
+        )
+
+    async def _run_query(self, query: str, max_results: int = 100, max_retries: int = 3) -> List[Dict]:
         """Run a chartink query and return the results with enhanced error handling."""
         logger.info(f"🔍 Running Chartink query (max_results: {max_results})")
         logger.debug(f"📝 Query: {query}")
@@ -325,11 +353,19 @@ class ChartinkService:
                 logger.info(f"🔍 Scan attempt {attempt}/{max_retries}")
                 
                 # Rate limiting
-                await self._rate_limit()
+                with span("chartink.rate_limit_wait"):
+                    await self._rate_limit()
                 
                 # Ensure we have a valid CSRF token
                 if not self.csrf_token or attempt > 1:
-                    success = await self._get_csrf_token()
+                    stale_token = self.csrf_token
+                    async with self._csrf_lock:
+                        # Another concurrent query may have refreshed it already
+                        if self.csrf_token and self.csrf_token != stale_token:
+                            success = True
+                        else:
+                            with span("chartink.csrf_fetch"):
+                                success = await self._get_csrf_token()
                     if not success:
                         logger.error(f"❌ Failed to get CSRF token on attempt {attempt}")
                         continue
@@ -358,24 +394,26 @@ class ChartinkService:
                 logger.info(f"📊 Query length: {len(query)} characters")
                 
                 # Make the request
-                response = await session.post(
-                    self.screener_url,
-                    headers=api_headers,
-                    data=data
-                )
+                with span("chartink.scan_post", query_length=len(query)):
+                    response = await session.post(
+                        self.screener_url,
+                        headers=api_headers,
+                        data=data
+                    )
                 
                 logger.info(f"📥 Response: HTTP {response.status_code}")
                 
                 if response.status_code == 200:
                     try:
                         # Try to parse JSON directly
-                        json_data = response.json()
+                        with span("chartink.json_decode"):
+                            json_data = response.json()
                         stocks = json_data.get('data', [])
                         
                         # Debug: Log the structure of the first stock
                         if stocks:
-                            logger.info(f"🔍 Sample stock data structure: {list(stocks[0].keys())}")
-                            logger.info(f"🔍 First stock sample: {stocks[0]}")
+                            logger.debug(f"🔍 Sample stock data structure: {list(stocks[0].keys())}")
+                            logger.debug(f"🔍 First stock sample: {stocks[0]}")
                         
                         # Limit results
                         if len(stocks) > max_results:
@@ -471,6 +509,11 @@ class ChartinkService:
 # Global chartink service
 chartink_service = ChartinkService()
 
+# Normalized ChartInk result sets shared across combinations
+result_set_cache = ResultSetCache(ttl_seconds=float(os.getenv('SWING_RESULT_CACHE_TTL_SECONDS', 300)))
+# Cached result sets belong to the queries of the previous config snapshot
+config_manager.holder.add_listener(lambda snapshot: result_set_cache.clear())
+
 # =====================================================================
 # SWING ANALYSIS ENGINE
 # =====================================================================
@@ -482,86 +525,50 @@ class SwingAnalysisEngine:
         self.config_manager = config_manager
         
     async def run_combination_analysis(self, combination: Dict[str, str], limit_per_query: int = 50) -> Dict:
-        """Run combination analysis using multiple categories."""
+        """Run combination analysis using multiple categories.
+
+        Category queries run concurrently through a compiled plan; result sets
+        are cached per (category, version) so overlapping combinations share
+        ChartInk round trips.
+        """
         logger.info(f"🎯 Starting combination analysis with {len(combination)} categories")
         logger.info(f"📊 Limit per query: {limit_per_query}")
         
-        weights = self.config_manager.get_scoring_weights()
-        logger.info(f"⚖️ Scoring weights: {weights}")
+        # One config snapshot for the whole analysis
+        snapshot = self.config_manager.snapshot
+        weights = snapshot.scoring_weights
+        logger.info(f"⚖️ Scoring weights: {dict(weights)}")
         
-        all_stocks = defaultdict(float)
-        stock_details = {}  # Store stock details from ChartInk
-        category_results = {}
+        plan = CombinationPlan.compile(combination, snapshot.get_variant_query, weights)
+        for category in plan.missing:
+            logger.warning(f"❌ No query found for {category} {combination[category]}")
         
-        for category, version in combination.items():
-            logger.info(f"🔍 Processing category: {category} (version: {version})")
-            
-            # Get query for this variant
-            query = self.config_manager.get_variant_query(category, version)
-            if not query:
-                logger.warning(f"❌ No query found for {category} {version}")
-                continue
-            
-            logger.info(f"📝 Query for {category}: {query[:100]}...")
-            
-            # Run chartink query with increased limit
-            stocks = await chartink_service.run_query(query, max_results=limit_per_query)
-            logger.info(f"📈 {category} query returned {len(stocks)} stocks")
-            
-            if stocks:
-                logger.info(f"🎯 {category} top 5 symbols: {[s.get('name', s.get('nsecode', 'N/A')) for s in stocks[:5]]}")
-            else:
-                logger.warning(f"⚠️ {category} query returned NO stocks!")
-            
-            # Calculate weight for this category
-            weight = weights.get(category, 25)  # Default weight of 25
-            
-            category_symbols = []
-            
-            # Add to scoring and store details
-            for stock in stocks:
-                # Try different symbol field names - prioritize nsecode for actual trading symbols
-                symbol = None
-                for field in ['nsecode', 'symbol', 'stock', 'ticker', 'name']:
-                    if field in stock and stock[field]:
-                        symbol = stock[field]
-                        break
-                
-                if symbol:
-                    # Clean up symbol (remove .NS, .BO suffixes)
-                    clean_symbol = str(symbol).replace('.NS', '').replace('.BO', '').strip()
-                    
-                    all_stocks[clean_symbol] += weight  # Add weight to score (0-100 scale)
-                    category_symbols.append(clean_symbol)
-                    
-                    # Store stock details for later use (without Yahoo API call)
-                    if clean_symbol not in stock_details:
-                        stock_details[clean_symbol] = {
-                            'symbol': clean_symbol,
-                            'name': stock.get('name', clean_symbol),
-                            'price': float(stock.get('close', 0)) if stock.get('close') else 0.0,
-                            'volume': int(stock.get('volume', 0)) if stock.get('volume') else 0,
-                            'per_change': float(stock.get('per_chg', stock.get('per_change', 0))) if stock.get('per_chg') or stock.get('per_change') else 0.0,
-                            'categories': set()
-                        }
-                    
-                    # Add category to this stock
-                    stock_details[clean_symbol]['categories'].add(category)
-                    
-                else:
-                    logger.warning(f"⚠️ No valid symbol found in stock data: {stock}")
-                    continue
-            
-            category_results[category] = {
-                'version': version,
-                'stocks_found': len(stocks),
-                'weight': weight,
-                'symbols': category_symbols
+        frames = await plan.execute(chartink_service.run_query, result_set_cache, limit_per_query)
+        
+        category_results = {}
+        for step in plan.steps:
+            frame = frames[step.category]
+            logger.info(f"📈 {step.category} ({step.version}) returned {len(frame)} stocks")
+            if frame.empty:
+                logger.warning(f"⚠️ {step.category} query returned NO stocks!")
+            category_results[step.category] = {
+                'version': step.version,
+                'stocks_found': len(frame),
+                'weight': step.weight,
+                'symbols': frame['symbol'].tolist()
             }
-                
+        
+        with span("scoring.merge"):
+            scores, details = merge_category_frames(plan, frames)
+        all_stocks = scores.to_dict()
+        stock_details = {
+            row['symbol']: {**row, 'categories': set(row['categories'])}
+            for row in details.to_dict('records')
+        }
+        
         logger.info(f"📊 Total unique stocks before scoring: {len(all_stocks)}")
         if all_stocks:
-            logger.info(f"🏆 Top 10 stocks by score: {dict(list(sorted(all_stocks.items(), key=lambda x: x[1], reverse=True))[:10])}")
+            logger.info(f"🏆 Top 10 stocks by score: {dict(list(all_stocks.items())[:10])}")
         
         # Calculate metrics
         unique_stocks = len(all_stocks)
@@ -571,8 +578,8 @@ class SwingAnalysisEngine:
         
         # Calculate performance score
         if unique_stocks > 0:
-            avg_score = sum(all_stocks.values()) / len(all_stocks)
-            multi_category_stocks = sum(1 for score in all_stocks.values() if score > max(weights.values()))
+            avg_score = float(scores.mean())
+            multi_category_stocks = int((scores > max(weights.values())).sum())
             performance_score = min(100, (avg_score / 100) * 100 + (multi_category_stocks / unique_stocks) * 20)
             logger.info(f"📊 Performance metrics - Avg score: {avg_score:.1f}, Multi-category: {multi_category_stocks}, Performance: {performance_score:.1f}")
         else:
@@ -581,11 +588,8 @@ class SwingAnalysisEngine:
             performance_score = 0
             logger.warning("⚠️ No stocks found - all metrics are 0")
         
-        # Sort stocks by score
-        sorted_stocks = sorted(all_stocks.items(), key=lambda x: x[1], reverse=True)
-        
         return {
-            'stocks': dict(sorted_stocks),
+            'stocks': all_stocks,
             'stock_details': stock_details,
             'metrics': {
                 'unique_stocks': unique_stocks,
@@ -640,6 +644,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage latency histograms on /metrics (recorded when TRACING_ENABLED=true)
+install_metrics(app, "swing")
+
 # Initialize API logger
 api_logger = APILogger("swing")
 
@@ -678,7 +685,9 @@ async def health_check():
             "timestamp": datetime.now().isoformat(),
             "config_loaded": config_loaded,
             "current_algorithm": current_algo.get('name', 'Unknown'),
-            "categories_available": list(config_manager.get_scoring_weights().keys())
+            "categories_available": list(config_manager.get_scoring_weights().keys()),
+            "worker_pid": os.getpid(),
+            "shared_results": chartink_service.shared_results.stats()
         }
     except Exception as e:
         return {
@@ -748,7 +757,7 @@ async def get_swing_buy_recommendations(request: SwingBuyRequest, raw_request: R
         raw_body = await raw_request.body()
         try:
             raw_json = raw_body.decode()
-            logger.info(f"RAW REQUEST BODY: {raw_json}")
+            logger.debug(f"RAW REQUEST BODY: {raw_json}")
             api_logger.log_request(json.loads(raw_json), '/api/swing/swing-buy-recommendations')
         except Exception as e:
             logger.warning(f"Could not decode raw request body: {e}")
@@ -780,10 +789,11 @@ async def get_swing_buy_recommendations(request: SwingBuyRequest, raw_request: R
         # Check cache first (unless force_refresh is True)
         if not request.force_refresh:
             logger.info("🔍 Checking cache for recent recommendations...")
-            cached_result = await recommendation_cache.get_cached_recommendation(
-                RecommendationType.SWING, 
-                cache_request
-            )
+            with span("cache.lookup"):
+                cached_result = await recommendation_cache.get_cached_recommendation(
+                    RecommendationType.SWING, 
+                    cache_request
+                )
             
             if cached_result:
                 processing_time = time.time() - start_time
@@ -801,11 +811,17 @@ async def get_swing_buy_recommendations(request: SwingBuyRequest, raw_request: R
         else:
             logger.info("🔄 FORCE REFRESH - Bypassing cache and running fresh analysis...")
         
+        # Fresh analysis requested: drop cached ChartInk result sets too
+        if request.force_refresh:
+            result_set_cache.clear()
+            await chartink_service.shared_results.invalidate()
+        
         # Run combination analysis
-        result = await analysis_engine.run_combination_analysis(
-            combination=combination,
-            limit_per_query=request.limit_per_query or 30
-        )
+        with span("analysis.combination"):
+            result = await analysis_engine.run_combination_analysis(
+                combination=combination,
+                limit_per_query=request.limit_per_query or 30
+            )
         
         # Get stocks with scores
         stocks_with_scores = result['stocks']
@@ -906,12 +922,13 @@ async def get_swing_buy_recommendations(request: SwingBuyRequest, raw_request: R
         
         # Always cache the results after fresh analysis (regardless of market hours when force_refresh is used)
         try:
-            await recommendation_cache.store_recommendation(
-                RecommendationType.SWING,
-                cache_request,
-                recommendations,
-                metadata
-            )
+            with span("cache.write"):
+                await recommendation_cache.store_recommendation(
+                    RecommendationType.SWING,
+                    cache_request,
+                    recommendations,
+                    metadata
+                )
             if request.force_refresh:
                 logger.info(f"✅ Force refresh: Updated cache with {len(recommendations)} swing recommendations")
             else:
@@ -925,40 +942,41 @@ async def get_swing_buy_recommendations(request: SwingBuyRequest, raw_request: R
                 execution_id = f"api_swing_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
                 market_info = market_timer.get_market_session_info()
                 
-                batch_id = await recommendation_history_storage.store_recommendation_batch(
-                    execution_id=execution_id,
-                    cron_job_id="api_swing_force_refresh",
-                    strategy=RecommendationStrategy.SWING,
-                    recommendations=recommendations,
-                    metadata={
-                        "algorithm_info": metadata.get("algorithm_info", {}),
-                        "performance_metrics": {
-                            "api_response_time_ms": processing_time * 1000,
-                            "total_processing_time_seconds": processing_time,
-                            "cache_bypassed": True,
+                with span("history.store"):
+                    batch_id = await recommendation_history_storage.store_recommendation_batch(
+                        execution_id=execution_id,
+                        cron_job_id="api_swing_force_refresh",
+                        strategy=RecommendationStrategy.SWING,
+                        recommendations=recommendations,
+                        metadata={
+                            "algorithm_info": metadata.get("algorithm_info", {}),
+                            "performance_metrics": {
+                                "api_response_time_ms": processing_time * 1000,
+                                "total_processing_time_seconds": processing_time,
+                                "cache_bypassed": True,
+                                "force_refresh": True
+                            },
+                            "source_info": {
+                                "trigger": "api_force_refresh",
+                                "endpoint": "/api/swing/swing-buy-recommendations",
+                                "user_agent": "API_Client"
+                            }
+                        },
+                        request_parameters={
+                            "combination": combination,
+                            "limit_per_query": request.limit_per_query or 50,
+                            "min_score": request.min_score or 25.0,
+                            "top_recommendations": request.top_recommendations or 20,
                             "force_refresh": True
                         },
-                        "source_info": {
-                            "trigger": "api_force_refresh",
-                            "endpoint": "/api/swing/swing-buy-recommendations",
-                            "user_agent": "API_Client"
+                        market_context={
+                            "market_condition": market_info.get('session', 'unknown'),
+                            "trading_session": market_info.get('session_id', ''),
+                            "market_open": market_info.get('is_open', False),
+                            "timestamp": datetime.now(),
+                            "source": "api_request"
                         }
-                    },
-                    request_parameters={
-                        "combination": combination,
-                        "limit_per_query": request.limit_per_query or 50,
-                        "min_score": request.min_score or 25.0,
-                        "top_recommendations": request.top_recommendations or 20,
-                        "force_refresh": True
-                    },
-                    market_context={
-                        "market_condition": market_info.get('session', 'unknown'),
-                        "trading_session": market_info.get('session_id', ''),
-                        "market_open": market_info.get('is_open', False),
-                        "timestamp": datetime.now(),
-                        "source": "api_request"
-                    }
-                )
+                    )
                 logger.info(f"✅ Stored swing recommendations batch in history: {batch_id}")
                 
                 # Add historical storage info to response metadata
@@ -978,12 +996,7 @@ async def get_swing_buy_recommendations(request: SwingBuyRequest, raw_request: R
         # Update response data with any metadata changes
         response_data["metadata"] = metadata
         
-        # Log the exact JSON response with proper indentation before sending to client
-        logger.info("=" * 60)
-        logger.info("EXACT JSON RESPONSE TO CLIENT:")
-        logger.info("=" * 60)
-        logger.info(json.dumps(response_data, indent=2, ensure_ascii=False))
-        logger.info("=" * 60)
+        logger.info(f"✅ SWING ANALYSIS COMPLETED: {len(recommendations)} recommendations (processing: {processing_time:.2f}s)")
         
         # Log the request
         api_logger.log_request(request.dict(), '/api/swing/swing-buy-recommendations')
@@ -1018,7 +1031,7 @@ async def get_swing_config():
     """Get current swing trading configuration."""
     try:
         return {
-            "config": config_manager.config,
+            "config": config_manager.snapshot.to_dict(),
             "current_algorithm": config_manager.get_current_algorithm_config(),
             "scoring_weights": config_manager.get_scoring_weights()
         }
@@ -1035,12 +1048,20 @@ async def startup_event():
     logger.info("🚀 Starting Swing Trading Server...")
     logger.info(f"📁 Config loaded from: {config_manager.config_path}")
     logger.info(f"🎯 Current algorithm: {config_manager.get_current_algorithm_config().get('name', 'Unknown')}")
+    # Clients are cheap to build; the HTML parser import goes to a background thread
+    warm(recommendation_cache, recommendation_history_storage)
+    warm(bs4, background=True)
+    health_oracle.start()
+    # Hot-reload the config snapshot when the JSON file changes
+    config_manager.watcher.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("🛑 Shutting down Swing Trading Server...")
+    config_manager.watcher.stop()
     await chartink_service.close()
+    await health_oracle.stop()
 
 # =====================================================================
 # MAIN ENTRY POINT
@@ -9,15 +9,46 @@ import sys
 import os
 import json
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from itertools import product
+from threading import Lock
 
 # Add the project root to the path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.dirname(project_root))
 
 # Import the test function
 from test_queries import test_query_silent
+from api.services.combination_plan import normalize_symbols
+
+# Category queries of one combination run in parallel
+QUERY_WORKERS = int(os.getenv('COMBINATION_QUERY_WORKERS', '4'))
+
+# Successful result sets by (category, version, limit)
+_RESULT_SETS = {}
+_RESULT_SETS_LOCK = Lock()
+
+def fetch_result_set(category, version, query, limit):
+    """Run a variant query once per (category, version, limit) and cache it.
+
+    Overlapping combinations share the same result set, so testing N
+    combinations costs one ChartInk call per distinct variant, not per
+    combination. Failed or empty results are not cached, so a transient
+    ChartInk error is retried by the next combination that needs the variant.
+    """
+    key = (category, version, limit)
+    with _RESULT_SETS_LOCK:
+        if key in _RESULT_SETS:
+            return _RESULT_SETS[key]
+    results = test_query_silent(query, limit=limit)
+    stocks = results.get('data', []) if results else []
+    result_set = (stocks, normalize_symbols(stocks))
+    if results and results.get('success') and stocks:
+        with _RESULT_SETS_LOCK:
+            _RESULT_SETS[key] = result_set
+    return result_set
 
 def load_config():
     """Load the long term config with all query variants"""
@@ -87,20 +118,24 @@ def test_single_combination(config, fundamental_v, momentum_v, value_v, quality_
     total_weight = 0
     total_stocks_found = 0
     
-    # Test each category
-    for category, version in zip(categories, versions):
-        variant_data = config['sub_algorithm_variants'][category][version]
-        query = variant_data['query']
+    # Run each category's query (cached per variant) in parallel
+    variants = [
+        (category, version, config['sub_algorithm_variants'][category][version])
+        for category, version in zip(categories, versions)
+    ]
+    with ThreadPoolExecutor(max_workers=QUERY_WORKERS) as pool:
+        result_sets = list(pool.map(
+            lambda v: fetch_result_set(v[0], v[1], v[2]['query'], limit), variants
+        ))
+    
+    stock_lookup = {}
+    for (category, version, variant_data), (stocks, frame) in zip(variants, result_sets):
         weight = variant_data['weight']
         name = variant_data['name']
         
         print(f"  🔍 {category}: {name[:40]}...")
         
-        # Run the query
-        results = test_query_silent(query, limit=limit)
-        
-        if results and 'data' in results:
-            stocks = results['data']
+        if stocks:
             stocks_found = len(stocks)
             print(f"     ✅ {stocks_found} stocks")
             
@@ -113,12 +148,13 @@ def test_single_combination(config, fundamental_v, momentum_v, value_v, quality_
             total_stocks_found += stocks_found
             total_weight += weight
             
-            # Score stocks from this category
-            for stock in stocks:
-                symbol = stock.get('nsecode', 'UNKNOWN')
+            # Score stocks from this category (symbols normalized once per result set)
+            for stock in frame.to_dict('records'):
+                symbol = stock['symbol']
                 all_stocks[symbol] += weight
                 stock_appearances[symbol] += 1
                 stock_categories[symbol].add(category)
+                stock_lookup.setdefault(symbol, stock)
         else:
             print(f"     ❌ No results")
             category_results[category] = {
@@ -137,20 +173,13 @@ def test_single_combination(config, fundamental_v, momentum_v, value_v, quality_
     
     for symbol, score in sorted_stocks[:10]:
         # Get stock details
-        stock_details = None
-        for cat_data in category_results.values():
-            for stock in cat_data['stocks']:
-                if stock.get('nsecode') == symbol:
-                    stock_details = stock
-                    break
-            if stock_details:
-                break
+        stock_details = stock_lookup.get(symbol)
         
         if stock_details:
             top_stocks.append({
                 'symbol': symbol,
                 'name': stock_details.get('name', 'N/A'),
-                'price': stock_details.get('close', 'N/A'),
+                'price': stock_details.get('price', 'N/A'),
                 'score': round(score, 2),
                 'appearances': stock_appearances[symbol],
                 'categories': list(stock_categories[symbol])
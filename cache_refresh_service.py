@@ -26,6 +26,8 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 sys.path.append(str(Path(__file__).parent / "api"))
 
+from utils.health_oracle import health_oracle
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -42,24 +44,9 @@ class InternetConnectivityChecker:
     
     @staticmethod
     def is_connected() -> bool:
-        """Check if internet connection is available."""
+        """Check if internet connection is available (shared health oracle)."""
         try:
-            # Test multiple endpoints for reliability
-            test_urls = [
-                "https://www.google.com",
-                "https://1.1.1.1",
-                "https://8.8.8.8"
-            ]
-            
-            for url in test_urls:
-                try:
-                    response = requests.get(url, timeout=5)
-                    if response.status_code == 200:
-                        return True
-                except:
-                    continue
-            
-            return False
+            return health_oracle.is_healthy("internet")
         except Exception:
             return False
 
@@ -14,6 +14,8 @@ from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
 
+from utils.async_logging import enable_async_logging
+
 logger = logging.getLogger(__name__)
 
 class CronEnvironmentLoader:
@@ -163,6 +165,8 @@ def setup_cron_logging(cron_type: str):
             logging.StreamHandler(sys.stdout)
         ]
     )
+    # Move file/console I/O off the event loop onto the background writer
+    enable_async_logging()
     
     logger.info(f"🚀 {cron_type.replace('_', ' ').title()} cron logging configured")
     logger.info(f"📁 Log file: {config['log_file']}")
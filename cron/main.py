@@ -37,6 +37,9 @@ logging.basicConfig(
         logging.StreamHandler(sys.stdout)
     ]
 )
+# Hand file/console I/O to the background log writer
+from utils.async_logging import enable_async_logging
+enable_async_logging()
 logger = logging.getLogger(__name__)
 
 def main():
@@ -12,10 +12,16 @@ Master service for managing automated trading recommendations with:
 
 Usage:
     python cron/main.py    # Start all services
+
+Env:
+    CRON_METRICS_PORT   port for the stage latency /metrics endpoint, served
+                        only with TRACING_ENABLED=true (default 8010, 0 disables)
+    CRON_METRICS_HOST   interface the metrics endpoint binds (default 127.0.0.1)
 """
 
 import asyncio
 import logging
+import os
 import signal
 import sys
 import json
@@ -29,6 +35,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from api.services.trading_scheduler import trading_scheduler
 from api.services.market_timer import MarketTimer
 from api.models.recommendation_models import recommendation_cache
+from utils.tracing import serve_metrics, snapshot as stage_latency_snapshot, tracing_enabled
 
 # Import strategy-specific cron jobs
 from cron.strategies.intraday_buy import IntradayBuyCron
@@ -48,6 +55,7 @@ class TradingCronManager:
         self.market_timer = MarketTimer()
         self.running = False
         self.start_time = None
+        self.metrics_server = None
         
         # Initialize strategy-specific cron jobs
         self.intraday_buy_cron = IntradayBuyCron()
@@ -65,6 +73,19 @@ class TradingCronManager:
             'long_buy': self.long_buy_cron
         }
         
+    def _start_metrics_server(self):
+        """Serve /metrics while tracing is on; a bind failure only costs the endpoint."""
+        metrics_port = int(os.getenv("CRON_METRICS_PORT", "8010"))
+        if not metrics_port or not tracing_enabled():
+            return
+        metrics_host = os.getenv("CRON_METRICS_HOST", "127.0.0.1")
+        try:
+            self.metrics_server = serve_metrics(metrics_port, "cron", host=metrics_host)
+        except OSError as e:
+            logger.warning(f"⚠️ Metrics endpoint disabled, could not bind {metrics_host}:{metrics_port}: {e}")
+            return
+        logger.info(f"📈 Metrics endpoint: http://{metrics_host}:{metrics_port}/metrics")
+        
     async def start_all_services(self):
         """Start all trading services and cron jobs"""
         try:
@@ -79,6 +100,9 @@ class TradingCronManager:
             logger.info("⏰ Starting trading scheduler...")
             await trading_scheduler.start_scheduler()
             
+            # Stage latency histograms on /metrics (0 disables the endpoint)
+            self._start_metrics_server()
+            
             # Log market status
             market_info = self.market_timer.get_market_session_info()
             logger.info(f"📊 Market Status: {market_info['session']} | Is Open: {market_info['is_open']}")
@@ -150,6 +174,10 @@ class TradingCronManager:
             # Close cache connections
             await recommendation_cache.close()
             
+            if self.metrics_server:
+                self.metrics_server.shutdown()
+                self.metrics_server = None
+            
             logger.info("✅ All services stopped successfully")
             
         except Exception as e:
@@ -217,6 +245,7 @@ class TradingCronManager:
                 "scheduler": scheduler_status,
                 "cache": cache_stats,
                 "strategies": strategy_statuses,
+                "stage_latency": stage_latency_snapshot(),
                 "summary": {
                     "market_open": market_info.get('is_open', False),
                     "jobs_active": scheduler_status.get('status') == 'running',
@@ -17,6 +17,8 @@ from abc import ABC, abstractmethod
 from api.services.market_timer import MarketTimer
 from api.services.trading_scheduler import trading_scheduler
 from api.models.recommendation_models import recommendation_cache
+from api.services.stage_memo import StageMemo, fingerprint
+from utils.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +38,10 @@ class BaseStrategyCron(ABC):
         self.error_count = 0
         self.last_error = None
         
+        # Unchanged results are not re-cached (refreshed after STAGE_MEMO_MAX_AGE)
+        self.result_memo = StageMemo(f"{strategy_name}.result")
+        self.unchanged_runs = 0
+        
         # Get strategy-specific configuration
         self.enabled = os.getenv(f"ENABLE_{strategy_name.upper()}", "true").lower() == "true"
         self.confidence_threshold = float(os.getenv(f"{strategy_name.upper()}_CONFIDENCE_THRESHOLD", "50.0"))
@@ -90,16 +96,22 @@ class BaseStrategyCron(ABC):
                 
             logger.info(f"🔄 Running {self.strategy_name} strategy...")
             
-            # Run the strategy-specific logic
-            result = await self.execute_strategy()
-            
-            # Update statistics
-            self.run_count += 1
-            self.last_run_time = datetime.now()
-            
-            # Cache the results
-            if result:
-                await self._cache_results(result)
+            with span(f"cron.{self.strategy_name}", group="cron"):
+                # Run the strategy-specific logic
+                result = await self.execute_strategy()
+                
+                # Update statistics
+                self.run_count += 1
+                self.last_run_time = datetime.now()
+                
+                # Cache the results unless they repeat the last run
+                if result:
+                    if self.result_memo.changed(self.strategy_name, fingerprint(result)):
+                        with span("cache.write"):
+                            await self._cache_results(result)
+                    else:
+                        self.unchanged_runs += 1
+                        logger.info(f"♻️ {self.strategy_name} results unchanged, cache kept")
                 
             logger.info(f"✅ {self.strategy_name} strategy completed successfully")
             
@@ -158,6 +170,7 @@ class BaseStrategyCron(ABC):
                 "run_count": self.run_count,
                 "error_count": self.error_count,
                 "last_error": self.last_error,
+                "unchanged_runs": self.unchanged_runs,
                 "configuration": {
                     "interval_minutes": self.interval_minutes,
                     "confidence_threshold": self.confidence_threshold,
@@ -183,6 +196,7 @@ class BaseStrategyCron(ABC):
             # Cache results
             if result:
                 await self._cache_results(result)
+                self.result_memo.store(self.strategy_name, fingerprint(result), None)
                 
             return {
                 "status": "completed",
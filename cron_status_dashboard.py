@@ -19,6 +19,7 @@ import asyncio
 import json
 import os
 import sys
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, List
@@ -86,8 +87,7 @@ class CronStatusDashboard:
                 return ["Log file not found"]
                 
             with open(self.log_file, 'r') as f:
-                all_lines = f.readlines()
-                return [line.strip() for line in all_lines[-lines:]]
+                return [line.strip() for line in deque(f, maxlen=lines)]
         except Exception as e:
             return [f"Error reading logs: {e}"]
             
@@ -99,6 +99,17 @@ class CronStatusDashboard:
         except Exception as e:
             return {"error": str(e), "status": "error"}
             
+    async def get_job_rollups(self) -> Dict[str, Any]:
+        """Get today's per-job execution rollups (no raw history scan)"""
+        try:
+            from api.models.cron_tracking_models import cron_execution_tracker
+            rollups = await cron_execution_tracker.get_rollups(
+                granularity="day", start_date=datetime.now()
+            )
+            return {"jobs": rollups}
+        except Exception as e:
+            return {"error": str(e)}
+            
     def format_time_ago(self, timestamp_str: str) -> str:
         """Format timestamp as time ago"""
         try:
@@ -199,6 +210,30 @@ class CronStatusDashboard:
             print(f"{Colors.YELLOW}No jobs scheduled{Colors.END}")
         print()
         
+    def render_job_rollups(self, rollup_info: Dict[str, Any]):
+        """Render today's execution counts per job"""
+        print(f"{Colors.BOLD}{Colors.GREEN}📊 TODAY'S EXECUTIONS{Colors.END}")
+        print("-" * 40)
+        
+        if "error" in rollup_info:
+            print(f"Error: {Colors.RED}{rollup_info['error']}{Colors.END}")
+            print()
+            return
+            
+        jobs = rollup_info.get('jobs', [])
+        if not jobs:
+            print(f"{Colors.YELLOW}No executions recorded today{Colors.END}")
+        for rollup in jobs:
+            count = rollup.get('count', 0)
+            failures = rollup.get('failures', 0)
+            duration_count = rollup.get('duration_count', 0)
+            avg_duration = rollup.get('duration_sum', 0) / duration_count if duration_count else 0
+            color = Colors.RED if failures else Colors.GREEN
+            print(f"  • {Colors.CYAN}{rollup.get('job_type', 'unknown'):<20}{Colors.END} "
+                  f"runs {count:<4} {color}failed {failures:<3}{Colors.END} "
+                  f"avg {avg_duration:.1f}s stocks {rollup.get('stocks_produced', 0)}")
+        print()
+        
     def render_recent_logs(self, logs: List[str]):
         """Render recent log entries"""
         print(f"{Colors.BOLD}{Colors.WHITE}📋 RECENT LOGS (Last 10 entries){Colors.END}")
@@ -284,6 +319,7 @@ class CronStatusDashboard:
                 process_info = self.get_cron_process_status()
                 market_info = self.get_market_status()
                 scheduler_info = self.get_scheduler_jobs_info()
+                rollup_info = await self.get_job_rollups()
                 recent_logs = self.get_recent_logs()
                 
                 # Render dashboard
@@ -291,6 +327,7 @@ class CronStatusDashboard:
                 self.render_process_status(process_info)
                 self.render_market_status(market_info)
                 self.render_scheduler_status(scheduler_info)
+                self.render_job_rollups(rollup_info)
                 self.render_recent_logs(recent_logs)
                 self.render_controls()
                 
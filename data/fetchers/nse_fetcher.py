@@ -4,7 +4,8 @@ import yfinance as yf
 from datetime import datetime, timedelta, time
 import pytz
 import logging
-import time as tm
+
+from shared.data import get_bar_store
 
 class NSEDataFetcher:
     """Fetcher for NSE (National Stock Exchange) data"""
@@ -42,19 +43,9 @@ class NSEDataFetcher:
             "BAJAJFINSV.NS", "ASIANPAINT.NS", "ULTRACEMCO.NS", "TITAN.NS", "BAJFINANCE.NS"
         ]
         
-        # Cache for data to avoid unnecessary API calls
-        self.data_cache = {}
-        self.cache_expiry = {}  # Store when cache entries expire
-        self.cache_duration = {
-            "1m": 60,           # 1 minute data expires in 60 seconds
-            "5m": 5 * 60,       # 5 minute data expires in 5 minutes
-            "15m": 15 * 60,
-            "30m": 30 * 60,
-            "1h": 60 * 60,
-            "1d": 24 * 60 * 60, # Daily data expires in 24 hours
-            "1wk": 7 * 24 * 60 * 60,
-            "1mo": 30 * 24 * 60 * 60
-        }
+        # Bars are served from the shared on-disk store, which only downloads
+        # the part of a requested range it does not already hold
+        self.bar_store = get_bar_store()
         
         # Indian market timezone
         self.ist_tz = pytz.timezone('Asia/Kolkata')
@@ -165,30 +156,12 @@ class NSEDataFetcher:
         
         self.logger.info(f"Fetching data for {symbol} from {start_str} to {end_str} with interval {interval}")
         
-        # Generate cache key
-        cache_key = f"{symbol}_{interval}_{start_str}_{end_str}"
-        
-        # Check if data is in cache and not expired
-        current_time_epoch = tm.time()
-        if (cache_key in self.data_cache and 
-            cache_key in self.cache_expiry and 
-            current_time_epoch < self.cache_expiry[cache_key]):
-            self.logger.info(f"Using cached data for {cache_key}")
-            return self.data_cache[cache_key]
-        
-        # Fetch data from yfinance
         try:
-            # Use native yfinance parameters with string dates
-            self.logger.info(f"Downloading data via yfinance: {symbol}, {start_str} to {end_str}, interval={interval}")
+            # yfinance treats end as exclusive; the bar store end is inclusive
+            end_bound = pd.Timestamp(end_str) - pd.Timedelta(microseconds=1)
+            data = self.bar_store.get_bars(symbol, pd.Timestamp(start_str), end_bound, interval)
             
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(
-                start=start_str,
-                end=end_str,
-                interval=interval
-            )
-            
-            self.logger.info(f"Downloaded {len(data)} rows of data")
+            self.logger.info(f"Loaded {len(data)} rows of data")
             
             # Handle empty data
             if data.empty:
@@ -216,11 +189,6 @@ class NSEDataFetcher:
                 ]
                 self.logger.info(f"Filtered for market hours: {original_len} → {len(data)} rows")
             
-            # Cache the data
-            self.data_cache[cache_key] = data
-            # Set cache expiry
-            self.cache_expiry[cache_key] = current_time_epoch + self.cache_duration.get(interval, 300)
-            
             return data
             
         except Exception as e:
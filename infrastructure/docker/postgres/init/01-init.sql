@@ -20,6 +20,38 @@ CREATE TABLE IF NOT EXISTS market_data.price_data (
     PRIMARY KEY (symbol, timestamp)
 );
 
+-- Rollups of price_data (1m -> 5m -> 1d), maintained by the market_data bulk ingest
+CREATE TABLE IF NOT EXISTS market_data.price_data_5m (
+    symbol VARCHAR(10) NOT NULL,
+    timestamp TIMESTAMP NOT NULL,
+    open DECIMAL(10,2) NOT NULL,
+    high DECIMAL(10,2) NOT NULL,
+    low DECIMAL(10,2) NOT NULL,
+    close DECIMAL(10,2) NOT NULL,
+    volume BIGINT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (symbol, timestamp)
+);
+
+CREATE TABLE IF NOT EXISTS market_data.price_data_1d (
+    symbol VARCHAR(10) NOT NULL,
+    timestamp TIMESTAMP NOT NULL,
+    open DECIMAL(10,2) NOT NULL,
+    high DECIMAL(10,2) NOT NULL,
+    low DECIMAL(10,2) NOT NULL,
+    close DECIMAL(10,2) NOT NULL,
+    volume BIGINT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (symbol, timestamp)
+);
+
+-- Every price_data bar before rolled_up_through has its 5m/1d rollups
+CREATE TABLE IF NOT EXISTS market_data.price_rollup_state (
+    name VARCHAR(32) PRIMARY KEY,
+    rolled_up_through TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 CREATE TABLE IF NOT EXISTS market_data.fundamental_data (
     symbol VARCHAR(10) NOT NULL,
     date DATE NOT NULL,
@@ -21,10 +21,11 @@ import asyncio
 import logging
 import sys
 import time
-import requests
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from utils.health_oracle import health_oracle
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -40,12 +41,7 @@ class InternetMonitor:
     """Monitor internet connectivity continuously."""
     
     def __init__(self):
-        self.test_endpoints = [
-            "https://www.google.com",
-            "https://1.1.1.1",  # Cloudflare DNS
-            "https://8.8.8.8",  # Google DNS
-            "https://httpbin.org/status/200",  # HTTP testing service
-        ]
+        self.test_endpoints = health_oracle.upstreams["internet"]
         self.check_interval = 30  # Check every 30 seconds
         self.is_connected = False
         self.connection_status_file = Path(__file__).parent / "logs" / "connection_status.txt"
@@ -53,27 +49,13 @@ class InternetMonitor:
         self.consecutive_failures = 0
         self.consecutive_successes = 0
         
-    def test_single_endpoint(self, url: str, timeout: int = 5) -> bool:
-        """Test connectivity to a single endpoint."""
-        try:
-            response = requests.get(url, timeout=timeout)
-            return response.status_code == 200
-        except Exception:
-            return False
-    
     def check_connectivity(self) -> bool:
-        """Check internet connectivity using multiple endpoints."""
-        successful_tests = 0
-        total_tests = len(self.test_endpoints)
+        """Check internet connectivity from the shared health oracle.
         
-        for endpoint in self.test_endpoints:
-            if self.test_single_endpoint(endpoint):
-                successful_tests += 1
-                # If at least one endpoint works, consider connected
-                if successful_tests >= 1:
-                    return True
-        
-        return False
+        The oracle probes its endpoints concurrently; this only reads the
+        published status.
+        """
+        return health_oracle.is_healthy("internet")
     
     def update_connection_status(self, connected: bool):
         """Update connection status and handle state changes."""
@@ -131,6 +113,9 @@ class InternetMonitor:
         # Ensure logs directory and status file exist
         self.connection_status_file.parent.mkdir(exist_ok=True)
         
+        # Probe from here unless a server already runs the prober
+        health_oracle.start()
+        
         while True:
             try:
                 # Check connectivity
@@ -20,6 +20,7 @@ from .risk_manager import RiskManager
 from .position_manager import PositionManager
 from .validators import OrderValidator
 from .notification_service import NotificationService
+from .journal import OrderJournal
 
 __version__ = "1.0.0"
 __author__ = "AlgoDiscovery Team"
@@ -31,5 +32,8 @@ __all__ = [
     
     # Core Services
     'OrderManager', 'ExecutionEngine', 'RiskManager',
-    'PositionManager', 'OrderValidator', 'NotificationService'
+    'PositionManager', 'OrderValidator', 'NotificationService',
+    
+    # Persistence
+    'OrderJournal'
 ] 
\ No newline at end of file
@@ -0,0 +1,408 @@
+"""
+Order Journal - Durable, append-only event log for the order subsystem
+
+Every order state change and every trade is appended to the journal as one
+JSON line. The caller only queues a shallow copy of the order / trade; a
+background writer thread encodes the events, drains the queue and commits
+everything that accumulated in a single write + fsync (group commit), so
+``create_order`` and ``process_trade`` never wait on encoding or disk.
+
+Periodic snapshots of order, position and risk state bound restart time: on
+recovery the latest snapshot is loaded and only the events after it are
+replayed.
+
+Layout::
+
+    <ORDER_JOURNAL_DIR>/events-<first seq>.ndjson   event segments
+    <ORDER_JOURNAL_DIR>/snapshot-<seq>.json         state as of event <seq>
+
+A new segment starts after each snapshot; segments and snapshots older than
+the previous snapshot are pruned. A failed write keeps its events pending,
+moves to a fresh segment (the old one may end in a torn line) and is retried;
+``flush()`` only reports events that actually reached the disk.
+
+Env
+---
+ORDER_JOURNAL_ENABLED    true/false (default true)
+ORDER_JOURNAL_DIR        journal directory (default <project>/data/order_journal)
+ORDER_JOURNAL_FSYNC      fsync each group commit (default true)
+ORDER_JOURNAL_LINGER_MS  wait after the first queued event so a commit takes a whole burst (default 5)
+ORDER_SNAPSHOT_SECONDS   seconds between snapshots (default 300)
+ORDER_SNAPSHOT_EVENTS    events that trigger an early snapshot (default 5000)
+ORDER_JOURNAL_RETRY_SECONDS  wait before retrying a failed write (default 1)
+"""
+
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import typing
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import Order, Trade
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ORDER_JOURNAL_ENABLED = os.getenv("ORDER_JOURNAL_ENABLED", "true").lower() == "true"
+ORDER_JOURNAL_DIR = Path(os.getenv("ORDER_JOURNAL_DIR", str(PROJECT_ROOT / "data" / "order_journal")))
+ORDER_JOURNAL_FSYNC = os.getenv("ORDER_JOURNAL_FSYNC", "true").lower() == "true"
+ORDER_JOURNAL_LINGER_MS = float(os.getenv("ORDER_JOURNAL_LINGER_MS", "5"))
+ORDER_SNAPSHOT_SECONDS = float(os.getenv("ORDER_SNAPSHOT_SECONDS", "300"))
+ORDER_SNAPSHOT_EVENTS = int(os.getenv("ORDER_SNAPSHOT_EVENTS", "5000"))
+ORDER_JOURNAL_RETRY_SECONDS = float(os.getenv("ORDER_JOURNAL_RETRY_SECONDS", "1"))
+
+EVENT_ORDER = "order"
+EVENT_TRADE = "trade"
+
+_SNAPSHOT = object()  # Queue marker for snapshot items
+_STOP = object()
+
+
+# =====================================================================
+# Dataclass <-> JSON-safe state
+# =====================================================================
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    return value
+
+
+def to_state(obj: Any) -> Dict[str, Any]:
+    """Order / Trade / Position dataclass -> JSON-safe dict"""
+    return {f.name: _encode(getattr(obj, f.name)) for f in fields(obj)}
+
+
+def _frozen_copy(obj: Any) -> Any:
+    """Copy of a dataclass, cheaper than copy.deepcopy
+
+    Scalar fields are shared; containers (``child_order_ids``, ``tags``) are
+    deep-copied so later changes to the live object can't leak into an event
+    that is still waiting to be encoded.
+    """
+    clone = object.__new__(type(obj))
+    clone.__dict__.update(obj.__dict__)
+    for name, value in obj.__dict__.items():
+        if isinstance(value, (list, dict, set)):
+            clone.__dict__[name] = copy.deepcopy(value)
+    return clone
+
+
+_HINTS: Dict[type, Dict[str, Any]] = {}
+
+
+def _field_types(cls: type) -> Dict[str, Any]:
+    hints = _HINTS.get(cls)
+    if hints is None:
+        hints = {}
+        for name, hint in typing.get_type_hints(cls).items():
+            # Optional[X] -> X
+            args = [a for a in typing.get_args(hint) if a is not type(None)]
+            hints[name] = args[0] if typing.get_origin(hint) is typing.Union and len(args) == 1 else hint
+        _HINTS[cls] = hints
+    return hints
+
+
+def from_state(cls: type, state: Dict[str, Any]) -> Any:
+    """JSON-safe dict -> dataclass instance"""
+    types = _field_types(cls)
+    values = {}
+    for name, value in state.items():
+        hint = types.get(name)
+        if hint is None:
+            continue
+        if value is not None and isinstance(hint, type):
+            if issubclass(hint, Enum):
+                value = hint(value)
+            elif hint is Decimal:
+                value = Decimal(value)
+            elif hint is datetime:
+                value = datetime.fromisoformat(value)
+        values[name] = value
+    return cls(**values)
+
+
+# =====================================================================
+# Journal
+# =====================================================================
+
+class OrderJournal:
+    """
+    Append-only order / trade event log with a group-commit writer thread
+    """
+
+    def __init__(self, directory: Optional[Path] = None, fsync: Optional[bool] = None,
+                 linger_ms: Optional[float] = None):
+        self.directory = Path(directory or ORDER_JOURNAL_DIR)
+        self.fsync = ORDER_JOURNAL_FSYNC if fsync is None else fsync
+        self.linger = (ORDER_JOURNAL_LINGER_MS if linger_ms is None else linger_ms) / 1000.0
+        self.logger = logging.getLogger(__name__)
+
+        self.seq = 0                    # Last sequence number handed out
+        self.snapshot_seq = 0           # Sequence covered by the latest snapshot
+        self._durable_seq = 0           # Last sequence on disk
+        self._lock = threading.Lock()
+        self._durable = threading.Condition()
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._segment = None
+        self._pending: List[Tuple[int, str]] = []  # Encoded events not on disk yet
+        self._rolls = 0
+
+        # Statistics
+        self.commits = 0
+        self.events_written = 0
+        self.write_errors = 0
+
+    # ------------------------------------------------------------------
+    # Caller side - no I/O
+    # ------------------------------------------------------------------
+
+    def record(self, kind: str, state: Any) -> int:
+        """Queue one event (a JSON-safe dict or a dataclass); returns its sequence number"""
+        with self._lock:
+            self.seq += 1
+            seq = self.seq
+        self._queue.put((seq, kind, state))
+        return seq
+
+    def record_order(self, order: Order) -> int:
+        # Copy - the order keeps changing after this event
+        return self.record(EVENT_ORDER, _frozen_copy(order))
+
+    def record_trade(self, trade: Trade) -> int:
+        return self.record(EVENT_TRADE, _frozen_copy(trade))
+
+    def snapshot(self, state: Dict[str, Any]) -> int:
+        """
+        Queue a snapshot of the state produced by every event recorded so far
+
+        The caller must capture ``state`` on the same thread that records
+        events, so it matches the sequence number taken here.
+        """
+        with self._lock:
+            seq = self.seq
+        self._queue.put((_SNAPSHOT, seq, state))
+        return seq
+
+    @property
+    def events_since_snapshot(self) -> int:
+        return self.seq - self.snapshot_seq
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything recorded so far is on disk"""
+        target = self.seq
+        with self._durable:
+            return self._durable.wait_for(lambda: self._durable_seq >= target, timeout)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Never append to a segment that may end in a torn line
+        self._open_segment(self.seq + 1)
+        self._durable_seq = self.seq
+        self._thread = threading.Thread(target=self._run, name="order-journal", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Order journal started at {self.directory} (seq {self.seq})")
+
+    def close(self, timeout: float = 10.0) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+        if self._pending:
+            self.logger.error(f"Order journal closed with {len(self._pending)} events not written "
+                              f"(seq {self._pending[0][0]}-{self._pending[-1][0]})")
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _open_segment(self, first_seq: int, suffix: str = "") -> None:
+        if self._segment is not None:
+            try:
+                self._segment.close()
+            except OSError:
+                pass
+            self._segment = None
+        self._segment = open(self.directory / f"events-{first_seq:012d}{suffix}.ndjson", "a", encoding="utf-8")
+
+    def _mark_durable(self, seq: int) -> None:
+        with self._durable:
+            self._durable_seq = max(self._durable_seq, seq)
+            self._durable.notify_all()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            try:
+                # Wake up on our own to retry a failed write
+                batch = [self._queue.get(timeout=ORDER_JOURNAL_RETRY_SECONDS if self._pending else None)]
+            except queue.Empty:
+                batch = []
+            # Group commit: one write for the whole burst, and fewer wake-ups
+            # competing with the event loop for the GIL
+            if self.linger and batch and batch[0] is not _STOP:
+                time.sleep(self.linger)
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for item in batch:
+                if item is _STOP:
+                    stopping = True
+                elif item[0] is _SNAPSHOT:
+                    # Events queued before the snapshot go to the old segment
+                    self._commit()
+                    self._write_snapshot(item[1], item[2])
+                else:
+                    seq, kind, state = item
+                    if is_dataclass(state):
+                        state = to_state(state)
+                    self._pending.append((seq, json.dumps({"seq": seq, "type": kind, "data": state}, default=str)))
+            self._commit()
+
+    def _commit(self) -> bool:
+        """Write every pending event; on failure they stay pending for a retry"""
+        if not self._pending:
+            return True
+        lines = self._pending
+        try:
+            if self._segment is None:
+                self._open_segment(lines[0][0], f"-r{self._rolls}")
+            self._segment.write("\n".join(line for _, line in lines) + "\n")
+            self._segment.flush()
+            if self.fsync:
+                os.fsync(self._segment.fileno())
+        except Exception as e:
+            self.write_errors += 1
+            self.logger.error(f"Order journal write failed ({len(lines)} events kept for retry): {e}")
+            # The segment may now end in a torn line - never append after it
+            self._rolls += 1
+            try:
+                self._open_segment(lines[0][0], f"-r{self._rolls}")
+            except OSError:
+                self._segment = None
+            return False
+        self._pending = []
+        self.commits += 1
+        self.events_written += len(lines)
+        self._mark_durable(lines[-1][0])
+        return True
+
+    def _write_snapshot(self, seq: int, state: Dict[str, Any]) -> None:
+        try:
+            path = self.directory / f"snapshot-{seq:012d}.json"
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"seq": seq, "created_at": time.time(), "state": state}, f, default=str)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp, path)
+            self.snapshot_seq = seq
+            # The snapshot covers events whose own write failed
+            self._pending = [item for item in self._pending if item[0] > seq]
+            self._mark_durable(seq)
+            self._open_segment(seq + 1)
+            self._prune()
+            self.logger.info(f"Order journal snapshot at seq {seq}")
+        except Exception as e:
+            self.write_errors += 1
+            self.logger.error(f"Order journal snapshot failed: {e}")
+
+    def _prune(self) -> None:
+        snapshots = sorted(self.directory.glob("snapshot-*.json"))
+        if len(snapshots) < 2:
+            return
+        # Keep the latest two snapshots and every segment the older one doesn't cover
+        older_seq = int(snapshots[-2].stem.split("-")[1])
+        for path in snapshots[:-2]:
+            path.unlink(missing_ok=True)
+        for path in self.directory.glob("events-*.ndjson"):
+            if int(path.stem.split("-")[1]) <= older_seq:
+                path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        (latest readable snapshot state, events after it in order)
+
+        Also advances ``seq`` past everything on disk; call before ``start``.
+        """
+        if not self.directory.exists():
+            return None, []
+
+        snapshot, snapshot_seq = None, 0
+        for path in sorted(self.directory.glob("snapshot-*.json"), reverse=True):
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                snapshot, snapshot_seq = data["state"], data["seq"]
+                break
+            except (ValueError, KeyError) as e:
+                self.logger.warning(f"Skipping unreadable order snapshot {path.name}: {e}")
+
+        events = []
+        seen = set()
+        last_seq = snapshot_seq
+        for path in sorted(self.directory.glob("events-*.ndjson")):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue  # Torn line of a failed or crashed write
+                    # A retried write can repeat events that partly made it to disk
+                    if event["seq"] in seen:
+                        continue
+                    seen.add(event["seq"])
+                    last_seq = max(last_seq, event["seq"])
+                    if event["seq"] > snapshot_seq:
+                        events.append(event)
+
+        events.sort(key=lambda event: event["seq"])
+        self.seq = self._durable_seq = last_seq
+        self.snapshot_seq = snapshot_seq
+        return snapshot, events
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "directory": str(self.directory),
+            "seq": self.seq,
+            "durable_seq": self._durable_seq,
+            "snapshot_seq": self.snapshot_seq,
+            "pending": self.seq - self._durable_seq,
+            "commits": self.commits,
+            "events_written": self.events_written,
+            "events_per_commit": round(self.events_written / self.commits, 2) if self.commits else 0.0,
+            "write_errors": self.write_errors,
+        }
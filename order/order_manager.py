@@ -18,6 +18,10 @@ from .execution_engine import ExecutionEngine
 from .position_manager import PositionManager
 from .risk_manager import RiskManager
 from .notification_service import NotificationService
+from .journal import (
+    OrderJournal, EVENT_ORDER, EVENT_TRADE, ORDER_SNAPSHOT_EVENTS, ORDER_SNAPSHOT_SECONDS,
+    from_state, to_state
+)
 
 
 class OrderManager:
@@ -31,13 +35,15 @@ class OrderManager:
         position_manager: PositionManager,
         risk_manager: RiskManager,
         notification_service: NotificationService,
-        validator: Optional[OrderValidator] = None
+        validator: Optional[OrderValidator] = None,
+        journal: Optional[OrderJournal] = None
     ):
         self.execution_engine = execution_engine
         self.position_manager = position_manager
         self.risk_manager = risk_manager
         self.notification_service = notification_service
         self.validator = validator or OrderValidator()
+        self.journal = journal
         
         # Order storage
         self.orders: Dict[str, Order] = {}
@@ -63,6 +69,14 @@ class OrderManager:
         """Start the order manager and background tasks"""
         self.is_running = True
         
+        # Restore state from the journal before accepting new orders
+        if self.journal:
+            self.recover()
+            self.journal.start()
+            self.background_tasks.append(
+                asyncio.create_task(self._snapshot_monitor())
+            )
+        
         # Start execution engine
         await self.execution_engine.start()
         
@@ -91,6 +105,11 @@ class OrderManager:
         # Stop execution engine
         await self.execution_engine.stop()
         
+        # Final snapshot so the next start replays nothing
+        if self.journal:
+            self.journal.snapshot(self.snapshot_state())
+            self.journal.close()
+        
         self.logger.info("OrderManager stopped")
     
     async def create_order(self, request: OrderRequest) -> Order:
@@ -344,6 +363,8 @@ class OrderManager:
         """
         # Store trade
         self.trades[trade.trade_id] = trade
+        if self.journal:
+            self.journal.record_trade(trade)
         
         # Get associated order
         order = self.orders.get(trade.order_id)
@@ -467,12 +488,88 @@ class OrderManager:
         """Add callback for trade events"""
         self.trade_callbacks.append(callback)
     
+    # Journal recovery
+    
+    def snapshot_state(self) -> Dict:
+        """Order, trade, position and risk state for an order journal snapshot"""
+        return {
+            'orders': [to_state(order) for order in self.orders.values()],
+            'trades': [to_state(trade) for trade in self.trades.values()],
+            'positions': self.position_manager.get_state(),
+            'risk': self.risk_manager.get_state()
+        }
+    
+    def recover(self) -> int:
+        """
+        Rebuild in-memory state from the latest journal snapshot plus the
+        events recorded after it
+        
+        Returns:
+            Number of replayed events
+        """
+        snapshot, events = self.journal.load()
+        
+        if snapshot:
+            self.orders = {
+                data['order_id']: from_state(Order, data) for data in snapshot.get('orders', [])
+            }
+            self.trades = {
+                data['trade_id']: from_state(Trade, data) for data in snapshot.get('trades', [])
+            }
+            self.position_manager.load_state(snapshot.get('positions', {}), list(self.trades.values()))
+            self.risk_manager.load_state(snapshot.get('risk', {}), self.trades)
+        
+        for event in events:
+            if event['type'] == EVENT_ORDER:
+                order = from_state(Order, event['data'])
+                self.orders[order.order_id] = order
+            elif event['type'] == EVENT_TRADE:
+                trade = from_state(Trade, event['data'])
+                self.trades[trade.trade_id] = trade
+                if trade.order_id in self.orders:
+                    self.position_manager.replay_trade(trade)
+                    self.risk_manager.replay_trade(trade)
+        
+        self.orders_by_symbol, self.orders_by_status, self.orders_by_strategy = {}, {}, {}
+        for order in self.orders.values():
+            self._index_order(order)
+        
+        if snapshot or events:
+            self.logger.info(
+                f"Recovered {len(self.orders)} orders and {len(self.trades)} trades "
+                f"({len(events)} events replayed after snapshot)"
+            )
+        return len(events)
+    
+    async def _snapshot_monitor(self) -> None:
+        """Background task that snapshots state on a timer or after many events"""
+        last_snapshot = datetime.utcnow()
+        while self.is_running:
+            try:
+                await asyncio.sleep(5)
+                
+                due = datetime.utcnow() - last_snapshot >= timedelta(seconds=ORDER_SNAPSHOT_SECONDS)
+                if (self.journal.events_since_snapshot and
+                        (due or self.journal.events_since_snapshot >= ORDER_SNAPSHOT_EVENTS)):
+                    self.journal.snapshot(self.snapshot_state())
+                    last_snapshot = datetime.utcnow()
+                
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                self.logger.error(f"Snapshot monitor error: {e}")
+    
     # Private methods
     
     async def _store_order(self, order: Order) -> None:
         """Store order and update indices"""
         self.orders[order.order_id] = order
-        
+        self._index_order(order)
+        if self.journal:
+            self.journal.record_order(order)
+    
+    def _index_order(self, order: Order) -> None:
+        """Add order to the lookup indices"""
         # Update symbol index
         if order.symbol not in self.orders_by_symbol:
             self.orders_by_symbol[order.symbol] = set()
@@ -499,6 +596,9 @@ class OrderManager:
         if order.status not in self.orders_by_status:
             self.orders_by_status[order.status] = set()
         self.orders_by_status[order.status].add(order.order_id)
+        
+        if self.journal:
+            self.journal.record_order(order)
     
     async def _create_bracket_orders(self, parent_order: Order, request: OrderRequest) -> List[Order]:
         """Create child orders for bracket order"""
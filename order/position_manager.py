@@ -8,6 +8,7 @@ from datetime import datetime
 from decimal import Decimal
 
 from .models import Trade, Position, PositionSide, OrderSide
+from .journal import to_state, from_state
 
 
 class PositionManager:
@@ -70,6 +71,34 @@ class PositionManager:
             f"{position.side.value} {position.quantity} @ {position.average_price}"
         )
     
+    def replay_trade(self, trade: Trade) -> None:
+        """
+        Apply a journaled trade during recovery - no market data or callbacks
+        """
+        self.trades.append(trade)
+        position = self.positions.get(trade.symbol)
+        if not position:
+            position = Position(
+                symbol=trade.symbol,
+                side=PositionSide.FLAT,
+                quantity=0,
+                average_price=Decimal('0'),
+                market_price=trade.price
+            )
+            self.positions[trade.symbol] = position
+        position.add_trade(trade)
+    
+    def get_state(self) -> Dict:
+        """Positions for an order journal snapshot (trades are kept by the OrderManager)"""
+        return {'positions': [to_state(position) for position in self.positions.values()]}
+    
+    def load_state(self, state: Dict, trades: List[Trade]) -> None:
+        """Restore positions from an order journal snapshot"""
+        self.positions = {
+            data['symbol']: from_state(Position, data) for data in state.get('positions', [])
+        }
+        self.trades = list(trades)
+    
     def get_position(self, symbol: str) -> Optional[Position]:
         """Get position for symbol"""
         return self.positions.get(symbol)
@@ -168,10 +168,7 @@ class RiskManager:
         Args:
             trade: Trade to monitor
         """
-        # Add to daily trades
-        today = datetime.now().date()
-        self.daily_trades = [t for t in self.daily_trades if t.timestamp.date() == today]
-        self.daily_trades.append(trade)
+        self._track_trade(trade)
         
         # Update daily P&L
         if self.position_manager:
@@ -183,13 +180,44 @@ class RiskManager:
                 self.logger.warning(f"Daily loss limit exceeded: {current_pnl}")
                 # Could trigger trading halt here
         
+        self.logger.info(f"Risk monitoring: Trade processed for {trade.symbol}")
+    
+    def replay_trade(self, trade: Trade) -> None:
+        """Apply a journaled trade during recovery - no limit checks"""
+        self._track_trade(trade)
+    
+    def _track_trade(self, trade: Trade) -> None:
+        """Daily trade list and exposure tracking"""
+        # Add to daily trades
+        today = datetime.now().date()
+        self.daily_trades = [t for t in self.daily_trades if t.timestamp.date() == today]
+        self.daily_trades.append(trade)
+        
         # Update exposure tracking
         if trade.side == OrderSide.BUY:
             self.symbol_exposure[trade.symbol] = self.symbol_exposure.get(trade.symbol, Decimal('0')) + trade.value
         else:
             self.symbol_exposure[trade.symbol] = self.symbol_exposure.get(trade.symbol, Decimal('0')) - trade.value
-        
-        self.logger.info(f"Risk monitoring: Trade processed for {trade.symbol}")
+    
+    def get_state(self) -> Dict[str, Any]:
+        """Risk tracking state for an order journal snapshot"""
+        return {
+            'daily_trade_ids': [trade.trade_id for trade in self.daily_trades],
+            'daily_pnl': str(self.daily_pnl),
+            'max_drawdown': str(self.max_drawdown),
+            'peak_portfolio_value': str(self.peak_portfolio_value),
+            'symbol_exposure': {symbol: str(value) for symbol, value in self.symbol_exposure.items()},
+        }
+    
+    def load_state(self, state: Dict[str, Any], trades: Dict[str, Trade]) -> None:
+        """Restore risk tracking from an order journal snapshot"""
+        self.daily_trades = [trades[trade_id] for trade_id in state.get('daily_trade_ids', []) if trade_id in trades]
+        self.daily_pnl = Decimal(state.get('daily_pnl', '0'))
+        self.max_drawdown = Decimal(state.get('max_drawdown', '0'))
+        self.peak_portfolio_value = Decimal(state.get('peak_portfolio_value', '0'))
+        self.symbol_exposure = {
+            symbol: Decimal(value) for symbol, value in state.get('symbol_exposure', {}).items()
+        }
     
     def _check_basic_order_limits(self, request: OrderRequest) -> RiskResult:
         """Check basic order limits"""
@@ -322,7 +350,7 @@ class RiskManager:
                 )
             
             # Warning when approaching limit
-            if total_volume > max_daily_volume * 0.8:
+            if total_volume > max_daily_volume * Decimal('0.8'):
                 warnings.append(f"High daily volume: {total_volume}")
                 risk_score += 0.2
         
@@ -0,0 +1,464 @@
+"""
+Vectorized backtester
+
+Entry signals, stop losses and targets are computed for the whole series in
+one pass over the indicator columns, instead of re-running a strategy on
+every growing prefix of the data. Exits are then resolved per trade with an
+array scan from the entry bar, so a two year daily backtest only loops over
+its trades. Watchlists are backtested across a process pool.
+
+Support and resistance used for targets are trailing (rolling low/high of
+the last ``SR_WINDOW`` bars), so no bar sees data from later bars.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from analysis.technical import (
+    add_moving_averages, add_rsi, add_macd, add_bollinger_bands, add_atr, add_adx
+)
+from config import DEFAULT_REWARD_RISK_RATIO
+from utils.logger import get_logger
+
+logger = get_logger(__name__, group="shared", service="analysis_backtest")
+
+WARMUP_BARS = 20  # Bars skipped before the first entry
+SR_WINDOW = 10    # Trailing window for support/resistance
+VOLUME_WINDOW = 20
+
+RESULT_COLUMNS = ["date", "action", "price", "reason", "pnl", "equity", "position_value"]
+
+def add_backtest_indicators(df):
+    """
+    Add the indicator columns used by the signal functions
+
+    Args:
+        df: DataFrame with OHLCV data
+
+    Returns:
+        DataFrame with indicators, trailing support/resistance and volume average
+    """
+    df = df.copy()
+    df = add_moving_averages(df)
+    df = add_rsi(df)
+    df = add_macd(df)
+    df = add_bollinger_bands(df)
+    df = add_atr(df)
+    df = add_adx(df)
+    df['Trailing_Support'] = df['Low'].rolling(window=SR_WINDOW).min()
+    df['Trailing_Resistance'] = df['High'].rolling(window=SR_WINDOW).max()
+    df['Volume_Avg'] = df['Volume'].rolling(window=VOLUME_WINDOW).mean()
+    return df
+
+def _long_reward_risk(df, stop_loss):
+    """Vectorized ``calculate_reward_risk`` for long entries at the close"""
+    entry = df['Close']
+    support = df['Trailing_Support']
+    resistance = df['Trailing_Resistance']
+    target = np.where(entry < resistance, resistance, entry + (entry - support))
+    risk = np.abs(entry - stop_loss)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(risk > 0, np.abs(target - entry) / risk, 0.0)
+    return target, ratio
+
+def _short_reward_risk(df, stop_loss):
+    """Reward/risk for short entries, targeting trailing support"""
+    entry = df['Close']
+    target = df['Trailing_Support'].to_numpy()
+    risk = np.abs(stop_loss - entry)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(risk > 0, np.abs(entry - target) / risk, 0.0)
+    return target, ratio
+
+def _signals(criteria, stop_loss=None, target=None, ratio=None):
+    criteria = np.array(criteria, dtype=bool)
+    n = len(criteria)
+    nan = np.full(n, np.nan)
+    if ratio is not None:
+        criteria &= np.nan_to_num(ratio) >= DEFAULT_REWARD_RISK_RATIO
+    return {
+        "entry": criteria,
+        "stop_loss": nan if stop_loss is None else np.asarray(stop_loss, dtype=float),
+        "target": nan if target is None else np.asarray(target, dtype=float),
+        "reward_risk_ratio": np.zeros(n) if ratio is None else np.nan_to_num(np.asarray(ratio, dtype=float)),
+    }
+
+# =====================================================================
+# SIGNAL FUNCTIONS (vectorized versions of the strategies/ modules)
+# =====================================================================
+
+def momentum_long_signals(df):
+    """Intraday momentum long - see ``strategies.intraday.momentum_long_strategy``"""
+    criteria = (
+        (df['Close'] > df['EMA_8']) & (df['EMA_8'] > df['EMA_21']) &
+        (df['RSI'] > 50) &
+        (df['MACD'] > df['MACD_Signal']) &
+        (df['Volume'] > df['Volume_Avg'])
+    )
+    stop_loss = np.minimum(df['Low'], df['Close'] - 2 * df['ATR'])
+    target, ratio = _long_reward_risk(df, stop_loss)
+    return _signals(criteria, stop_loss, target, ratio)
+
+def breakout_long_signals(df):
+    """Intraday breakout long - see ``strategies.intraday.breakout_long_strategy``"""
+    recent_high = df['High'].rolling(window=10).max().shift(1)
+    criteria = (
+        (df['Close'] > recent_high) &
+        (df['Volume'] > 1.5 * df['Volume_Avg']) &
+        (df['RSI'] > 50) &
+        (df['ADX'] > 20)
+    )
+    stop_loss = np.minimum(np.minimum(df['Low'].shift(1), df['Low']), df['Close'] - 1.5 * df['ATR'])
+    target, ratio = _long_reward_risk(df, stop_loss)
+    return _signals(criteria, stop_loss, target, ratio)
+
+def momentum_short_signals(df):
+    """Intraday momentum short - see ``strategies.intraday.momentum_short_strategy``"""
+    criteria = (
+        (df['Close'] < df['EMA_8']) & (df['EMA_8'] < df['EMA_21']) &
+        (df['RSI'] < 50) &
+        (df['MACD'] < df['MACD_Signal']) &
+        (df['Volume'] > df['Volume_Avg'])
+    )
+    stop_loss = np.maximum(df['High'], df['Close'] + 2 * df['ATR'])
+    target, ratio = _short_reward_risk(df, stop_loss)
+    return _signals(criteria, stop_loss, target, ratio)
+
+def value_investing_signals(df):
+    """Long-term value (technical criteria only) - see ``strategies.long_term``"""
+    return _signals((df['Close'] > df['SMA_200'] * 0.9) & (df['RSI'] < 60))
+
+def growth_investing_signals(df):
+    """Long-term growth (technical criteria only) - see ``strategies.long_term``"""
+    return _signals(
+        (df['Close'] > df['SMA_50']) & (df['SMA_50'] > df['SMA_200']) &
+        (df['EMA_8'] > df['EMA_21']) &
+        (df['RSI'] > 40)
+    )
+
+def momentum_investing_signals(df):
+    """Long-term momentum - see ``strategies.long_term.momentum_investing_strategy``"""
+    return _signals(
+        (df['Close'] > df['SMA_50']) & (df['SMA_50'] > df['SMA_200']) &
+        (df['Close'].pct_change(periods=60) > 0.1) &
+        (df['Close'].pct_change(periods=120) > 0.15) &
+        (df['RSI'] > 50) &
+        (df['MACD'] > df['MACD_Signal'])
+    )
+
+def breakdown_short_signals(df):
+    """Breakdown short - see ``strategies.short_sell.breakdown_short_strategy``"""
+    recent_low = df['Low'].rolling(window=10).min().shift(1)
+    criteria = (
+        (df['Close'] < recent_low) &
+        (df['Close'] < df['SMA_50']) &
+        (df['RSI'] < 40) &
+        (df['MACD'] < df['MACD_Signal']) &
+        (df['Volume'] > df['Volume_Avg'] * 1.2)
+    )
+    stop_loss = np.maximum(df['High'], df['Close'] + 1.5 * df['ATR'])
+    target, ratio = _short_reward_risk(df, stop_loss)
+    return _signals(criteria, stop_loss, target, ratio)
+
+def volatility_short_signals(df):
+    """Volatility short - see ``strategies.short_sell.volatility_short_strategy``"""
+    criteria = (
+        (df['Close'] < df['SMA_50']) &
+        (df['BB_Width'] > df['BB_Width'].rolling(window=20).mean() * 1.5) &
+        (df['Close'] > df['BB_Upper']) &
+        (df['RSI'] > 70) &
+        (df['MACD'] < df['MACD_Signal'])
+    )
+    stop_loss = np.maximum(df['High'], df['Close'] + 1.5 * df['ATR'])
+    target, ratio = _short_reward_risk(df, stop_loss)
+    return _signals(criteria, stop_loss, target, ratio)
+
+# Entry type -> strategy name -> (side, signal function). Swing strategies are
+# still placeholders that never signal, so swing has no entries here.
+SIGNAL_STRATEGIES = {
+    "intraday": {
+        "momentum_long": ("long", momentum_long_signals),
+        "breakout_long": ("long", breakout_long_signals),
+        "momentum_short": ("short", momentum_short_signals),
+    },
+    "swing": {},
+    "long_term": {
+        "value_investing": ("long", value_investing_signals),
+        "growth_investing": ("long", growth_investing_signals),
+        "momentum_investing": ("long", momentum_investing_signals),
+    },
+    "short_sell": {
+        "breakdown_short": ("short", breakdown_short_signals),
+        "volatility_short": ("short", volatility_short_signals),
+    },
+}
+
+def strategy_options(entry_type):
+    """Strategies selectable for ``entry_type``: "any" plus every signal function"""
+    strategies = SIGNAL_STRATEGIES.get(entry_type)
+    return ["any", *strategies] if strategies else []
+
+BACKTEST_ENTRY_TYPES = [entry_type for entry_type in SIGNAL_STRATEGIES if SIGNAL_STRATEGIES[entry_type]]
+
+def validate_strategy(entry_type, strategy="any"):
+    """
+    Raise ValueError unless ``strategy`` has signals for ``entry_type``
+
+    An unknown pair would otherwise backtest to zero trades without a word.
+    """
+    if entry_type not in SIGNAL_STRATEGIES:
+        raise ValueError(f"Invalid entry type: {entry_type}")
+    if not SIGNAL_STRATEGIES[entry_type]:
+        raise ValueError(f"No backtestable strategies for entry type: {entry_type}")
+    if strategy != "any" and strategy not in SIGNAL_STRATEGIES[entry_type]:
+        raise ValueError(
+            f"Unknown {entry_type} strategy: {strategy} "
+            f"(expected one of {', '.join(strategy_options(entry_type))})"
+        )
+
+def compute_signals(df, entry_type, strategy="any"):
+    """
+    Compute entry signal columns for the whole series
+
+    When several strategies fire on the same bar, buys win over sells and
+    then the higher reward/risk ratio wins, as in ``analyze_stock_intraday``.
+
+    Args:
+        df: DataFrame with backtest indicators (see ``add_backtest_indicators``)
+        entry_type: Entry type (intraday, swing, long_term, short_sell)
+        strategy: Strategy name or "any"
+
+    Returns:
+        Dictionary of per-bar arrays: entry, is_long, stop_loss, target,
+        reward_risk_ratio and strategy
+    """
+    validate_strategy(entry_type, strategy)
+    strategies = SIGNAL_STRATEGIES[entry_type]
+    if strategy != "any":
+        strategies = {name: spec for name, spec in strategies.items() if name == strategy}
+
+    n = len(df)
+    best = {
+        "entry": np.zeros(n, dtype=bool),
+        "is_long": np.zeros(n, dtype=bool),
+        "stop_loss": np.full(n, np.nan),
+        "target": np.full(n, np.nan),
+        "reward_risk_ratio": np.zeros(n),
+        "strategy": np.full(n, None, dtype=object),
+    }
+    for name, (side, signal_func) in strategies.items():
+        signals = signal_func(df)
+        is_long = side == "long"
+        better = signals["entry"] & (
+            ~best["entry"] |
+            (is_long & ~best["is_long"]) |
+            ((is_long == best["is_long"]) & (signals["reward_risk_ratio"] > best["reward_risk_ratio"]))
+        )
+        for key in ("stop_loss", "target", "reward_risk_ratio"):
+            best[key] = np.where(better, signals[key], best[key])
+        best["entry"] |= better
+        best["is_long"] = np.where(better, is_long, best["is_long"])
+        best["strategy"][better] = name
+    return best
+
+# =====================================================================
+# SIMULATION
+# =====================================================================
+
+def simulate_trades(dates, close, signals, initial_capital=100000, risk_percent=1.0, warmup=WARMUP_BARS):
+    """
+    Walk entry signals one position at a time and resolve exits on closes
+
+    A position exits on the first later bar whose close crosses the stop
+    loss (checked first) or the target, and a new entry can be taken on the
+    exit bar. Positions still open at the end close on the last bar.
+
+    Args:
+        dates: DatetimeIndex of the bars
+        close: Array of close prices
+        signals: Output of ``compute_signals``
+        initial_capital: Initial capital
+        risk_percent: Risk percentage per trade
+        warmup: Bars skipped before the first entry
+
+    Returns:
+        Tuple of (results DataFrame, final equity)
+    """
+    close = np.asarray(close, dtype=float)
+    n = len(close)
+    tradable = np.asarray(pd.DatetimeIndex(dates).dayofweek < 5)
+    entries = np.flatnonzero(signals["entry"] & tradable)
+    entries = entries[entries >= warmup]
+
+    rows = {column: [] for column in RESULT_COLUMNS}
+
+    def record(index, action, price, reason, pnl, equity, position_value):
+        for column, value in zip(RESULT_COLUMNS, (dates[index], action, price, reason, pnl, equity, position_value)):
+            rows[column].append(value)
+
+    equity = float(initial_capital)
+    cursor = warmup
+    while cursor < n:
+        k = np.searchsorted(entries, cursor)
+        if k >= len(entries):
+            break
+        i = entries[k]
+        is_long = bool(signals["is_long"][i])
+        entry_price = close[i]
+
+        stop_loss = signals["stop_loss"][i]
+        if np.isnan(stop_loss):
+            stop_loss = entry_price * 0.95 if is_long else entry_price * 1.05
+        target = signals["target"][i]
+        if np.isnan(target):
+            target = entry_price * 1.1 if is_long else entry_price * 0.9
+
+        risk_amount = equity * (risk_percent / 100)
+        risk_per_share = entry_price - stop_loss if is_long else stop_loss - entry_price
+        shares = int(risk_amount / risk_per_share) if risk_per_share > 0 else 0
+        position_value = shares * entry_price
+        record(i, "entry", entry_price, signals["strategy"][i] or "unknown", 0.0, equity, position_value)
+
+        after = close[i + 1:]
+        if is_long:
+            stopped, reached = after <= stop_loss, after >= target
+        else:
+            stopped, reached = after >= stop_loss, after <= target
+        hit = (stopped | reached) & tradable[i + 1:]
+
+        if hit.any():
+            offset = int(np.argmax(hit))
+            j = i + 1 + offset
+            reason = "stop_loss" if stopped[offset] else "target"
+            cursor = j
+        else:
+            j = n - 1
+            reason = "end_of_backtest"
+            cursor = n
+
+        exit_price = close[j]
+        if is_long:
+            pnl = (exit_price / entry_price - 1) * position_value
+        else:
+            pnl = (entry_price / exit_price - 1) * position_value
+        equity += pnl
+        record(j, "exit", exit_price, reason, pnl, equity, position_value)
+
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS), equity
+
+def calculate_metrics(results_df, initial_capital, final_equity):
+    """
+    Calculate performance metrics from backtest results
+
+    Args:
+        results_df: DataFrame of entry/exit rows
+        initial_capital: Initial capital
+        final_equity: Equity after the last exit
+
+    Returns:
+        Dictionary with performance metrics
+    """
+    pnl = results_df.loc[results_df["action"] == "exit", "pnl"].to_numpy(dtype=float)
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl <= 0]
+
+    total_trades = len(pnl)
+    total_profit = float(wins.sum())
+    total_loss = float(abs(losses.sum()))
+
+    return {
+        "total_trades": total_trades,
+        "winning_trades": len(wins),
+        "losing_trades": len(losses),
+        "win_rate": (len(wins) / total_trades * 100) if total_trades > 0 else 0,
+        "avg_profit": float(wins.mean()) if len(wins) else 0,
+        "avg_loss": float(abs(losses.mean())) if len(losses) else 0,
+        "profit_factor": (total_profit / total_loss) if total_loss > 0 else float('inf'),
+        "total_profit": total_profit,
+        "total_loss": total_loss,
+        "total_return": (final_equity - initial_capital) / initial_capital * 100,
+        "initial_capital": initial_capital,
+        "final_equity": final_equity
+    }
+
+def _prepare_frame(df):
+    """Date-indexed OHLCV frame from either an indexed or a reset frame"""
+    if 'Date' in df.columns:
+        df = df.set_index('Date')
+    df.index = pd.DatetimeIndex(df.index)
+    return df.sort_index()
+
+def run_vectorized_backtest(df, entry_type, strategy="any", initial_capital=100000, risk_percent=1.0):
+    """
+    Backtest one symbol's OHLCV data
+
+    Args:
+        df: DataFrame with OHLCV data (DatetimeIndex or a Date column)
+        entry_type: Entry type (intraday, swing, long_term, short_sell)
+        strategy: Strategy name or "any"
+        initial_capital: Initial capital
+        risk_percent: Risk percentage
+
+    Returns:
+        Tuple of (results DataFrame, metrics) or (None, None) if there were no trades
+
+    Raises:
+        ValueError: If the strategy has no signal function for the entry type
+    """
+    validate_strategy(entry_type, strategy)
+    if df is None or df.empty:
+        return None, None
+
+    df = add_backtest_indicators(_prepare_frame(df))
+    signals = compute_signals(df, entry_type, strategy)
+    results_df, equity = simulate_trades(df.index, df['Close'], signals, initial_capital, risk_percent)
+
+    if results_df.empty:
+        return None, None
+    return results_df, calculate_metrics(results_df, initial_capital, equity)
+
+# =====================================================================
+# BATCH
+# =====================================================================
+
+def _backtest_symbol(args):
+    symbol, entry_type, strategy, start_date, end_date, initial_capital, risk_percent = args
+    try:
+        from data.yahoo import get_stock_data_range
+        df = get_stock_data_range(symbol, start_date, end_date)
+        return symbol, run_vectorized_backtest(df, entry_type, strategy, initial_capital, risk_percent)
+    except Exception as e:
+        logger.error(f"Error backtesting {symbol}: {e}")
+        return symbol, (None, None)
+
+def run_batch_backtest(symbols, entry_type, strategy, start_date, end_date,
+                       initial_capital=100000, risk_percent=1.0, max_workers=None):
+    """
+    Backtest a watchlist, one symbol per process pool task
+
+    Args:
+        symbols: List of stock symbols
+        entry_type: Entry type (intraday, swing, long_term, short_sell)
+        strategy: Strategy name or "any"
+        start_date: Start date
+        end_date: End date
+        initial_capital: Initial capital per symbol
+        risk_percent: Risk percentage
+        max_workers: Process count (default: CPU count)
+
+    Returns:
+        Dictionary of symbol -> (results DataFrame, metrics)
+    """
+    # Fail once up front instead of once per symbol inside the pool
+    validate_strategy(entry_type, strategy)
+    tasks = [(symbol, entry_type, strategy, start_date, end_date, initial_capital, risk_percent)
+             for symbol in symbols]
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+
+    if workers <= 1:
+        return dict(_backtest_symbol(task) for task in tasks)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(_backtest_symbol, tasks))
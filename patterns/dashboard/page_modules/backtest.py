@@ -9,11 +9,10 @@ from datetime import datetime, timedelta
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from data.mongodb import MongoDB
-from data.yahoo import get_stock_data
-from strategies.intraday import analyze_stock_intraday
-from strategies.swing import analyze_stock_swing
-from strategies.long_term import analyze_stock_long_term
-from strategies.short_sell import analyze_stock_short_sell
+from data.yahoo import get_stock_data_range
+from analysis.backtest import (
+    BACKTEST_ENTRY_TYPES, run_vectorized_backtest, run_batch_backtest, strategy_options
+)
 from utils.logger import get_logger
 
 logger = get_logger(__name__, group="dashboard", service="page_backtest")
@@ -21,6 +20,9 @@ logger = get_logger(__name__, group="dashboard", service="page_backtest")
 # Initialize MongoDB
 db = MongoDB()
 
+# Strategy choices per entry type - only strategies the backtester has signals for
+STRATEGY_OPTIONS = {entry_type: strategy_options(entry_type) for entry_type in BACKTEST_ENTRY_TYPES}
+
 def run_backtest(symbol, entry_type, strategy, start_date, end_date, initial_capital=100000, risk_percent=1.0):
     """
     Run backtest
@@ -39,226 +41,14 @@ def run_backtest(symbol, entry_type, strategy, start_date, end_date, initial_cap
     """
     try:
         # Get historical data
-        df = get_stock_data(symbol, start_date=start_date, end_date=end_date)
+        df = get_stock_data_range(symbol, start_date, end_date)
         
-        if df.empty:
+        if df is None or df.empty:
             logger.warning(f"No data for {symbol}")
             return None, None
         
-        # Initialize results
-        results = []
-        equity = initial_capital
-        position = None
-        
-        # Select analysis function based on entry type
-        if entry_type == "intraday":
-            analyze_func = analyze_stock_intraday
-        elif entry_type == "swing":
-            analyze_func = analyze_stock_swing
-        elif entry_type == "long_term":
-            analyze_func = analyze_stock_long_term
-        elif entry_type == "short_sell":
-            analyze_func = analyze_stock_short_sell
-        else:
-            logger.error(f"Invalid entry type: {entry_type}")
-            return None, None
-        
-        # Run backtest
-        for i in range(20, len(df)):  # Start after indicators are calculated
-            date = df.index[i]
-            
-            # Skip if not a trading day
-            if pd.to_datetime(date).weekday() >= 5:  # Saturday or Sunday
-                continue
-            
-            # Get historical data up to current date
-            historical_df = df.iloc[:i+1]
-            
-            # Check for exit if in position
-            if position is not None:
-                current_price = historical_df["Close"].iloc[-1]
-                
-                # Check for exit conditions
-                if position["type"] == "long":
-                    # Check stop loss
-                    if current_price <= position["stop_loss"]:
-                        # Exit at stop loss
-                        pnl = (current_price / position["entry_price"] - 1) * position["position_value"]
-                        equity += pnl
-                        
-                        results.append({
-                            "date": date,
-                            "action": "exit",
-                            "price": current_price,
-                            "reason": "stop_loss",
-                            "pnl": pnl,
-                            "equity": equity,
-                            "position_value": position["position_value"]
-                        })
-                        
-                        position = None
-                    
-                    # Check target
-                    elif current_price >= position["target"]:
-                        # Exit at target
-                        pnl = (current_price / position["entry_price"] - 1) * position["position_value"]
-                        equity += pnl
-                        
-                        results.append({
-                            "date": date,
-                            "action": "exit",
-                            "price": current_price,
-                            "reason": "target",
-                            "pnl": pnl,
-                            "equity": equity,
-                            "position_value": position["position_value"]
-                        })
-                        
-                        position = None
-                
-                elif position["type"] == "short":
-                    # Check stop loss
-                    if current_price >= position["stop_loss"]:
-                        # Exit at stop loss
-                        pnl = (position["entry_price"] / current_price - 1) * position["position_value"]
-                        equity += pnl
-                        
-                        results.append({
-                            "date": date,
-                            "action": "exit",
-                            "price": current_price,
-                            "reason": "stop_loss",
-                            "pnl": pnl,
-                            "equity": equity,
-                            "position_value": position["position_value"]
-                        })
-                        
-                        position = None
-                    
-                    # Check target
-                    elif current_price <= position["target"]:
-                        # Exit at target
-                        pnl = (position["entry_price"] / current_price - 1) * position["position_value"]
-                        equity += pnl
-                        
-                        results.append({
-                            "date": date,
-                            "action": "exit",
-                            "price": current_price,
-                            "reason": "target",
-                            "pnl": pnl,
-                            "equity": equity,
-                            "position_value": position["position_value"]
-                        })
-                        
-                        position = None
-            
-            # Check for entry if not in position
-            if position is None:
-                # Analyze stock
-                analysis = analyze_func(symbol, historical_df, account_balance=equity, risk_percent=risk_percent)
-                
-                # Check for entry signal
-                if analysis and analysis.get("signal") in ["buy", "sell"]:
-                    # Get entry details
-                    entry_price = historical_df["Close"].iloc[-1]
-                    stop_loss = analysis.get("stop_loss", entry_price * 0.95 if analysis["signal"] == "buy" else entry_price * 1.05)
-                    target = analysis.get("target", entry_price * 1.1 if analysis["signal"] == "buy" else entry_price * 0.9)
-                    
-                    # Calculate position size
-                    risk_amount = equity * (risk_percent / 100)
-                    
-                    if analysis["signal"] == "buy":
-                        risk_per_share = entry_price - stop_loss
-                    else:  # sell
-                        risk_per_share = stop_loss - entry_price
-                    
-                    shares = int(risk_amount / risk_per_share) if risk_per_share > 0 else 0
-                    position_value = shares * entry_price
-                    
-                    # Check if strategy matches
-                    if strategy == "any" or analysis.get("strategy") == strategy:
-                        # Enter position
-                        position = {
-                            "type": "long" if analysis["signal"] == "buy" else "short",
-                            "entry_price": entry_price,
-                            "stop_loss": stop_loss,
-                            "target": target,
-                            "shares": shares,
-                            "position_value": position_value,
-                            "entry_date": date
-                        }
-                        
-                        results.append({
-                            "date": date,
-                            "action": "entry",
-                            "price": entry_price,
-                            "reason": analysis.get("strategy", "unknown"),
-                            "pnl": 0,
-                            "equity": equity,
-                            "position_value": position_value
-                        })
-        
-        # Close position at end of backtest if still open
-        if position is not None:
-            current_price = df["Close"].iloc[-1]
-            
-            if position["type"] == "long":
-                pnl = (current_price / position["entry_price"] - 1) * position["position_value"]
-            else:  # short
-                pnl = (position["entry_price"] / current_price - 1) * position["position_value"]
-            
-            equity += pnl
-            
-            results.append({
-                "date": df.index[-1],
-                "action": "exit",
-                "price": current_price,
-                "reason": "end_of_backtest",
-                "pnl": pnl,
-                "equity": equity,
-                "position_value": position["position_value"]
-            })
-        
-        # Calculate performance metrics
-        if results:
-            results_df = pd.DataFrame(results)
-            
-            # Calculate metrics
-            total_trades = len(results_df[results_df["action"] == "exit"])
-            winning_trades = len(results_df[(results_df["action"] == "exit") & (results_df["pnl"] > 0)])
-            losing_trades = len(results_df[(results_df["action"] == "exit") & (results_df["pnl"] <= 0)])
-            
-            win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-            
-            avg_profit = results_df[(results_df["action"] == "exit") & (results_df["pnl"] > 0)]["pnl"].mean() if winning_trades > 0 else 0
-            avg_loss = abs(results_df[(results_df["action"] == "exit") & (results_df["pnl"] <= 0)]["pnl"].mean()) if losing_trades > 0 else 0
-            
-            total_profit = results_df[(results_df["action"] == "exit") & (results_df["pnl"] > 0)]["pnl"].sum()
-            total_loss = abs(results_df[(results_df["action"] == "exit") & (results_df["pnl"] <= 0)]["pnl"].sum())
-            
-            profit_factor = (total_profit / total_loss) if total_loss > 0 else float('inf')
-            
-            total_return = ((equity - initial_capital) / initial_capital * 100)
-            
-            metrics = {
-                "total_trades": total_trades,
-                "winning_trades": winning_trades,
-                "losing_trades": losing_trades,
-                "win_rate": win_rate,
-                "avg_profit": avg_profit,
-                "avg_loss": avg_loss,
-                "profit_factor": profit_factor,
-                "total_profit": total_profit,
-                "total_loss": total_loss,
-                "total_return": total_return,
-                "initial_capital": initial_capital,
-                "final_equity": equity
-            }
-            
-            return results_df, metrics
-        
-        return None, None
+        # Signals are computed once for the whole series, exits are array scans
+        return run_vectorized_backtest(df, entry_type, strategy, initial_capital, risk_percent)
     except Exception as e:
         logger.error(f"Error running backtest: {e}")
         return None, None
@@ -268,34 +58,27 @@ def show_backtest_page():
     st.title("Backtest")
     
     # Create tabs
-    tab1, tab2 = st.tabs(["Run Backtest", "Saved Backtests"])
+    tab1, tab2, tab3 = st.tabs(["Run Backtest", "Saved Backtests", "Watchlist Backtest"])
     
     # Run Backtest tab
     with tab1:
         st.header("Run Backtest")
         
+        # Entry type sits outside the form so the strategy list follows it
+        entry_type = st.selectbox(
+            "Entry Type",
+            BACKTEST_ENTRY_TYPES
+        )
+        
         # Input form
         with st.form("backtest_form"):
             # Symbol
             symbol = st.text_input("Symbol", "RELIANCE.NS")
             
-            # Entry type
-            entry_type = st.selectbox(
-                "Entry Type",
-                ["intraday", "swing", "long_term", "short_sell"]
-            )
-            
             # Strategy
-            strategies = {
-                "intraday": ["any", "momentum_long", "breakout_long", "reversal_long"],
-                "swing": ["any", "trend_following_long", "pullback_long", "breakout_long"],
-                "long_term": ["any", "value_investing", "growth_investing", "momentum_investing"],
-                "short_sell": ["any", "trend_following_short", "breakdown_short", "volatility_short"]
-            }
-            
             strategy = st.selectbox(
                 "Strategy",
-                strategies.get(entry_type, ["any"])
+                STRATEGY_OPTIONS[entry_type]
             )
             
             # Date range
@@ -554,4 +337,68 @@ def show_backtest_page():
                 # Display trade list
                 st.dataframe(trades_df, use_container_width=True)
         else:
-            st.info("No saved backtest results") 
\ No newline at end of file
+            st.info("No saved backtest results") 
+    
+    # Watchlist Backtest tab
+    with tab3:
+        st.header("Watchlist Backtest")
+        
+        batch_entry_type = st.selectbox(
+            "Entry Type",
+            BACKTEST_ENTRY_TYPES,
+            key="batch_entry_type"
+        )
+        
+        with st.form("batch_backtest_form"):
+            symbols_text = st.text_area("Symbols (one per line)", "RELIANCE.NS\nTCS.NS\nINFY.NS\nHDFCBANK.NS")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                batch_start_date = st.date_input(
+                    "Start Date",
+                    datetime.now() - timedelta(days=730),
+                    key="batch_start_date"
+                )
+            
+            with col2:
+                batch_strategy = st.selectbox(
+                    "Strategy",
+                    STRATEGY_OPTIONS[batch_entry_type],
+                    key="batch_strategy"
+                )
+                batch_end_date = st.date_input(
+                    "End Date",
+                    datetime.now(),
+                    key="batch_end_date"
+                )
+            
+            batch_submitted = st.form_submit_button("Run Watchlist Backtest")
+        
+        if batch_submitted:
+            symbols = [line.strip() for line in symbols_text.splitlines() if line.strip()]
+            
+            with st.spinner(f"Backtesting {len(symbols)} symbols..."):
+                batch_results = run_batch_backtest(
+                    symbols,
+                    entry_type=batch_entry_type,
+                    strategy=batch_strategy,
+                    start_date=batch_start_date,
+                    end_date=batch_end_date
+                )
+            
+            summary = []
+            for symbol, (_, metrics) in batch_results.items():
+                if metrics is None:
+                    summary.append({"Symbol": symbol, "Total Return": None, "Win Rate": None,
+                                    "Profit Factor": None, "Total Trades": 0})
+                    continue
+                summary.append({
+                    "Symbol": symbol,
+                    "Total Return": round(metrics["total_return"], 2),
+                    "Win Rate": round(metrics["win_rate"], 2),
+                    "Profit Factor": round(metrics["profit_factor"], 2),
+                    "Total Trades": metrics["total_trades"]
+                })
+            
+            st.dataframe(pd.DataFrame(summary), use_container_width=True)
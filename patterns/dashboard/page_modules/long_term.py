@@ -14,6 +14,7 @@ from data.yahoo import get_stock_data, get_stock_fundamentals
 from config.queries import LONG_TERM_QUERIES
 from strategies.long_term import analyze_stock_long_term
 from utils.logger import get_logger
+from dashboard.precompute import read_page_frames, refresh_page
 
 logger = get_logger(__name__, group="dashboard", service="page_long_term")
 
@@ -46,49 +47,34 @@ def show_long_term_page(market_condition):
                     st.error("No stocks found")
                 else:
                     # Save to MongoDB
-                    for _, row in df.iterrows():
-                        stock_data = {
-                            "symbol": row["nsecode"],
-                            "name": row.get("name", ""),
-                            "close": float(row["close"]),
-                            "change": float(row.get("per_chg", 0)),
-                            "volume": float(row.get("volume", 0)),
-                            "scan_type": "long_term",
-                            "query_name": query_name,
-                            "timestamp": datetime.now()
-                        }
-                        
+                    records = pd.DataFrame({
+                        "symbol": df["nsecode"],
+                        "name": df["name"] if "name" in df.columns else "",
+                        "close": df["close"].astype(float),
+                        "change": df["per_chg"].astype(float) if "per_chg" in df.columns else 0.0,
+                        "volume": df["volume"].astype(float) if "volume" in df.columns else 0.0,
+                        "scan_type": "long_term",
+                        "query_name": query_name,
+                        "timestamp": datetime.now()
+                    }).to_dict("records")
+                    
+                    for stock_data in records:
                         db.save_scan_result(stock_data)
                     
+                    # Republish the precomputed scanner table with the new results
+                    refresh_page("long_term", db)
+                    
                     st.success(f"Found {len(df)} stocks using {query_name}")
         
-        # Get recent scan results from MongoDB
-        scan_results = db.get_scan_results(scan_type="long_term", limit=50)
+        # Recent scan results, precomputed and formatted by the dashboard precompute service
+        display_df = read_page_frames("long_term", db)["scan_results"]
         
-        if scan_results:
-            # Create DataFrame from scan results
-            df = pd.DataFrame(scan_results)
-            
-            # Format timestamp
-            df["timestamp"] = pd.to_datetime(df["timestamp"]).dt.strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Format change
-            df["change"] = df["change"].apply(lambda x: f"{x:.2f}%")
-            
-            # Format volume
-            df["volume"] = df["volume"].apply(lambda x: f"{x:,.0f}")
-            
-            # Select columns to display
-            display_df = df[["timestamp", "symbol", "name", "close", "change", "volume", "query_name"]]
-            
-            # Rename columns
-            display_df.columns = ["Timestamp", "Symbol", "Name", "Close", "Change", "Volume", "Query"]
-            
+        if not display_df.empty:
             # Display scan results
             st.dataframe(display_df, use_container_width=True)
             
             # Add selected stocks to watchlist
-            selected_symbols = st.multiselect("Add to Watchlist", df["symbol"].unique())
+            selected_symbols = st.multiselect("Add to Watchlist", display_df["Symbol"].unique())
             
             if selected_symbols and st.button("Add Selected to Watchlist"):
                 for symbol in selected_symbols:
@@ -7,6 +7,9 @@ import pandas as pd
 from datetime import datetime
 from utils.logger import get_logger
 
+from dashboard.precompute import read_page_frames
+from dashboard.utils.display_frames import get_mock_scan_results  # noqa: F401
+
 logger = get_logger(__name__, group="dashboard", service="page_swing_scanner")
 
 def show_swing_scanner(data_service):
@@ -40,48 +43,15 @@ def show_swing_scanner(data_service):
     
     # Display mock scan results
     if submit_button or "last_scan_results" in st.session_state:
-        # Store default results in session state if not already there
-        if "last_scan_results" not in st.session_state:
-            st.session_state.last_scan_results = get_mock_scan_results()
-        
-        # Display results
-        results = st.session_state.last_scan_results
+        # Precomputed display frame, shared by every session
+        display_df = read_page_frames("swing_scanner")["scan_results"]
+        st.session_state.last_scan_results = True
         
         # Show results count
-        st.caption(f"Found {len(results)} matching patterns")
+        st.caption(f"Found {len(display_df)} matching patterns")
         
-        if results:
-            # Convert to DataFrame for display
-            df = pd.DataFrame(results)
-            
-            # Format columns
-            if 'timestamp' in df.columns:
-                df['date'] = pd.to_datetime(df['timestamp']).dt.strftime("%Y-%m-%d")
-            
-            # Select columns to display
-            display_columns = ['symbol', 'pattern', 'price', 'signal', 'date']
-            display_df = df[display_columns].rename(columns={
-                'symbol': 'Symbol',
-                'pattern': 'Pattern',
-                'price': 'Price',
-                'signal': 'Signal',
-                'date': 'Date'
-            })
-            
+        if not display_df.empty:
             # Display results
             st.dataframe(display_df, use_container_width=True, height=300)
         else:
             st.info("No matching patterns found for the selected criteria.")
-    
-def get_mock_scan_results():
-    """Generate mock scan results for testing"""
-    return [
-        {"symbol": "RELIANCE", "pattern": "Cup and Handle", "price": 2580.5, "signal": "Buy", "timestamp": datetime.now()},
-        {"symbol": "HDFCBANK", "pattern": "Double Bottom", "price": 1650.25, "signal": "Buy", "timestamp": datetime.now()},
-        {"symbol": "INFY", "pattern": "Ascending Triangle", "price": 1495.75, "signal": "Watch", "timestamp": datetime.now()},
-        {"symbol": "TCS", "pattern": "Support Bounce", "price": 3450.0, "signal": "Buy", "timestamp": datetime.now()},
-        {"symbol": "MARUTI", "pattern": "Breakout", "price": 10250.5, "signal": "Strong Buy", "timestamp": datetime.now()},
-        {"symbol": "SBIN", "pattern": "Channel Breakout", "price": 630.25, "signal": "Buy", "timestamp": datetime.now()},
-        {"symbol": "HINDUNILVR", "pattern": "Golden Cross", "price": 2680.0, "signal": "Watch", "timestamp": datetime.now()},
-        {"symbol": "AXISBANK", "pattern": "Bullish Flag", "price": 950.5, "signal": "Buy", "timestamp": datetime.now()},
-    ] 
\ No newline at end of file
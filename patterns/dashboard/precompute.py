@@ -0,0 +1,177 @@
+"""
+Dashboard precompute service
+
+Builds every page's data frames - including the formatted display frames -
+in the background and publishes them to the shared frame store
+(``shared/data/frame_store.py``). Pages read the latest generation from
+memory-mapped files instead of querying MongoDB / ChartInk and formatting
+rows on every Streamlit rerun, so interactions stay fast while market data
+is being refreshed.
+
+Usage::
+
+    python dashboard/precompute.py            # refresh on a schedule
+    python dashboard/precompute.py --once     # build every page once
+
+Env
+---
+DASHBOARD_PRECOMPUTE_SECONDS         refresh interval during market hours (default 30)
+DASHBOARD_PRECOMPUTE_CLOSED_SECONDS  refresh interval outside market hours (default 300)
+DASHBOARD_FRAMES_MAX_AGE_INTERVALS   refresh intervals after which pages stop trusting
+                                     published frames and build them live (default 3)
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Patterns root and project root, for running as a script
+PATTERNS_ROOT = Path(__file__).resolve().parent.parent
+for path in (PATTERNS_ROOT.parent, PATTERNS_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from shared.data.frame_store import get_frame_store
+from utils.logger import get_logger
+from dashboard.utils.display_frames import (
+    get_global_markets_data,
+    get_mock_scan_results,
+    global_markets_display,
+    movers_display,
+    movers_from_scan_results,
+    pattern_scan_display,
+    scan_results_display,
+)
+
+logger = get_logger(__name__, group="dashboard", service="dashboard_precompute")
+
+PRECOMPUTE_SECONDS = float(os.getenv("DASHBOARD_PRECOMPUTE_SECONDS", "30"))
+PRECOMPUTE_CLOSED_SECONDS = float(os.getenv("DASHBOARD_PRECOMPUTE_CLOSED_SECONDS", "300"))
+FRAMES_MAX_AGE_INTERVALS = float(os.getenv("DASHBOARD_FRAMES_MAX_AGE_INTERVALS", "3"))
+
+
+def precompute_interval():
+    """Seconds between refreshes: shorter while the market is open"""
+    try:
+        from dashboard.utils.market_utils import is_market_open
+        market_open = is_market_open()
+    except Exception:
+        market_open = True
+    return PRECOMPUTE_SECONDS if market_open else PRECOMPUTE_CLOSED_SECONDS
+
+
+# =====================================================================
+# Page builders - db -> {frame name: DataFrame}
+# =====================================================================
+
+def build_home_frames(db):
+    """Market movers and global markets for the home page"""
+    scan_results = db.get_scan_results(limit=500) if db is not None else []
+    gainers, losers = movers_from_scan_results(scan_results)
+    return {
+        "gainers": movers_display(gainers),
+        "losers": movers_display(losers),
+        "global_markets": global_markets_display(get_global_markets_data()),
+    }
+
+
+def build_long_term_frames(db):
+    """Latest long-term scanner results"""
+    scan_results = db.get_scan_results(scan_type="long_term", limit=50) if db is not None else []
+    return {"scan_results": scan_results_display(scan_results)}
+
+
+def build_swing_scanner_frames(db):
+    """Pattern scanner results for the swing page"""
+    return {"scan_results": pattern_scan_display(get_mock_scan_results())}
+
+
+PAGE_BUILDERS = {
+    "home": build_home_frames,
+    "long_term": build_long_term_frames,
+    "swing_scanner": build_swing_scanner_frames,
+}
+
+
+def refresh_page(page, db=None, store=None):
+    """Build one page's frames and publish them; returns the frames"""
+    store = store or get_frame_store()
+    started = time.perf_counter()
+    frames = PAGE_BUILDERS[page](db)
+    build_seconds = time.perf_counter() - started
+    store.publish(page, frames, info={"build_seconds": round(build_seconds, 4)})
+    logger.debug(f"Published {page} frames in {build_seconds:.3f}s")
+    return frames
+
+
+def read_page_frames(page, db=None, max_age=None):
+    """
+    Frames for a page from the store, building them inline if the
+    precompute service has not published any or they are older than max_age
+    (default: DASHBOARD_FRAMES_MAX_AGE_INTERVALS refresh intervals, so pages
+    fall back to live data when the service has stopped)
+    """
+    if max_age is None:
+        max_age = FRAMES_MAX_AGE_INTERVALS * precompute_interval()
+    store = get_frame_store()
+    try:
+        meta, frames = store.read_page(page)
+        if frames:
+            age = time.time() - meta["published_at"]
+            if age <= max_age:
+                return frames
+            logger.warning(f"Precomputed frames for {page} are {age:.0f}s old, building them live")
+    except Exception as e:
+        logger.warning(f"Precomputed frames for {page} unavailable: {e}")
+    try:
+        return refresh_page(page, db, store)
+    except Exception as e:
+        logger.warning(f"Could not publish {page} frames: {e}")
+        return PAGE_BUILDERS[page](db)
+
+
+class DashboardPrecomputer:
+    """Refreshes every page's frames on a schedule"""
+
+    def __init__(self, db=None, store=None, pages=None):
+        self.db = db
+        self.store = store or get_frame_store()
+        self.pages = list(pages or PAGE_BUILDERS)
+
+    def run_once(self):
+        for page in self.pages:
+            try:
+                refresh_page(page, self.db, self.store)
+            except Exception as e:
+                logger.error(f"Error precomputing {page} frames: {e}")
+
+    def interval(self):
+        return precompute_interval()
+
+    def run_forever(self):
+        logger.info(f"Dashboard precompute started for pages: {', '.join(self.pages)}")
+        while True:
+            started = time.monotonic()
+            self.run_once()
+            time.sleep(max(1.0, self.interval() - (time.monotonic() - started)))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute dashboard page data")
+    parser.add_argument("--once", action="store_true", help="Build every page once and exit")
+    parser.add_argument("--pages", nargs="*", choices=sorted(PAGE_BUILDERS), help="Pages to build")
+    args = parser.parse_args()
+
+    from data.mongodb import MongoDB
+    precomputer = DashboardPrecomputer(db=MongoDB(), pages=args.pages)
+    if args.once:
+        precomputer.run_once()
+    else:
+        precomputer.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Display frame builders shared by the dashboard pages and the precompute service
+
+Every builder turns raw data into the frame a page shows, with all values
+already formatted as display strings, so rendering is a plain lookup.
+They have no Streamlit dependency and run either in the background
+precompute service or, when it is not running, inline in the page.
+"""
+
+import html
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Shown until real movers / global market data is available
+DEFAULT_GAINERS = pd.DataFrame({
+    "Symbol": ["TATAMOTORS", "ICICIBANK", "SUNPHARMA", "HDFCBANK", "TCS"],
+    "Price": [825.50, 1095.60, 1248.75, 1678.30, 3745.20],
+    "Change%": [3.8, 2.9, 2.7, 2.5, 2.2]
+})
+
+DEFAULT_LOSERS = pd.DataFrame({
+    "Symbol": ["HINDALCO", "TECHM", "ITC", "HCLTECH", "ASIANPAINT"],
+    "Price": [512.25, 1345.60, 445.75, 1278.30, 3125.20],
+    "Change%": [-2.8, -2.1, -1.9, -1.7, -1.5]
+})
+
+
+def get_global_markets_data():
+    """
+    Get global markets data
+
+    Returns:
+        DataFrame with global market data
+    """
+    # This would be replaced with actual API calls or database queries
+    # Mock data for demonstration
+    global_indices = {
+        "Index": ["S&P 500", "Nasdaq", "Dow Jones", "FTSE 100", "Nikkei 225", "Hang Seng", "DAX"],
+        "Value": ["5,123.45", "16,789.32", "38,456.78", "7,845.21", "36,789.56", "18,234.67", "16,543.21"],
+        "Change%": [0.85, 1.25, 0.45, -0.32, 1.75, -0.65, 0.55]
+    }
+
+    return pd.DataFrame(global_indices)
+
+
+def get_mock_scan_results():
+    """Generate mock scan results for testing"""
+    return [
+        {"symbol": "RELIANCE", "pattern": "Cup and Handle", "price": 2580.5, "signal": "Buy", "timestamp": datetime.now()},
+        {"symbol": "HDFCBANK", "pattern": "Double Bottom", "price": 1650.25, "signal": "Buy", "timestamp": datetime.now()},
+        {"symbol": "INFY", "pattern": "Ascending Triangle", "price": 1495.75, "signal": "Watch", "timestamp": datetime.now()},
+        {"symbol": "TCS", "pattern": "Support Bounce", "price": 3450.0, "signal": "Buy", "timestamp": datetime.now()},
+        {"symbol": "MARUTI", "pattern": "Breakout", "price": 10250.5, "signal": "Strong Buy", "timestamp": datetime.now()},
+        {"symbol": "SBIN", "pattern": "Channel Breakout", "price": 630.25, "signal": "Buy", "timestamp": datetime.now()},
+        {"symbol": "HINDUNILVR", "pattern": "Golden Cross", "price": 2680.0, "signal": "Watch", "timestamp": datetime.now()},
+        {"symbol": "AXISBANK", "pattern": "Bullish Flag", "price": 950.5, "signal": "Buy", "timestamp": datetime.now()},
+    ]
+
+
+def _text(values):
+    """Numbers as they print in an f-string, e.g. 3.8 -> '3.8'"""
+    return pd.Series(values).astype(object).astype(str)
+
+
+def _escaped(values):
+    return pd.Series(values).astype(str).map(html.escape)
+
+
+def _change_columns(change):
+    """Sign-prefixed change text and its CSS class"""
+    change = pd.Series(change, dtype=float)
+    positive = (change > 0).to_numpy()
+    return (
+        pd.Series(np.where(positive, "+", ""), index=change.index) + _text(change.to_numpy()) + "%",
+        pd.Series(np.where(positive, "positive", "negative"), index=change.index),
+    )
+
+
+def movers_display(movers):
+    """Gainers / losers -> Symbol, Price, Change, ChangeClass strings"""
+    change, change_class = _change_columns(movers["Change%"].to_numpy())
+    return pd.DataFrame({
+        "Symbol": _escaped(movers["Symbol"].to_numpy()),
+        "Price": "₹" + _text(movers["Price"].to_numpy()),
+        "Change": change,
+        "ChangeClass": change_class,
+    })
+
+
+def movers_from_scan_results(scan_results, count=5):
+    """Top gainers and losers among the latest scan results (one row per symbol)"""
+    if not scan_results:
+        return DEFAULT_GAINERS, DEFAULT_LOSERS
+
+    df = pd.DataFrame(scan_results)
+    if not {"symbol", "close", "change"} <= set(df.columns):
+        return DEFAULT_GAINERS, DEFAULT_LOSERS
+    if "timestamp" in df.columns:
+        df = df.sort_values("timestamp", ascending=False)
+    df = df.drop_duplicates("symbol")
+    movers = pd.DataFrame({
+        "Symbol": df["symbol"].to_numpy(),
+        "Price": pd.to_numeric(df["close"], errors="coerce").round(2).to_numpy(),
+        "Change%": pd.to_numeric(df["change"], errors="coerce").round(2).to_numpy(),
+    }).dropna()
+
+    gainers = movers[movers["Change%"] > 0].nlargest(count, "Change%")
+    losers = movers[movers["Change%"] < 0].nsmallest(count, "Change%")
+    return (gainers if not gainers.empty else DEFAULT_GAINERS,
+            losers if not losers.empty else DEFAULT_LOSERS)
+
+
+def global_markets_display(global_data):
+    """Global indices -> Index, Value, Change, ChangeClass strings"""
+    change, change_class = _change_columns(global_data["Change%"].to_numpy())
+    return pd.DataFrame({
+        "Index": _escaped(global_data["Index"].to_numpy()),
+        "Value": _escaped(global_data["Value"].to_numpy()),
+        "Change": change,
+        "ChangeClass": change_class,
+    })
+
+
+def scan_results_display(scan_results):
+    """Stored scan results -> the scanner table of the long-term / intraday pages"""
+    columns = ["Timestamp", "Symbol", "Name", "Close", "Change", "Volume", "Query"]
+    if not scan_results:
+        return pd.DataFrame(columns=columns)
+
+    df = pd.DataFrame(scan_results)
+    for column in ("name", "query_name"):
+        if column not in df.columns:
+            df[column] = ""
+    change = pd.to_numeric(df["change"], errors="coerce").to_numpy(dtype=float)
+    volume = pd.to_numeric(df["volume"], errors="coerce").to_numpy(dtype=float)
+
+    return pd.DataFrame({
+        "Timestamp": pd.to_datetime(df["timestamp"]).dt.strftime("%Y-%m-%d %H:%M:%S").to_numpy(),
+        "Symbol": df["symbol"].to_numpy(),
+        "Name": df["name"].fillna("").to_numpy(),
+        "Close": pd.to_numeric(df["close"], errors="coerce").to_numpy(dtype=float),
+        "Change": np.char.mod("%.2f%%", change),
+        "Volume": [f"{v:,.0f}" for v in volume],
+        "Query": df["query_name"].fillna("").to_numpy(),
+    }, columns=columns)
+
+
+def pattern_scan_display(results):
+    """Pattern scanner results -> Symbol, Pattern, Price, Signal, Date"""
+    columns = ["Symbol", "Pattern", "Price", "Signal", "Date"]
+    if not results:
+        return pd.DataFrame(columns=columns)
+
+    df = pd.DataFrame(results)
+    return pd.DataFrame({
+        "Symbol": df["symbol"].to_numpy(),
+        "Pattern": df["pattern"].to_numpy(),
+        "Price": pd.to_numeric(df["price"], errors="coerce").to_numpy(dtype=float),
+        "Signal": df["signal"].to_numpy(),
+        "Date": pd.to_datetime(df["timestamp"]).dt.strftime("%Y-%m-%d").to_numpy(),
+    }, columns=columns)
+
+
+def cards_html(display_df, template):
+    """One HTML string for all rows; ``template`` uses {Column} placeholders"""
+    if display_df is None or display_df.empty:
+        return ""
+    parts = template.split("{")
+    html_rows = pd.Series(parts[0], index=display_df.index)
+    for part in parts[1:]:
+        column, literal = part.split("}", 1)
+        html_rows = html_rows + display_df[column].astype(str) + literal
+    return "".join(html_rows.tolist())
@@ -0,0 +1,289 @@
+"""
+Time-decayed signal store for the stock tracker
+
+Keeps one fixed-size row of aggregates per symbol instead of a growing list
+of signal timestamps:
+
+- ``last_signal``  time of the latest buy signal (recency)
+- ``frequency``    signal count decayed exponentially, as of ``frequency_at``
+- ``avg_*``        exponential moving averages of strength, volume and R/R
+
+Every update is O(1) per symbol (or one vectorized pass per scan) and
+scores are computed for all symbols at once when ranking.
+
+On disk the store is an append-only log of fixed-width binary rows - the
+full state of a symbol after each update. Loading keeps the last row per
+symbol; once the log holds several rows per symbol it is compacted to one
+row each and atomically replaced.
+
+Env
+---
+SIGNAL_FREQUENCY_HALF_LIFE_HOURS   half-life of the frequency accumulator (default 36)
+"""
+
+import functools
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__, group="shared", service="signal_store")
+
+FREQUENCY_HALF_LIFE_HOURS = float(os.getenv("SIGNAL_FREQUENCY_HALF_LIFE_HOURS", "36"))
+
+# Averages move 30% towards each new observation
+EMA_WEIGHT = 0.3
+# Log rows per symbol before the log is compacted
+COMPACT_RATIO = 4
+
+SIGNAL_DTYPE = np.dtype([
+    ("symbol", "U24"),
+    ("last_signal", "f8"),      # epoch seconds, NaN before the first buy signal
+    ("frequency", "f8"),
+    ("frequency_at", "f8"),
+    ("buy_signals", "i8"),
+    ("sell_signals", "i8"),
+    ("avg_strength", "f8"),
+    ("avg_volume", "f8"),
+    ("avg_reward_risk", "f8"),
+    ("last_price", "f8"),
+    ("last_update", "f8"),
+    ("source", "U32"),
+])
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _epoch(when):
+    if when is None:
+        return datetime.now().timestamp()
+    return when.timestamp() if isinstance(when, datetime) else float(when)
+
+
+def _format_times(values):
+    """Epoch seconds -> local time strings ('' for NaN)"""
+    return [datetime.fromtimestamp(v).strftime(TIME_FORMAT) if v == v else "" for v in values.tolist()]
+
+
+def _locked(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def signal_scores(rows, now):
+    """
+    Ranking score of every row at ``now`` (epoch seconds)
+
+    Weights as before: 35% recency (linear over 24h), 25% frequency (capped
+    at 5 decayed signals), 15% strength, 10% volume (capped at 1M), 15%
+    reward/risk (capped at 3:1).
+    """
+    hours = (now - rows["last_signal"]) / 3600.0
+    recency = np.where(np.isnan(hours), 0.0, np.clip(24.0 - hours, 0.0, 24.0) / 24.0)
+    decay = np.exp2(-np.maximum(now - rows["frequency_at"], 0.0) / (FREQUENCY_HALF_LIFE_HOURS * 3600.0))
+    frequency = np.minimum(1.0, rows["frequency"] * decay / 5.0)
+    return (
+        0.35 * recency +
+        0.25 * frequency +
+        0.15 * rows["avg_strength"] +
+        0.10 * np.minimum(1.0, rows["avg_volume"] / 1_000_000) +
+        0.15 * np.minimum(1.0, rows["avg_reward_risk"] / 3.0)
+    )
+
+
+class SignalStore:
+    """Per-symbol decayed signal aggregates backed by an append-only log"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.rows = np.zeros(64, dtype=SIGNAL_DTYPE)
+        self.size = 0
+        self.index = {}
+        self._dirty = set()
+        self._log_rows = 0
+        self._lock = threading.RLock()  # Scheduler thread writes, dashboard reads
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def _positions(self, symbols, now):
+        """Row positions of ``symbols``, adding rows for new ones"""
+        positions = np.empty(len(symbols), dtype=np.int64)
+        for i, symbol in enumerate(symbols):
+            position = self.index.get(symbol)
+            if position is None:
+                if self.size == len(self.rows):
+                    self.rows = np.resize(self.rows, 2 * len(self.rows))
+                position = self.size
+                row = np.zeros(1, dtype=SIGNAL_DTYPE)[0]
+                row["symbol"] = symbol
+                row["last_signal"] = np.nan
+                row["frequency_at"] = now
+                self.rows[position] = row
+                self.index[symbol] = position
+                self.size += 1
+            positions[i] = position
+        self._dirty.update(positions.tolist())
+        return positions
+
+    @_locked
+    def record_signals(self, symbols, when=None, strength=0.0, volume=0.0, reward_risk=0.0,
+                       price=None, source=""):
+        """
+        Record a buy signal for each symbol (arrays or scalars per argument)
+
+        Symbols must be unique within one call.
+        """
+        now = _epoch(when)
+        symbols = [str(s) for s in symbols]
+        if not symbols:
+            return
+        at = self._positions(symbols, now)
+        rows = self.rows
+
+        decay = np.exp2(-np.maximum(now - rows["frequency_at"][at], 0.0) / (FREQUENCY_HALF_LIFE_HOURS * 3600.0))
+        rows["frequency"][at] = rows["frequency"][at] * decay + 1.0
+        rows["frequency_at"][at] = now
+        rows["last_signal"][at] = now
+        rows["buy_signals"][at] += 1
+        for column, value in (("avg_strength", strength), ("avg_volume", volume),
+                              ("avg_reward_risk", reward_risk)):
+            rows[column][at] = (1 - EMA_WEIGHT) * rows[column][at] + EMA_WEIGHT * np.asarray(value, dtype=float)
+        if price is not None:
+            rows["last_price"][at] = price
+        rows["last_update"][at] = now
+        if source:
+            rows["source"][at] = source
+
+    @_locked
+    def record_sell(self, symbol, when=None):
+        at = self._positions([symbol], _epoch(when))
+        self.rows["sell_signals"][at] += 1
+
+    @_locked
+    def update_price(self, symbol, price, when=None):
+        now = _epoch(when)
+        at = self._positions([symbol], now)
+        self.rows["last_price"][at] = price
+        self.rows["last_update"][at] = now
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @_locked
+    def last_update(self, symbol):
+        """Datetime of the symbol's last update, or None"""
+        position = self.index.get(symbol)
+        return None if position is None else datetime.fromtimestamp(self.rows["last_update"][position])
+
+    @_locked
+    def top(self, n=100, when=None):
+        """DataFrame of the ``n`` best scored symbols at ``when``, best first"""
+        if not self.size:
+            return pd.DataFrame()
+        rows = self.rows[:self.size]
+        scores = signal_scores(rows, _epoch(when))
+        if n < len(scores):
+            best = np.argpartition(-scores, n - 1)[:n]
+        else:
+            best = np.arange(len(scores))
+        best = best[np.argsort(-scores[best], kind="stable")]
+
+        top = pd.DataFrame({name: rows[name][best] for name in SIGNAL_DTYPE.names})
+        top["score"] = scores[best]
+        top["last_update"] = _format_times(top["last_update"].to_numpy())
+        top["last_signal"] = _format_times(top["last_signal"].to_numpy())
+        return top
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        raw = self.path.read_bytes()
+        usable = len(raw) - len(raw) % SIGNAL_DTYPE.itemsize
+        if usable != len(raw):
+            # Cut off a torn last row so the next append starts on a row boundary
+            logger.warning(f"⚠️ Dropping torn {len(raw) - usable}-byte tail of {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(usable)
+        log = np.frombuffer(raw[:usable], dtype=SIGNAL_DTYPE)
+        self._log_rows = len(log)
+        if not len(log):
+            return
+        # Last row per symbol wins
+        _, first_from_end = np.unique(log["symbol"][::-1], return_index=True)
+        latest = np.sort(len(log) - 1 - first_from_end)
+        self.rows = np.resize(log[latest].copy(), max(64, 2 * len(latest)))
+        self.size = len(latest)
+        self.index = {symbol: i for i, symbol in enumerate(self.rows["symbol"][:self.size].tolist())}
+
+    @_locked
+    def flush(self):
+        """Append the rows changed since the last flush; compact when the log grows"""
+        if not self._dirty:
+            return
+        if self._log_rows + len(self._dirty) > COMPACT_RATIO * max(self.size, 16):
+            self.compact()
+            return
+        changed = self.rows[np.sort(np.fromiter(self._dirty, dtype=np.int64))]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(changed.tobytes())
+        self._log_rows += len(changed)
+        self._dirty.clear()
+
+    @_locked
+    def compact(self):
+        """Rewrite the log with one row per symbol"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(self.rows[:self.size].tobytes())
+        os.replace(tmp, self.path)
+        self._log_rows = self.size
+        self._dirty.clear()
+
+    @_locked
+    def import_metrics(self, metrics_file):
+        """One-off import of the old stock_metrics.json format"""
+        try:
+            with open(metrics_file, "r") as f:
+                metrics = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not import {metrics_file}: {e}")
+            return 0
+
+        for symbol, data in metrics.items():
+            times = sorted(_epoch(datetime.strptime(t, TIME_FORMAT)) for t in data.get("signal_times", []))
+            at = self._positions([symbol], times[-1] if times else _epoch(None))[0]
+            row = self.rows[at]
+            if times:
+                row["last_signal"] = times[-1]
+                row["frequency"] = float(np.sum(np.exp2(
+                    -(times[-1] - np.asarray(times)) / (FREQUENCY_HALF_LIFE_HOURS * 3600.0))))
+                row["frequency_at"] = times[-1]
+            row["buy_signals"] = data.get("buy_signals", 0)
+            row["sell_signals"] = data.get("sell_signals", 0)
+            for column in ("avg_strength", "avg_volume", "avg_reward_risk", "last_price"):
+                row[column] = float(data.get(column, 0) or 0)
+            if data.get("last_update"):
+                row["last_update"] = _epoch(datetime.strptime(data["last_update"], TIME_FORMAT))
+            row["source"] = data.get("source", "")
+        self.compact()
+        logger.info(f"Imported {len(metrics)} symbols from {metrics_file}")
+        return len(metrics)
@@ -8,6 +8,7 @@ import random
 from datetime import datetime, timedelta
 from utils.logger import get_logger
 from data.chartink import get_chartink_scans
+from data.waterfall import iter_waterfall, new_symbols
 
 logger = get_logger(__name__, group="shared", service="top_stocks_service")
 
@@ -188,17 +189,19 @@ class TopStocksService:
         """
         logger.info(f"Running waterfall query (min={min_stocks}, max={max_stocks})")
         all_stocks = []
+        seen_symbols = set()
         found_queries = 0
         
-        for idx, query_key in enumerate(QUERY_WATERFALL):
-            logger.info(f"Waterfall [{idx+1}/{len(QUERY_WATERFALL)}]: Trying '{query_key}'")
+        # Later queries run speculatively while earlier results are processed
+        steps = [(query_key, CHARTINK_QUERIES[query_key]["query"]) for query_key in QUERY_WATERFALL]
+        for idx, (query_key, df, error) in enumerate(iter_waterfall(steps, get_chartink_scans)):
+            logger.info(f"Waterfall [{idx+1}/{len(QUERY_WATERFALL)}]: Result for '{query_key}'")
             
             try:
-                query_data = CHARTINK_QUERIES[query_key]
-                query_name = query_data["name"]
+                if error is not None:
+                    raise error
                 
-                # Run the query
-                df = get_chartink_scans(query_data["query"])
+                query_name = CHARTINK_QUERIES[query_key]["name"]
                 
                 # Skip if no results
                 if df is None or df.empty:
@@ -211,51 +214,17 @@ class TopStocksService:
                 remaining_slots = max_stocks - len(all_stocks)
                 if remaining_slots <= 0:
                     break
-                    
-                # Get symbols we already have to avoid duplicates
-                existing_symbols = {s["symbol"] for s in all_stocks if "symbol" in s}
                 
-                # Process new stocks
-                stocks = []
-                unique_count = 0
-                
-                for i, row in df.iterrows():
-                    symbol = row.get("nsecode", "")
-                    
-                    # Skip if we already have this symbol
-                    if symbol in existing_symbols:
-                        continue
-                        
-                    # Calculate signal
-                    signal = "bullish" if float(row.get('per_chg', 0)) > 0 else "bearish"
-                    
-                    # Create stock object with CONSISTENT FIELD MAPPING
-                    stock = {
-                        "symbol": symbol,
-                        "company": row.get("name", symbol),  # Ensure company field exists
-                        "name": row.get("name", symbol),
-                        "pattern": query_name,
-                        "per_chg": float(row.get("per_chg", 0)),
-                        "change": f"{float(row.get('per_chg', 0)):.2f}%",  # Formatted change as string
-                        "volume": int(row.get("volume", 0)),
-                        "close": float(row.get("close", 0)),
-                        "query_key": query_key,
-                        "signal": signal  # Add signal field for UI
-                    }
-                    
-                    stocks.append(stock)
-                    existing_symbols.add(symbol)
-                    unique_count += 1
-                    
-                    # Stop if we have enough from this query
-                    if unique_count >= remaining_slots:
-                        break
+                # Skip symbols we already have, then take what still fits
+                fresh = new_symbols(df, seen_symbols).head(remaining_slots)
+                stocks = self._stocks_from_scan(fresh, query_name, query_key)
+                seen_symbols.update(stock["symbol"] for stock in stocks)
                 
                 # Add the new stocks to our collection
                 all_stocks.extend(stocks)
-                logger.info(f"Added {unique_count} unique stocks from '{query_name}'")
+                logger.info(f"Added {len(stocks)} unique stocks from '{query_name}'")
                 
-                # If we have enough stocks, we can stop
+                # If we have enough stocks, we can stop (queued queries are cancelled)
                 if len(all_stocks) >= min_stocks:
                     logger.info(f"Reached min stocks ({min_stocks}), can stop waterfall")
                     break
@@ -287,6 +256,33 @@ class TopStocksService:
         
         return all_stocks
 
+    @staticmethod
+    def _stocks_from_scan(df, query_name, query_key):
+        """ChartInk scan rows -> stock dicts with CONSISTENT FIELD MAPPING"""
+        if df.empty:
+            return []
+        
+        def column(name, default):
+            return df[name] if name in df.columns else pd.Series(default, index=df.index)
+        
+        symbols = column("nsecode", "")
+        per_chg = column("per_chg", 0).astype(float)
+        names = column("name", None).fillna(symbols)
+        
+        stocks = pd.DataFrame({
+            "symbol": symbols,
+            "company": names,  # Ensure company field exists
+            "name": names,
+            "pattern": query_name,
+            "per_chg": per_chg,
+            "change": per_chg.map("{:.2f}%".format),  # Formatted change as string
+            "volume": column("volume", 0).astype(int),
+            "close": column("close", 0).astype(float),
+            "query_key": query_key,
+            "signal": pd.Series(per_chg.to_numpy() > 0, index=df.index).map({True: "bullish", False: "bearish"})  # Add signal field for UI
+        })
+        return stocks.to_dict("records")
+
     def _run_single_query(self, query_key, limit=10):
         """
         Run a single ChartInk query with debugging
@@ -319,24 +315,7 @@ class TopStocksService:
                 return []
             
             # Process results - MAKE SURE ALL REQUIRED FIELDS ARE INCLUDED
-            stocks = []
-            for i, row in df.head(limit).iterrows():
-                # Calculate a signal value (bullish/bearish/neutral)
-                signal = "bullish" if float(row.get('per_chg', 0)) > 0 else "bearish"
-                
-                stock = {
-                    "symbol": row.get("nsecode", ""),
-                    "name": row.get("name", row.get("nsecode", "")),
-                    "change": f"{row.get('per_chg', 0):.2f}%", 
-                    "per_chg": float(row.get("per_chg", 0)),
-                    "volume": int(row.get("volume", 0)),
-                    "close": float(row.get("close", 0)),
-                    "pattern": query_name,
-                    "query_key": query_key,
-                    "company": row.get("name", row.get("nsecode", "")),  # Ensure company field exists
-                    "signal": signal  # Add signal field for UI
-                }
-                stocks.append(stock)
+            stocks = self._stocks_from_scan(df.head(limit), query_name, query_key)
             
             self.last_data_source = f"ChartInk: {query_name}"
             
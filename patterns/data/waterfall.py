@@ -0,0 +1,76 @@
+"""
+Speculative waterfall executor for prioritized scanner queries
+
+A query waterfall tries scans in priority order until enough stocks are
+found. Running it strictly one query at a time costs a full ChartInk round
+trip (plus the rate-limit gap) per step, which adds up on quiet days when
+the selective queries come back empty.
+
+``iter_waterfall`` keeps the next few queries in flight while the caller
+looks at the current one, and still yields results strictly in priority
+order. When the caller stops consuming (``break`` out of the loop), queries
+that have not started are cancelled. Rate limiting stays with the fetch
+function - ``get_chartink_scans`` spaces concurrent calls itself.
+
+Env
+---
+WATERFALL_SPECULATION   queries kept in flight ahead of the consumer (default 3)
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__, group="shared", service="data_waterfall")
+
+WATERFALL_SPECULATION = int(os.getenv("WATERFALL_SPECULATION", "3"))
+
+
+def iter_waterfall(steps, fetch, speculation=None):
+    """
+    Run ``fetch(payload)`` for each ``(key, payload)`` step, speculatively
+
+    Args:
+        steps: Ordered (key, payload) pairs, highest priority first
+        fetch: Function returning a DataFrame (or None) for one payload
+        speculation: Queries kept in flight (1 runs the waterfall sequentially)
+
+    Yields:
+        (key, DataFrame or None, error or None) in the order of ``steps``
+    """
+    steps = list(steps)
+    if not steps:
+        return
+    speculation = max(1, min(speculation or WATERFALL_SPECULATION, len(steps)))
+    executor = ThreadPoolExecutor(max_workers=speculation, thread_name_prefix="waterfall")
+    futures = []
+    try:
+        for key, payload in steps[:speculation]:
+            futures.append(executor.submit(fetch, payload))
+
+        for position, (key, _) in enumerate(steps):
+            try:
+                result, error = futures[position].result(), None
+            except Exception as e:
+                result, error = None, e
+            # Keep the window full while the caller processes this result
+            upcoming = position + speculation
+            if upcoming < len(steps):
+                futures.append(executor.submit(fetch, steps[upcoming][1]))
+            yield key, result, error
+    finally:
+        pending = sum(1 for future in futures if future.cancel())
+        if pending:
+            logger.info(f"Waterfall stopped early, cancelled {pending} queued queries")
+        # Queries already in flight finish in the background (and warm the cache)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def new_symbols(df, seen, column="nsecode"):
+    """Rows of ``df`` whose symbol is not in ``seen`` (first occurrence of each)"""
+    if column not in df.columns:
+        return df.iloc[0:0]
+    symbols = df[column].fillna("").astype(str)
+    fresh = ~symbols.isin(seen) & ~symbols.duplicated()
+    return df[fresh.to_numpy()]
@@ -6,6 +6,7 @@ import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
 from shared.config.settings import YAHOO_INTERVAL_MAPPING
+from shared.data import get_bar_store
 from utils.logger import get_logger
 
 logger = get_logger(__name__, group="shared", service="data_yahoo")
@@ -27,8 +28,8 @@ def get_stock_data(symbol, period="1mo", interval="1d"):
         if not symbol.endswith(('.NS', '.BO')):
             symbol = f"{symbol}.NS"
             
-        stock = yf.Ticker(symbol)
-        df = stock.history(period=period, interval=YAHOO_INTERVAL_MAPPING.get(interval, interval))
+        # Served from the local bar store; only uncovered ranges hit Yahoo
+        df = get_bar_store().get_period(symbol, period, YAHOO_INTERVAL_MAPPING.get(interval, interval))
         
         if df.empty:
             logger.warning(f"No data found for {symbol}")
@@ -45,6 +46,40 @@ def get_stock_data(symbol, period="1mo", interval="1d"):
         logger.error(f"Error fetching data for {symbol}: {e}")
         return None
 
+def get_stock_data_range(symbol, start_date, end_date=None, interval="1d"):
+    """
+    Fetch stock data between two dates
+    
+    Args:
+        symbol: Stock symbol (will append .NS for NSE stocks)
+        start_date: First date to include
+        end_date: Last date to include (default: now)
+        interval: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+    
+    Returns:
+        DataFrame with OHLCV data
+    """
+    try:
+        if not symbol.endswith(('.NS', '.BO')):
+            symbol = f"{symbol}.NS"
+        
+        if end_date is not None:
+            # Dates are inclusive - take every bar of the end day
+            end_date = pd.Timestamp(end_date) + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)
+        df = get_bar_store().get_bars(symbol, start_date, end_date, YAHOO_INTERVAL_MAPPING.get(interval, interval))
+        
+        if df.empty:
+            logger.warning(f"No data found for {symbol}")
+            return None
+        
+        df = df.reset_index()
+        df.columns = [col if col != 'Datetime' else 'Date' for col in df.columns]
+        
+        return df
+    except Exception as e:
+        logger.error(f"Error fetching data for {symbol}: {e}")
+        return None
+
 def get_market_index_data(index_symbol="^NSEI", period="1mo", interval="1d"):
     """
     Fetch market index data from Yahoo Finance
@@ -17,6 +17,13 @@ def launch_app():
     
     subprocess.run(["streamlit", "run", app_path], env=env)
 
+def launch_precompute():
+    """Start the dashboard precompute service in the background"""
+    env = os.environ.copy()
+    env["PYTHONPATH"] = path_manager.PROJECT_ROOT
+    
+    return subprocess.Popen([sys.executable, os.path.join(path_manager.PATHS["dashboard"], "precompute.py")], env=env)
+
 def launch_background():
     """Launch background tasks"""
     subprocess.run([sys.executable, "main.py"])
@@ -25,11 +32,18 @@ if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="Launch Market Analyzer")
-    parser.add_argument("--mode", choices=["app", "background", "both"], 
+    parser.add_argument("--mode", choices=["app", "background", "precompute", "both"], 
                         default="app", help="Launch mode")
     
     args = parser.parse_args()
     
+    if args.mode == "precompute":
+        launch_precompute().wait()
+    
+    if args.mode == "both":
+        # Pages read the frames the precompute service publishes
+        launch_precompute()
+    
     if args.mode == "app" or args.mode == "both":
         # Start Streamlit app
         launch_app()
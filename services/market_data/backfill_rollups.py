@@ -0,0 +1,41 @@
+"""
+One-off rollup backfill for market_data.price_data
+
+Rolls up the bars stored before the 5m/1d tiers existed, oldest first, and
+records the watermark retention checks before pruning. Safe to re-run: it
+resumes from the recorded watermark.
+
+Usage::
+
+    python -m services.market_data.backfill_rollups [--chunk-days 7]
+"""
+
+import argparse
+import logging
+
+from .database import SessionLocal
+from .price_store import BACKFILL_CHUNK_DAYS, PriceStore
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the 5m/1d price rollups")
+    parser.add_argument("--chunk-days", type=int, default=BACKFILL_CHUNK_DAYS,
+                        help="Days rolled up per transaction")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        watermark = PriceStore().backfill_rollups(db, chunk_days=args.chunk_days)
+        logger.info(f"Rollups complete through {watermark}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import logging
@@ -10,6 +12,7 @@ from .database import get_db, engine
 from .models import Base, PriceData, FundamentalData
 from .schemas import PriceDataCreate, PriceDataResponse, FundamentalDataResponse
 from .services.market_data_service import MarketDataService
+from .price_store import PriceStore, INTERVALS, parse_columnar, parse_records
 from .core.config import settings
 
 # Configure logging
@@ -40,6 +43,7 @@ app.add_middleware(
 
 # Initialize services
 market_data_service = MarketDataService()
+price_store = PriceStore()
 
 @app.get("/")
 async def root():
@@ -92,14 +96,86 @@ async def update_price_data(
     data: List[PriceDataCreate],
     db: Session = Depends(get_db)
 ):
-    """Update price data for multiple symbols"""
+    """Update price data for multiple symbols
+
+    Goes through the price store like the bulk endpoint, so the 5m / 1d
+    rollups and retention stay in step with the base bars.
+    """
     try:
-        await market_data_service.update_price_data(db=db, data=data)
+        rows = list(parse_records(item.dict() for item in data))
+        await run_in_threadpool(price_store.ingest, db, rows)
         return {"status": "success", "message": f"Updated {len(data)} price records"}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid price rows: {str(e)}")
     except Exception as e:
         logger.error(f"Error updating price data: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _request_lines(request: Request):
+    """Split the request body into lines as it streams in"""
+    pending = b""
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+@app.post("/api/v1/market/price/bulk")
+async def bulk_ingest_price_data(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """Bulk upsert price bars.
+
+    Accepts NDJSON (application/x-ndjson), CSV with a header row (text/csv) or
+    a columnar JSON object of arrays (application/json). Rows are COPYed and
+    upserted in batches, and the 5m / 1d rollups are refreshed with them.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    try:
+        if content_type == "application/json":
+            payload = await request.json()
+            summary = await run_in_threadpool(price_store.ingest, db, parse_columnar(payload))
+        elif content_type == "text/csv":
+            summary = await price_store.ingest_stream(db, _request_lines(request), fmt="csv")
+        else:
+            summary = await price_store.ingest_stream(db, _request_lines(request), fmt="ndjson")
+        return {"status": "success", **summary}
+    except (ValueError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid price rows: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error in bulk price ingest: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/v1/market/prices")
+async def get_price_ranges(
+    symbols: str = Query(..., description="Comma-separated symbols"),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    interval: str = Query("1m", description=f"One of {', '.join(INTERVALS)}"),
+    db: Session = Depends(get_db)
+):
+    """Columnar bars for several symbols, downsampled server-side to interval"""
+    if interval not in INTERVALS:
+        raise HTTPException(status_code=400, detail=f"Unsupported interval '{interval}'")
+    symbol_list = [s.strip() for s in symbols.split(",") if s.strip()]
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="No symbols given")
+    try:
+        if not end_date:
+            end_date = datetime.utcnow()
+        if not start_date:
+            start_date = end_date - timedelta(days=30)
+
+        data = await run_in_threadpool(price_store.read_range, db, symbol_list, start_date, end_date, interval)
+        # Plain arrays - skip per-row response model validation
+        return JSONResponse(content=data)
+    except Exception as e:
+        logger.error(f"Error fetching price ranges: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
@@ -22,6 +22,52 @@ class PriceData(Base):
     def __repr__(self):
         return f"<PriceData(symbol='{self.symbol}', timestamp='{self.timestamp}')>"
 
+class PriceData5m(Base):
+    """5-minute rollup of price_data, maintained on bulk ingest"""
+    __tablename__ = "price_data_5m"
+    __table_args__ = {"schema": "market_data"}
+
+    symbol = Column(String(10), primary_key=True)
+    timestamp = Column(DateTime, primary_key=True)
+    open = Column(Numeric(10, 2), nullable=False)
+    high = Column(Numeric(10, 2), nullable=False)
+    low = Column(Numeric(10, 2), nullable=False)
+    close = Column(Numeric(10, 2), nullable=False)
+    volume = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<PriceData5m(symbol='{self.symbol}', timestamp='{self.timestamp}')>"
+
+class PriceData1d(Base):
+    """Daily rollup of price_data_5m, maintained on bulk ingest"""
+    __tablename__ = "price_data_1d"
+    __table_args__ = {"schema": "market_data"}
+
+    symbol = Column(String(10), primary_key=True)
+    timestamp = Column(DateTime, primary_key=True)
+    open = Column(Numeric(10, 2), nullable=False)
+    high = Column(Numeric(10, 2), nullable=False)
+    low = Column(Numeric(10, 2), nullable=False)
+    close = Column(Numeric(10, 2), nullable=False)
+    volume = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<PriceData1d(symbol='{self.symbol}', timestamp='{self.timestamp}')>"
+
+class PriceRollupState(Base):
+    """How far the rollup tiers are complete; retention never prunes past it"""
+    __tablename__ = "price_rollup_state"
+    __table_args__ = {"schema": "market_data"}
+
+    name = Column(String(32), primary_key=True)
+    rolled_up_through = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<PriceRollupState(name='{self.name}', rolled_up_through='{self.rolled_up_through}')>"
+
 class FundamentalData(Base):
     """Model for storing fundamental data"""
     __tablename__ = "fundamental_data"
@@ -0,0 +1,487 @@
+"""
+Price Store
+===========
+
+Bulk ingestion and range reads over ``market_data.price_data``.
+
+Tiers
+-----
+price_data      base bars as pushed by the collectors (1m)
+price_data_5m   5-minute rollup of price_data
+price_data_1d   daily rollup of price_data_5m
+
+Ingest COPYs each batch into a temporary table, upserts it into price_data
+with a single ``INSERT ... ON CONFLICT`` and recomputes the 5m and 1d buckets
+the batch touched, all in one transaction. Every write path (bulk endpoint and
+the per-record ``/price/update``) goes through here, so the rollups never lag
+the base bars. Reads go to the coarsest tier
+whose step divides the requested interval and downsample in SQL, returning
+columnar payloads (one array per field) instead of per-row objects.
+
+Bars stored before the rollup tiers existed are rolled up once by
+``backfill_rollups`` (``python -m services.market_data.backfill_rollups``),
+which records how far the rollups are complete in
+``market_data.price_rollup_state``.
+
+Retention is off by default. When enabled it prunes base bars after
+MARKET_DATA_RETENTION_1M_DAYS and 5m bars after MARKET_DATA_RETENTION_5M_DAYS
+(0 keeps forever), but never past the rollup watermark, so no bar is deleted
+before its rollups exist. Daily bars are kept. Late bars older than the base
+retention are stored but recompute their rollup bucket from what is left, so
+keep the retention above the collectors' backfill window.
+
+Env
+---
+MARKET_DATA_BULK_BATCH_SIZE        rows per COPY batch (default 5000)
+MARKET_DATA_RETENTION_1M_DAYS      base bar retention in days (default 0, keep forever)
+MARKET_DATA_RETENTION_5M_DAYS      5m bar retention in days (default 0, keep forever)
+MARKET_DATA_BACKFILL_CHUNK_DAYS    days rolled up per backfill transaction (default 7)
+MARKET_DATA_RETENTION_CHECK_SECONDS  minimum gap between retention runs (default 3600)
+"""
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = int(os.getenv("MARKET_DATA_BULK_BATCH_SIZE", "5000"))
+RETENTION_1M_DAYS = int(os.getenv("MARKET_DATA_RETENTION_1M_DAYS", "0"))
+RETENTION_5M_DAYS = int(os.getenv("MARKET_DATA_RETENTION_5M_DAYS", "0"))
+BACKFILL_CHUNK_DAYS = int(os.getenv("MARKET_DATA_BACKFILL_CHUNK_DAYS", "7"))
+RETENTION_CHECK_SECONDS = float(os.getenv("MARKET_DATA_RETENTION_CHECK_SECONDS", "3600"))
+
+FIELDS = ("symbol", "timestamp", "open", "high", "low", "close", "volume")
+
+INTERVALS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "1d": 86400,
+    "1w": 7 * 86400,
+}
+
+# (interval, table, retention days) - finest first
+TIERS = (
+    ("1m", "market_data.price_data", RETENTION_1M_DAYS),
+    ("5m", "market_data.price_data_5m", RETENTION_5M_DAYS),
+    ("1d", "market_data.price_data_1d", 0),
+)
+
+STAGING_TABLE = "price_ingest_staging"
+ROLLUP_STATE_TABLE = "market_data.price_rollup_state"
+ROLLUP_STATE_KEY = "rollups"
+
+EPOCH = datetime(1970, 1, 1)
+MILLISECOND = timedelta(milliseconds=1)
+
+
+def bucket_sql(column: str, seconds: int) -> str:
+    """SQL expression flooring a timestamp column to ``seconds`` buckets."""
+    if seconds == 86400:
+        return f"date_trunc('day', {column})"
+    if seconds == 7 * 86400:
+        return f"date_trunc('week', {column})"
+    return (f"(TIMESTAMP 'epoch' + floor(extract(epoch from {column}) / {seconds}) "
+            f"* {seconds} * INTERVAL '1 second')")
+
+
+def source_tier(interval: str) -> Tuple[str, int]:
+    """Coarsest stored tier that can serve ``interval``.
+
+    Returns:
+        (table, tier step in seconds)
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"Unsupported interval '{interval}', use one of {', '.join(INTERVALS)}")
+    seconds = INTERVALS[interval]
+    table, step = TIERS[0][1], INTERVALS[TIERS[0][0]]
+    for tier_interval, tier_table, _ in TIERS:
+        tier_step = INTERVALS[tier_interval]
+        if tier_step <= seconds and seconds % tier_step == 0:
+            table, step = tier_table, tier_step
+    return table, step
+
+
+def _rollup_sql(source: str, target: str, seconds: int, staged: bool = True) -> str:
+    """Recompute ``target`` buckets from ``source``.
+
+    With ``staged`` the buckets touched by the staged rows are recomputed,
+    otherwise every bucket in ``[:start, :end)`` (bounds aligned to buckets).
+    """
+    bucket = bucket_sql("s.timestamp", seconds)
+    if staged:
+        touched_start = bucket_sql("min(timestamp)", seconds)
+        touched_end = bucket_sql("max(timestamp)", seconds)
+        source_rows = f"""{source} s
+        JOIN (
+            SELECT symbol, {touched_start} AS bucket_start,
+                   {touched_end} + INTERVAL '{seconds} seconds' AS bucket_end
+            FROM {STAGING_TABLE}
+            GROUP BY symbol
+        ) t ON s.symbol = t.symbol AND s.timestamp >= t.bucket_start AND s.timestamp < t.bucket_end"""
+    else:
+        source_rows = f"{source} s WHERE s.timestamp >= :start AND s.timestamp < :end"
+    return f"""
+        INSERT INTO {target} (symbol, timestamp, open, high, low, close, volume)
+        SELECT s.symbol, {bucket} AS bucket,
+               (array_agg(s.open ORDER BY s.timestamp))[1],
+               max(s.high), min(s.low),
+               (array_agg(s.close ORDER BY s.timestamp DESC))[1],
+               sum(s.volume)
+        FROM {source_rows}
+        GROUP BY s.symbol, bucket
+        ON CONFLICT (symbol, timestamp) DO UPDATE SET
+            open = EXCLUDED.open, high = EXCLUDED.high, low = EXCLUDED.low,
+            close = EXCLUDED.close, volume = EXCLUDED.volume, updated_at = now()
+    """
+
+
+# =====================================================================
+# ROW PARSING
+# =====================================================================
+
+def _normalize_row(row: Dict[str, Any]) -> Tuple:
+    """Validate one bar with the PriceDataBase constraints, without pydantic."""
+    symbol = str(row["symbol"]).strip()
+    if not 1 <= len(symbol) <= 10:
+        raise ValueError(f"Invalid symbol '{symbol}'")
+    timestamp = row["timestamp"]
+    if not isinstance(timestamp, datetime):
+        timestamp = datetime.fromisoformat(str(timestamp).replace("Z", "+00:00"))
+    if timestamp.tzinfo is not None:
+        # Stored naive in UTC
+        timestamp = (timestamp - timestamp.utcoffset()).replace(tzinfo=None)
+    prices = [float(row[field]) for field in ("open", "high", "low", "close")]
+    volume = int(float(row["volume"]))
+    if min(prices) < 0 or volume < 0:
+        raise ValueError(f"Negative price or volume for {symbol} at {timestamp}")
+    return (symbol, timestamp.isoformat(sep=" "), *prices, volume)
+
+
+def parse_ndjson(lines: Iterable[bytes]) -> Iterator[Tuple]:
+    """Bars from newline-delimited JSON objects."""
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield _normalize_row(json.loads(line))
+
+
+def parse_csv(lines: Iterable[bytes]) -> Iterator[Tuple]:
+    """Bars from CSV with a header row naming at least the FIELDS columns."""
+    reader = csv.DictReader(line.decode("utf-8") for line in lines if line.strip())
+    for row in reader:
+        yield _normalize_row(row)
+
+
+def parse_records(records: Iterable[Dict[str, Any]]) -> Iterator[Tuple]:
+    """Bars from already-decoded records (e.g. ``PriceDataCreate.dict()``)."""
+    for record in records:
+        yield _normalize_row(record)
+
+
+def parse_columnar(payload: Dict[str, Sequence[Any]]) -> Iterator[Tuple]:
+    """Bars from a columnar payload; a scalar ``symbol`` applies to every row."""
+    length = len(payload["timestamp"])
+    symbol = payload["symbol"]
+    symbols = [symbol] * length if isinstance(symbol, str) else symbol
+    for i in range(length):
+        yield _normalize_row({
+            "symbol": symbols[i],
+            **{field: payload[field][i] for field in FIELDS[1:]},
+        })
+
+
+def batched(rows: Iterable[Tuple], size: int = BULK_BATCH_SIZE) -> Iterator[List[Tuple]]:
+    batch: List[Tuple] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class PriceStore:
+    """Bulk upserts, rollup maintenance, retention and columnar range reads."""
+
+    def __init__(self):
+        self._last_retention = 0.0
+
+    # -----------------------------------------------------------------
+    # Ingest
+    # -----------------------------------------------------------------
+
+    def upsert_batch(self, db: Session, rows: List[Tuple]) -> int:
+        """COPY one batch into staging, upsert it and refresh its rollups.
+
+        Args:
+            db: Database session
+            rows: Normalized bars (see ``_normalize_row``)
+
+        Returns:
+            Number of rows upserted
+        """
+        if not rows:
+            return 0
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+
+        try:
+            db.execute(text(f"""
+                CREATE TEMPORARY TABLE IF NOT EXISTS {STAGING_TABLE} (
+                    symbol VARCHAR(10), timestamp TIMESTAMP,
+                    open DECIMAL(10,2), high DECIMAL(10,2), low DECIMAL(10,2),
+                    close DECIMAL(10,2), volume BIGINT,
+                    seq BIGSERIAL
+                ) ON COMMIT DELETE ROWS
+            """))
+            cursor = db.connection().connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY {STAGING_TABLE} ({', '.join(FIELDS)}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            finally:
+                cursor.close()
+
+            # Last row wins when a batch repeats a bar - seq numbers rows in COPY order
+            result = db.execute(text(f"""
+                INSERT INTO market_data.price_data ({', '.join(FIELDS)})
+                SELECT DISTINCT ON (symbol, timestamp) {', '.join(FIELDS)}
+                FROM {STAGING_TABLE}
+                ORDER BY symbol, timestamp, seq DESC
+                ON CONFLICT (symbol, timestamp) DO UPDATE SET
+                    open = EXCLUDED.open, high = EXCLUDED.high, low = EXCLUDED.low,
+                    close = EXCLUDED.close, volume = EXCLUDED.volume, updated_at = now()
+            """))
+            for (_, source, _), (interval, target, _) in zip(TIERS, TIERS[1:]):
+                db.execute(text(_rollup_sql(source, target, INTERVALS[interval])))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return result.rowcount
+
+    def ingest(self, db: Session, rows: Iterable[Tuple], batch_size: int = BULK_BATCH_SIZE) -> Dict[str, Any]:
+        """Upsert a stream of bars batch by batch.
+
+        Every batch commits on its own, so a failure part way through leaves
+        the earlier batches (and their rollups) in place.
+        """
+        started = time.perf_counter()
+        total = batches = 0
+        for batch in batched(rows, batch_size):
+            total += self.upsert_batch(db, batch)
+            batches += 1
+        self.maybe_apply_retention(db)
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Bulk ingest: {total} rows in {batches} batch(es), {elapsed:.2f}s")
+        return {"rows": total, "batches": batches, "seconds": round(elapsed, 3)}
+
+    async def ingest_stream(self, db: Session, lines: AsyncIterator[bytes], fmt: str = "ndjson",
+                            batch_size: int = BULK_BATCH_SIZE) -> Dict[str, Any]:
+        """Upsert NDJSON or CSV lines as they arrive, one batch at a time.
+
+        The blocking database work runs in the default executor, so the event
+        loop keeps serving other requests while a batch is written.
+        """
+        if fmt not in ("ndjson", "csv"):
+            raise ValueError(f"Unsupported format '{fmt}'")
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        total = batches = 0
+        header: Optional[bytes] = None
+        pending: List[bytes] = []
+
+        async def flush() -> int:
+            chunk = [header, *pending] if fmt == "csv" else pending
+            parsed = list(parse_csv(chunk) if fmt == "csv" else parse_ndjson(chunk))
+            pending.clear()
+            return await loop.run_in_executor(None, partial(self.upsert_batch, db, parsed))
+
+        async for line in lines:
+            if not line.strip():
+                continue
+            if fmt == "csv" and header is None:
+                header = line
+                continue
+            pending.append(line)
+            if len(pending) >= batch_size:
+                total += await flush()
+                batches += 1
+        if pending:
+            total += await flush()
+            batches += 1
+        await loop.run_in_executor(None, partial(self.maybe_apply_retention, db))
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Bulk ingest ({fmt}): {total} rows in {batches} batch(es), {elapsed:.2f}s")
+        return {"rows": total, "batches": batches, "seconds": round(elapsed, 3)}
+
+    # -----------------------------------------------------------------
+    # Rollup backfill
+    # -----------------------------------------------------------------
+
+    def rolled_up_through(self, db: Session) -> Optional[datetime]:
+        """Every bar before this timestamp has its rollups; None if never backfilled."""
+        return db.execute(
+            text(f"SELECT rolled_up_through FROM {ROLLUP_STATE_TABLE} WHERE name = :name"),
+            {"name": ROLLUP_STATE_KEY},
+        ).scalar()
+
+    def backfill_rollups(self, db: Session, chunk_days: int = BACKFILL_CHUNK_DAYS,
+                         now: Optional[datetime] = None) -> Optional[datetime]:
+        """Roll up the bars already in price_data, oldest first, one chunk per transaction.
+
+        Resumes from the recorded watermark. Bars ingested after the backfill
+        started are rolled up by the ingest itself, so the watermark ends at
+        the start time.
+
+        Returns:
+            The new watermark
+        """
+        until = now or datetime.utcnow()
+        start = self.rolled_up_through(db)
+        if start is None:
+            first = db.execute(text(f"SELECT min(timestamp) FROM {TIERS[0][1]}")).scalar()
+            start = until if first is None else datetime.combine(first.date(), datetime.min.time())
+
+        step = timedelta(days=max(1, chunk_days))
+        while True:
+            # Day-aligned chunks never split a 5m or 1d bucket
+            end = min(start + step, until)
+            try:
+                if start < end:
+                    for (_, source, _), (interval, target, _) in zip(TIERS, TIERS[1:]):
+                        db.execute(text(_rollup_sql(source, target, INTERVALS[interval], staged=False)),
+                                   {"start": start, "end": end})
+                db.execute(text(f"""
+                    INSERT INTO {ROLLUP_STATE_TABLE} (name, rolled_up_through)
+                    VALUES (:name, :through)
+                    ON CONFLICT (name) DO UPDATE SET
+                        rolled_up_through = EXCLUDED.rolled_up_through, updated_at = now()
+                """), {"name": ROLLUP_STATE_KEY, "through": end})
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            logger.info(f"Rollups backfilled through {end}")
+            if end >= until:
+                return end
+            start = end
+
+    # -----------------------------------------------------------------
+    # Retention
+    # -----------------------------------------------------------------
+
+    def apply_retention(self, db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Delete bars older than each tier's retention, never past the rollup watermark."""
+        now = now or datetime.utcnow()
+        deleted = {}
+        tiers = [(interval, table, days) for interval, table, days in TIERS if days > 0]
+        try:
+            watermark = self.rolled_up_through(db) if tiers else None
+            if tiers and watermark is None:
+                logger.warning("Retention skipped: run backfill_rollups before pruning bars")
+                tiers = []
+            for interval, table, days in tiers:
+                cutoff = min(now - timedelta(days=days), watermark)
+                result = db.execute(text(f"DELETE FROM {table} WHERE timestamp < :cutoff"),
+                                    {"cutoff": cutoff})
+                deleted[interval] = result.rowcount
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        self._last_retention = time.monotonic()
+        if any(deleted.values()):
+            logger.info(f"Retention pruned {deleted}")
+        return deleted
+
+    def maybe_apply_retention(self, db: Session) -> Optional[Dict[str, int]]:
+        if self._last_retention and time.monotonic() - self._last_retention < RETENTION_CHECK_SECONDS:
+            return None
+        try:
+            return self.apply_retention(db)
+        except Exception as e:
+            logger.error(f"Error applying retention: {str(e)}")
+            return None
+
+    # -----------------------------------------------------------------
+    # Reads
+    # -----------------------------------------------------------------
+
+    def read_range(self, db: Session, symbols: Sequence[str], start: datetime, end: datetime,
+                   interval: str = "1m") -> Dict[str, Any]:
+        """Bars for several symbols between ``start`` and ``end`` (inclusive).
+
+        Returns:
+            ``{"interval", "source", "fields", "symbols": {symbol: {field: [...]}}}``
+            with timestamps as epoch milliseconds.
+        """
+        table, step = source_tier(interval)
+        seconds = INTERVALS[interval]
+
+        if seconds == step:
+            sql = f"""
+                SELECT symbol, timestamp, open::float8, high::float8, low::float8,
+                       close::float8, volume
+                FROM {table}
+                WHERE symbol = ANY(:symbols) AND timestamp BETWEEN :start AND :end
+                ORDER BY symbol, timestamp
+            """
+        else:
+            bucket = bucket_sql("timestamp", seconds)
+            sql = f"""
+                SELECT symbol, {bucket} AS bucket,
+                       ((array_agg(open ORDER BY timestamp))[1])::float8,
+                       max(high)::float8, min(low)::float8,
+                       ((array_agg(close ORDER BY timestamp DESC))[1])::float8,
+                       sum(volume)
+                FROM {table}
+                WHERE symbol = ANY(:symbols) AND timestamp BETWEEN :start AND :end
+                GROUP BY symbol, bucket
+                ORDER BY symbol, bucket
+            """
+
+        columns: Dict[str, Dict[str, list]] = {
+            symbol: {field: [] for field in FIELDS[1:]} for symbol in symbols
+        }
+        result = db.execute(
+            text(sql).execution_options(stream_results=True),
+            {"symbols": list(symbols), "start": start, "end": end},
+        )
+        for partition in result.partitions(BULK_BATCH_SIZE):
+            for symbol, timestamp, open_, high, low, close, volume in partition:
+                bars = columns.setdefault(symbol, {field: [] for field in FIELDS[1:]})
+                bars["timestamp"].append((timestamp - EPOCH) // MILLISECOND)
+                bars["open"].append(open_)
+                bars["high"].append(high)
+                bars["low"].append(low)
+                bars["close"].append(close)
+                bars["volume"].append(int(volume))
+
+        return {
+            "interval": interval,
+            "source": table,
+            "fields": list(FIELDS[1:]),
+            "symbols": columns,
+        }
@@ -43,8 +43,10 @@ CHARTINK_CONFIG = {
 }
 
 # Chartink URL constants for backward compatibility
-CHARTINK_URL = "https://chartink.com/screener/process"
-CHARTINK_REFERER = "https://chartink.com/screener/"
+# (CHARTINK_BASE_URL points them at a stand-in server for load tests)
+CHARTINK_BASE_URL = CHARTINK_CONFIG["base_url"].rstrip("/")
+CHARTINK_URL = f"{CHARTINK_BASE_URL}/screener/process"
+CHARTINK_REFERER = f"{CHARTINK_BASE_URL}/screener/"
 
 # Intraday settings
 INTRADAY_CONFIG = {
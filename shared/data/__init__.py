@@ -0,0 +1,12 @@
+"""
+Shared Data Package
+===================
+
+Market data storage shared by the API services, cron jobs and the patterns
+dashboard.
+"""
+
+from .bar_store import BarStore, get_bar_store
+from .frame_store import FrameStore, get_frame_store
+
+__all__ = ["BarStore", "get_bar_store", "FrameStore", "get_frame_store"]
@@ -0,0 +1,381 @@
+"""
+OHLCV Bar Store
+===============
+
+Persistent, range-aware store of OHLCV bars shared by every historical data
+fetch path (``NSEDataFetcher``, ``patterns/data/yahoo``,
+``RealTimeDataService`` and ``LongTermInvestmentService``).
+
+Layout
+------
+One partition per (interval, symbol)::
+
+    <BAR_STORE_DIR>/<interval>/<SYMBOL>.npy    sorted structured array (ts, OHLCV)
+    <BAR_STORE_DIR>/<interval>/<SYMBOL>.json   covered range, timezone, fetch time
+
+Bars are read through ``np.load(mmap_mode='r')`` and sliced with
+``searchsorted``, so serving a sub-range only touches the rows it returns.
+
+Gap filling
+-----------
+Each partition records the contiguous time range it has already fetched
+(which may include holidays with no bars). A request is answered locally
+when it falls inside that range; otherwise only the missing head and/or
+tail segment is downloaded and merged in. The tail is re-fetched from the
+last stored bar so a partial (still forming) bar gets replaced, but only
+once the request runs more than ``tail_ttl`` past the covered range, so
+repeated "up to now" requests within a few minutes stay local.
+
+A symbol listed after a requested start has nothing before its first bar.
+When a fetch comes back starting well after the segment it asked for, that
+first bar is recorded as ``listed`` and earlier heads are not re-requested.
+
+Periods
+-------
+Day-count periods ("1d", "5d", ...) are trading sessions, as Yahoo treats
+them: a calendar window wide enough for weekends and holidays is fetched
+and trimmed to the last N session dates present, so "1d" on a Sunday is
+Friday's session rather than an empty frame.
+
+Env
+---
+BAR_STORE_DIR      root directory (default <project>/cache/bars)
+BAR_STORE_ENABLED  true/false - bypass the store and fetch directly (default true)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+BAR_STORE_DIR = Path(os.getenv("BAR_STORE_DIR", str(PROJECT_ROOT / "cache" / "bars")))
+BAR_STORE_ENABLED = os.getenv("BAR_STORE_ENABLED", "true").lower() == "true"
+
+DEFAULT_TZ = "Asia/Kolkata"  # Naive dates are NSE exchange time
+
+BAR_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+BAR_DTYPE = np.dtype([("ts", "<i8")] + [(field, "<f8") for field in BAR_FIELDS])
+
+INTERVAL_SECONDS = {
+    "1m": 60, "2m": 120, "5m": 300, "15m": 900, "30m": 1800,
+    "60m": 3600, "90m": 5400, "1h": 3600,
+    "1d": 86400, "5d": 5 * 86400, "1wk": 7 * 86400, "1mo": 30 * 86400, "3mo": 90 * 86400,
+}
+
+# Yahoo only serves intraday bars this far back
+INTRADAY_LOOKBACK = {
+    "1m": pd.Timedelta(days=7),
+    "2m": pd.Timedelta(days=59), "5m": pd.Timedelta(days=59), "15m": pd.Timedelta(days=59),
+    "30m": pd.Timedelta(days=59), "90m": pd.Timedelta(days=59),
+    "60m": pd.Timedelta(days=729), "1h": pd.Timedelta(days=729),
+}
+
+# Day-count periods are trading sessions, not calendar days
+SESSION_PERIODS = {"1d": 1, "5d": 5, "7d": 7, "60d": 60, "730d": 730}
+SESSION_HOLIDAY_DAYS = 7  # extra calendar days fetched to cover exchange holidays
+
+PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1), "2mo": pd.DateOffset(months=2), "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6), "1y": pd.DateOffset(years=1), "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5), "10y": pd.DateOffset(years=10),
+}
+MAX_HISTORY_START = pd.Timestamp("1990-01-01", tz=DEFAULT_TZ)
+
+# A fetch whose first bar lands this far after its start found the listing date
+LISTING_GAP = pd.Timedelta(days=7)
+
+Fetcher = Callable[[str, pd.Timestamp, pd.Timestamp, str], pd.DataFrame]
+
+
+def yahoo_fetch(symbol: str, start: pd.Timestamp, end: pd.Timestamp, interval: str) -> pd.DataFrame:
+    """Download bars for [start, end) from Yahoo Finance."""
+    import yfinance as yf
+    return yf.Ticker(symbol).history(start=start, end=end, interval=interval)
+
+
+def _to_timestamp(value, tz: str = DEFAULT_TZ) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize(tz) if ts.tzinfo is None else ts
+
+
+def _parse_ts(value: str) -> pd.Timestamp:
+    return pd.Timestamp(value).tz_convert(DEFAULT_TZ)
+
+
+def _now() -> pd.Timestamp:
+    return pd.Timestamp.now(tz=DEFAULT_TZ)
+
+
+def period_start(period: str, interval: str, now: Optional[pd.Timestamp] = None) -> pd.Timestamp:
+    """Translate a Yahoo style ``period`` into a start timestamp.
+
+    Session periods get a calendar window that holds at least N sessions;
+    ``last_sessions`` trims the fetched bars back to exactly N.
+    """
+    now = now or _now()
+    if period == "max":
+        start = MAX_HISTORY_START
+    elif period == "ytd":
+        start = now.normalize().replace(month=1, day=1)
+    elif period in SESSION_PERIODS:
+        sessions = SESSION_PERIODS[period]
+        start = now.normalize() - pd.offsets.BDay(sessions) - pd.Timedelta(days=SESSION_HOLIDAY_DAYS)
+    elif period in PERIOD_OFFSETS:
+        start = now - PERIOD_OFFSETS[period]
+    else:
+        raise ValueError(f"Unsupported period: {period}")
+    lookback = INTRADAY_LOOKBACK.get(interval)
+    if lookback is not None:
+        start = max(start, now - lookback)
+    return start
+
+
+def last_sessions(frame: pd.DataFrame, sessions: int) -> pd.DataFrame:
+    """Rows from the last ``sessions`` trading dates present in ``frame``."""
+    if frame.empty:
+        return frame
+    days = frame.index.normalize()
+    dates = days.unique()
+    if len(dates) <= sessions:
+        return frame
+    return frame[days >= dates[-sessions]]
+
+
+class BarStore:
+    """Range-aware on-disk OHLCV store partitioned by symbol and interval."""
+
+    def __init__(self, root: Optional[Path] = None, fetcher: Optional[Fetcher] = None,
+                 enabled: Optional[bool] = None):
+        self.root = Path(root or BAR_STORE_DIR)
+        self.fetcher = fetcher or yahoo_fetch
+        self.enabled = BAR_STORE_ENABLED if enabled is None else enabled
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.stats = {"local": 0, "partial": 0, "miss": 0, "bars_fetched": 0}
+
+    # -----------------------------------------------------------------
+    # Public API
+    # -----------------------------------------------------------------
+
+    def get_bars(self, symbol: str, start, end=None, interval: str = "1d") -> pd.DataFrame:
+        """Bars for ``start <= ts <= end``, fetching only uncovered segments."""
+        now = _now()
+        start = _to_timestamp(start)
+        end = min(_to_timestamp(end), now) if end is not None else now
+        if start > end:
+            return self._empty_frame()
+
+        if not self.enabled:
+            return self._normalize(self.fetcher(symbol, start, end + self._step(interval), interval))
+
+        with self._lock_for(symbol, interval):
+            bars, meta = self._load(symbol, interval)
+            missing = self._missing_segments(bars, meta, start, end, interval)
+
+            if missing:
+                self.stats["partial" if meta else "miss"] += 1
+                changed = False
+                for seg_start, seg_end in missing:
+                    fetched = self._normalize(self.fetcher(symbol, seg_start, seg_end + self._step(interval), interval))
+                    if fetched.empty:
+                        # Yahoo answers transient errors with an empty frame -
+                        # leave the segment uncovered so the next call retries it
+                        continue
+                    self.stats["bars_fetched"] += len(fetched)
+                    bars = self._merge(bars, fetched)
+                    if meta is None:
+                        meta = {"tz": self._tz_name(fetched), "index_name": fetched.index.name}
+                    first_bar = fetched.index[0]
+                    is_head = "start" not in meta or seg_start < _parse_ts(meta["start"])
+                    if is_head and first_bar - seg_start > LISTING_GAP and "listed" not in meta:
+                        # Yahoo had bars but none before this one - nothing older exists
+                        meta["listed"] = first_bar.isoformat()
+                    cov_start = min(seg_start, _parse_ts(meta["start"])) if "start" in meta else seg_start
+                    cov_end = max(seg_end, _parse_ts(meta["end"])) if "end" in meta else seg_end
+                    meta.update(start=cov_start.isoformat(), end=cov_end.isoformat())
+                    changed = True
+                if changed:
+                    meta["fetched_at"] = time.time()
+                    self._save(symbol, interval, bars, meta)
+            else:
+                self.stats["local"] += 1
+
+        return self._slice(bars, meta, start, end)
+
+    def get_period(self, symbol: str, period: str = "1mo", interval: str = "1d") -> pd.DataFrame:
+        """Bars for a Yahoo style ``period`` (5d, 1mo, 6mo, 2y, ytd, max, ...)."""
+        bars = self.get_bars(symbol, period_start(period, interval), None, interval)
+        if period in SESSION_PERIODS:
+            bars = last_sessions(bars, SESSION_PERIODS[period])
+        return bars
+
+    def coverage(self, symbol: str, interval: str = "1d") -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Time range already held locally for a partition."""
+        meta = self._read_meta(symbol, interval)
+        if not meta or "start" not in meta:
+            return None
+        return _parse_ts(meta["start"]), _parse_ts(meta["end"])
+
+    def invalidate(self, symbol: str, interval: str = "1d") -> None:
+        """Drop a partition so it is re-downloaded on next use."""
+        with self._lock_for(symbol, interval):
+            for path in self._paths(symbol, interval):
+                path.unlink(missing_ok=True)
+
+    # -----------------------------------------------------------------
+    # Range bookkeeping
+    # -----------------------------------------------------------------
+
+    def _missing_segments(self, bars: np.ndarray, meta: Optional[dict], start: pd.Timestamp,
+                          end: pd.Timestamp, interval: str):
+        if not meta or "start" not in meta:
+            return [(start, end)]
+
+        cov_start, cov_end = _parse_ts(meta["start"]), _parse_ts(meta["end"])
+        segments = []
+        if start < cov_start and "listed" not in meta:
+            # Head segment - runs up to the covered range to keep it contiguous
+            segments.append((start, cov_start))
+        if (end - cov_end).total_seconds() > self._tail_ttl(interval):
+            # Tail segment - restart at the last stored bar to replace a partial bar
+            tail_start = cov_end
+            if len(bars):
+                tail_start = min(cov_end, pd.Timestamp(int(bars["ts"][-1]), tz="UTC").tz_convert(DEFAULT_TZ))
+            segments.append((tail_start, end))
+        return segments
+
+    @staticmethod
+    def _step(interval: str) -> pd.Timedelta:
+        return pd.Timedelta(seconds=INTERVAL_SECONDS.get(interval, 86400))
+
+    @staticmethod
+    def _tail_ttl(interval: str) -> float:
+        return min(INTERVAL_SECONDS.get(interval, 86400), 900)
+
+    # -----------------------------------------------------------------
+    # Frames <-> arrays
+    # -----------------------------------------------------------------
+
+    @staticmethod
+    def _empty_frame() -> pd.DataFrame:
+        return pd.DataFrame(columns=list(BAR_FIELDS), index=pd.DatetimeIndex([], tz=DEFAULT_TZ))
+
+    @staticmethod
+    def _tz_name(frame: pd.DataFrame) -> str:
+        tz = getattr(frame.index, "tz", None)
+        return str(tz) if tz is not None else DEFAULT_TZ
+
+    @staticmethod
+    def _normalize(frame: Optional[pd.DataFrame]) -> pd.DataFrame:
+        if frame is None or frame.empty:
+            return BarStore._empty_frame()
+        frame = frame[[field for field in BAR_FIELDS if field in frame.columns]]
+        if frame.index.tz is None:
+            frame = frame.tz_localize(DEFAULT_TZ)
+        return frame
+
+    @staticmethod
+    def _to_array(frame: pd.DataFrame) -> np.ndarray:
+        array = np.empty(len(frame), dtype=BAR_DTYPE)
+        # Index resolution varies (s/us/ns) between pandas versions and sources
+        array["ts"] = frame.index.tz_convert("UTC").as_unit("ns").asi8
+        for field in BAR_FIELDS:
+            array[field] = frame[field].to_numpy(dtype="f8") if field in frame.columns else np.nan
+        return array
+
+    def _merge(self, bars: np.ndarray, fetched: pd.DataFrame) -> np.ndarray:
+        if fetched.empty:
+            return bars
+        combined = np.concatenate([np.asarray(bars), self._to_array(fetched)])
+        # Stable sort + keep the last occurrence so fresh bars replace stored ones
+        order = np.argsort(combined["ts"], kind="stable")
+        combined = combined[order]
+        keep = np.append(combined["ts"][1:] != combined["ts"][:-1], True)
+        return combined[keep]
+
+    def _slice(self, bars: np.ndarray, meta: Optional[dict], start: pd.Timestamp,
+               end: pd.Timestamp) -> pd.DataFrame:
+        if not len(bars):
+            return self._empty_frame()
+        ts = bars["ts"]
+        lo = np.searchsorted(ts, start.tz_convert("UTC").value, side="left")
+        hi = np.searchsorted(ts, end.tz_convert("UTC").value, side="right")
+        window = np.array(bars[lo:hi])
+
+        tz = (meta or {}).get("tz", DEFAULT_TZ)
+        index = pd.DatetimeIndex(pd.to_datetime(window["ts"], unit="ns", utc=True)).tz_convert(tz)
+        index.name = (meta or {}).get("index_name")
+        frame = pd.DataFrame({field: window[field] for field in BAR_FIELDS}, index=index)
+        frame["Volume"] = np.nan_to_num(frame["Volume"].to_numpy()).astype("int64")
+        return frame
+
+    # -----------------------------------------------------------------
+    # Storage
+    # -----------------------------------------------------------------
+
+    def _lock_for(self, symbol: str, interval: str) -> threading.Lock:
+        key = (symbol, interval)
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def _paths(self, symbol: str, interval: str) -> Tuple[Path, Path]:
+        safe = symbol.upper().replace("/", "_").replace("^", "IDX_")
+        directory = self.root / interval
+        return directory / f"{safe}.npy", directory / f"{safe}.json"
+
+    def _read_meta(self, symbol: str, interval: str) -> Optional[dict]:
+        _, meta_path = self._paths(symbol, interval)
+        if not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load(self, symbol: str, interval: str) -> Tuple[np.ndarray, Optional[dict]]:
+        bars_path, _ = self._paths(symbol, interval)
+        meta = self._read_meta(symbol, interval)
+        if meta is None or not bars_path.exists():
+            return np.empty(0, dtype=BAR_DTYPE), None
+        try:
+            return np.load(bars_path, mmap_mode="r"), meta
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Corrupt bar partition {bars_path}, refetching: {e}")
+            return np.empty(0, dtype=BAR_DTYPE), None
+
+    def _save(self, symbol: str, interval: str, bars: np.ndarray, meta: dict) -> None:
+        bars_path, meta_path = self._paths(symbol, interval)
+        bars_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers (other processes) see whole files
+        tmp_bars = bars_path.parent / f"{bars_path.stem}.{os.getpid()}.tmp.npy"
+        np.save(tmp_bars, np.ascontiguousarray(bars))
+        os.replace(tmp_bars, bars_path)
+        tmp_meta = meta_path.parent / f"{meta_path.stem}.{os.getpid()}.tmp"
+        with open(tmp_meta, "w") as f:
+            json.dump(meta, f, separators=(",", ":"))
+        os.replace(tmp_meta, meta_path)
+
+
+_default_store: Optional[BarStore] = None
+_default_lock = threading.Lock()
+
+
+def get_bar_store() -> BarStore:
+    """Process-wide bar store used by all fetch paths."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = BarStore()
+        return _default_store
@@ -0,0 +1,199 @@
+"""
+Precomputed Frame Store
+=======================
+
+Local hand-off of precomputed DataFrames from a background writer (the
+dashboard precompute service) to readers in other processes (the Streamlit
+pages).
+
+Layout
+------
+One directory per page, holding immutable generations::
+
+    <FRAME_STORE_DIR>/<page>/CURRENT            name of the live generation
+    <FRAME_STORE_DIR>/<page>/gen-<n>/meta.json  frames, columns, dtypes, build info
+    <FRAME_STORE_DIR>/<page>/gen-<n>/<frame>.<i>.npy   one array per column
+
+A writer builds a whole generation in a temporary directory, renames it into
+place and then swaps ``CURRENT``, so readers always see a complete set of
+frames. Columns are read with ``np.load(mmap_mode='r')``: numeric and
+datetime columns are used straight from the page cache without copying,
+text columns are stored as fixed-width unicode. Readers cache the mapped
+frames per generation, so a Streamlit rerun only re-reads ``CURRENT``.
+
+The default root is under ``/dev/shm`` when it exists, i.e. shared memory.
+
+Env
+---
+FRAME_STORE_DIR    root directory (default /dev/shm/alg_frames or <project>/cache/frames)
+FRAME_STORE_KEEP   generations kept per page for in-flight readers (default 3)
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+_SHM = Path("/dev/shm")
+FRAME_STORE_DIR = Path(os.getenv(
+    "FRAME_STORE_DIR",
+    str(_SHM / "alg_frames" if _SHM.is_dir() else PROJECT_ROOT / "cache" / "frames")
+))
+FRAME_STORE_KEEP = int(os.getenv("FRAME_STORE_KEEP", "3"))
+
+CURRENT_FILE = "CURRENT"
+META_FILE = "meta.json"
+
+
+def _encode_column(series: pd.Series) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Column -> (array to save, meta needed to decode it)"""
+    dtype = series.dtype
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        tz = str(dtype.tz) if getattr(dtype, "tz", None) is not None else None
+        values = series.dt.tz_convert("UTC").dt.tz_localize(None) if tz else series
+        return values.to_numpy(dtype="datetime64[ns]").view("i8"), {"kind": "datetime", "tz": tz}
+    if pd.api.types.is_bool_dtype(dtype) or (pd.api.types.is_numeric_dtype(dtype)
+                                              and not isinstance(dtype, pd.CategoricalDtype)):
+        return series.to_numpy(dtype=float if series.isna().any() else None), {"kind": "numeric"}
+    text = series.astype(object).where(series.notna(), "").astype(str).to_numpy(dtype=str)
+    return text, {"kind": "text"}
+
+
+def _decode_column(values: np.ndarray, meta: Dict[str, Any]):
+    if meta["kind"] == "datetime":
+        times = pd.DatetimeIndex(values.view("datetime64[ns]"))
+        return times.tz_localize("UTC").tz_convert(meta["tz"]) if meta["tz"] else times
+    return values
+
+
+class FrameStore:
+    """Generation-swapped, memory-mapped store of named DataFrames per page."""
+
+    def __init__(self, root: Optional[Path] = None, keep: Optional[int] = None):
+        self.root = Path(root or FRAME_STORE_DIR)
+        self.keep = max(1, keep or FRAME_STORE_KEEP)
+        self._cache: Dict[str, Tuple[str, Dict[str, Any], Dict[str, pd.DataFrame]]] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Writer
+    # ------------------------------------------------------------------
+
+    def publish(self, page: str, frames: Dict[str, pd.DataFrame], info: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Write a complete set of frames for ``page`` and make it current
+
+        Returns:
+            Name of the new generation
+        """
+        page_dir = self.root / page
+        page_dir.mkdir(parents=True, exist_ok=True)
+        generation = f"gen-{time.time_ns()}"
+        staging = page_dir / f".{generation}.tmp"
+        staging.mkdir()
+
+        try:
+            meta = {"page": page, "published_at": time.time(), "info": info or {}, "frames": {}}
+            for name, frame in frames.items():
+                columns = []
+                for i, column in enumerate(frame.columns):
+                    values, column_meta = _encode_column(frame[column])
+                    np.save(staging / f"{name}.{i}.npy", values, allow_pickle=False)
+                    columns.append({"name": str(column), **column_meta})
+                meta["frames"][name] = {"rows": len(frame), "columns": columns}
+            (staging / META_FILE).write_text(json.dumps(meta, default=str))
+
+            staging.rename(page_dir / generation)
+            pointer = page_dir / f".{CURRENT_FILE}.tmp"
+            pointer.write_text(generation)
+            os.replace(pointer, page_dir / CURRENT_FILE)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        self._prune(page_dir, generation)
+        return generation
+
+    def _prune(self, page_dir: Path, current: str) -> None:
+        generations = sorted(p.name for p in page_dir.glob("gen-*"))
+        # Older generations may still be mapped by readers - unlinking is safe on POSIX
+        for name in generations[:-self.keep]:
+            if name != current:
+                shutil.rmtree(page_dir / name, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Reader
+    # ------------------------------------------------------------------
+
+    def current_generation(self, page: str) -> Optional[str]:
+        try:
+            return (self.root / page / CURRENT_FILE).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _load(self, page: str, generation: str) -> Tuple[Dict[str, Any], Dict[str, pd.DataFrame]]:
+        gen_dir = self.root / page / generation
+        meta = json.loads((gen_dir / META_FILE).read_text())
+        frames = {}
+        for name, frame_meta in meta["frames"].items():
+            data = {}
+            for i, column in enumerate(frame_meta["columns"]):
+                values = np.load(gen_dir / f"{name}.{i}.npy", mmap_mode="r", allow_pickle=False)
+                data[column["name"]] = _decode_column(values, column)
+            frames[name] = pd.DataFrame(data, copy=False) if data else pd.DataFrame(index=range(frame_meta["rows"]))
+        return meta, frames
+
+    def read_page(self, page: str) -> Tuple[Dict[str, Any], Dict[str, pd.DataFrame]]:
+        """
+        (meta, frames) of the current generation; empty when nothing is published
+
+        Frames are shared between callers and backed by read-only maps - copy
+        before modifying them.
+        """
+        for _ in range(3):
+            generation = self.current_generation(page)
+            if generation is None:
+                return {}, {}
+            with self._lock:
+                cached = self._cache.get(page)
+                if cached is not None and cached[0] == generation:
+                    return cached[1], cached[2]
+            try:
+                meta, frames = self._load(page, generation)
+            except FileNotFoundError:
+                continue  # Pruned between reading CURRENT and opening it
+            with self._lock:
+                self._cache[page] = (generation, meta, frames)
+            return meta, frames
+        logger.warning(f"Frame store page {page} kept changing while being read")
+        return {}, {}
+
+    def read(self, page: str, frame: str) -> Optional[pd.DataFrame]:
+        """One frame of the current generation, or None"""
+        return self.read_page(page)[1].get(frame)
+
+    def age(self, page: str) -> Optional[float]:
+        """Seconds since the current generation was published"""
+        meta, _ = self.read_page(page)
+        return time.time() - meta["published_at"] if meta else None
+
+
+_default_store: Optional[FrameStore] = None
+
+
+def get_frame_store() -> FrameStore:
+    """Process-wide frame store."""
+    global _default_store
+    if _default_store is None:
+        _default_store = FrameStore()
+    return _default_store
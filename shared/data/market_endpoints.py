@@ -0,0 +1,57 @@
+"""
+Market data endpoint overrides
+
+Lets the servers talk to a local stand-in (``tests/performance/standin.py``)
+instead of the live providers, for load tests:
+
+- ChartInk: ``CHARTINK_BASE_URL`` (read by ``shared.config.settings``)
+- Yahoo Finance: ``YAHOO_BASE_URL``, applied to yfinance by
+  ``redirect_yfinance``
+
+yfinance has no base URL setting; its API hosts live in module-level
+constants (``_BASE_URL_``, ``_QUERY1_URL_`` and URLs derived from them),
+which ``redirect_yfinance`` rewrites. Cookie and crumb requests that
+yfinance builds inline still go to Yahoo, once per process.
+
+Env
+---
+YAHOO_BASE_URL   serve yfinance chart / quoteSummary requests from this host
+"""
+
+import os
+import sys
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__, group="shared", service="market_endpoints")
+
+YAHOO_BASE_URL = os.getenv("YAHOO_BASE_URL", "").rstrip("/")
+YAHOO_HOSTS = ("https://query1.finance.yahoo.com", "https://query2.finance.yahoo.com")
+
+
+def redirect_yfinance(base_url=None):
+    """
+    Point yfinance's API hosts at ``base_url`` (default YAHOO_BASE_URL)
+
+    Returns:
+        Number of URL constants rewritten (0 when no override is set)
+    """
+    base_url = (base_url or YAHOO_BASE_URL).rstrip("/")
+    if not base_url:
+        return 0
+    import yfinance  # noqa: F401 - loads the submodules holding the constants
+
+    rewritten = 0
+    for name, module in list(sys.modules.items()):
+        if not name.startswith("yfinance") or module is None:
+            continue
+        for attr, value in list(vars(module).items()):
+            if not isinstance(value, str):
+                continue
+            for host in YAHOO_HOSTS:
+                if value.startswith(host):
+                    setattr(module, attr, base_url + value[len(host):])
+                    rewritten += 1
+                    break
+    logger.info(f"yfinance redirected to {base_url} ({rewritten} endpoints)")
+    return rewritten
@@ -254,6 +254,19 @@ class RecommendationOrchestrator:
         if stock_data_df is not None and not stock_data_df.empty:
             stock_data_lookup = stock_data_df.set_index('symbol').to_dict('index')
         
+        # One candidate frame shared by every algorithm, scored in one call each
+        candidates = pd.DataFrame([
+            stock_data_lookup.get(symbol, {
+                'close': 0,
+                'volume': 0,
+                'per_chg': 0,
+                'high': 0,
+                'low': 0
+            })
+            for symbol in symbols
+        ])
+        candidates['symbol'] = symbols
+        
         for alg_config in algorithms:
             alg_id = alg_config['alg_id']
             
@@ -261,21 +274,10 @@ class RecommendationOrchestrator:
                 try:
                     algorithm = self.loaded_algorithms[alg_id]
                     
-                    # Generate scores for all symbols
-                    for symbol in symbols:
-                        # Get stock data for this symbol
-                        stock_data = stock_data_lookup.get(symbol, {
-                            'symbol': symbol,
-                            'close': 0,
-                            'volume': 0,
-                            'per_chg': 0,
-                            'high': 0,
-                            'low': 0
-                        })
-                        
-                        # Calculate score using the algorithm
-                        score = algorithm.calculate_score(stock_data)
-                        seed_scores[symbol][alg_id] = score
+                    # Calculate scores for all symbols using the algorithm
+                    scores = algorithm.calculate_scores(candidates)
+                    for symbol, score in zip(symbols, scores):
+                        seed_scores[symbol][alg_id] = float(score)
                         
                 except Exception as e:
                     self.logger.error(f"Error in seed algorithm {alg_id}: {e}")
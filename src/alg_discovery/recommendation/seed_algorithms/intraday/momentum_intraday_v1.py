@@ -16,6 +16,9 @@ from typing import Dict, Any
 from datetime import datetime
 
 from recommendation_engine.utils.base_algorithm import BaseSeedAlgorithm
+from recommendation_engine.seed_algorithms.utils.scoring_kernel import (
+    AnyOf, Cond, Const, ScoringTable, Step, When
+)
 
 
 class MomentumIntradayV1(BaseSeedAlgorithm):
@@ -70,8 +73,61 @@ class MomentumIntradayV1(BaseSeedAlgorithm):
         self.persistence_weight = self.parameters.get('persistence_weight', 0.2)
         self.rsi_weight = self.parameters.get('rsi_weight', 0.1)
         
+        self.scoring_kernel = self.scoring_table().compile()
+        
         self.logger.info(f"Initialized {self.alg_id} with momentum_weight={self.momentum_weight}")
     
+    def scoring_table(self) -> ScoringTable:
+        """
+        Scoring rules for this algorithm
+        
+        - Momentum: price change bands, negative momentum scores low
+        - Volume: volume vs average (average falls back to volume)
+        - Persistence: position within day's range, for positive momentum
+        - RSI: simplified RSI-like quality of the move
+        """
+        return ScoringTable(
+            inputs={
+                'close': 0.0,
+                'volume': 0.0,
+                'per_chg': 0.0,
+                'high': 0.0,
+                'low': 0.0,
+                'avg_volume': 'volume',
+            },
+            derived={
+                'volume_ratio': lambda c: c['volume'] / np.where(c['avg_volume'] <= 0, c['volume'], c['avg_volume']),
+                'range_position': lambda c: (c['close'] - c['low']) / (c['high'] - c['low']),
+            },
+            components=[
+                ('momentum', self.momentum_weight,
+                 Step('per_chg', [0.0, 0.5, 1.0, 2.0, 3.0, 5.0], [10.0, 25.0, 40.0, 55.0, 70.0, 85.0, 100.0])),
+                ('volume', self.volume_weight,
+                 Step('volume_ratio', [1.0, 1.2, 1.5, 2.0, 3.0], [20.0, 40.0, 55.0, 70.0, 85.0, 100.0])),
+                ('persistence', self.persistence_weight,
+                 When(Cond('high', '<=', 'low'), Const(50.0),
+                      When(Cond('per_chg', '>', 0), Step('range_position', [0.4, 0.6, 0.8], [30.0, 50.0, 70.0, 90.0]),
+                           Const(20.0)))),
+                ('rsi', self.rsi_weight,
+                 When(Cond('per_chg', '>', 0), Step('per_chg', [1.5, 3.0], [60.0, 70.0, 80.0]),
+                      # Negative momentum - might be oversold opportunity
+                      Step('per_chg', [-3.0], [40.0, 30.0], closed='right'))),
+            ],
+            guard=AnyOf(Cond('close', '<=', 0), Cond('volume', '<=', 0)),
+        )
+    
+    def calculate_scores(self, stocks: Any) -> np.ndarray:
+        """
+        Calculate momentum scores for many stocks with the compiled scoring table
+        
+        Args:
+            stocks: DataFrame, list of stock dictionaries or dict of arrays
+            
+        Returns:
+            np.ndarray: Scores between 0-100, in input order
+        """
+        return self.scoring_kernel.score(stocks)
+    
     def calculate_score(self, stock_data: Dict[str, Any]) -> float:
         """
         Calculate momentum score for a stock
@@ -83,146 +139,12 @@ class MomentumIntradayV1(BaseSeedAlgorithm):
             float: Score between 0-100
         """
         try:
-            # Extract basic data
-            current_price = float(stock_data.get('close', 0))
-            volume = float(stock_data.get('volume', 0))
-            price_change_pct = float(stock_data.get('per_chg', 0))
-            
-            # Basic validation
-            if current_price <= 0 or volume <= 0:
-                return 0.0
-            
-            # Calculate individual components
-            momentum_score = self._calculate_momentum_score(stock_data)
-            volume_score = self._calculate_volume_score(stock_data)
-            persistence_score = self._calculate_persistence_score(stock_data)
-            rsi_score = self._calculate_rsi_score(stock_data)
-            
-            # Combine scores with weights
-            total_score = (
-                momentum_score * self.momentum_weight +
-                volume_score * self.volume_weight +
-                persistence_score * self.persistence_weight +
-                rsi_score * self.rsi_weight
-            )
-            
-            # Ensure score is between 0-100
-            final_score = max(0, min(100, total_score))
-            
-            return final_score
+            return float(self.calculate_scores([stock_data])[0])
             
         except Exception as e:
             self.logger.error(f"Error calculating score: {e}")
             return 0.0
     
-    def _calculate_momentum_score(self, stock_data: Dict[str, Any]) -> float:
-        """Calculate price momentum score"""
-        try:
-            price_change_pct = float(stock_data.get('per_chg', 0))
-            
-            # Score based on price change magnitude
-            if price_change_pct >= 5.0:
-                return 100.0
-            elif price_change_pct >= 3.0:
-                return 85.0
-            elif price_change_pct >= 2.0:
-                return 70.0
-            elif price_change_pct >= 1.0:
-                return 55.0
-            elif price_change_pct >= 0.5:
-                return 40.0
-            elif price_change_pct >= 0:
-                return 25.0
-            else:
-                return 10.0  # Negative momentum gets low score
-                
-        except:
-            return 25.0
-    
-    def _calculate_volume_score(self, stock_data: Dict[str, Any]) -> float:
-        """Calculate volume momentum score"""
-        try:
-            volume = float(stock_data.get('volume', 0))
-            avg_volume = float(stock_data.get('avg_volume', volume))
-            
-            if avg_volume <= 0:
-                avg_volume = volume
-            
-            volume_ratio = volume / avg_volume
-            
-            # Score based on volume surge
-            if volume_ratio >= 3.0:
-                return 100.0
-            elif volume_ratio >= 2.0:
-                return 85.0
-            elif volume_ratio >= 1.5:
-                return 70.0
-            elif volume_ratio >= 1.2:
-                return 55.0
-            elif volume_ratio >= 1.0:
-                return 40.0
-            else:
-                return 20.0
-                
-        except:
-            return 40.0
-    
-    def _calculate_persistence_score(self, stock_data: Dict[str, Any]) -> float:
-        """Calculate momentum persistence score"""
-        try:
-            # Use available data to estimate persistence
-            price_change = float(stock_data.get('per_chg', 0))
-            high = float(stock_data.get('high', 0))
-            low = float(stock_data.get('low', 0))
-            close = float(stock_data.get('close', 0))
-            
-            if high <= low:
-                return 50.0
-            
-            # Calculate position within day's range
-            range_position = (close - low) / (high - low)
-            
-            # For buy signals, prefer stocks closing near highs
-            if price_change > 0:
-                if range_position >= 0.8:
-                    return 90.0
-                elif range_position >= 0.6:
-                    return 70.0
-                elif range_position >= 0.4:
-                    return 50.0
-                else:
-                    return 30.0
-            else:
-                # For negative momentum, lower persistence score
-                return 20.0
-                
-        except:
-            return 50.0
-    
-    def _calculate_rsi_score(self, stock_data: Dict[str, Any]) -> float:
-        """Calculate RSI-based score (simplified)"""
-        try:
-            price_change = float(stock_data.get('per_chg', 0))
-            
-            # Simplified RSI-like calculation
-            if price_change > 0:
-                # Positive momentum
-                if price_change >= 3.0:
-                    return 80.0  # Strong but not overbought
-                elif price_change >= 1.5:
-                    return 70.0
-                else:
-                    return 60.0
-            else:
-                # Negative momentum - might be oversold opportunity
-                if price_change <= -3.0:
-                    return 40.0  # Potential oversold bounce
-                else:
-                    return 30.0
-                    
-        except:
-            return 50.0
-    
     def get_selection_criteria(self) -> Dict[str, Any]:
         """Get selection criteria for this algorithm"""
         return {
@@ -16,6 +16,9 @@ from typing import Dict, Any
 from datetime import datetime
 
 from recommendation_engine.utils.base_algorithm import BaseSeedAlgorithm
+from recommendation_engine.seed_algorithms.utils.scoring_kernel import (
+    All, AnyOf, Cond, Const, ScoringTable, Step, Sum, When
+)
 
 
 class VolumeSurgeIntradayV1(BaseSeedAlgorithm):
@@ -70,8 +73,93 @@ class VolumeSurgeIntradayV1(BaseSeedAlgorithm):
         self.breakout_weight = self.parameters.get('breakout_weight', 0.2)
         self.institutional_weight = self.parameters.get('institutional_weight', 0.15)
         
+        self.scoring_kernel = self.scoring_table().compile()
+        
         self.logger.info(f"Initialized {self.alg_id} with min_volume_surge={self.min_volume_surge}")
     
+    def scoring_table(self) -> ScoringTable:
+        """
+        Scoring rules for this algorithm
+        
+        - Surge: volume vs historical average
+        - Correlation: price and volume moving in the same direction
+        - Breakout: daily range, close near high with volume, price change
+        - Institutional: absolute volume, surge and turnover
+        """
+        no_average = Cond('avg_volume', '<=', 0)
+        
+        return ScoringTable(
+            inputs={
+                'close': 0.0,
+                'volume': 0.0,
+                'per_chg': 0.0,
+                'high': 0.0,
+                'low': 0.0,
+                'market_cap': 0.0,
+                'avg_volume': 'volume',
+            },
+            derived={
+                'volume_ratio': lambda c: c['volume'] / c['avg_volume'],
+                'volume_change': lambda c: (c['volume'] - c['avg_volume']) / c['avg_volume'] * 100,
+                'correlation_strength': lambda c: np.minimum(np.abs(c['per_chg']), np.abs(c['volume_change'])),
+                'daily_range': lambda c: (c['high'] - c['low']) / c['low'] * 100,
+                'range_position': lambda c: (c['close'] - c['low']) / (c['high'] - c['low']),
+                'volume_turnover': lambda c: np.where(c['market_cap'] > 0,
+                                                      c['volume'] / (c['market_cap'] / c['close']), 0.0),
+            },
+            components=[
+                ('surge', self.surge_weight,
+                 When(no_average, Const(0.0),
+                      Step('volume_ratio', [1.0, 1.2, 1.5, 2.0, 2.5, 3.0, 5.0],
+                           [15.0, 30.0, 45.0, 60.0, 70.0, 80.0, 90.0, 100.0]))),
+                ('correlation', self.correlation_weight,
+                 When(no_average, Const(50.0),
+                      When(All(Cond('per_chg', '>', 0), Cond('volume_change', '>', 0)),
+                           Step('correlation_strength', [1.0, 2.0, 3.0], [50.0, 65.0, 80.0, 95.0]),
+                           # Price down, volume up - potential reversal
+                           When(All(Cond('per_chg', '<', 0), Cond('volume_change', '>', 0)), Const(40.0),
+                                # Price up, volume down - weak signal
+                                When(All(Cond('per_chg', '>', 0), Cond('volume_change', '<', 0)), Const(25.0),
+                                     Const(30.0)))))),
+                ('breakout', self.breakout_weight,
+                 When(AnyOf(Cond('high', '<=', 'low'), no_average, Cond('low', '==', 0)), Const(50.0),
+                      Sum(
+                          # Wide range suggests volatility/breakout
+                          Step('daily_range', [2.0, 3.0, 5.0], [0.0, 10.0, 20.0, 30.0]),
+                          # Position near high with volume suggests bullish breakout
+                          When(All(Cond('range_position', '>=', 0.8), Cond('volume_ratio', '>=', 1.5)), Const(40.0),
+                               When(All(Cond('range_position', '>=', 0.6), Cond('volume_ratio', '>=', 1.2)),
+                                    Const(25.0), Step('range_position', [0.4], [0.0, 15.0]))),
+                          # Price change confirmation
+                          Step('per_chg', [0.5, 1.0, 2.0], [0.0, 10.0, 20.0, 30.0]),
+                          cap=100.0))),
+                ('institutional', self.institutional_weight,
+                 When(AnyOf(no_average, Cond('close', '<=', 0)), Const(50.0),
+                      Sum(
+                          # 10 lakh / 50 lakh / 1 crore+ volume
+                          Step('volume', [1000000, 5000000, 10000000], [0.0, 20.0, 30.0, 40.0]),
+                          # Volume surge suggests new interest
+                          Step('volume_ratio', [1.5, 2.0, 3.0], [0.0, 15.0, 25.0, 35.0]),
+                          # Reasonable turnover
+                          When(All(Cond('volume_turnover', '>=', 0.02), Cond('volume_turnover', '<=', 0.1)),
+                               Const(25.0), When(Cond('volume_turnover', '<=', 0.02), Const(15.0), Const(0.0))),
+                          cap=100.0))),
+            ],
+            guard=AnyOf(Cond('close', '<=', 0), Cond('volume', '<=', 0)),
+        )
+    
+    def calculate_scores(self, stocks: Any) -> np.ndarray:
+        """
+        Calculate volume surge scores for many stocks with the compiled scoring table
+        
+        Args:
+            stocks: DataFrame, list of stock dictionaries or dict of arrays
+            
+        Returns:
+            np.ndarray: Scores between 0-100, in input order
+        """
+        return self.scoring_kernel.score(stocks)
+    
     def calculate_score(self, stock_data: Dict[str, Any]) -> float:
         """
         Calculate volume surge score for a stock
@@ -83,201 +171,12 @@ class VolumeSurgeIntradayV1(BaseSeedAlgorithm):
             float: Score between 0-100
         """
         try:
-            # Extract basic data
-            current_volume = float(stock_data.get('volume', 0))
-            current_price = float(stock_data.get('close', 0))
-            
-            # Basic validation
-            if current_price <= 0 or current_volume <= 0:
-                return 0.0
-            
-            # Calculate individual components
-            surge_score = self._calculate_surge_score(stock_data)
-            correlation_score = self._calculate_correlation_score(stock_data)
-            breakout_score = self._calculate_breakout_score(stock_data)
-            institutional_score = self._calculate_institutional_score(stock_data)
-            
-            # Combine scores with weights
-            total_score = (
-                surge_score * self.surge_weight +
-                correlation_score * self.correlation_weight +
-                breakout_score * self.breakout_weight +
-                institutional_score * self.institutional_weight
-            )
-            
-            # Ensure score is between 0-100
-            final_score = max(0, min(100, total_score))
-            
-            return final_score
+            return float(self.calculate_scores([stock_data])[0])
             
         except Exception as e:
             self.logger.error(f"Error calculating score: {e}")
             return 0.0
     
-    def _calculate_surge_score(self, stock_data: Dict[str, Any]) -> float:
-        """Calculate volume surge score"""
-        try:
-            volume = float(stock_data.get('volume', 0))
-            avg_volume = float(stock_data.get('avg_volume', volume))
-            
-            if avg_volume <= 0:
-                return 0.0
-            
-            volume_ratio = volume / avg_volume
-            
-            # Score based on volume surge magnitude
-            if volume_ratio >= 5.0:
-                return 100.0
-            elif volume_ratio >= 3.0:
-                return 90.0
-            elif volume_ratio >= 2.5:
-                return 80.0
-            elif volume_ratio >= 2.0:
-                return 70.0
-            elif volume_ratio >= 1.5:
-                return 60.0
-            elif volume_ratio >= 1.2:
-                return 45.0
-            elif volume_ratio >= 1.0:
-                return 30.0
-            else:
-                return 15.0
-                
-        except:
-            return 30.0
-    
-    def _calculate_correlation_score(self, stock_data: Dict[str, Any]) -> float:
-        """Calculate price-volume correlation score"""
-        try:
-            price_change = float(stock_data.get('per_chg', 0))
-            volume = float(stock_data.get('volume', 0))
-            avg_volume = float(stock_data.get('avg_volume', volume))
-            
-            if avg_volume <= 0:
-                return 50.0
-            
-            volume_change = (volume - avg_volume) / avg_volume * 100
-            
-            # Check if price and volume move in same direction
-            if price_change > 0 and volume_change > 0:
-                # Both positive - good correlation
-                correlation_strength = min(abs(price_change), abs(volume_change))
-                if correlation_strength >= 3.0:
-                    return 95.0
-                elif correlation_strength >= 2.0:
-                    return 80.0
-                elif correlation_strength >= 1.0:
-                    return 65.0
-                else:
-                    return 50.0
-            elif price_change < 0 and volume_change > 0:
-                # Price down, volume up - potential reversal
-                return 40.0
-            elif price_change > 0 and volume_change < 0:
-                # Price up, volume down - weak signal
-                return 25.0
-            else:
-                # Both negative
-                return 30.0
-                
-        except:
-            return 50.0
-    
-    def _calculate_breakout_score(self, stock_data: Dict[str, Any]) -> float:
-        """Calculate breakout confirmation score"""
-        try:
-            price_change = float(stock_data.get('per_chg', 0))
-            high = float(stock_data.get('high', 0))
-            low = float(stock_data.get('low', 0))
-            close = float(stock_data.get('close', 0))
-            volume = float(stock_data.get('volume', 0))
-            avg_volume = float(stock_data.get('avg_volume', volume))
-            
-            if high <= low or avg_volume <= 0:
-                return 50.0
-            
-            # Calculate daily range and position
-            daily_range = (high - low) / low * 100
-            range_position = (close - low) / (high - low)
-            volume_ratio = volume / avg_volume
-            
-            # Score based on breakout characteristics
-            breakout_score = 0.0
-            
-            # Wide range suggests volatility/breakout
-            if daily_range >= 5.0:
-                breakout_score += 30.0
-            elif daily_range >= 3.0:
-                breakout_score += 20.0
-            elif daily_range >= 2.0:
-                breakout_score += 10.0
-            
-            # Position near high with volume suggests bullish breakout
-            if range_position >= 0.8 and volume_ratio >= 1.5:
-                breakout_score += 40.0
-            elif range_position >= 0.6 and volume_ratio >= 1.2:
-                breakout_score += 25.0
-            elif range_position >= 0.4:
-                breakout_score += 15.0
-            
-            # Price change confirmation
-            if price_change >= 2.0:
-                breakout_score += 30.0
-            elif price_change >= 1.0:
-                breakout_score += 20.0
-            elif price_change >= 0.5:
-                breakout_score += 10.0
-            
-            return min(100.0, breakout_score)
-                
-        except:
-            return 50.0
-    
-    def _calculate_institutional_score(self, stock_data: Dict[str, Any]) -> float:
-        """Calculate institutional activity score"""
-        try:
-            volume = float(stock_data.get('volume', 0))
-            market_cap = float(stock_data.get('market_cap', 0))
-            avg_volume = float(stock_data.get('avg_volume', volume))
-            close = float(stock_data.get('close', 0))
-            
-            if avg_volume <= 0 or close <= 0:
-                return 50.0
-            
-            # Estimate institutional interest
-            volume_turnover = volume / (market_cap / close) if market_cap > 0 else 0
-            volume_ratio = volume / avg_volume
-            
-            # Large volume with reasonable turnover suggests institutional activity
-            institutional_score = 0.0
-            
-            # Volume-based indicators
-            if volume >= 10000000:  # 1 crore+ volume
-                institutional_score += 40.0
-            elif volume >= 5000000:  # 50 lakh+ volume
-                institutional_score += 30.0
-            elif volume >= 1000000:  # 10 lakh+ volume
-                institutional_score += 20.0
-            
-            # Volume surge suggests new interest
-            if volume_ratio >= 3.0:
-                institutional_score += 35.0
-            elif volume_ratio >= 2.0:
-                institutional_score += 25.0
-            elif volume_ratio >= 1.5:
-                institutional_score += 15.0
-            
-            # Turnover analysis
-            if 0.02 <= volume_turnover <= 0.1:  # Reasonable turnover
-                institutional_score += 25.0
-            elif volume_turnover <= 0.02:
-                institutional_score += 15.0
-            
-            return min(100.0, institutional_score)
-                
-        except:
-            return 50.0
-    
     def get_selection_criteria(self) -> Dict[str, Any]:
         """Get selection criteria for this algorithm"""
         return {
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Seed Algorithm Scoring Kernel
+
+Seed algorithms declare their score as a table of rules over named columns
+instead of hand-written if/elif chains per stock:
+
+- ``Step``   threshold bands (``x >= t`` picks the next value)
+- ``Linear`` piecewise-linear interpolation between points
+- ``When``   a rule chosen by a condition, ``Sum`` adds rules up
+
+A ``ScoringTable`` lists the raw inputs (with their defaults), the derived
+columns, the weighted components and the guard that zeroes a candidate. It
+is compiled once into numpy closures and then scores whole arrays of
+candidates per call, so several algorithms or versions can score the same
+candidate set side by side cheaply.
+"""
+
+import operator
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+Columns = Dict[str, np.ndarray]
+Evaluator = Callable[[Columns], np.ndarray]
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+def _numeric(values: Any, size: int) -> np.ndarray:
+    """Float array of one input column; missing or non-numeric values are NaN"""
+    if values is None:
+        return np.full(size, np.nan)
+    try:
+        return np.asarray(values, dtype=float).reshape(size)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(list(values)), errors='coerce').to_numpy(dtype=float)
+
+
+# =====================================================================
+# Conditions
+# =====================================================================
+
+class Cond:
+    """``column <op> value``; ``value`` may name another column"""
+
+    def __init__(self, column: str, op: str, value: Union[float, str]):
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator: {op}")
+        self.column = column
+        self.op = op
+        self.value = value
+
+    def compile(self) -> Evaluator:
+        compare = OPERATORS[self.op]
+        column, value = self.column, self.value
+        if isinstance(value, str):
+            return lambda cols: compare(cols[column], cols[value])
+        return lambda cols: compare(cols[column], value)
+
+
+class All:
+    """Every condition holds"""
+
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def compile(self) -> Evaluator:
+        compiled = [c.compile() for c in self.conditions]
+        return lambda cols: np.logical_and.reduce([c(cols) for c in compiled])
+
+
+class AnyOf:
+    """At least one condition holds"""
+
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def compile(self) -> Evaluator:
+        compiled = [c.compile() for c in self.conditions]
+        return lambda cols: np.logical_or.reduce([c(cols) for c in compiled])
+
+
+# =====================================================================
+# Rules
+# =====================================================================
+
+class Const:
+    """The same value for every candidate"""
+
+    def __init__(self, value: float):
+        self.value = float(value)
+
+    def compile(self) -> Evaluator:
+        value = self.value
+        return lambda cols: np.full(len(next(iter(cols.values()))), value)
+
+
+class Step:
+    """
+    Threshold bands over one column
+
+    ``thresholds`` ascend and ``values`` has one more entry: values[0] below
+    the first threshold, values[i] from thresholds[i-1] up. With
+    ``closed='right'`` a value equal to a threshold stays in the lower band
+    (``x > t`` instead of ``x >= t``).
+    """
+
+    def __init__(self, column: str, thresholds: Sequence[float], values: Sequence[float],
+                 closed: str = 'left'):
+        if len(values) != len(thresholds) + 1:
+            raise ValueError("Step needs exactly one more value than thresholds")
+        if list(thresholds) != sorted(thresholds):
+            raise ValueError("Step thresholds must ascend")
+        if closed not in ('left', 'right'):
+            raise ValueError("closed must be 'left' or 'right'")
+        self.column = column
+        self.thresholds = np.asarray(thresholds, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        self.side = 'right' if closed == 'left' else 'left'
+
+    def compile(self) -> Evaluator:
+        column, thresholds, values, side = self.column, self.thresholds, self.values, self.side
+        return lambda cols: values[np.searchsorted(thresholds, cols[column], side=side)]
+
+
+class Linear:
+    """Piecewise-linear score between (x, y) points, flat beyond the ends"""
+
+    def __init__(self, column: str, xs: Sequence[float], ys: Sequence[float]):
+        if len(xs) != len(ys) or not xs:
+            raise ValueError("Linear needs matching, non-empty xs and ys")
+        self.column = column
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+
+    def compile(self) -> Evaluator:
+        column, xs, ys = self.column, self.xs, self.ys
+        return lambda cols: np.interp(cols[column], xs, ys)
+
+
+class When:
+    """``then`` where the condition holds, ``otherwise`` elsewhere"""
+
+    def __init__(self, condition, then, otherwise):
+        self.condition = condition
+        self.then = then
+        self.otherwise = otherwise
+
+    def compile(self) -> Evaluator:
+        condition, then, otherwise = self.condition.compile(), self.then.compile(), self.otherwise.compile()
+        return lambda cols: np.where(condition(cols), then(cols), otherwise(cols))
+
+
+class Sum:
+    """Sum of rules, optionally capped"""
+
+    def __init__(self, *rules, cap: Optional[float] = None):
+        self.rules = rules
+        self.cap = cap
+
+    def compile(self) -> Evaluator:
+        compiled = [r.compile() for r in self.rules]
+        cap = self.cap
+
+        def evaluate(cols):
+            total = np.sum([r(cols) for r in compiled], axis=0)
+            return np.minimum(total, cap) if cap is not None else total
+        return evaluate
+
+
+# =====================================================================
+# Tables
+# =====================================================================
+
+class ScoringTable:
+    """
+    Declarative score of one seed algorithm
+
+    Args:
+        inputs: Raw column -> default when missing/NaN (a number, or the name
+            of an earlier input to copy, e.g. avg_volume defaults to volume)
+        derived: Column name -> function of the columns so far, in order
+        components: (name, weight, rule) triples, combined as a weighted sum
+        guard: Condition that forces the score to 0 (e.g. no price)
+        bounds: Final clamp of the weighted sum
+    """
+
+    def __init__(self, inputs: Dict[str, Union[float, str]],
+                 derived: Optional[Dict[str, Callable[[Columns], np.ndarray]]] = None,
+                 components: Sequence[Tuple[str, float, Any]] = (),
+                 guard=None, bounds: Tuple[float, float] = (0.0, 100.0)):
+        self.inputs = inputs
+        self.derived = derived or {}
+        self.components = list(components)
+        self.guard = guard
+        self.bounds = bounds
+
+    def compile(self) -> 'ScoringKernel':
+        return ScoringKernel(self)
+
+
+class ScoringKernel:
+    """A compiled ScoringTable - scores arrays of candidates"""
+
+    def __init__(self, table: ScoringTable):
+        self.table = table
+        self.names = [name for name, _, _ in table.components]
+        self.weights = np.array([weight for _, weight, _ in table.components], dtype=float)
+        self._rules = [rule.compile() for _, _, rule in table.components]
+        self._guard = table.guard.compile() if table.guard is not None else None
+
+    def columns(self, candidates: Union[pd.DataFrame, Iterable[Dict[str, Any]], Dict[str, Any]]) -> Columns:
+        """Input and derived columns for a DataFrame, dict of arrays or list of dicts"""
+        if isinstance(candidates, pd.DataFrame):
+            size = len(candidates)
+            raw = lambda name: candidates[name] if name in candidates.columns else None
+        elif isinstance(candidates, dict):
+            size = len(next(iter(candidates.values()), ()))
+            raw = candidates.get
+        else:
+            records = list(candidates)
+            size = len(records)
+            raw = lambda name: [record.get(name) for record in records]
+
+        cols: Columns = {}
+        for name, default in self.table.inputs.items():
+            values = _numeric(raw(name), size)
+            fallback = cols[default] if isinstance(default, str) else default
+            cols[name] = np.where(np.isnan(values), fallback, values)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for name, derive in self.table.derived.items():
+                cols[name] = np.asarray(derive(cols), dtype=float)
+        return cols
+
+    def evaluate(self, cols: Columns) -> Tuple[np.ndarray, np.ndarray]:
+        """(component scores as components x candidates, final scores)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            parts = np.array([rule(cols) for rule in self._rules], dtype=float).reshape(len(self._rules), -1)
+            low, high = self.table.bounds
+            scores = np.clip(self.weights @ parts, low, high)
+            if self._guard is not None:
+                scores = np.where(self._guard(cols), 0.0, scores)
+        return parts, scores
+
+    def score(self, candidates) -> np.ndarray:
+        """Final score per candidate"""
+        return self.evaluate(self.columns(candidates))[1]
+
+    def breakdown(self, candidates) -> pd.DataFrame:
+        """Component scores and the final score per candidate"""
+        parts, scores = self.evaluate(self.columns(candidates))
+        frame = pd.DataFrame(parts.T, columns=self.names)
+        frame['score'] = scores
+        return frame
+
+
+def score_side_by_side(algorithms: Sequence[Any], candidates: pd.DataFrame,
+                       key: str = 'symbol') -> pd.DataFrame:
+    """
+    Score the same candidates with several seed algorithms / versions
+
+    Returns:
+        DataFrame indexed like ``candidates`` (by ``key`` when present) with
+        one ``<alg_id>@<version>`` column per algorithm (``#n`` appended when
+        the same version is passed twice, e.g. with different parameters)
+    """
+    records = candidates.to_dict('records') if isinstance(candidates, pd.DataFrame) else list(candidates)
+    frame = pd.DataFrame.from_records(records)
+    result = pd.DataFrame(index=frame[key] if key in frame.columns else frame.index)
+    for position, algorithm in enumerate(algorithms):
+        label = f"{algorithm.alg_id}@{algorithm.version}"
+        if label in result.columns:
+            label = f"{label}#{position}"
+        result[label] = algorithm.calculate_scores(frame)
+    return result
@@ -61,6 +61,28 @@ class BaseSeedAlgorithm(ABC):
         """
         pass
     
+    def calculate_scores(self, stocks: Any) -> np.ndarray:
+        """
+        Calculate scores for many stocks at once
+        
+        Algorithms with a compiled scoring table override this with a
+        vectorized version; the default scores one stock at a time.
+        
+        Args:
+            stocks: DataFrame or list of stock dictionaries
+            
+        Returns:
+            np.ndarray: Scores between 0-100, in input order
+        """
+        records = stocks.to_dict('records') if isinstance(stocks, pd.DataFrame) else list(stocks)
+        scores = np.zeros(len(records))
+        for i, stock in enumerate(records):
+            try:
+                scores[i] = self.calculate_score(stock)
+            except Exception as e:
+                self.logger.error(f"Error scoring {stock.get('symbol', 'unknown')}: {e}")
+        return scores
+    
     def score_stocks(self, stocks_df: pd.DataFrame) -> pd.DataFrame:
         """
         Score multiple stocks and return ranked dataframe
@@ -74,28 +96,20 @@ class BaseSeedAlgorithm(ABC):
         if stocks_df.empty:
             return stocks_df
         
-        scores = []
-        for _, stock in stocks_df.iterrows():
-            try:
-                score = self.calculate_score(stock.to_dict())
-                scores.append({
-                    'symbol': stock.get('symbol', stock.get('nsecode', '')),
-                    'alg_score': score,
-                    'alg_id': self.alg_id,
-                    'trading_theme': self.trading_theme,
-                    'timestamp': datetime.now()
-                })
-            except Exception as e:
-                self.logger.error(f"Error scoring {stock.get('symbol', 'unknown')}: {e}")
-                scores.append({
-                    'symbol': stock.get('symbol', stock.get('nsecode', '')),
-                    'alg_score': 0.0,
-                    'alg_id': self.alg_id,
-                    'trading_theme': self.trading_theme,
-                    'timestamp': datetime.now()
-                })
-        
-        score_df = pd.DataFrame(scores)
+        if 'symbol' in stocks_df.columns:
+            symbols = stocks_df['symbol']
+        elif 'nsecode' in stocks_df.columns:
+            symbols = stocks_df['nsecode']
+        else:
+            symbols = pd.Series([''] * len(stocks_df))
+        
+        score_df = pd.DataFrame({
+            'symbol': symbols.to_numpy(),
+            'alg_score': self.calculate_scores(stocks_df),
+            'alg_id': self.alg_id,
+            'trading_theme': self.trading_theme,
+            'timestamp': datetime.now()
+        })
         score_df = score_df.sort_values('alg_score', ascending=False)
         score_df['rank'] = range(1, len(score_df) + 1)
         
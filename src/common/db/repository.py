@@ -130,6 +130,16 @@ class SQLAlchemyRepository(Generic[T], BaseRepository):
             session.commit()
             return result.rowcount
 
+    def update_many(self, changes_by_id: Dict[Any, Dict[str, Any]]):
+        """Partial updates of several records in one transaction."""
+        with self._get_session() as session:
+            rowcount = 0
+            for identifier, changes in changes_by_id.items():
+                stmt = sa_update(self.model).where(self.model.id == identifier).values(**changes)
+                rowcount += session.execute(stmt).rowcount
+            session.commit()
+            return rowcount
+
     def delete(self, identifier: Any):  # type: ignore[override]
         with self._get_session() as session:
             stmt = sa_delete(self.model).where(self.model.id == identifier)
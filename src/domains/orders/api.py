@@ -10,10 +10,12 @@ from uuid import UUID
 
 from .schemas import OrderCreate, OrderPublic, OrderUpdateIn, OrderList
 from .services import OrderService, RiskService, NotificationService, ExecutionService
-from .repositories import OrderRepository, TradeRepository
+from .repositories import OrderRepository, TradeRepository, close_order_write_behind
 from .brokers import get_broker_adapter
 
 router = APIRouter(prefix="/orders", tags=["orders"])
+# Queued fills must reach the database before the app exits
+router.add_event_handler("shutdown", close_order_write_behind)
 
 # DI factory ----------------------------------------------------------------
 
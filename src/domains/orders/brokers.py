@@ -17,7 +17,7 @@ from typing import Dict, List
 from datetime import datetime
 
 from domains.orders.models import OrderModel, TradeModel
-from domains.orders.repositories import OrderRepository, TradeRepository
+from domains.orders.repositories import get_order_write_behind
 from order.models import OrderStatus, OrderSide
 
 # ---------------------------------------------------------------------------
@@ -55,8 +55,9 @@ class PaperBrokerAdapter(BrokerAdapter):
         fill_price = self._determine_fill_price(order)
         quantity = order.quantity
 
-        # Mark order as filled
-        OrderRepository.update(order.id, {
+        # Mark order as filled (written by the background batcher)
+        writer = get_order_write_behind()
+        writer.update_order(order.id, {
             "status": OrderStatus.FILLED,
             "filled_quantity": quantity,
             "average_fill_price": fill_price,
@@ -76,7 +77,7 @@ class PaperBrokerAdapter(BrokerAdapter):
             fees=Decimal("0"),
             exchange="PAPER",
         )
-        TradeRepository.insert(trade)
+        writer.insert_trade(trade)
         return broker_id
 
     async def cancel(self, broker_order_id: str) -> None:
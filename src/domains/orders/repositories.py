@@ -2,10 +2,23 @@
 
 Pre-configured repository helpers for the Orders domain – keeps service layer
 code ultra-thin.
+
+``OrderWriteBehind`` takes order updates and trade inserts off the request
+path: callers enqueue them and a background thread writes everything queued
+so far in one transaction per table (updates to the same order are merged).
+A failed flush puts the batch back in the queue for the next one; ``close()``
+(router shutdown / interpreter exit) stops the thread and flushes what is left.
+Env: ORDER_WRITE_BEHIND_INTERVAL – max seconds between flushes (default 0.05).
 """
 
 from __future__ import annotations
 
+import atexit
+import logging
+import os
+import threading
+from typing import Any, Dict, List
+
 from common.db.repository import SQLAlchemyRepository
 from common.db import get_sync_session_factory
 
@@ -16,7 +29,117 @@ SessionLocal = get_sync_session_factory()
 OrderRepository = SQLAlchemyRepository(SessionLocal, OrderModel)
 TradeRepository = SQLAlchemyRepository(SessionLocal, TradeModel)
 
+logger = logging.getLogger(__name__)
+
+ORDER_WRITE_BEHIND_INTERVAL = float(os.getenv("ORDER_WRITE_BEHIND_INTERVAL", "0.05"))
+
+
+class OrderWriteBehind:
+    """Batches order updates and trade inserts onto a background thread."""
+
+    def __init__(self, orders=OrderRepository, trades=TradeRepository,
+                 interval: float = ORDER_WRITE_BEHIND_INTERVAL):
+        self._orders = orders
+        self._trades = trades
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._order_changes: Dict[Any, Dict[str, Any]] = {}
+        self._new_trades: List[Any] = []
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="order-write-behind", daemon=True)
+        self._thread.start()
+
+    def update_order(self, order_id: Any, changes: Dict[str, Any]) -> None:
+        with self._lock:
+            self._order_changes.setdefault(order_id, {}).update(changes)
+        self._wake.set()
+
+    def insert_trade(self, trade: Any) -> None:
+        with self._lock:
+            self._new_trades.append(trade)
+        self._wake.set()
+
+    def flush(self) -> bool:
+        """Write everything queued so far (also called by the background thread).
+
+        Returns False if the write failed; the batch is queued again.
+        """
+        with self._lock:
+            order_changes, self._order_changes = self._order_changes, {}
+            new_trades, self._new_trades = self._new_trades, []
+        # Orders first – trades reference them
+        try:
+            if order_changes:
+                self._orders.update_many(order_changes)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Order write-behind flush failed (%d orders, %d trades), will retry: %s",
+                         len(order_changes), len(new_trades), exc)
+            self._requeue(order_changes, new_trades)
+            return False
+        try:
+            if new_trades:
+                self._trades.insert_many(new_trades)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Order write-behind flush failed (%d trades), will retry: %s", len(new_trades), exc)
+            self._requeue({}, new_trades)
+            return False
+        return True
+
+    def _requeue(self, order_changes: Dict[Any, Dict[str, Any]], new_trades: List[Any]) -> None:
+        with self._lock:
+            # Changes queued since the failed flush are newer – they win
+            for order_id, changes in order_changes.items():
+                self._order_changes[order_id] = {**changes, **self._order_changes.get(order_id, {})}
+            self._new_trades[:0] = new_trades
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stop the background thread and write whatever is still queued."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        if not self.flush():
+            logger.error("Order write-behind closed with %d orders and %d trades not written",
+                         len(self._order_changes), len(self._new_trades))
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if self._closed.is_set():
+                break
+            if not self.flush():
+                # Back off, then retry even if nothing new arrives
+                self._closed.wait(max(self._interval, 1.0))
+                self._wake.set()
+                continue
+            # Let a burst of fills accumulate into the next transaction
+            self._closed.wait(self._interval)
+
+
+_write_behind: OrderWriteBehind | None = None
+
+
+def get_order_write_behind() -> OrderWriteBehind:
+    global _write_behind
+    if _write_behind is None:
+        _write_behind = OrderWriteBehind()
+        atexit.register(close_order_write_behind)
+    return _write_behind
+
+
+def close_order_write_behind() -> None:
+    """Flush and stop the shared write-behind (app shutdown hook)."""
+    if _write_behind is not None:
+        _write_behind.close()
+
+
 __all__ = [
     "OrderRepository",
     "TradeRepository",
-] 
\ No newline at end of file
+    "OrderWriteBehind",
+    "get_order_write_behind",
+    "close_order_write_behind",
+]
@@ -0,0 +1,19 @@
+"""
+Offline benchmark suite
+
+Replays recorded ChartInk scans and Yahoo Finance frames from a local
+fixture store (``tests/fixtures/benchmarks``) and measures latency and
+throughput of the recommendation hot paths. Results are saved per commit
+under ``.benchmarks/`` for comparison::
+
+    pytest tests/performance                      # run and save
+    python -m tests.performance.harness compare   # latest run vs the one before
+    python -m tests.performance.harness compare HEAD~1 HEAD --threshold 0.1
+
+Env
+---
+BENCH_ROUNDS    measured rounds per benchmark (default 20)
+BENCH_WARMUP    unmeasured warmup rounds (default 3)
+BENCH_SAVE      save results under .benchmarks/ (default 1)
+BENCH_RECORD    call the live services and record fixtures (default 0)
+"""
@@ -0,0 +1,75 @@
+"""
+Benchmark session plumbing
+
+Benchmarks only run when selected - ``pytest tests/performance`` or
+``pytest -m performance`` - so the regular test run stays fast. The
+results of a session are printed at the end and saved under
+``.benchmarks/`` (unless BENCH_SAVE=0).
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from tests.performance.fixture_store import FixtureStore
+from tests.performance.harness import ResultStore, format_results, measure, measure_async
+
+PERFORMANCE_DIR = Path(__file__).resolve().parent
+BENCH_SAVE = os.getenv("BENCH_SAVE", "1") == "1"
+
+_results = []
+
+
+def _selected(config):
+    if "performance" in (config.getoption("markexpr") or ""):
+        return True
+    for arg in config.args:
+        path = Path(arg.split("::")[0]).resolve()
+        if path == PERFORMANCE_DIR or PERFORMANCE_DIR in path.parents:
+            return True
+    return False
+
+
+def pytest_collection_modifyitems(config, items):
+    skip = None if _selected(config) else pytest.mark.skip(
+        reason="benchmarks run with `pytest tests/performance` or `-m performance`")
+    for item in items:
+        if PERFORMANCE_DIR in Path(str(item.fspath)).parents:
+            item.add_marker(pytest.mark.performance)
+            if skip:
+                item.add_marker(skip)
+
+
+class Bench:
+    """Runs benchmarks and collects their results for the session"""
+
+    def run(self, fn, name, group="default", **kwargs):
+        result = measure(fn, name, group, **kwargs)
+        _results.append(result)
+        return result
+
+    def run_async(self, coro_fn, name, group="default", **kwargs):
+        result = measure_async(coro_fn, name, group, **kwargs)
+        _results.append(result)
+        return result
+
+
+@pytest.fixture
+def bench():
+    return Bench()
+
+
+@pytest.fixture(scope="session")
+def fixture_store():
+    return FixtureStore()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not _results:
+        return
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(format_results(_results))
+    if BENCH_SAVE:
+        path = ResultStore().save(_results)
+        terminalreporter.write_line(f"\nSaved to {path}")
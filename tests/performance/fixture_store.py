@@ -0,0 +1,231 @@
+"""
+Local fixture store for the offline benchmarks
+
+ChartInk scans are stored per query (keyed by a hash of the normalized
+scan clause) as the ``data`` rows ChartInk returns; Yahoo Finance history
+is stored per symbol, period and interval as CSV, and ``Ticker.info`` as
+JSON. Anything not recorded falls back to deterministic synthetic data
+seeded by the fixture key, so every run replays the same inputs.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "fixtures" / "benchmarks"
+
+# NSE symbols used for synthetic scans
+UNIVERSE = [
+    "RELIANCE", "TCS", "HDFCBANK", "INFY", "ICICIBANK", "HINDUNILVR", "ITC", "SBIN",
+    "BHARTIARTL", "KOTAKBANK", "LT", "AXISBANK", "ASIANPAINT", "MARUTI", "SUNPHARMA",
+    "TITAN", "ULTRACEMCO", "BAJFINANCE", "NESTLEIND", "WIPRO", "HCLTECH", "TECHM",
+    "POWERGRID", "NTPC", "ONGC", "TATAMOTORS", "TATASTEEL", "JSWSTEEL", "HINDALCO",
+    "ADANIPORTS", "GRASIM", "CIPLA", "DRREDDY", "DIVISLAB", "EICHERMOT", "HEROMOTOCO",
+    "BAJAJ-AUTO", "BRITANNIA", "COALINDIA", "BPCL", "INDUSINDBK", "SBILIFE",
+    "HDFCLIFE", "APOLLOHOSP", "TATACONSUM", "UPL", "M&M", "PIDILITIND", "DABUR", "HAVELLS",
+]
+
+# Bars per (period, interval) for synthetic history
+_PERIOD_DAYS = {"1d": 1, "5d": 5, "1mo": 21, "3mo": 63, "6mo": 126, "1y": 252, "2y": 504, "5y": 1260}
+_INTERVAL_MINUTES = {"1m": 1, "5m": 5, "15m": 15, "30m": 30, "1h": 60, "1d": 375}
+_SESSION_MINUTES = 375
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def query_key(query):
+    """Fixture key of a ChartInk scan clause (whitespace-insensitive)"""
+    return _digest(" ".join(str(query).split()))[:16]
+
+
+def _rng(key):
+    return np.random.default_rng(int(_digest(key)[:8], 16))
+
+
+def _file_symbol(symbol):
+    return symbol.replace("^", "_").replace("&", "_").replace("/", "_")
+
+
+def synthetic_scan(query):
+    """ChartInk ``data`` rows for a scan nobody recorded"""
+    rng = _rng(query_key(query))
+    count = int(rng.integers(10, 41))
+    picks = rng.choice(len(UNIVERSE), size=count, replace=False)
+    close = np.round(rng.uniform(80, 4000, count), 2)
+    change = np.round(rng.normal(0.8, 2.0, count), 2)
+    volume = rng.integers(50_000, 5_000_000, count)
+    return [
+        {
+            "sr": i + 1,
+            "nsecode": UNIVERSE[p],
+            "name": f"{UNIVERSE[p].title()} Ltd",
+            "bsecode": str(500000 + int(p)),
+            "per_chg": float(change[i]),
+            "close": float(close[i]),
+            "volume": int(volume[i]),
+        }
+        for i, p in enumerate(picks.tolist())
+    ]
+
+
+def synthetic_history(symbol, period="1mo", interval="1d"):
+    """Yahoo Finance style OHLCV frame (Open/High/Low/Close/Volume)"""
+    rng = _rng(f"{symbol}|{period}|{interval}")
+    minutes = _INTERVAL_MINUTES.get(interval, _SESSION_MINUTES)
+    days = _PERIOD_DAYS.get(period, 21)
+    per_day = max(1, _SESSION_MINUTES // minutes)
+    bars = days * per_day
+
+    sessions = pd.bdate_range(end="2024-06-28", periods=days)
+    if interval == "1d":
+        index = sessions.tz_localize("Asia/Kolkata")
+    else:
+        offsets = pd.to_timedelta(np.arange(per_day) * minutes, unit="min")
+        opens = sessions + pd.Timedelta(hours=9, minutes=15)
+        index = pd.DatetimeIndex((opens.to_numpy()[:, None] + offsets.to_numpy()[None, :]).ravel())
+        index = index.tz_localize("Asia/Kolkata")
+
+    start = rng.uniform(100, 3000)
+    close = start * np.exp(np.cumsum(rng.normal(0.0003, 0.01, bars)))
+    open_ = np.concatenate(([start], close[:-1]))
+    spread = np.abs(rng.normal(0, 0.004, bars)) * close
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) + spread,
+        "Low": np.minimum(open_, close) - spread,
+        "Close": close,
+        "Volume": rng.integers(10_000, 2_000_000, bars),
+    }, index=pd.DatetimeIndex(index, name="Datetime" if interval != "1d" else "Date"))
+
+
+def synthetic_info(symbol):
+    """The ``Ticker.info`` fields the services read"""
+    rng = _rng(f"{symbol}|info")
+    return {
+        "symbol": symbol,
+        "longName": f"{symbol.split('.')[0].title()} Ltd",
+        "sector": str(rng.choice(["Technology", "Financial Services", "Energy", "Consumer Defensive", "Healthcare"])),
+        "marketCap": float(rng.uniform(1e10, 2e13)),
+        "trailingPE": float(rng.uniform(8, 60)),
+        "forwardPE": float(rng.uniform(8, 50)),
+        "priceToBook": float(rng.uniform(0.8, 12)),
+        "pegRatio": float(rng.uniform(0.5, 3)),
+        "returnOnEquity": float(rng.uniform(0.02, 0.35)),
+        "returnOnAssets": float(rng.uniform(0.01, 0.2)),
+        "debtToEquity": float(rng.uniform(0, 200)),
+        "currentRatio": float(rng.uniform(0.6, 3)),
+        "quickRatio": float(rng.uniform(0.4, 2.5)),
+        "dividendYield": float(rng.uniform(0, 0.05)),
+        "payoutRatio": float(rng.uniform(0, 0.8)),
+        "revenueGrowth": float(rng.normal(0.1, 0.1)),
+        "earningsGrowth": float(rng.normal(0.1, 0.15)),
+        "profitMargins": float(rng.uniform(0.02, 0.3)),
+        "operatingMargins": float(rng.uniform(0.05, 0.35)),
+        "grossMargins": float(rng.uniform(0.1, 0.6)),
+        "bookValue": float(rng.uniform(50, 1500)),
+        "totalCashPerShare": float(rng.uniform(5, 300)),
+        "beta": float(rng.uniform(0.5, 1.8)),
+        "priceToSalesTrailing12Months": float(rng.uniform(0.5, 15)),
+        "enterpriseValue": float(rng.uniform(1e10, 2e13)),
+    }
+
+
+class FixtureStore:
+    """Recorded ChartInk / Yahoo Finance responses with synthetic fallback"""
+
+    def __init__(self, directory=FIXTURES_DIR):
+        self.directory = Path(directory)
+        self._memo = {}  # Replays are served from memory after the first read
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, kind, name):
+        return self.directory / kind / name
+
+    def _cached(self, key, load):
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+        value, recorded = load()
+        with self._lock:
+            self._memo[key] = value
+            if recorded:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return value
+
+    # ------------------------------------------------------------------
+    # ChartInk
+    # ------------------------------------------------------------------
+
+    def scan_rows(self, query):
+        """ChartInk ``data`` rows for a scan clause"""
+        def load():
+            path = self._path("chartink", f"{query_key(query)}.json")
+            if path.exists():
+                return json.loads(path.read_text())["data"], True
+            return synthetic_scan(query), False
+        return self._cached(("scan", query_key(query)), load)
+
+    def scan_frame(self, query):
+        return pd.DataFrame(self.scan_rows(query))
+
+    def save_scan(self, query, rows):
+        path = self._path("chartink", f"{query_key(query)}.json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"query": " ".join(str(query).split()), "data": rows}, indent=1, default=str))
+        with self._lock:
+            self._memo[("scan", query_key(query))] = rows
+
+    # ------------------------------------------------------------------
+    # Yahoo Finance
+    # ------------------------------------------------------------------
+
+    def history(self, symbol, period="1mo", interval="1d"):
+        """OHLCV frame for ``Ticker(symbol).history(period, interval)``"""
+        name = f"{_file_symbol(symbol)}_{period}_{interval}.csv"
+
+        def load():
+            path = self._path("yahoo", name)
+            if path.exists():
+                frame = pd.read_csv(path, index_col=0)
+                frame.index = pd.to_datetime(frame.index, utc=True).tz_convert("Asia/Kolkata")
+                return frame, True
+            return synthetic_history(symbol, period, interval), False
+        return self._cached(("history", name), load).copy()
+
+    def save_history(self, symbol, period, interval, frame):
+        path = self._path("yahoo", f"{_file_symbol(symbol)}_{period}_{interval}.csv")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        frame.to_csv(path)
+        with self._lock:
+            self._memo[("history", path.name)] = frame.copy()
+
+    def info(self, symbol):
+        """``Ticker(symbol).info``"""
+        name = f"{_file_symbol(symbol)}_info.json"
+
+        def load():
+            path = self._path("yahoo", name)
+            if path.exists():
+                return json.loads(path.read_text()), True
+            return synthetic_info(symbol), False
+        return dict(self._cached(("info", name), load))
+
+    def save_info(self, symbol, info):
+        path = self._path("yahoo", f"{_file_symbol(symbol)}_info.json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(info, indent=1, default=str))
+        with self._lock:
+            self._memo[("info", path.name)] = dict(info)
+
+    def get_stats(self):
+        return {"recorded": self.hits, "synthetic": self.misses, "directory": str(self.directory)}
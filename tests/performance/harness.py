@@ -0,0 +1,299 @@
+"""
+Benchmark timing, result storage and commit-to-commit comparison
+
+``measure`` / ``measure_async`` run a callable for a number of warmup and
+measured rounds and summarize the latencies (percentiles, ops/sec). A run's
+results are saved as one JSON file per pytest session under
+``.benchmarks/``, tagged with the git commit they were measured on.
+
+Usage::
+
+    python -m tests.performance.harness list
+    python -m tests.performance.harness compare                # two latest runs
+    python -m tests.performance.harness compare main HEAD      # latest run of each commit
+    python -m tests.performance.harness compare a.json b.json --threshold 0.15
+
+``compare`` exits with status 1 when a benchmark's median latency grew by
+more than the threshold, so it can gate CI.
+"""
+
+import asyncio
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+BENCHMARK_DIR = PROJECT_ROOT / ".benchmarks"
+
+BENCH_ROUNDS = int(os.getenv("BENCH_ROUNDS", "20"))
+BENCH_WARMUP = int(os.getenv("BENCH_WARMUP", "3"))
+REGRESSION_THRESHOLD = 0.10
+
+
+@dataclass
+class BenchResult:
+    """Latency summary of one benchmark"""
+    name: str
+    group: str
+    rounds: int
+    mean_ms: float
+    stdev_ms: float
+    min_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    ops_per_sec: float
+    items_per_sec: Optional[float] = None
+
+    @classmethod
+    def from_timings(cls, name, group, seconds, items=None):
+        ms = sorted(s * 1000.0 for s in seconds)
+        mean = statistics.fmean(ms)
+        return cls(
+            name=name,
+            group=group,
+            rounds=len(ms),
+            mean_ms=round(mean, 4),
+            stdev_ms=round(statistics.pstdev(ms), 4),
+            min_ms=round(ms[0], 4),
+            p50_ms=round(percentile(ms, 50), 4),
+            p95_ms=round(percentile(ms, 95), 4),
+            p99_ms=round(percentile(ms, 99), 4),
+            max_ms=round(ms[-1], 4),
+            ops_per_sec=round(1000.0 / mean, 3) if mean else 0.0,
+            items_per_sec=round(items * 1000.0 / mean, 3) if items and mean else None,
+        )
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an ascending list"""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+@contextmanager
+def _gc_paused():
+    """Keep collector pauses out of the measured rounds"""
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def measure(fn, name, group="default", rounds=None, warmup=None, items=None, setup=None):
+    """
+    Time ``fn()``
+
+    Args:
+        fn: Callable under test
+        name: Benchmark name
+        group: Hot path the benchmark belongs to
+        rounds / warmup: Override BENCH_ROUNDS / BENCH_WARMUP
+        items: Units of work per call (stocks, orders ...), adds items_per_sec
+        setup: Called before every round, outside the timing
+    """
+    rounds = rounds or BENCH_ROUNDS
+    warmup = BENCH_WARMUP if warmup is None else warmup
+
+    def one_round():
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        return time.perf_counter() - started
+
+    for _ in range(warmup):
+        one_round()
+    with _gc_paused():
+        timings = [one_round() for _ in range(rounds)]
+    return BenchResult.from_timings(name, group, timings, items)
+
+
+def measure_async(coro_fn, name, group="default", rounds=None, warmup=None, items=None, setup=None):
+    """``measure`` for a coroutine function; all rounds share one event loop"""
+    rounds = rounds or BENCH_ROUNDS
+    warmup = BENCH_WARMUP if warmup is None else warmup
+
+    async def one_round():
+        if setup:
+            setup()
+        started = time.perf_counter()
+        await coro_fn()
+        return time.perf_counter() - started
+
+    async def run():
+        for _ in range(warmup):
+            await one_round()
+        with _gc_paused():
+            return [await one_round() for _ in range(rounds)]
+
+    return BenchResult.from_timings(name, group, asyncio.run(run()), items)
+
+
+# =====================================================================
+# Result storage
+# =====================================================================
+
+def git_revision(ref="HEAD"):
+    """(full sha, dirty) of ``ref``; (None, False) outside a git checkout"""
+    try:
+        sha = subprocess.run(["git", "rev-parse", ref], cwd=PROJECT_ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = ref == "HEAD" and bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True).stdout.strip())
+        return sha, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+
+class ResultStore:
+    """Benchmark runs saved as JSON files, one per session"""
+
+    def __init__(self, directory=BENCHMARK_DIR):
+        self.directory = Path(directory)
+
+    def save(self, results, extra=None):
+        sha, dirty = git_revision()
+        run = {
+            "commit": sha,
+            "dirty": dirty,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "machine": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "processor": platform.processor() or platform.machine(),
+                "cpu_count": os.cpu_count(),
+            },
+            "settings": {"rounds": BENCH_ROUNDS, "warmup": BENCH_WARMUP},
+            "results": [asdict(result) for result in results],
+            **(extra or {}),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = self.directory / f"{stamp}_{(sha or 'nogit')[:10]}{'-dirty' if dirty else ''}.json"
+        path.write_text(json.dumps(run, indent=1))
+        return path
+
+    def runs(self):
+        """Saved run files, oldest first"""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob("*.json"))
+
+    def resolve(self, ref):
+        """Run file for a path, or the latest run of a git ref"""
+        if ref and Path(ref).is_file():
+            return Path(ref)
+        sha, _ = git_revision(ref)
+        prefix = (sha or ref)[:10]
+        matches = [path for path in self.runs() if path.stem.split("_", 1)[-1].startswith(prefix)]
+        if not matches:
+            raise FileNotFoundError(f"No benchmark run saved for {ref}")
+        return matches[-1]
+
+    @staticmethod
+    def load(path):
+        return json.loads(Path(path).read_text())
+
+
+def compare_runs(base, head, threshold=REGRESSION_THRESHOLD):
+    """
+    Rows comparing the benchmarks both runs have
+
+    Returns:
+        List of dicts with base/head median and p95, the median change and
+        a status of 'regressed', 'improved' or 'same'
+    """
+    base_results = {r["name"]: r for r in base["results"]}
+    rows = []
+    for result in head["results"]:
+        before = base_results.get(result["name"])
+        if before is None:
+            continue
+        change = result["p50_ms"] / before["p50_ms"] - 1.0 if before["p50_ms"] else 0.0
+        status = "regressed" if change > threshold else "improved" if change < -threshold else "same"
+        rows.append({
+            "name": result["name"],
+            "base_p50_ms": before["p50_ms"],
+            "head_p50_ms": result["p50_ms"],
+            "base_p95_ms": before["p95_ms"],
+            "head_p95_ms": result["p95_ms"],
+            "change": change,
+            "status": status,
+        })
+    return rows
+
+
+def format_results(results):
+    lines = [f"{'benchmark':<48} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'ops/s':>10}"]
+    for r in results:
+        r = r if isinstance(r, dict) else asdict(r)
+        lines.append(f"{r['name']:<48} {r['p50_ms']:>10.3f} {r['p95_ms']:>10.3f} "
+                     f"{r['p99_ms']:>10.3f} {r['ops_per_sec']:>10.1f}")
+    return "\n".join(lines)
+
+
+def format_comparison(rows):
+    lines = [f"{'benchmark':<48} {'base p50':>10} {'head p50':>10} {'change':>9}  status"]
+    for row in rows:
+        lines.append(f"{row['name']:<48} {row['base_p50_ms']:>10.3f} {row['head_p50_ms']:>10.3f} "
+                     f"{row['change']:>+8.1%}  {row['status']}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Saved benchmark runs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List saved runs")
+    compare = commands.add_parser("compare", help="Compare two runs")
+    compare.add_argument("base", nargs="?", help="Run file or git ref (default: second latest run)")
+    compare.add_argument("head", nargs="?", help="Run file or git ref (default: latest run)")
+    compare.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                         help="Median latency change counted as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    store = ResultStore()
+    if args.command == "list":
+        for path in store.runs():
+            run = store.load(path)
+            print(f"{path.name}  {len(run['results'])} benchmarks  {run['created_at']}")
+        return 0
+
+    runs = store.runs()
+    try:
+        head = store.resolve(args.head) if args.head else runs[-1]
+        base = store.resolve(args.base) if args.base else runs[-2]
+    except (IndexError, FileNotFoundError) as e:
+        print(f"Nothing to compare: {e or 'fewer than two saved runs'}", file=sys.stderr)
+        return 2
+
+    rows = compare_runs(store.load(base), store.load(head), args.threshold)
+    print(f"base: {base.name}\nhead: {head.name}\n")
+    print(format_comparison(rows))
+    return 1 if any(row["status"] == "regressed" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
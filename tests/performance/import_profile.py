@@ -0,0 +1,131 @@
+"""
+Cold-import profiler for the servers and cron strategies
+
+Imports each entry point in a fresh interpreter under ``python -X importtime``
+and reports the total import time, the slowest packages and which heavy
+libraries were pulled in at import time. Heavy libraries are meant to load
+on first use or from a startup hook (``utils.lazy``), not at import.
+
+Usage::
+
+    python -m tests.performance.import_profile
+    python -m tests.performance.import_profile api.swing_server --top 25
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+
+ENTRY_POINTS = [
+    "api.swing_server",
+    "api.shortterm_server",
+    "api.longterm_server",
+    "api.intraday_server",
+    "cron.manager",
+    "cron.strategies.intraday_buy",
+    "cron.strategies.swing_buy",
+    "cron.strategies.long_buy",
+    "api.models.recommendation_models",
+    "api.models.recommendation_history_models",
+    "api.models.cron_tracking_models",
+]
+
+# Libraries that should stay out of import time
+HEAVY_MODULES = ["yfinance", "bs4", "motor", "pymongo", "scipy", "sklearn"]
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    ok: bool
+    total_ms: float = 0.0
+    packages: Dict[str, float] = field(default_factory=dict)
+    heavy: List[str] = field(default_factory=list)
+    error: str = ""
+
+    def top(self, n: int = 15) -> List[tuple]:
+        return sorted(self.packages.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+def parse_importtime(stderr: str, module: str):
+    """``-X importtime`` output -> (cumulative ms of ``module``, {package: self ms})
+
+    Only the subtree imported by ``module`` counts, so interpreter start-up
+    (site, encodings) stays out of the breakdown.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            own, cumulative, name = line[len("import time:"):].split("|")
+            rows.append((int(own) / 1000, int(cumulative) / 1000, name))
+        except ValueError:
+            continue
+
+    # Children are printed before their parent, one indent level deeper
+    for end, (_, cumulative, name) in enumerate(rows):
+        if name.strip() == module and len(name) - len(name.lstrip()) == 1:
+            break
+    else:
+        return 0.0, {}
+    begin = end
+    while begin > 0 and len(rows[begin - 1][2]) - len(rows[begin - 1][2].lstrip()) > 1:
+        begin -= 1
+
+    packages: Dict[str, float] = {}
+    for own, _, name in rows[begin:end]:
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0.0) + own
+    return cumulative, packages
+
+
+def profile_import(module: str, python: Optional[str] = None) -> ImportProfile:
+    """Import ``module`` in a fresh interpreter and profile it."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(ROOT), str(ROOT / "api")]))
+    probe = (f"import sys; import {module}; "
+             f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    proc = subprocess.run([python or sys.executable, "-X", "importtime", "-c", probe],
+                          cwd=ROOT, env=env, capture_output=True, text=True, timeout=300)
+    if proc.returncode != 0:
+        last = proc.stderr.strip().splitlines()[-1:] or ["import failed"]
+        return ImportProfile(module, ok=False, error=last[0])
+
+    total_ms, packages = parse_importtime(proc.stderr, module)
+    heavy = [m for m in proc.stdout.strip().splitlines()[-1].split(",") if m] if proc.stdout.strip() else []
+    return ImportProfile(module, ok=True, total_ms=total_ms,
+                         packages=packages, heavy=heavy)
+
+
+def format_report(profiles: List[ImportProfile], top: int = 10) -> str:
+    lines = []
+    for profile in profiles:
+        if not profile.ok:
+            lines.append(f"{profile.module}: not importable here ({profile.error})")
+            continue
+        heavy = ", ".join(profile.heavy) or "none"
+        lines.append(f"{profile.module}: {profile.total_ms:.0f} ms (heavy at import: {heavy})")
+        for package, ms in profile.top(top):
+            lines.append(f"    {package:<28} {ms:>9.1f} ms")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile cold imports of the servers and cron strategies")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--top", type=int, default=10, help="slowest packages to show per module")
+    args = parser.parse_args(argv)
+
+    profiles = [profile_import(module) for module in args.modules]
+    print(format_report(profiles, args.top))
+    return 1 if any(p.heavy for p in profiles if p.ok) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+Load driver for the recommendation servers
+
+Fires a weighted mix of swing, short-term, long-term and intraday
+recommendation requests at running servers and reports throughput and
+tail latency per endpoint. Point the servers at the stand-in
+(``tests/performance/standin.py``) to load-test them without touching
+ChartInk or Yahoo Finance.
+
+Two traffic models:
+
+- open loop (``--rate``): Poisson arrivals at a fixed rate, latency counted
+  from the scheduled send time, so a slow server is not hidden by the
+  driver slowing down with it
+- closed loop (``--concurrency``): that many clients sending back to back
+
+Usage::
+
+    python -m tests.performance.load_driver --rate 5 --duration 120
+    python -m tests.performance.load_driver --concurrency 20 --mix swing=1,intraday=1 --json run.json
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+import httpx
+
+from tests.performance.harness import percentile
+
+DEFAULT_TARGETS = {
+    "longterm": "http://localhost:8001",
+    "swing": "http://localhost:8002",
+    "shortterm": "http://localhost:8003",
+    "intraday": "http://localhost:8004",
+}
+DEFAULT_MIX = {"swing": 3, "shortterm": 3, "longterm": 2, "intraday": 2}
+
+
+def _combination_body(rng, force_refresh_rate):
+    return {
+        "limit_per_query": rng.choice([30, 50, 50, 50]),
+        "top_recommendations": rng.choice([10, 20, 20]),
+        "force_refresh": rng.random() < force_refresh_rate,
+    }
+
+
+@dataclass
+class Endpoint:
+    """One request type of the mix"""
+    name: str
+    server: str
+    path: str
+    body: Callable[[random.Random, float], dict]
+
+
+ENDPOINTS = {
+    "swing": Endpoint("swing", "swing", "/api/swing/swing-buy-recommendations", _combination_body),
+    "shortterm": Endpoint("shortterm", "shortterm", "/api/shortterm/shortterm-buy-recommendations",
+                          _combination_body),
+    "longterm": Endpoint("longterm", "longterm", "/api/longterm/long-buy-recommendations", _combination_body),
+    "intraday": Endpoint("intraday", "intraday", "/api/intraday/intraday-buy-recommendations",
+                         lambda rng, _: {"limit": rng.choice([10, 20]), "chartink_theme": "intraday_buy"}),
+    "intraday_sell": Endpoint("intraday_sell", "intraday", "/api/intraday/intraday-sell-recommendations",
+                              lambda rng, _: {"limit": 10, "chartink_theme": "intraday_sell"}),
+}
+
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+
+    def record(self, status, seconds):
+        self.statuses[status] += 1
+        self.latencies.append(seconds)
+
+    def summary(self, window):
+        ms = sorted(s * 1000.0 for s in self.latencies)
+        ok = sum(count for status, count in self.statuses.items() if status == 200)
+        total = sum(self.statuses.values())
+        row = {
+            "requests": total,
+            "ok": ok,
+            "errors": total - ok,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items(), key=str)},
+            "throughput_rps": round(ok / window, 3) if window else 0.0,
+        }
+        if ms:
+            row.update({
+                "p50_ms": round(percentile(ms, 50), 1),
+                "p90_ms": round(percentile(ms, 90), 1),
+                "p99_ms": round(percentile(ms, 99), 1),
+                "p999_ms": round(percentile(ms, 99.9), 1),
+                "max_ms": round(ms[-1], 1),
+            })
+        return row
+
+
+class LoadDriver:
+    """Sends the request mix and collects per-endpoint latencies"""
+
+    def __init__(self, targets=None, mix=None, force_refresh_rate=0.1, timeout=120.0,
+                 max_in_flight=500, seed=None):
+        self.targets = {**DEFAULT_TARGETS, **(targets or {})}
+        self.mix = {name: weight for name, weight in (mix or DEFAULT_MIX).items() if weight > 0}
+        unknown = set(self.mix) - set(ENDPOINTS)
+        if unknown:
+            raise ValueError(f"Unknown endpoints in mix: {', '.join(sorted(unknown))}")
+        self.force_refresh_rate = force_refresh_rate
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.rng = random.Random(seed)
+        self.stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.dropped = 0
+        self._measure_from = 0.0
+
+    def _pick(self):
+        names = list(self.mix)
+        return ENDPOINTS[self.rng.choices(names, weights=[self.mix[n] for n in names])[0]]
+
+    async def _send(self, client, endpoint, scheduled):
+        url = self.targets[endpoint.server] + endpoint.path
+        try:
+            response = await client.post(url, json=endpoint.body(self.rng, self.force_refresh_rate))
+            status = response.status_code
+        except httpx.TimeoutException:
+            status = "timeout"
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        finished = time.perf_counter()
+        if scheduled >= self._measure_from:
+            self.stats[endpoint.name].record(status, finished - scheduled)
+
+    async def run_open_loop(self, rate, duration, warmup=0.0):
+        """Poisson arrivals at ``rate`` requests/sec for ``duration`` seconds"""
+        limits = httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight)
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+            start = time.perf_counter()
+            self._measure_from = start + warmup
+            deadline = self._measure_from + duration
+            in_flight = set()
+            next_at = start
+            while next_at < deadline:
+                now = time.perf_counter()
+                if next_at > now:
+                    await asyncio.sleep(next_at - now)
+                if len(in_flight) >= self.max_in_flight:
+                    self.dropped += 1
+                else:
+                    task = asyncio.create_task(self._send(client, self._pick(), next_at))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                next_at += self.rng.expovariate(rate)
+            if in_flight:
+                await asyncio.wait(in_flight)
+        return self.report(duration)
+
+    async def run_closed_loop(self, concurrency, duration, warmup=0.0):
+        """``concurrency`` clients sending back to back for ``duration`` seconds"""
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+            start = time.perf_counter()
+            self._measure_from = start + warmup
+            deadline = self._measure_from + duration
+
+            async def worker():
+                while time.perf_counter() < deadline:
+                    await self._send(client, self._pick(), time.perf_counter())
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return self.report(duration)
+
+    def report(self, window):
+        endpoints = {name: stats.summary(window) for name, stats in sorted(self.stats.items())}
+        overall = EndpointStats()
+        for stats in self.stats.values():
+            overall.latencies.extend(stats.latencies)
+            overall.statuses.update(stats.statuses)
+        return {
+            "window_seconds": window,
+            "dropped": self.dropped,
+            "overall": overall.summary(window),
+            "endpoints": endpoints,
+        }
+
+
+def format_report(report):
+    lines = [f"{'endpoint':<14} {'reqs':>6} {'errors':>6} {'rps':>8} {'p50 ms':>9} {'p90 ms':>9} "
+             f"{'p99 ms':>9} {'p99.9 ms':>9} {'max ms':>9}"]
+    rows = list(report["endpoints"].items()) + [("overall", report["overall"])]
+    for name, row in rows:
+        lines.append(f"{name:<14} {row['requests']:>6} {row['errors']:>6} {row['throughput_rps']:>8.2f} "
+                     f"{row.get('p50_ms', 0):>9.1f} {row.get('p90_ms', 0):>9.1f} {row.get('p99_ms', 0):>9.1f} "
+                     f"{row.get('p999_ms', 0):>9.1f} {row.get('max_ms', 0):>9.1f}")
+    errors = {name: row["statuses"] for name, row in report["endpoints"].items() if row["errors"]}
+    if errors:
+        lines.append("\nstatuses: " + json.dumps(errors))
+    if report["dropped"]:
+        lines.append(f"dropped (driver at max in-flight): {report['dropped']}")
+    return "\n".join(lines)
+
+
+def _pairs(text, cast):
+    pairs = {}
+    for item in filter(None, (text or "").split(",")):
+        name, _, value = item.partition("=")
+        pairs[name.strip()] = cast(value.strip())
+    return pairs
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mixed-traffic load driver for the recommendation servers")
+    model = parser.add_mutually_exclusive_group()
+    model.add_argument("--rate", type=float, help="Open loop: requests per second (Poisson arrivals)")
+    model.add_argument("--concurrency", type=int, help="Closed loop: concurrent clients")
+    parser.add_argument("--duration", type=float, default=60.0, help="Measured seconds (default 60)")
+    parser.add_argument("--warmup", type=float, default=10.0, help="Unmeasured seconds first (default 10)")
+    parser.add_argument("--mix", help="Endpoint weights, e.g. swing=3,shortterm=3,longterm=2,intraday=2")
+    parser.add_argument("--target", help="Server base URLs, e.g. swing=http://localhost:8002")
+    parser.add_argument("--force-refresh-rate", type=float, default=0.1,
+                        help="Share of requests bypassing the recommendation cache (default 0.1)")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    driver = LoadDriver(
+        targets=_pairs(args.target, str),
+        mix=_pairs(args.mix, float) or None,
+        force_refresh_rate=args.force_refresh_rate,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+    if args.concurrency:
+        report = asyncio.run(driver.run_closed_loop(args.concurrency, args.duration, args.warmup))
+    else:
+        report = asyncio.run(driver.run_open_loop(args.rate or 2.0, args.duration, args.warmup))
+
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=1)
+    return 0 if report["overall"]["requests"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Replay patches for the offline benchmarks
+
+Each patch swaps one network boundary for the fixture store:
+
+- ``replay_run_query``         a server's ``ChartinkService.run_query``
+- ``replay_chartink_scans``    ``patterns.data.chartink.get_chartink_scans``
+- ``replay_query_silent``      the long-term server's ``test_query_silent``
+- ``replay_yfinance``          ``yfinance.Ticker`` and ``yfinance.download``
+
+Patching at the service boundary keeps rate limiting, CSRF refreshes and
+retries out of the measurement - what is timed is our own processing of
+the responses. With ``BENCH_RECORD=1`` the original is called instead and
+its response written to the store.
+"""
+
+import os
+import sys
+from contextlib import ExitStack, contextmanager
+from unittest import mock
+
+import pandas as pd
+
+RECORD = os.getenv("BENCH_RECORD", "0") == "1"
+
+
+@contextmanager
+def replay_run_query(service, store, record=RECORD):
+    """``await service.run_query(query, max_results)`` -> recorded rows"""
+    original = service.run_query
+
+    async def run_query(query, max_results=100, max_retries=3):
+        if record:
+            rows = await original(query, max_results=max_results, max_retries=max_retries)
+            store.save_scan(query, rows)
+        return store.scan_rows(query)[:max_results]
+
+    with mock.patch.object(service, "run_query", run_query):
+        yield
+
+
+@contextmanager
+def replay_chartink_scans(store, record=RECORD):
+    """``get_chartink_scans(query)`` -> recorded DataFrame, under every import name"""
+    modules = [sys.modules[name] for name in ("patterns.data.chartink", "data.chartink") if name in sys.modules]
+    if not modules:
+        import patterns.data.chartink
+        modules = [patterns.data.chartink]
+    original = modules[0].get_chartink_scans
+
+    def get_chartink_scans(query, debug=True, use_cache=True):
+        if record:
+            df = original(query, debug=debug, use_cache=False)
+            store.save_scan(query, df.to_dict("records"))
+        return store.scan_frame(query)
+
+    with ExitStack() as stack:
+        for module in modules:
+            stack.enter_context(mock.patch.object(module, "get_chartink_scans", get_chartink_scans))
+        yield
+
+
+@contextmanager
+def replay_query_silent(module, store, record=RECORD):
+    """The long-term server's ``test_query_silent(query, limit)`` -> recorded rows"""
+    original = module.test_query_silent
+
+    def test_query_silent(query, limit=10):
+        if record:
+            result = original(query, limit=limit)
+            store.save_scan(query, result.get("data", []) if result else [])
+        return {"success": True, "data": store.scan_rows(query)[:limit]}
+
+    with mock.patch.object(module, "test_query_silent", test_query_silent):
+        yield
+
+
+class FixtureTicker:
+    """``yfinance.Ticker`` backed by the fixture store"""
+
+    def __init__(self, ticker, store, record=RECORD, original=None):
+        self.ticker = ticker
+        self._store = store
+        self._live = original(ticker) if record and original else None
+
+    @property
+    def info(self):
+        if self._live is not None:
+            self._store.save_info(self.ticker, self._live.info)
+        return self._store.info(self.ticker)
+
+    def history(self, period="1mo", interval="1d", **kwargs):
+        if self._live is not None:
+            self._store.save_history(self.ticker, period, interval,
+                                     self._live.history(period=period, interval=interval))
+        return self._store.history(self.ticker, period, interval)
+
+
+@contextmanager
+def replay_yfinance(store, record=RECORD):
+    """``yfinance.Ticker`` / ``yfinance.download`` -> recorded frames"""
+    import yfinance
+
+    original_ticker = yfinance.Ticker
+
+    def ticker(symbol, *args, **kwargs):
+        return FixtureTicker(symbol, store, record, original_ticker)
+
+    def download(tickers, period="1mo", interval="1d", group_by="column", **kwargs):
+        symbols = tickers.split() if isinstance(tickers, str) else list(tickers)
+        frames = {symbol: ticker(symbol).history(period=period, interval=interval) for symbol in symbols}
+        if len(symbols) == 1:
+            return frames[symbols[0]]
+        combined = pd.concat(frames, axis=1)  # (symbol, field) columns
+        return combined if group_by == "ticker" else combined.swaplevel(axis=1).sort_index(axis=1)
+
+    with mock.patch.object(yfinance, "Ticker", ticker), mock.patch.object(yfinance, "download", download):
+        yield
@@ -0,0 +1,368 @@
+"""
+Local ChartInk and Yahoo Finance stand-in for load tests
+
+Implements the parts of both protocols the servers use, served from the
+benchmark fixture store (recorded responses, synthetic otherwise):
+
+- ChartInk: ``GET /screener`` returns the page with the ``csrf-token`` meta
+  tag and a session cookie; ``POST /screener/process`` checks the token
+  against the session (HTTP 419 on mismatch) and returns the scan's
+  ``data`` rows for ``scan_clause``
+- Yahoo Finance: ``/v8/finance/chart/{symbol}``, ``/v10/finance/quoteSummary/{symbol}``
+  and ``/v1/test/getcrumb``
+
+Latency is drawn from a lognormal distribution around the configured
+median; 5xx errors, expired CSRF tokens (419) and throttling (429, random
+or above a per-client rate) are injected with configurable probabilities.
+``GET /standin/stats`` returns request counts and ``POST /standin/config``
+changes the settings of a running stand-in.
+
+Usage::
+
+    python -m tests.performance.standin --port 8765 --latency-ms 300 --csrf-expiry-rate 0.02
+    CHARTINK_BASE_URL=http://localhost:8765 YAHOO_BASE_URL=http://localhost:8765 python api/swing_server.py
+
+Env
+---
+STANDIN_LATENCY_MS          median ChartInk response time (default 250)
+STANDIN_YAHOO_LATENCY_MS    median Yahoo response time (default 120)
+STANDIN_LATENCY_SIGMA       lognormal spread of the latency (default 0.5)
+STANDIN_ERROR_RATE          share of 5xx responses (default 0)
+STANDIN_CSRF_EXPIRY_RATE    share of screener calls answered with 419 (default 0)
+STANDIN_THROTTLE_RATE       share of screener calls answered with 429 (default 0)
+STANDIN_RATE_LIMIT          screener calls per client per minute before 429 (default 0 = off)
+"""
+
+import asyncio
+import math
+import os
+import random
+import secrets
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import asdict, dataclass, fields
+from typing import Optional
+from urllib.parse import parse_qs
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
+
+from tests.performance.fixture_store import FixtureStore
+
+SESSION_COOKIE = "ci_session"
+
+# Yahoo ranges -> fixture periods
+_RANGE_PERIODS = {"1d": "1d", "5d": "5d", "1mo": "1mo", "3mo": "3mo", "6mo": "6mo", "1y": "1y",
+                  "2y": "2y", "5y": "5y", "ytd": "6mo", "max": "5y"}
+
+# quoteSummary module -> {field: Ticker.info key}
+_QUOTE_MODULES = {
+    "price": {"longName": "longName", "marketCap": "marketCap"},
+    "summaryDetail": {"trailingPE": "trailingPE", "forwardPE": "forwardPE", "beta": "beta",
+                      "dividendYield": "dividendYield", "payoutRatio": "payoutRatio",
+                      "priceToSalesTrailing12Months": "priceToSalesTrailing12Months"},
+    "defaultKeyStatistics": {"priceToBook": "priceToBook", "pegRatio": "pegRatio",
+                             "bookValue": "bookValue", "enterpriseValue": "enterpriseValue"},
+    "financialData": {"returnOnEquity": "returnOnEquity", "returnOnAssets": "returnOnAssets",
+                      "debtToEquity": "debtToEquity", "currentRatio": "currentRatio",
+                      "quickRatio": "quickRatio", "revenueGrowth": "revenueGrowth",
+                      "earningsGrowth": "earningsGrowth", "profitMargins": "profitMargins",
+                      "operatingMargins": "operatingMargins", "grossMargins": "grossMargins",
+                      "totalCashPerShare": "totalCashPerShare"},
+    "assetProfile": {"sector": "sector"},
+}
+
+
+@dataclass
+class StandinConfig:
+    """Latency and fault injection settings"""
+    latency_ms: float = 250.0
+    yahoo_latency_ms: float = 120.0
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0
+    csrf_expiry_rate: float = 0.0
+    throttle_rate: float = 0.0
+    rate_limit: int = 0
+    csrf_ttl_seconds: float = 7200.0
+
+    @classmethod
+    def from_env(cls):
+        values = {}
+        for field in fields(cls):
+            raw = os.getenv(f"STANDIN_{field.name.upper()}")
+            if raw is not None:
+                values[field.name] = type(field.default)(raw)
+        return cls(**values)
+
+    def update(self, changes):
+        for field in fields(self):
+            if field.name in changes:
+                setattr(self, field.name, type(field.default)(changes[field.name]))
+
+
+class Standin:
+    """Sessions, counters and fault injection shared by the routes"""
+
+    def __init__(self, store=None, config=None, seed=None):
+        self.store = store or FixtureStore()
+        self.config = config or StandinConfig.from_env()
+        self.rng = random.Random(seed)
+        self.sessions = {}  # session id -> (csrf token, issued at)
+        self.calls = defaultdict(deque)  # client -> recent screener call times
+        self.counts = Counter()
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+
+    async def delay(self, median_ms):
+        if median_ms > 0:
+            sigma = self.config.latency_sigma
+            await asyncio.sleep(self.rng.lognormvariate(math.log(median_ms), sigma) / 1000.0)
+
+    def count(self, route, status):
+        with self.lock:
+            self.counts[f"{route} {status}"] += 1
+
+    def chance(self, rate):
+        return rate > 0 and self.rng.random() < rate
+
+    def issue_token(self, session_id):
+        token = secrets.token_urlsafe(30)
+        with self.lock:
+            self.sessions[session_id] = (token, time.time())
+        return token
+
+    def token_valid(self, session_id, token):
+        with self.lock:
+            issued = self.sessions.get(session_id)
+        return (issued is not None and token == issued[0]
+                and time.time() - issued[1] < self.config.csrf_ttl_seconds)
+
+    def over_rate_limit(self, client):
+        limit = self.config.rate_limit
+        if limit <= 0:
+            return False
+        now = time.time()
+        with self.lock:
+            calls = self.calls[client]
+            while calls and now - calls[0] > 60:
+                calls.popleft()
+            calls.append(now)
+            return len(calls) > limit
+
+    def stats(self):
+        with self.lock:
+            counts = dict(self.counts)
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "sessions": len(self.sessions),
+            "counts": counts,
+            "fixtures": self.store.get_stats(),
+            "config": asdict(self.config),
+        }
+
+
+def _screener_page(token):
+    # The servers treat pages under 1000 characters as undecoded content
+    filler = "\n".join(f'<option value="{i}">Scan {i}</option>' for i in range(40))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="csrf-token" content="{token}">
+<title>Stock Screener - ChartInk stand-in</title>
+</head>
+<body>
+<form id="scan_form" method="post" action="/screener/process">
+<input type="hidden" name="_token" value="{token}">
+<textarea name="scan_clause"></textarea>
+<select name="saved_scans">
+{filler}
+</select>
+</form>
+</body>
+</html>
+"""
+
+
+def _chart_payload(symbol, frame, range_, interval):
+    timestamps = frame.index.as_unit("s").asi8.tolist()
+    close = frame["Close"].round(4).tolist()
+    result = {
+        "meta": {
+            "currency": "INR",
+            "symbol": symbol,
+            "exchangeName": "NSI",
+            "instrumentType": "EQUITY",
+            "regularMarketPrice": close[-1] if close else None,
+            "chartPreviousClose": close[-2] if len(close) > 1 else None,
+            "gmtoffset": 19800,
+            "timezone": "IST",
+            "exchangeTimezoneName": "Asia/Kolkata",
+            "dataGranularity": interval,
+            "range": range_,
+        },
+        "timestamp": timestamps,
+        "indicators": {"quote": [{
+            "open": frame["Open"].round(4).tolist(),
+            "high": frame["High"].round(4).tolist(),
+            "low": frame["Low"].round(4).tolist(),
+            "close": close,
+            "volume": frame["Volume"].astype(int).tolist(),
+        }]},
+    }
+    if interval in ("1d", "5d", "1wk", "1mo", "3mo"):
+        result["indicators"]["adjclose"] = [{"adjclose": close}]
+    return {"chart": {"result": [result], "error": None}}
+
+
+def _quote_summary(symbol, info, modules):
+    result = {}
+    for module in modules:
+        mapping = _QUOTE_MODULES.get(module)
+        if mapping is None:
+            continue
+        result[module] = {
+            field: ({"raw": info[key], "fmt": f"{info[key]:.2f}"} if isinstance(info.get(key), float) else info.get(key))
+            for field, key in mapping.items() if key in info
+        }
+    result.setdefault("price", {})["symbol"] = symbol
+    return {"quoteSummary": {"result": [result], "error": None}}
+
+
+def _period_for_span(seconds):
+    days = seconds / 86400
+    for period, span in (("1d", 1), ("5d", 7), ("1mo", 31), ("3mo", 92), ("6mo", 183), ("1y", 366), ("2y", 731)):
+        if days <= span:
+            return period
+    return "5y"
+
+
+def create_app(store=None, config=None, seed=None):
+    """FastAPI app of the stand-in; ``app.state.standin`` holds its state"""
+    app = FastAPI(title="ChartInk / Yahoo Finance stand-in")
+    standin = Standin(store, config, seed)
+    app.state.standin = standin
+
+    def fault(route):
+        if standin.chance(standin.config.error_rate):
+            standin.count(route, 503)
+            return JSONResponse({"message": "Service Unavailable"}, status_code=503)
+        return None
+
+    # ------------------------------------------------------------------
+    # ChartInk
+    # ------------------------------------------------------------------
+
+    @app.get("/")
+    @app.get("/screener")
+    @app.get("/screener/")
+    async def screener_page(request: Request):
+        await standin.delay(standin.config.latency_ms / 2)
+        session_id = request.cookies.get(SESSION_COOKIE) or secrets.token_hex(16)
+        response = HTMLResponse(_screener_page(standin.issue_token(session_id)))
+        response.set_cookie(SESSION_COOKIE, session_id, httponly=True)
+        standin.count("screener", 200)
+        return response
+
+    @app.post("/screener/process")
+    async def screener_process(request: Request):
+        form = parse_qs((await request.body()).decode("utf-8"))
+        query = form.get("scan_clause", [""])[0]
+        token = request.headers.get("x-csrf-token") or form.get("csrf_token", [None])[0]
+        client = request.client.host if request.client else "unknown"
+        await standin.delay(standin.config.latency_ms)
+
+        if standin.over_rate_limit(client) or standin.chance(standin.config.throttle_rate):
+            standin.count("process", 429)
+            return JSONResponse({"message": "Too Many Attempts."}, status_code=429,
+                                headers={"Retry-After": "60"})
+        if not standin.token_valid(request.cookies.get(SESSION_COOKIE), token) or \
+                standin.chance(standin.config.csrf_expiry_rate):
+            standin.count("process", 419)
+            return JSONResponse({"message": "CSRF token mismatch."}, status_code=419)
+        failed = fault("process")
+        if failed:
+            return failed
+        if not query.strip():
+            standin.count("process", 200)
+            return {"draw": 1, "recordsTotal": 0, "recordsFiltered": 0, "data": [], "scan_error": "Empty scan clause"}
+
+        rows = standin.store.scan_rows(query)
+        standin.count("process", 200)
+        return {"draw": 1, "recordsTotal": len(rows), "recordsFiltered": len(rows), "data": rows}
+
+    # ------------------------------------------------------------------
+    # Yahoo Finance
+    # ------------------------------------------------------------------
+
+    @app.get("/v1/test/getcrumb")
+    async def crumb():
+        standin.count("crumb", 200)
+        return PlainTextResponse("standin-crumb")
+
+    @app.get("/v8/finance/chart/{symbol}")
+    async def chart(symbol: str, range_: Optional[str] = Query(None, alias="range"), interval: str = "1d",
+                    period1: Optional[int] = None, period2: Optional[int] = None):
+        await standin.delay(standin.config.yahoo_latency_ms)
+        failed = fault("chart")
+        if failed:
+            return failed
+        if range_:
+            period = _RANGE_PERIODS.get(range_, "1mo")
+        elif period1 is not None:
+            period = _period_for_span((period2 or time.time()) - period1)
+        else:
+            period = "1mo"
+        frame = standin.store.history(symbol, period, interval)
+        standin.count("chart", 200)
+        return _chart_payload(symbol, frame, range_ or period, interval)
+
+    @app.get("/v10/finance/quoteSummary/{symbol}")
+    async def quote_summary(symbol: str, modules: str = "price,summaryDetail"):
+        await standin.delay(standin.config.yahoo_latency_ms)
+        failed = fault("quoteSummary")
+        if failed:
+            return failed
+        standin.count("quoteSummary", 200)
+        return _quote_summary(symbol, standin.store.info(symbol), modules.split(","))
+
+    # ------------------------------------------------------------------
+    # Control
+    # ------------------------------------------------------------------
+
+    @app.get("/standin/stats")
+    async def stats():
+        return standin.stats()
+
+    @app.post("/standin/config")
+    async def configure(request: Request):
+        standin.config.update(await request.json())
+        return asdict(standin.config)
+
+    return app
+
+
+def main(argv=None):
+    import argparse
+
+    defaults = StandinConfig.from_env()
+    parser = argparse.ArgumentParser(description="ChartInk / Yahoo Finance stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", help="Fixture store directory")
+    parser.add_argument("--seed", type=int, help="Seed for latency and fault injection")
+    for field in fields(StandinConfig):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=type(field.default),
+                            default=getattr(defaults, field.name))
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    config = StandinConfig(**{field.name: getattr(args, field.name) for field in fields(StandinConfig)})
+    store = FixtureStore(args.fixtures) if args.fixtures else None
+    uvicorn.run(create_app(store, config, args.seed), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
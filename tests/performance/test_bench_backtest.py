@@ -0,0 +1,74 @@
+"""
+Benchmarks for the backtesting engine on replayed Yahoo Finance history
+"""
+
+import numpy as np
+import pandas as pd
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backtesting.engine import BacktestEngine
+from tests.performance.fixture_store import UNIVERSE
+
+GROUP = "backtest"
+SYMBOLS = [f"{symbol}.NS" for symbol in UNIVERSE[:10]]
+
+
+class _CrossoverStrategy:
+    """20/50 day moving average crossover, long or flat"""
+
+    def generate_signals(self, data):
+        df = data.copy()
+        fast = df['close'].rolling(20).mean()
+        slow = df['close'].rolling(50).mean()
+        df['signal'] = (fast > slow).astype(int)
+        return df
+
+
+def _crossover_orders(price_data, symbol, quantity=10):
+    """run_backtest signals: buy on the up-cross, sell on the down-cross"""
+    close = price_data[symbol]
+    above = close.rolling(20).mean() > close.rolling(50).mean()
+    cross = above.astype(int).diff().fillna(0)
+    return pd.DataFrame({
+        'signal': cross.to_numpy(),
+        'symbol': symbol,
+        'price': close.to_numpy(),
+        'quantity': quantity,
+    }, index=price_data.index)
+
+
+class TestBacktestBenchmarks:
+    """Benchmark BacktestEngine.run and run_backtest"""
+
+    def test_run(self, bench, fixture_store):
+        """Benchmark the vectorized run over two years of daily bars per symbol"""
+        frames = [
+            fixture_store.history(symbol, "2y", "1d").rename(columns=str.lower)
+            for symbol in SYMBOLS
+        ]
+        engine = BacktestEngine()
+        strategy = _CrossoverStrategy()
+
+        def run_all():
+            for frame in frames:
+                engine.run(frame, strategy)
+
+        bench.run(run_all, "backtest_engine.run", GROUP, items=len(frames))
+        result = engine.run(frames[0], strategy)
+        assert np.isfinite(result['metrics']['total_return'])
+
+    def test_run_backtest(self, bench, fixture_store):
+        """Benchmark the day-by-day portfolio simulation"""
+        price_data = pd.DataFrame({
+            symbol: fixture_store.history(symbol, "2y", "1d")['Close'] for symbol in SYMBOLS
+        })
+        signals = _crossover_orders(price_data, SYMBOLS[0])
+        engine = BacktestEngine()
+
+        bench.run(lambda: engine.run_backtest(price_data, lambda data: signals), "backtest_engine.run_backtest", GROUP,
+                  items=len(price_data))
+        results = engine.run_backtest(price_data, lambda data: signals)
+        assert len(results) >= len(price_data)
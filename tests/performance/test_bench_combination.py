@@ -0,0 +1,65 @@
+"""
+Benchmarks for the servers' combination analysis with replayed ChartInk scans
+"""
+
+import asyncio
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from tests.performance.replay import replay_query_silent, replay_run_query
+
+GROUP = "combination_analysis"
+
+
+def _server(name):
+    # Every server imports api.services, which needs yfinance
+    pytest.importorskip("yfinance")
+    return pytest.importorskip(f"api.{name}")
+
+
+class TestCombinationAnalysisBenchmarks:
+    """Benchmark run_combination_analysis of each server"""
+
+    def test_swing(self, bench, fixture_store):
+        """Benchmark swing analysis, cold and with cached result sets"""
+        server = _server("swing_server")
+        combination = server.config_manager.get_current_algorithm_config().get('sub_algorithm_config', {
+            'breakout': 'v1.0', 'momentum': 'v1.0', 'pattern': 'v1.0', 'reversal': 'v1.0'
+        })
+        analyse = lambda: server.analysis_engine.run_combination_analysis(dict(combination), limit_per_query=50)
+
+        with replay_run_query(server.chartink_service, fixture_store):
+            cold = bench.run_async(analyse, "swing.run_combination_analysis[cold]", GROUP,
+                                   setup=server.result_set_cache.clear)
+            bench.run_async(analyse, "swing.run_combination_analysis[cached]", GROUP)
+            result = asyncio.run(analyse())
+        assert result['metrics']['unique_stocks'] > 0
+        assert cold.rounds > 0
+
+    def test_shortterm(self, bench, fixture_store):
+        """Benchmark short-term analysis"""
+        server = _server("shortterm_server")
+        combination = server.config_manager.get_current_algorithm_config().get('sub_algorithm_config', {
+            'momentum': 'v1.0', 'reversal': 'v1.0', 'volatility': 'v1.0'
+        })
+        analyse = lambda: server.analysis_engine.run_combination_analysis(dict(combination), limit_per_query=40)
+
+        with replay_run_query(server.chartink_service, fixture_store):
+            bench.run_async(analyse, "shortterm.run_combination_analysis", GROUP)
+            result = asyncio.run(analyse())
+        assert result
+
+    def test_longterm(self, bench, fixture_store):
+        """Benchmark long-term analysis"""
+        server = _server("longterm_server")
+        config = server.config_snapshots.current.data
+        analyse = lambda: server.run_combination_analysis(config, "v1.0", "v1.0", "v1.0", "v1.0", limit=50)
+
+        with replay_query_silent(server, fixture_store):
+            bench.run_async(analyse, "longterm.run_combination_analysis", GROUP)
+            result = asyncio.run(analyse())
+        assert result
@@ -0,0 +1,28 @@
+"""
+Benchmarks for cold start: import time of the servers and cron strategies
+in a fresh interpreter, and which heavy libraries load at import
+"""
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from tests.performance.import_profile import ENTRY_POINTS, profile_import
+
+GROUP = "imports"
+
+
+class TestImportBenchmarks:
+    """Benchmark cold imports"""
+
+    @pytest.mark.parametrize("module", ENTRY_POINTS)
+    def test_cold_import(self, bench, module):
+        """Benchmark importing an entry point and check heavy libraries stay lazy"""
+        profile = profile_import(module)
+        if not profile.ok:
+            pytest.skip(f"{module} is not importable here: {profile.error}")
+
+        bench.run(lambda: profile_import(module), f"import {module}", GROUP, rounds=3, warmup=0)
+        assert profile.heavy == [], f"{module} imports {profile.heavy} at import time"
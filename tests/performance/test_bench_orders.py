@@ -0,0 +1,85 @@
+"""
+Benchmarks for order creation
+"""
+
+import asyncio
+from decimal import Decimal
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from order.journal import OrderJournal
+from order.models import OrderRequest, OrderSide, OrderType
+from order.order_manager import OrderManager
+from order.position_manager import PositionManager
+from order.risk_manager import RiskManager
+from tests.performance.fixture_store import UNIVERSE
+
+GROUP = "orders"
+ORDERS_PER_ROUND = 200
+# The validator only accepts alphabetic symbols
+SYMBOLS = [symbol for symbol in UNIVERSE if symbol.isalpha()]
+
+
+class _Execution:
+    """Accepts every order without a broker round trip"""
+
+    async def submit_order(self, order):
+        return order.order_id
+
+
+class _Notifications:
+    async def send_order_notification(self, order, event, data=None):
+        pass
+
+    async def send_trade_notification(self, trade):
+        pass
+
+
+def _requests():
+    return [
+        OrderRequest(
+            symbol=SYMBOLS[i % len(SYMBOLS)], side=OrderSide.BUY, order_type=OrderType.LIMIT,
+            quantity=1, price=Decimal("100.5"), strategy_id="bench"
+        )
+        for i in range(ORDERS_PER_ROUND)
+    ]
+
+
+class TestOrderBenchmarks:
+    """Benchmark OrderManager.create_order"""
+
+    def _run(self, bench, name, journal_dir=None):
+        requests = _requests()
+        managers = []
+
+        def new_manager():
+            position_manager = PositionManager()
+            managers.append(OrderManager(
+                execution_engine=_Execution(),
+                position_manager=position_manager,
+                risk_manager=RiskManager(position_manager=position_manager),
+                notification_service=_Notifications(),
+                journal=OrderJournal(journal_dir, fsync=False) if journal_dir else None
+            ))
+
+        async def create_orders():
+            manager = managers[-1]
+            for request in requests:
+                await manager.create_order(request)
+
+        result = bench.run_async(create_orders, name, GROUP, setup=new_manager, items=ORDERS_PER_ROUND)
+        for manager in managers:
+            if manager.journal:
+                manager.journal.close()
+        assert len(managers[-1].orders) == ORDERS_PER_ROUND
+        return result
+
+    def test_create_order(self, bench):
+        """Benchmark creating a batch of limit orders"""
+        self._run(bench, "order_manager.create_order")
+
+    def test_create_order_journaled(self, bench, tmp_path):
+        """Benchmark creating orders with the event journal enabled"""
+        self._run(bench, "order_manager.create_order[journal]", tmp_path)
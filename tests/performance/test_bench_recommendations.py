@@ -0,0 +1,104 @@
+"""
+Benchmarks for the recommendation path: orchestrator, intraday screener
+and fundamental re-ranking, on replayed ChartInk and Yahoo Finance data
+"""
+
+import asyncio
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from alg_discovery.recommendation.config.algorithm_registry import AlgorithmRegistry
+from alg_discovery.recommendation.recommendation_orchestrator import RecommendationOrchestrator
+from tests.performance.fixture_store import UNIVERSE
+from tests.performance.replay import replay_chartink_scans, replay_yfinance
+
+GROUP = "recommendations"
+
+# Scans the benchmarks replay
+SCAN_QUERIES = [
+    "( {cash} ( latest close > latest sma( close,20 ) and latest volume > latest sma( volume,20 ) ) )",
+    "( {cash} ( latest rsi( 14 ) > 60 and latest close > 1 day ago high ) )",
+    "( {cash} ( latest close > latest ema( close,50 ) and weekly close > weekly ema( close,20 ) ) )",
+]
+
+
+def _scan_stocks(fixture_store):
+    """Unique scanned stocks in the shape the servers hand to the re-ranker"""
+    stocks = {}
+    for query in SCAN_QUERIES:
+        for row in fixture_store.scan_rows(query):
+            stocks.setdefault(row['nsecode'], {
+                'symbol': row['nsecode'],
+                'name': row['name'],
+                'price': row['close'],
+                'per_change': row['per_chg'],
+                'volume': row['volume'],
+                'score': 60.0 + row['per_chg'],
+            })
+    return list(stocks.values())
+
+
+class TestRecommendationBenchmarks:
+    """Benchmark the recommendation hot paths"""
+
+    @pytest.mark.parametrize("theme", ["intraday_buy", "swing_buy"])
+    def test_orchestrator(self, bench, theme, monkeypatch):
+        """Benchmark RecommendationOrchestrator.get_recommendations over the universe"""
+        # Registering the algorithms would rewrite the packaged algorithms.json
+        monkeypatch.setattr(AlgorithmRegistry, "save_config", lambda self: None)
+        orchestrator = RecommendationOrchestrator()
+        symbols = UNIVERSE * 4
+
+        bench.run(lambda: orchestrator.get_recommendations(symbols, trading_theme=theme, limit=20),
+                  f"orchestrator.get_recommendations[{theme}]", GROUP, items=len(symbols))
+        result = orchestrator.get_recommendations(symbols, trading_theme=theme, limit=20)
+        assert 'error' not in result['metadata']
+
+    def test_intraday_screener(self, bench, fixture_store):
+        """Benchmark IntradayScreener.screen_stocks with ChartInk discovery"""
+        pytest.importorskip("yfinance")
+        from api.services.data_service import RealTimeDataService
+        from api.services.intraday_service import IntradayScreener
+
+        data_service = RealTimeDataService()
+        screener = IntradayScreener(data_service)
+
+        def cold_caches():
+            data_service.cache.invalidate()
+            data_service.price_cache.invalidate()
+
+        with replay_chartink_scans(fixture_store), replay_yfinance(fixture_store):
+            bench.run_async(lambda: screener.screen_stocks("momentum_breakout"),
+                            "intraday_screener.screen_stocks", GROUP, rounds=5, warmup=1, setup=cold_caches)
+            results = asyncio.run(screener.screen_stocks("momentum_breakout"))
+        assert isinstance(results, list)
+
+    def test_fundamental_reranker(self, bench, fixture_store, tmp_path):
+        """Benchmark FundamentalReranker.rerank_stocks, technical-only and with fundamentals"""
+        pytest.importorskip("yfinance")
+        from api.services.fundamental_reranker import FundamentalReranker
+
+        stocks = _scan_stocks(fixture_store)
+        reranker = FundamentalReranker()
+        reranker.cache_file = str(tmp_path / "fundamental_cache.json")
+
+        bench.run_async(lambda: reranker.rerank_stocks(stocks, limit=20),
+                        "fundamental_reranker.rerank_stocks[technical]", GROUP, items=len(stocks))
+
+        # Fundamentals from the fixture store; the request spacing is the live
+        # API's limit and is left out, the per-stock pause is part of the path
+        reranker.enable_fundamental_analysis = True
+        reranker.request_delay = 0
+        reranker.daily_request_limit = float("inf")
+        subset = stocks[:10]
+        with replay_yfinance(fixture_store):
+            bench.run_async(lambda: reranker.rerank_stocks(subset, limit=20),
+                            "fundamental_reranker.rerank_stocks[fundamental]", GROUP,
+                            rounds=3, warmup=1, items=len(subset), setup=reranker.cache_data.clear)
+            ranked = asyncio.run(reranker.rerank_stocks(subset, limit=20))
+        assert len(ranked) == len(subset)
@@ -0,0 +1,159 @@
+"""
+Unit tests for the asynchronous logging backend
+"""
+
+import io
+import json
+import logging
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils import async_logging
+from utils.async_logging import (
+    CompactJsonFormatter,
+    SamplingFilter,
+    flush_async_logging,
+    make_async_handlers,
+    payload_fragment,
+    truncate_payload,
+)
+
+
+@pytest.fixture
+def queued_logger():
+    """Logger fronted by the shared queue, writing compact JSON to a buffer"""
+    buffer = io.StringIO()
+    handler = logging.StreamHandler(buffer)
+    handler.setFormatter(CompactJsonFormatter())
+
+    logger = logging.getLogger("test_async_logging_writer")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    fronts = make_async_handlers(logger.name, handler)
+    for front in fronts:
+        logger.addHandler(front)
+
+    def lines():
+        assert flush_async_logging()
+        return [json.loads(line) for line in buffer.getvalue().splitlines()]
+
+    yield logger, lines
+
+    for front in fronts:
+        logger.removeHandler(front)
+    flush_async_logging()
+    async_logging._routes.pop(logger.name, None)
+
+
+def _record(payload):
+    record = logging.LogRecord("t", logging.INFO, __file__, 1, "m", None, None)
+    record.payload = payload
+    return record
+
+
+class TestAsyncLogging:
+    """Test queue-based logging helpers"""
+
+    def test_truncate_payload_caps_size(self):
+        """Test large payloads are capped with a truncation marker"""
+        text = truncate_payload({"data": "x" * 500}, max_chars=50)
+        assert text.startswith('{"data":"xxx')
+        assert "<truncated" in text
+
+    def test_truncation_stops_encoding_early(self):
+        """Test encoding a huge payload stops shortly after the cap"""
+        encoded = []
+
+        class Item:
+            def __init__(self, i):
+                self.i = i
+
+            def __str__(self):
+                encoded.append(self.i)
+                return "item"
+
+        text = truncate_payload([Item(i) for i in range(10000)], max_chars=100)
+        assert text.startswith('["item","item"')
+        assert "<truncated" in text
+        assert len(encoded) < 50
+
+    def test_compact_formatter_single_line(self):
+        """Test records render as one JSON line with an embedded payload"""
+        record = logging.LogRecord("t", logging.INFO, __file__, 1, "hello %s", ("x",), None)
+        record.payload = {"rows": [1, 2, 3]}
+        line = CompactJsonFormatter().format(record)
+        assert "\n" not in line
+        parsed = json.loads(line)
+        assert parsed["msg"] == "hello x"
+        assert parsed["payload"] == {"rows": [1, 2, 3]}
+
+    def test_string_payloads_stay_valid_json(self):
+        """Test only well-formed JSON strings are embedded raw"""
+        formatter = CompactJsonFormatter()
+        for payload in ['{"ok": true}', "{not json", "[1, 2", "plain", "x" * 5000]:
+            parsed = json.loads(formatter.format(_record(payload)))
+            expected = json.loads(payload) if payload == '{"ok": true}' else payload
+            if len(payload) > 4096:
+                assert parsed["payload"].startswith("x" * 4096)
+                assert "<truncated" in parsed["payload"]
+            else:
+                assert parsed["payload"] == expected
+        assert json.loads(payload_fragment({"data": "x" * 500}, max_chars=50)).startswith('{"data":"xxx')
+
+    def test_sampling_filter_keeps_one_in_n(self):
+        """Test sampled records are thinned per key, untagged records pass"""
+        sampler = SamplingFilter(every=10)
+        kept = 0
+        for _ in range(100):
+            record = logging.LogRecord("t", logging.INFO, __file__, 1, "m", None, None)
+            record.sample = "hot.loop"
+            kept += sampler.filter(record)
+        assert kept == 10
+
+        plain = logging.LogRecord("t", logging.INFO, __file__, 1, "m", None, None)
+        assert sampler.filter(plain)
+
+    def test_sampling_without_async(self, monkeypatch):
+        """Test handlers get a sampling filter when async logging is off"""
+        monkeypatch.setattr(async_logging, "ASYNC_ENABLED", False)
+        handler = logging.StreamHandler(io.StringIO())
+        assert make_async_handlers("test_sync_sampling", handler) == [handler]
+        make_async_handlers("test_sync_sampling", handler)
+        assert sum(isinstance(f, SamplingFilter) for f in handler.filters) == 1
+
+        logger = logging.getLogger("test_sync_sampling_root")
+        plain = logging.StreamHandler(io.StringIO())
+        logger.addHandler(plain)
+        try:
+            assert not async_logging.enable_async_logging(logger)
+            assert logger.handlers == [plain]
+            assert any(isinstance(f, SamplingFilter) for f in plain.filters)
+        finally:
+            logger.removeHandler(plain)
+
+    def test_records_written_by_background_writer(self, queued_logger):
+        """Test records reach the wrapped handler once the queue is flushed"""
+        logger, lines = queued_logger
+        logger.info("queued", extra={"payload": {"ok": True}})
+
+        written = lines()
+        assert written[-1]["msg"] == "queued"
+        assert written[-1]["payload"] == {"ok": True}
+        assert async_logging._listener is not None
+
+    def test_payload_snapshot_at_call_time(self, queued_logger):
+        """Test mutating a payload after logging does not change the written line"""
+        logger, lines = queued_logger
+        payload = {"rows": [1]}
+        for i in range(200):
+            logger.info("row", extra={"payload": payload})
+            payload["rows"].append(i)
+            payload[f"k{i}"] = i
+
+        written = lines()
+        assert len(written) == 200
+        assert [len(line["payload"]["rows"]) for line in written] == list(range(1, 201))
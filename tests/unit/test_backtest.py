@@ -0,0 +1,119 @@
+"""
+Unit tests for the vectorized backtester
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "patterns"))
+
+from analysis.backtest import (
+    BACKTEST_ENTRY_TYPES,
+    run_batch_backtest,
+    run_vectorized_backtest,
+    simulate_trades,
+    strategy_options,
+)
+
+
+def _signals(n, entries):
+    """Long entries at the given bars, with optional (stop, target) per bar"""
+    signals = {
+        "entry": np.zeros(n, dtype=bool),
+        "is_long": np.ones(n, dtype=bool),
+        "stop_loss": np.full(n, np.nan),
+        "target": np.full(n, np.nan),
+        "reward_risk_ratio": np.zeros(n),
+        "strategy": np.full(n, None, dtype=object),
+    }
+    for index, (stop_loss, target) in entries.items():
+        signals["entry"][index] = True
+        signals["stop_loss"][index] = stop_loss
+        signals["target"][index] = target
+        signals["strategy"][index] = "test"
+    return signals
+
+
+def _wave_frame(n=400):
+    """Trending, oscillating daily bars"""
+    t = np.arange(n)
+    close = 100 + 0.1 * t + 8 * np.sin(t / 6)
+    return pd.DataFrame({
+        "Open": close - 0.5, "High": close + 1, "Low": close - 1, "Close": close,
+        "Volume": 1e5 + 1e4 * np.cos(t / 3),
+    }, index=pd.bdate_range("2022-01-03", periods=n))
+
+
+class TestSimulateTrades:
+    """Test entries, exits and position sizing on hand-made signals"""
+
+    def test_target_then_stop(self):
+        """Test one trade exits at its target and the next at the default stop"""
+        n = 30
+        dates = pd.bdate_range("2024-01-01", periods=n)
+        close = np.full(n, 100.0)
+        close[24:] = 110.0
+        close[28:] = 104.0
+        # Bar 22 fires while the first position is open and is skipped
+        signals = _signals(n, {20: (95.0, 110.0), 22: (95.0, 110.0), 26: (np.nan, np.nan)})
+
+        results, equity = simulate_trades(dates, close, signals, initial_capital=100000, risk_percent=1.0)
+
+        assert list(results["action"]) == ["entry", "exit", "entry", "exit"]
+        assert list(results["date"]) == [dates[20], dates[24], dates[26], dates[28]]
+        assert list(results["reason"]) == ["test", "target", "test", "stop_loss"]
+        # 1% of 100000 at 5 risk per share -> 200 shares
+        assert results["position_value"][0] == 200 * 100.0
+        assert results["pnl"][1] == pytest.approx(2000.0)
+        # Default stop 5% under 110: 1020 risk / 5.5 per share -> 185 shares
+        assert results["position_value"][2] == 185 * 110.0
+        assert equity == pytest.approx(102000.0 + (104.0 / 110.0 - 1) * 185 * 110.0)
+
+    def test_no_entries_before_warmup(self):
+        """Test signals inside the warmup are ignored"""
+        n = 30
+        signals = _signals(n, {5: (95.0, 110.0)})
+        results, equity = simulate_trades(pd.bdate_range("2024-01-01", periods=n), np.full(n, 100.0), signals)
+        assert results.empty
+        assert equity == 100000
+
+
+class TestVectorizedBacktest:
+    """Test strategy selection and deterministic trade generation"""
+
+    def test_trades_are_deterministic(self):
+        """Test the same data gives the same alternating trade list"""
+        df = _wave_frame()
+        first, metrics = run_vectorized_backtest(df, "long_term", "value_investing")
+        second, _ = run_vectorized_backtest(df, "long_term", "value_investing")
+
+        pd.testing.assert_frame_equal(first, second)
+        assert metrics["total_trades"] == len(first) // 2 > 0
+        assert list(first["action"]) == ["entry", "exit"] * metrics["total_trades"]
+        assert set(first["reason"][first["action"] == "entry"]) == {"value_investing"}
+        assert set(first["reason"][first["action"] == "exit"]) <= {"stop_loss", "target", "end_of_backtest"}
+
+    def test_options_come_from_the_registry(self):
+        """Test every offered strategy is accepted and swing is not offered"""
+        assert "swing" not in BACKTEST_ENTRY_TYPES
+        assert strategy_options("intraday") == ["any", "momentum_long", "breakout_long", "momentum_short"]
+        df = _wave_frame(60)
+        for entry_type in BACKTEST_ENTRY_TYPES:
+            for strategy in strategy_options(entry_type):
+                run_vectorized_backtest(df, entry_type, strategy)
+
+    def test_unknown_strategy_raises(self):
+        """Test strategies without signals fail instead of backtesting zero trades"""
+        df = _wave_frame(60)
+        with pytest.raises(ValueError):
+            run_vectorized_backtest(df, "intraday", "reversal_long")
+        with pytest.raises(ValueError):
+            run_vectorized_backtest(df, "intraday", "value_investing")
+        with pytest.raises(ValueError):
+            run_vectorized_backtest(df, "swing", "any")
+        with pytest.raises(ValueError):
+            run_batch_backtest(["TCS.NS"], "short_sell", "trend_following_short", None, None)
@@ -0,0 +1,166 @@
+"""
+Unit tests for the local OHLCV bar store
+"""
+
+import numpy as np
+import pandas as pd
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from shared.data import bar_store
+from shared.data.bar_store import BarStore, period_start
+
+
+class FakeFetcher:
+    """Business-day bars for [start, end), recording each requested range"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbol, start, end, interval):
+        self.calls.append((start.date(), end.date()))
+        index = pd.date_range(start.normalize(), end, freq="B", inclusive="left", name="Date")
+        index = index[(index >= start.normalize()) & (index < end)]
+        return pd.DataFrame({
+            "Open": 1.0, "High": 2.0, "Low": 0.5,
+            "Close": np.arange(len(index), dtype=float), "Volume": 100, "Dividends": 0.0,
+        }, index=index)
+
+
+class IntradayFetcher:
+    """5m session bars (09:15-15:25) on business days, skipping ``holidays``"""
+
+    def __init__(self, holidays=()):
+        self.holidays = {pd.Timestamp(day).date() for day in holidays}
+        self.calls = []
+
+    def __call__(self, symbol, start, end, interval):
+        self.calls.append((start, end))
+        days = pd.bdate_range(start.normalize().tz_localize(None), end.tz_localize(None))
+        index = pd.DatetimeIndex([
+            stamp for day in days if day.date() not in self.holidays
+            for stamp in pd.date_range(day + pd.Timedelta("9h15min"), periods=75, freq="5min")
+        ]).tz_localize("Asia/Kolkata")
+        index = index[(index >= start) & (index < end)]
+        return pd.DataFrame({"Open": 1.0, "High": 2.0, "Low": 0.5, "Close": 1.5, "Volume": 10}, index=index)
+
+
+class TestBarStore:
+    """Test range-aware bar storage"""
+
+    def test_sub_range_served_locally(self, tmp_path):
+        """Test a range inside the stored coverage does not refetch"""
+        fetcher = FakeFetcher()
+        store = BarStore(root=tmp_path, fetcher=fetcher, enabled=True)
+
+        full = store.get_bars("RELIANCE.NS", "2024-01-10", "2024-02-09")
+        part = store.get_bars("RELIANCE.NS", "2024-01-15", "2024-02-01")
+
+        assert len(fetcher.calls) == 1
+        assert len(full) == 23
+        assert len(part) == 14
+        assert list(full.columns) == ["Open", "High", "Low", "Close", "Volume"]
+        assert full.index.name == "Date"
+        assert str(full.index.tz) == "Asia/Kolkata"
+
+    def test_head_gap_fetched_only(self, tmp_path):
+        """Test an earlier start downloads just the missing head segment"""
+        fetcher = FakeFetcher()
+        store = BarStore(root=tmp_path, fetcher=fetcher, enabled=True)
+
+        store.get_bars("TCS.NS", "2024-01-10", "2024-02-09")
+        bars = store.get_bars("TCS.NS", "2023-12-01", "2024-01-19")
+
+        assert fetcher.calls[1][0] == pd.Timestamp("2023-12-01").date()
+        assert fetcher.calls[1][1] <= pd.Timestamp("2024-01-11").date()
+        assert bars.index.is_monotonic_increasing and bars.index.is_unique
+        start, end = store.coverage("TCS.NS")
+        assert start.date() == pd.Timestamp("2023-12-01").date()
+        assert end.date() == pd.Timestamp("2024-02-09").date()
+
+    def test_partition_survives_new_instance(self, tmp_path):
+        """Test bars persist on disk across store instances"""
+        BarStore(root=tmp_path, fetcher=FakeFetcher(), enabled=True).get_bars("INFY.NS", "2024-01-01", "2024-01-31")
+
+        fetcher = FakeFetcher()
+        bars = BarStore(root=tmp_path, fetcher=fetcher, enabled=True).get_bars("INFY.NS", "2024-01-05", "2024-01-25")
+
+        assert fetcher.calls == []
+        assert len(bars) == 15
+
+    def test_empty_fetch_not_covered(self, tmp_path):
+        """Test an empty (failed) fetch is retried instead of cached as covered"""
+        fetcher = FakeFetcher()
+        answers = [pd.DataFrame()]
+
+        def flaky(symbol, start, end, interval):
+            return answers.pop() if answers else fetcher(symbol, start, end, interval)
+
+        store = BarStore(root=tmp_path, fetcher=flaky, enabled=True)
+        assert store.get_bars("TCS.NS", "2024-01-10", "2024-02-09").empty
+        assert store.coverage("TCS.NS") is None
+
+        assert len(store.get_bars("TCS.NS", "2024-01-10", "2024-02-09")) == 23
+        assert len(fetcher.calls) == 1
+
+
+class TestSessionPeriods:
+    """Test day-count periods are trading sessions"""
+
+    def _store(self, tmp_path, monkeypatch, now, holidays=()):
+        monkeypatch.setattr(bar_store, "_now", lambda: pd.Timestamp(now, tz="Asia/Kolkata"))
+        return BarStore(root=tmp_path, fetcher=IntradayFetcher(holidays), enabled=True)
+
+    def test_weekend_one_day(self, tmp_path, monkeypatch):
+        """Test "1d" on a Sunday returns Friday's full session"""
+        store = self._store(tmp_path, monkeypatch, "2024-01-14 11:00")
+        bars = store.get_period("TCS.NS", "1d", "5m")
+
+        assert len(bars) == 75
+        assert set(bars.index.date) == {pd.Timestamp("2024-01-12").date()}
+
+    def test_weekend_five_days(self, tmp_path, monkeypatch):
+        """Test "5d" on a Saturday returns the five sessions of that week"""
+        store = self._store(tmp_path, monkeypatch, "2024-01-13 11:00")
+        bars = store.get_period("TCS.NS", "5d", "5m")
+
+        assert len(bars) == 5 * 75
+        assert str(bars.index[0].date()) == "2024-01-08"
+        assert str(bars.index[-1].date()) == "2024-01-12"
+
+    def test_five_days_after_holiday(self, tmp_path, monkeypatch):
+        """Test "5d" before Monday's open reaches back past a Friday holiday"""
+        store = self._store(tmp_path, monkeypatch, "2024-01-29 08:00", holidays=["2024-01-26"])
+        bars = store.get_period("TCS.NS", "5d", "5m")
+
+        dates = sorted({str(day) for day in bars.index.date})
+        assert dates == ["2024-01-19", "2024-01-22", "2024-01-23", "2024-01-24", "2024-01-25"]
+
+    def test_session_window_start(self):
+        """Test the fetch window for "5d" holds five weekdays plus a holiday margin"""
+        start = period_start("5d", "1d", now=pd.Timestamp("2024-01-13 11:00", tz="Asia/Kolkata"))
+        assert start <= pd.Timestamp("2024-01-08", tz="Asia/Kolkata")
+
+
+class TestListing:
+    """Test symbols listed after the requested start"""
+
+    def test_pre_listing_head_not_refetched(self, tmp_path):
+        """Test the head before a symbol's first bar is requested only once"""
+        fetcher = FakeFetcher()
+        listing = pd.Timestamp("2024-03-01", tz="Asia/Kolkata")
+
+        def listed(symbol, start, end, interval):
+            frame = fetcher(symbol, start, end, interval)
+            return frame[frame.index >= listing]
+
+        store = BarStore(root=tmp_path, fetcher=listed, enabled=True)
+        first = store.get_bars("NEW.NS", "2024-01-01", "2024-04-30")
+        store.get_bars("NEW.NS", "2023-06-01", "2024-04-30")
+        again = store.get_bars("NEW.NS", "2023-01-01", "2024-04-30")
+
+        assert len(fetcher.calls) == 1
+        assert first.index[0].date() == listing.date()
+        assert len(again) == len(first)
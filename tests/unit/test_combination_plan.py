@@ -0,0 +1,111 @@
+"""
+Unit tests for compiled combination query plans
+"""
+
+import asyncio
+
+import pandas as pd
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api.services.combination_plan import (
+    CombinationPlan,
+    ResultSetCache,
+    merge_category_frames,
+    normalize_symbols,
+)
+
+QUERIES = {
+    ("momentum", "v1.0"): "momentum-v1",
+    ("value", "v1.0"): "value-v1",
+    ("quality", "v2.0"): "quality-v2",
+}
+RESULTS = {
+    "momentum-v1": [{"nsecode": "TCS", "name": "Tata Consultancy", "close": 3500, "volume": 1000, "per_chg": 1.5},
+                    {"nsecode": "infy.NS", "close": 1500, "volume": 2000}],
+    "value-v1": [{"symbol": "ITC.NS", "close": 400, "volume": 500},
+                 {"nsecode": "TCS", "close": 3501, "volume": 10}],
+    "quality-v2": [],
+}
+
+
+def _plan(combination):
+    return CombinationPlan.compile(combination, lambda c, v: QUERIES.get((c, v)),
+                                   weights={"momentum": 30, "value": 20})
+
+
+class Runner:
+    """Async ChartInk stand-in counting each query it runs"""
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    async def __call__(self, query, limit):
+        self.calls.append((query, limit))
+        await asyncio.sleep(0)
+        if query in self.fail:
+            raise RuntimeError("chartink down")
+        return RESULTS[query][:limit]
+
+
+class TestCombinationPlan:
+    """Test plan compilation, execution and scoring"""
+
+    def test_compile_resolves_steps(self):
+        """Test known variants become steps with weights and unknown ones are reported"""
+        plan = _plan({"momentum": "v1.0", "value": "v1.0", "quality": "v2.0", "growth": "v9.9"})
+        assert [(s.category, s.query, s.weight) for s in plan.steps] == [
+            ("momentum", "momentum-v1", 30), ("value", "value-v1", 20), ("quality", "quality-v2", 25)]
+        assert plan.missing == ["growth"]
+
+    def test_normalize_symbols(self):
+        """Test symbol fallback, suffix stripping, upper-casing and de-duplication"""
+        frame = normalize_symbols(RESULTS["value-v1"] + RESULTS["momentum-v1"] + [{"close": 1}], upper=True)
+        assert frame["symbol"].tolist() == ["ITC", "TCS", "INFY"]
+        assert frame.loc[1, "price"] == 3501
+        assert frame.loc[0, "name"] == "ITC"
+        assert normalize_symbols([]).empty
+
+    def test_execute_and_merge(self):
+        """Test steps run concurrently, share cached result sets and score by summed weight"""
+        runner, cache = Runner(), ResultSetCache()
+        plan = _plan({"momentum": "v1.0", "value": "v1.0", "quality": "v2.0"})
+
+        async def run():
+            first, second = await asyncio.gather(plan.execute(runner, cache, 10, upper=True),
+                                                 plan.execute(runner, cache, 10, upper=True))
+            return first, second
+
+        frames, again = asyncio.run(run())
+        assert sorted(runner.calls) == [("momentum-v1", 10), ("quality-v2", 10), ("value-v1", 10)]
+        assert frames.keys() == again.keys() == {"momentum", "value", "quality"}
+
+        scores, details = merge_category_frames(plan, frames)
+        assert scores.to_dict() == {"TCS": 50.0, "INFY": 30.0, "ITC": 20.0}
+        tcs = details.set_index("symbol").loc["TCS"]
+        assert tcs["categories"] == ["momentum", "value"]
+        assert tcs["name"] == "Tata Consultancy"
+
+    def test_failed_and_empty_results_are_not_cached(self):
+        """Test a failing query yields an empty frame and is retried on the next run"""
+        runner, cache = Runner(fail={"value-v1"}), ResultSetCache()
+        plan = _plan({"momentum": "v1.0", "value": "v1.0"})
+
+        frames = asyncio.run(plan.execute(runner, cache, 10))
+        assert frames["value"].empty and not frames["momentum"].empty
+
+        runner.fail.clear()
+        frames = asyncio.run(plan.execute(runner, cache, 10))
+        assert not frames["value"].empty
+        assert [query for query, _ in runner.calls].count("momentum-v1") == 1
+        assert [query for query, _ in runner.calls].count("value-v1") == 2
+
+    def test_merge_with_no_results(self):
+        """Test a combination whose queries all came back empty scores nothing"""
+        plan = _plan({"quality": "v2.0"})
+        scores, details = merge_category_frames(plan, {"quality": pd.DataFrame()})
+        assert scores.empty
+        assert "categories" in details.columns and details.empty
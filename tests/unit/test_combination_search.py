@@ -0,0 +1,128 @@
+"""
+Unit tests for the offline bitset combination search
+"""
+
+from itertools import product
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api.services.combination_search import CombinationSearch, VariantSnapshot
+
+# Two identical momentum variants give tied combinations; every category has
+# an empty variant, so one combination matches nothing at all
+RESULTS = {
+    "fundamental": {"v1.0": ["TCS", "INFY", "HDFC"], "v1.1": ["TCS", "ITC"], "v2.0": []},
+    "momentum": {"v1.0": ["INFY", "SBIN"], "v1.1": ["INFY", "SBIN"], "v2.0": []},
+    "value": {"v1.0": ["ITC", "HDFC", "SBIN", "TCS"], "v1.1": []},
+}
+WEIGHTS = {
+    "fundamental": {"v1.0": 0.3, "v1.1": 0.25, "v2.0": 0.2},
+    "momentum": {"v1.0": 0.25, "v1.1": 0.25, "v2.0": 0.4},
+    "value": {"v1.0": 0.2, "v1.1": 0.35},
+}
+
+
+def _snapshot():
+    variants = {
+        category: {version: {"query": f"{category}:{version}", "weight": WEIGHTS[category][version]}
+                   for version in versions}
+        for category, versions in RESULTS.items()
+    }
+
+    def runner(query):
+        category, version = query.split(":")
+        return [{"nsecode": symbol} for symbol in RESULTS[category][version]]
+
+    return VariantSnapshot.record(variants, runner, delay_seconds=0)
+
+
+def _brute_force():
+    """The per-combination set arithmetic the bitset search replaced"""
+    categories = sorted(RESULTS)
+    results = []
+    for versions in product(*(sorted(RESULTS[c]) for c in categories)):
+        stock_categories = {}
+        total, weighted_hits = 0, 0.0
+        for category, version in zip(categories, versions):
+            for symbol in RESULTS[category][version]:
+                stock_categories.setdefault(symbol, set()).add(category)
+                weighted_hits += WEIGHTS[category][version] * 100
+            total += len(RESULTS[category][version])
+        unique = len(stock_categories)
+        multi = sum(1 for found_in in stock_categories.values() if len(found_in) > 1)
+        avg_score = weighted_hits / unique if unique else 0.0
+        performance = min(100.0, avg_score + multi / unique * 20) if unique else 0.0
+        results.append({
+            "combination": dict(zip(categories, versions)),
+            "metrics": {
+                "unique_stocks": unique,
+                "total_stocks_across_categories": total,
+                "avg_score": round(avg_score, 2),
+                "multi_category_stocks": multi,
+                "performance_score": round(performance, 2),
+                "diversity_score": round(unique / max(total, 1) * 100, 2),
+            },
+        })
+    results.sort(key=lambda r: (r["metrics"]["performance_score"], r["metrics"]["diversity_score"]),
+                 reverse=True)
+    return results
+
+
+def _key(result):
+    return tuple(sorted(result["combination"].items()))
+
+
+def _rank_key(result):
+    return result["metrics"]["performance_score"], result["metrics"]["diversity_score"]
+
+
+class TestCombinationSearch:
+    """Test the bitset search against brute-force enumeration"""
+
+    def test_grid_matches_brute_force(self):
+        """Test every combination scores and ranks as in the brute-force enumeration"""
+        expected = _brute_force()
+        results = CombinationSearch(_snapshot(), workers=1).run("grid", top_n=len(expected))
+
+        assert len(results) == len(expected) == 3 * 3 * 2
+        assert [_rank_key(r) for r in results] == [_rank_key(r) for r in expected]
+        by_combination = {_key(r): r["metrics"] for r in expected}
+        for result in results:
+            assert result["metrics"] == pytest.approx(by_combination[_key(result)])
+        assert [r["rank"] for r in results] == list(range(1, len(expected) + 1))
+
+    def test_ties_keep_both_combinations(self):
+        """Test identical variants tie and both appear at the same score"""
+        results = CombinationSearch(_snapshot(), workers=1).run("grid", top_n=100)
+        tied = [r for r in results
+                if r["combination"]["fundamental"] == "v1.0" and r["combination"]["value"] == "v1.0"
+                and r["combination"]["momentum"] in ("v1.0", "v1.1")]
+        assert len(tied) == 2
+        assert _rank_key(tied[0]) == _rank_key(tied[1])
+        assert abs(tied[0]["rank"] - tied[1]["rank"]) == 1
+
+    def test_empty_result_combination(self):
+        """Test a combination matching no symbols scores zero and ranks last"""
+        results = CombinationSearch(_snapshot(), workers=1).run("grid", top_n=100)
+        empty = results[-1]
+        assert empty["combination"] == {"fundamental": "v2.0", "momentum": "v2.0", "value": "v1.1"}
+        assert empty["metrics"] == {
+            "unique_stocks": 0, "total_stocks_across_categories": 0, "avg_score": 0.0,
+            "multi_category_stocks": 0, "performance_score": 0.0, "diversity_score": 0.0,
+        }
+
+    def test_greedy_and_random_scores_match(self):
+        """Test partial searches report the brute-force metrics of what they visit"""
+        by_combination = {_key(r): r["metrics"] for r in _brute_force()}
+        search = CombinationSearch(_snapshot(), workers=1)
+        for results in (search.run("greedy", top_n=100), search.run("random", top_n=100, samples=8, seed=3)):
+            assert results
+            for result in results:
+                assert result["metrics"] == pytest.approx(by_combination[_key(result)])
+
+        best = search.run("greedy", top_n=1)[0]
+        assert _rank_key(best) == _rank_key(_brute_force()[0])
@@ -0,0 +1,162 @@
+"""
+Unit tests for config snapshots and their file watcher
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api.services.config_manager import TradingConfigManager
+from api.services.config_snapshot import SnapshotFileWatcher, SnapshotHolder
+
+
+CONFIG = {
+    "current_version": "v1.0.0",
+    "algorithms": {"v1.0.0": {"name": "Base", "sub_algorithm_config": {"breakout": "v1.0"}}},
+    "scoring_system": {"category_weights": {"breakout": 35}},
+    "sub_algorithm_variants": {"breakout": {"v1.0": {"query": "( {cash} ( latest close > 1 ) )"}}},
+}
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data))
+
+
+def _watched(tmp_path, data=CONFIG):
+    path = tmp_path / "swing_config.json"
+    _write(path, data)
+    holder = SnapshotHolder("test_config", share=False)
+    watcher = SnapshotFileWatcher(holder, path)
+    watcher.reload()
+    return path, holder, watcher
+
+
+class TestSnapshotFileWatcher:
+    """Test config file changes reach the snapshot holder"""
+
+    def test_changed_file_bumps_version(self, tmp_path):
+        """Test a reload publishes a new version only when the content changed"""
+        path, holder, watcher = _watched(tmp_path)
+        assert holder.version == 1
+
+        watcher.reload()
+        assert holder.version == 1
+
+        _write(path, dict(CONFIG, current_version="v2.0.0"))
+        watcher.reload()
+        assert holder.version == 2
+        assert holder.current.data["current_version"] == "v2.0.0"
+
+    def test_unparsable_file_keeps_snapshot(self, tmp_path):
+        """Test a half-written file keeps the current snapshot"""
+        path, holder, watcher = _watched(tmp_path)
+        path.write_text('{"current_version": ')
+        assert watcher.reload() is holder.current
+        assert holder.version == 1
+
+    def test_events_for_the_file_reload(self, tmp_path):
+        """Test modify and rename-over events for the config file trigger a reload"""
+        path, holder, watcher = _watched(tmp_path)
+        _write(path, dict(CONFIG, current_version="v2.0.0"))
+
+        watcher.dispatch(SimpleNamespace(is_directory=False, src_path=str(tmp_path / "other.json")))
+        assert holder.version == 1
+        watcher.dispatch(SimpleNamespace(is_directory=False, src_path=str(path)))
+        assert holder.version == 2
+
+        _write(path, dict(CONFIG, current_version="v3.0.0"))
+        watcher.dispatch(SimpleNamespace(is_directory=False, src_path=str(tmp_path / ".swing.tmp"),
+                                         dest_path=str(path)))
+        assert holder.version == 3
+
+    def test_watcher_picks_up_file_change(self, tmp_path):
+        """Test the background observer reloads a changed file"""
+        path, holder, watcher = _watched(tmp_path)
+        watcher.start()
+        try:
+            _write(path, dict(CONFIG, current_version="v2.0.0"))
+            deadline = time.time() + 5
+            while holder.version == 1 and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            watcher.stop()
+        assert holder.version == 2
+
+
+class TestSnapshotData:
+    """Test data leaving a snapshot is plain JSON"""
+
+    def test_to_dict_is_json_serializable(self, tmp_path):
+        """Test thawed snapshot data round-trips through json.dumps"""
+        _, holder, _ = _watched(tmp_path)
+        snapshot = holder.current
+        assert json.loads(json.dumps(snapshot.to_dict())) == CONFIG
+        with pytest.raises(TypeError):
+            json.dumps(snapshot.data)
+
+
+STRATEGIES = {
+    "version": "1.0",
+    "strategies": {
+        "swing": {
+            "name": "Swing", "timeframe": "3-10 days", "target_return": 5.0, "stop_loss": 3.0,
+            "seed_algorithms": {
+                "chartink_themes": [{"name": "breakout", "weight": 0.6, "limit": 20,
+                                     "filters": {"min_price": 50, "sectors": ["IT", "Bank"]}}],
+                "custom_scanners": [{"name": "squeeze", "weight": 0.4, "parameters": {"bb": [20, 2]}}],
+            },
+            "analysis_criteria": {"rsi": {"min": 30, "max": 70}},
+        }
+    },
+    "global_settings": {"fallback_symbols": ["TCS", "INFY"], "limits": {"max": 10}},
+    "experimental_features": {"ml_scoring": {"enabled": True, "models": ["gbm"]}},
+}
+
+
+class TestConfigManagerGetters:
+    """Test config manager getters hand out plain, serializable data"""
+
+    def test_getters_are_json_serializable(self, tmp_path):
+        """Test every getter result round-trips through json.dumps"""
+        path = tmp_path / "trading_strategies.json"
+        _write(path, STRATEGIES)
+        manager = TradingConfigManager(str(path))
+        manager.reload_config_sync(raise_errors=True)
+        strategy = STRATEGIES["strategies"]["swing"]
+
+        results = {
+            "analysis_criteria": (manager.get_analysis_criteria("swing"), strategy["analysis_criteria"]),
+            "global_settings": (manager.get_global_settings(), STRATEGIES["global_settings"]),
+            "experimental_features": (manager.get_experimental_features(), STRATEGIES["experimental_features"]),
+            "chartink_filters": (manager.get_seed_algorithms("swing")[0].filters,
+                                 strategy["seed_algorithms"]["chartink_themes"][0]["filters"]),
+            "scanner_filters": (manager.get_seed_algorithms("swing", "custom_scanners")[0].filters,
+                                strategy["seed_algorithms"]["custom_scanners"][0]["parameters"]),
+        }
+        for name, (result, expected) in results.items():
+            assert json.loads(json.dumps(result)) == expected, name
+
+    def test_getter_results_do_not_leak_into_snapshot(self, tmp_path):
+        """Test mutating a getter result leaves the snapshot unchanged"""
+        path = tmp_path / "trading_strategies.json"
+        _write(path, STRATEGIES)
+        manager = TradingConfigManager(str(path))
+        manager.reload_config_sync(raise_errors=True)
+
+        manager.get_global_settings()["limits"]["max"] = 99
+        manager.get_seed_algorithms("swing")[0].filters["min_price"] = 0
+        assert manager.get_global_settings()["limits"]["max"] == 10
+        assert manager.get_seed_algorithms("swing")[0].filters["min_price"] == 50
+
+    def test_unloaded_getters_are_empty(self):
+        """Test getters before the first load return empty dicts"""
+        manager = TradingConfigManager("/nonexistent/trading_strategies.json")
+        assert manager.get_global_settings() == {}
+        assert manager.get_experimental_features() == {}
+        assert manager.get_analysis_criteria("swing") == {}
@@ -0,0 +1,256 @@
+"""
+Unit tests for cron execution rollups
+"""
+
+import asyncio
+import fcntl
+import os
+import subprocess
+from datetime import datetime, timedelta
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api.models.cron_tracking_models import (
+    CronExecutionTracker,
+    CronJobStatus,
+    CronJobType,
+    combine_rollups,
+    duration_bucket,
+    merge_rollup,
+    rollup_increments,
+)
+
+
+def _matches(doc, query):
+    """Enough of Mongo's query language for the rebuild's end_time filters"""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(_matches(doc, branch) for branch in condition):
+                return False
+            continue
+        value = doc.get(key)
+        for op, bound in condition.items():
+            if op == "$exists" and (key in doc) != bound:
+                return False
+            if op == "$gte" and (value is None or value < bound):
+                return False
+            if op == "$lt" and (value is None or value >= bound):
+                return False
+    return True
+
+
+class FakeCollection:
+    """In-memory stand-in for the motor collection calls rollups make"""
+
+    def __init__(self, db, name):
+        self.db, self.name, self.docs = db, name, []
+        self.on_insert = None
+
+    async def drop(self):
+        self.docs = []
+
+    async def create_index(self, *args, **kwargs):
+        pass
+
+    async def delete_many(self, query):
+        self.docs = []
+
+    async def insert_many(self, docs):
+        self.docs.extend(dict(doc) for doc in docs)
+        if self.on_insert:
+            await self.on_insert()
+
+    async def rename(self, name, dropTarget=False):
+        self.db[name].docs, self.docs = self.docs, []
+
+    async def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            query, update = operation._filter, operation._doc
+            doc = next((d for d in self.docs if all(d.get(k) == v for k, v in query.items())), None)
+            if doc is None:
+                doc = dict(query, **update.get("$setOnInsert", {}))
+                self.docs.append(doc)
+            merge_rollup(doc, update.get("$inc", {}), update.get("$max", {}))
+
+    def find(self, query, projection=None):
+        async def cursor():
+            for doc in list(self.docs):
+                if _matches(doc, query):
+                    yield doc
+        return cursor()
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection(self, name)
+        return self[name]
+
+
+def _mongo_tracker():
+    tracker = CronExecutionTracker(use_mongodb=False)
+    db = FakeDatabase()
+    tracker.use_mongodb = True
+    tracker.db = db
+    tracker.executions_collection = db["cron_executions"]
+    tracker.rollups_collection = db["cron_rollups"]
+    tracker._rollup_swap = asyncio.Lock()
+
+    async def no_summary(*args, **kwargs):
+        pass
+
+    tracker._update_job_summary = no_summary
+    return tracker, db
+
+
+def _execution(started_at, status="success"):
+    return {"job_type": CronJobType.SWING_ANALYSIS.value, "status": status, "actual_start_time": started_at,
+            "end_time": started_at + timedelta(seconds=30), "duration_seconds": 30.0,
+            "recommendations_count": 2}
+
+
+class TestCronRollups:
+    """Test pre-aggregated cron analytics"""
+
+    def test_duration_buckets(self):
+        """Test durations land in the expected histogram buckets"""
+        assert duration_bucket(3) == "le_5s"
+        assert duration_bucket(45) == "le_60s"
+        assert duration_bucket(900) == "gt_600s"
+        assert duration_bucket(None) == "unknown"
+
+    def test_merge_and_combine(self):
+        """Test increments accumulate and buckets combine"""
+        first = merge_rollup({}, rollup_increments("success", 4.0, 10), {"last_execution": "2024-01-01T09"})
+        second = merge_rollup({}, rollup_increments("failed", 70.0, 0), {"last_execution": "2024-01-02T09"})
+        combined = combine_rollups([first, second])
+
+        assert combined["count"] == 2
+        assert combined["successes"] == 1
+        assert combined["failures"] == 1
+        assert combined["stocks_produced"] == 10
+        assert combined["duration_histogram"] == {"le_5s": 1, "le_120s": 1}
+        assert combined["last_execution"] == "2024-01-02T09"
+
+    def test_analytics_served_from_file_rollups(self, tmp_path):
+        """Test completed executions feed the analytics through rollups"""
+        tracker = CronExecutionTracker(use_mongodb=False)
+        tracker.storage_dir = tmp_path
+
+        async def run():
+            for i in range(4):
+                execution_id = await tracker.start_job_execution(
+                    f"job_{i}", "Swing", CronJobType.SWING_ANALYSIS, datetime.now()
+                )
+                status = CronJobStatus.FAILED if i == 0 else CronJobStatus.SUCCESS
+                await tracker.complete_job_execution(
+                    execution_id, status, output_summary={"recommendations_generated": 5}
+                )
+            return await tracker.get_performance_analytics(CronJobType.SWING_ANALYSIS, days=7)
+
+        analytics = asyncio.run(run())
+        assert analytics["total_executions"] == 4
+        assert analytics["failed_executions"] == 1
+        assert analytics["total_recommendations_generated"] == 20
+        assert analytics["duration_histogram"] == {"le_5s": 4}
+
+    def test_concurrent_processes_keep_every_increment(self, tmp_path):
+        """Test separate processes updating the rollup file lose no increments"""
+        workers, per_worker = 4, 10
+        script = (
+            "import asyncio, sys\n"
+            "from datetime import datetime\n"
+            f"sys.path.insert(0, {str(Path(__file__).parent.parent.parent)!r})\n"
+            "from pathlib import Path\n"
+            "from api.models.cron_tracking_models import CronExecutionTracker, CronJobStatus, CronJobType\n"
+            "tracker = CronExecutionTracker(use_mongodb=False)\n"
+            f"tracker.storage_dir = Path({str(tmp_path)!r})\n"
+            "async def run():\n"
+            f"    for _ in range({per_worker}):\n"
+            "        execution_id = await tracker.start_job_execution(\n"
+            "            'job', 'Swing', CronJobType.SWING_ANALYSIS, datetime.now())\n"
+            "        await tracker.complete_job_execution(execution_id, CronJobStatus.SUCCESS)\n"
+            "asyncio.run(run())\n"
+        )
+        processes = [subprocess.Popen([sys.executable, "-c", script]) for _ in range(workers)]
+        assert all(process.wait(timeout=60) == 0 for process in processes)
+
+        tracker = CronExecutionTracker(use_mongodb=False)
+        tracker.storage_dir = tmp_path
+        rollups = asyncio.run(tracker.get_rollups(CronJobType.SWING_ANALYSIS, granularity="all"))
+        assert rollups[0]["count"] == workers * per_worker
+
+    def test_existing_history_is_backfilled(self, tmp_path):
+        """Test initialize builds rollups from executions recorded before rollups existed"""
+        tracker = CronExecutionTracker(use_mongodb=False)
+        tracker.storage_dir = tmp_path
+
+        async def run():
+            for _ in range(3):
+                execution_id = await tracker.start_job_execution(
+                    "job", "Swing", CronJobType.SWING_ANALYSIS, datetime.now()
+                )
+                await tracker.complete_job_execution(execution_id, CronJobStatus.SUCCESS)
+            tracker.rollup_file.unlink()
+
+            await tracker.initialize()
+            return await tracker.get_rollups(CronJobType.SWING_ANALYSIS, granularity="all")
+
+        rollups = asyncio.run(run())
+        assert rollups[0]["count"] == 3
+
+
+class TestRollupRebuild:
+    """Test rollup rebuilds and the rollup file lock under concurrency"""
+
+    def test_completion_during_swap_is_replayed(self):
+        """Test an execution completed between catch-up and rename is not lost"""
+        tracker, db = _mongo_tracker()
+        past = datetime.now() - timedelta(hours=2)
+        db["cron_executions"].docs = [_execution(past + timedelta(minutes=i)) for i in range(3)]
+
+        async def other_process_completes():
+            # Another process completes while the scratch collection is being filled:
+            # its increment goes to the live collection, which is about to be replaced
+            execution = _execution(datetime.now() - timedelta(seconds=30))
+            execution["end_time"] = datetime.now()
+            db["cron_executions"].docs.append(execution)
+            await tracker._record_rollups(**tracker._execution_rollup(execution))
+
+        async def run():
+            db[f"cron_rollups_rebuild_{os.getpid()}"].on_insert = other_process_completes
+            await tracker.rebuild_rollups()
+            return [doc for doc in db["cron_rollups"].docs if doc["granularity"] == "all"]
+
+        rollups = asyncio.run(run())
+        assert rollups[0]["count"] == 4
+        assert rollups[0]["stocks_produced"] == 8
+
+    def test_waiting_for_file_lock_keeps_loop_running(self, tmp_path):
+        """Test a completion waiting on another process's lock does not block the event loop"""
+        tracker = CronExecutionTracker(use_mongodb=False)
+        tracker.storage_dir = tmp_path
+        tracker.rollup_file.parent.mkdir(parents=True, exist_ok=True)
+
+        async def run():
+            execution_id = await tracker.start_job_execution(
+                "job", "Swing", CronJobType.SWING_ANALYSIS, datetime.now()
+            )
+            with open(f"{tracker.rollup_file}.lock", "a") as held:
+                fcntl.flock(held, fcntl.LOCK_EX)
+                completion = asyncio.create_task(
+                    tracker.complete_job_execution(execution_id, CronJobStatus.SUCCESS)
+                )
+                ticks = 0
+                for _ in range(5):
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+                assert not completion.done()
+                fcntl.flock(held, fcntl.LOCK_UN)
+            assert await asyncio.wait_for(completion, timeout=5)
+            return ticks, await tracker.get_rollups(CronJobType.SWING_ANALYSIS, granularity="all")
+
+        ticks, rollups = asyncio.run(run())
+        assert ticks == 5
+        assert rollups[0]["count"] == 1
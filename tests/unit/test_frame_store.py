@@ -0,0 +1,76 @@
+"""
+Unit tests for the precomputed frame store
+"""
+
+import numpy as np
+import pandas as pd
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "patterns"))
+
+from dashboard import precompute
+from shared.data.frame_store import FrameStore
+
+
+class TestFrameStore:
+    """Test generation-swapped, memory-mapped frames"""
+
+    def test_round_trip(self, tmp_path):
+        """Test numeric, text and datetime columns survive a publish"""
+        store = FrameStore(root=tmp_path)
+        frame = pd.DataFrame({
+            "Symbol": ["TCS", "INFY", None],
+            "Close": [3450.0, 1495.75, np.nan],
+            "Volume": [100, 200, 300],
+            "Timestamp": pd.date_range("2024-01-01", periods=3, freq="h", tz="Asia/Kolkata"),
+        })
+        store.publish("home", {"movers": frame, "empty": pd.DataFrame(columns=["A"])})
+
+        meta, frames = store.read_page("home")
+        movers = frames["movers"]
+        assert movers["Symbol"].tolist() == ["TCS", "INFY", ""]
+        assert np.allclose(movers["Close"].to_numpy()[:2], [3450.0, 1495.75])
+        assert movers["Volume"].tolist() == [100, 200, 300]
+        assert movers["Timestamp"].tolist() == frame["Timestamp"].tolist()
+        assert list(frames["empty"].columns) == ["A"] and frames["empty"].empty
+        # Numeric columns are read-only views of the mapped file, not copies
+        assert not movers["Volume"].to_numpy().flags["WRITEABLE"]
+        assert store.age("home") >= 0
+
+    def test_generations_swap_and_prune(self, tmp_path):
+        """Test readers follow CURRENT and old generations are pruned"""
+        store = FrameStore(root=tmp_path, keep=2)
+        reader = FrameStore(root=tmp_path)
+        assert reader.read("home", "movers") is None
+
+        for value in range(4):
+            store.publish("home", {"movers": pd.DataFrame({"x": [value]})})
+            assert reader.read("home", "movers")["x"].tolist() == [value]
+
+        assert len(list((tmp_path / "home").glob("gen-*"))) == 2
+        # Unchanged generation is served from the reader's cache
+        assert reader.read_page("home")[1] is reader.read_page("home")[1]
+
+
+class TestReadPageFrames:
+    """Test pages fall back to live frames when the precompute service stops"""
+
+    def test_stale_frames_are_rebuilt(self, tmp_path, monkeypatch):
+        """Test frames older than the default max age are built live and republished"""
+        store = FrameStore(root=tmp_path)
+        builds = []
+        monkeypatch.setattr(precompute, "get_frame_store", lambda: store)
+        monkeypatch.setattr(precompute, "precompute_interval", lambda: 30.0)
+        monkeypatch.setitem(precompute.PAGE_BUILDERS, "test_page",
+                            lambda db: builds.append(db) or {"rows": pd.DataFrame({"x": [len(builds)]})})
+
+        store.publish("test_page", {"rows": pd.DataFrame({"x": [0]})})
+        assert precompute.read_page_frames("test_page")["rows"]["x"].tolist() == [0]
+        assert builds == []
+
+        # The service died: its last generation is older than 3 intervals
+        monkeypatch.setattr(precompute.time, "time", lambda: store.read_page("test_page")[0]["published_at"] + 91)
+        assert precompute.read_page_frames("test_page")["rows"]["x"].tolist() == [1]
+        assert store.read("test_page", "rows")["x"].tolist() == [1]
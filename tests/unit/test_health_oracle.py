@@ -0,0 +1,77 @@
+"""
+Unit tests for the shared upstream health oracle
+"""
+
+import asyncio
+import time
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.health_oracle import HealthOracle, summarize
+
+UPSTREAMS = {"chartink": ["http://chartink.test/"], "internet": ["http://a.test", "http://b.test"]}
+
+
+def _oracle(tmp_path, **kwargs):
+    return HealthOracle(upstreams=UPSTREAMS, path=str(tmp_path / "health.json"),
+                        interval=10, timeout=0.5, window=5, failures_to_down=2, **kwargs)
+
+
+class TestHealthOracle:
+    """Test rolling stats, shared reads and concurrent probing"""
+
+    def test_rolling_window_and_blips(self, tmp_path):
+        """Test one failed round is tolerated and the window is bounded"""
+        prober = _oracle(tmp_path)
+        for ok in (True, True, False):
+            prober.publish({"chartink": (ok, 100.0)})
+        status = prober.status("chartink")
+        assert status["healthy"] and status["consecutive_failures"] == 1
+        assert status["success_rate"] == 0.667
+
+        prober.publish({"chartink": (False, 500.0)})
+        assert not prober.is_healthy("chartink")
+
+        for _ in range(5):
+            prober.publish({"chartink": (True, 40.0)})
+        status = prober.status("chartink")
+        assert status["rounds"] == 5 and status["success_rate"] == 1.0
+        assert status["latency_ms_p50"] == 40.0
+
+        assert summarize([], 2)["healthy"] is False
+
+    def test_readers_share_published_status(self, tmp_path):
+        """Test another process reads the document without probing"""
+        prober = _oracle(tmp_path)
+        reader = _oracle(tmp_path)
+
+        async def must_not_probe():
+            raise AssertionError("reader probed")
+
+        reader.probe_round = must_not_probe
+        prober.publish({"chartink": (True, 80.0), "internet": (False, 500.0)})
+        assert reader.is_healthy("chartink")
+        assert reader.status("internet")["consecutive_failures"] == 1
+        assert reader.status("unknown") is None
+
+    def test_stale_status_probes_concurrently(self, tmp_path):
+        """Test a stale document triggers one concurrent probe round"""
+        oracle = _oracle(tmp_path)
+        oracle.publish({"chartink": (False, 1.0)}, now=time.time() - 3600)
+        probed = []
+
+        async def fake_endpoint(session, url):
+            probed.append(url)
+            await asyncio.sleep(0.2)
+            return url != "http://a.test", 200.0
+
+        oracle._probe_endpoint = fake_endpoint
+        start = time.perf_counter()
+        assert oracle.is_healthy("internet") and oracle.is_healthy("chartink")
+        assert time.perf_counter() - start < 0.5
+        assert sorted(probed) == sorted(sum(UPSTREAMS.values(), []))
+
+        # Fresh now - no second round
+        assert oracle.is_healthy("chartink") and len(probed) == 3
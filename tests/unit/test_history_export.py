@@ -0,0 +1,180 @@
+"""
+Unit tests for streaming recommendation history export
+"""
+
+import asyncio
+import csv
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api.models.history_export import column_kind, open_export_writer
+from api.models.recommendation_history_models import RecommendationHistoryStorage, RecommendationStrategy
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+        self.sorted_by = self.batch = None
+
+    def sort(self, key, direction):
+        self.sorted_by = (key, direction)
+        return self
+
+    def batch_size(self, size):
+        self.batch = size
+        return self
+
+    def __aiter__(self):
+        async def gen():
+            for doc in self.docs:
+                yield dict(doc)
+        return gen()
+
+
+class _Collection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.calls = []
+
+    def find(self, query, projection=None):
+        self.calls.append((query, projection))
+        rows = self.docs
+        if projection:
+            rows = [{k: v for k, v in doc.items() if projection.get(k, 0)} for doc in rows]
+        self.cursor = _Cursor(rows)
+        return self.cursor
+
+
+def _docs(n):
+    return [{"_id": i, "symbol": f"S{i}", "strategy": "swing", "overall_score": 50 + i,
+             "generated_at": datetime(2025, 1, 1, 10) + timedelta(minutes=i), "scores": {"rsi": i}}
+            for i in range(n)]
+
+
+def _mongo_storage(docs):
+    storage = RecommendationHistoryStorage.__new__(RecommendationHistoryStorage)
+    storage.use_mongodb = True
+    storage.recommendations_collection = _Collection(docs)
+    return storage
+
+
+class TestHistoryExport:
+    """Test cursor batching, projection and the export formats"""
+
+    def test_cursor_batches_and_projection(self):
+        """Test one projected cursor, oldest first, yielded in batches"""
+        storage = _mongo_storage(_docs(5))
+
+        async def collect():
+            return [batch async for batch in storage.iter_recommendation_history(
+                strategy=RecommendationStrategy.SWING, fields=["symbol", "overall_score"], batch_size=2)]
+
+        batches = asyncio.run(collect())
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert batches[0][0] == {"symbol": "S0", "overall_score": 50}
+        query, projection = storage.recommendations_collection.calls[0]
+        assert query == {"strategy": "swing"}
+        assert projection == {"symbol": 1, "overall_score": 1, "_id": 0}
+        assert storage.recommendations_collection.cursor.batch == 2
+
+    def test_formats(self, tmp_path):
+        """Test CSV, JSON Lines and JSON written incrementally"""
+        storage = _mongo_storage(_docs(3))
+
+        async def export(name, format, fields=None):
+            return await storage.export_recommendations(str(tmp_path / name), format, fields, batch_size=2)
+
+        assert asyncio.run(export("out.csv", "csv")) == 3
+        with open(tmp_path / "out.csv", newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert rows[1]["symbol"] == "S1" and rows[1]["_id"] == "1"
+        assert json.loads(rows[2]["scores"]) == {"rsi": 2}
+        assert rows[0]["generated_at"] == "2025-01-01T10:00:00"
+
+        assert asyncio.run(export("out.jsonl", "jsonl", ["symbol"])) == 3
+        lines = (tmp_path / "out.jsonl").read_text().splitlines()
+        assert [json.loads(line) for line in lines] == [{"symbol": f"S{i}"} for i in range(3)]
+
+        assert asyncio.run(export("out.json", "json", ["symbol"])) == 3
+        document = json.loads((tmp_path / "out.json").read_text())
+        assert len(document["recommendations"]) == 3
+        assert document["export_metadata"]["total_records"] == 3
+
+        empty = _mongo_storage([])
+        asyncio.run(empty.export_recommendations(str(tmp_path / "empty.json"), "json"))
+        assert json.loads((tmp_path / "empty.json").read_text())["recommendations"] == []
+
+    def test_no_record_cap(self, tmp_path):
+        """Test exports are not capped at the old 10,000 records"""
+        storage = _mongo_storage(_docs(10050))
+        path = tmp_path / "all.jsonl"
+        assert asyncio.run(storage.export_recommendations(str(path), "jsonl", ["symbol"])) == 10050
+        assert len(path.read_text().splitlines()) == 10050
+
+
+def _write(path, format, batches, fields=None, metadata=None):
+    writer = open_export_writer(str(path), format, fields)
+    for batch in batches:
+        writer.write_batch(batch)
+    writer.close(metadata)
+    return writer
+
+
+class TestExportWriters:
+    """Test the writers directly with sparse and drifting batches"""
+
+    def test_csv_keeps_fields_from_later_batches(self, tmp_path):
+        """Test a field first seen in a later batch gets a column, not dropped"""
+        batches = [[{"symbol": "A", "score": 1}], [{"symbol": "B", "score": 2, "note": "late"}]]
+        writer = _write(tmp_path / "sparse.csv", "csv", batches)
+        with open(tmp_path / "sparse.csv", newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert writer.columns == ["symbol", "score", "note"]
+        assert rows == [{"symbol": "A", "score": "1", "note": ""},
+                        {"symbol": "B", "score": "2", "note": "late"}]
+
+    def test_csv_projection(self, tmp_path):
+        """Test explicit fields fix the columns, in order, including absent ones"""
+        batches = [[{"symbol": "A", "score": 1, "extra": 0}]]
+        _write(tmp_path / "fields.csv", "csv", batches, fields=["score", "symbol", "missing"])
+        with open(tmp_path / "fields.csv", newline='') as f:
+            assert list(csv.reader(f)) == [["score", "symbol", "missing"], ["1", "A", ""]]
+
+    @pytest.mark.parametrize("sizes", [[], [1], [2, 1, 3]])
+    def test_json_is_valid_for_any_batch_count(self, tmp_path, sizes):
+        """Test the JSON document parses with zero, one or many batches"""
+        records = [{"symbol": f"S{i}", "at": datetime(2025, 1, 1)} for i in range(sum(sizes))]
+        batches, start = [], 0
+        for size in sizes:
+            batches.append(records[start:start + size])
+            start += size
+
+        _write(tmp_path / "out.json", "json", batches, metadata={"fields": None})
+        document = json.loads((tmp_path / "out.json").read_text())
+        assert [r["symbol"] for r in document["recommendations"]] == [r["symbol"] for r in records]
+        assert document["export_metadata"]["total_records"] == len(records)
+
+    def test_column_kinds(self):
+        """Test parquet columns widen ints and fall back to strings on drift"""
+        assert column_kind({"number"}) == "number"
+        assert column_kind({"timestamp"}) == "timestamp"
+        assert column_kind({"number", "string"}) == "string"
+        assert column_kind(set()) == "string"
+
+    def test_parquet_type_drift(self, tmp_path):
+        """Test later batches with new fields or other types still write"""
+        pq = pytest.importorskip("pyarrow.parquet")
+        batches = [[{"symbol": "A", "score": 1, "sector": None}],
+                   [{"symbol": "B", "score": 2.5, "sector": "IT", "target": "n/a"}],
+                   [{"symbol": "C", "score": 3, "target": 120.0}]]
+        _write(tmp_path / "out.parquet", "parquet", batches)
+        table = pq.read_table(tmp_path / "out.parquet")
+        assert table.column_names == ["symbol", "score", "sector", "target"]
+        assert table.column("score").to_pylist() == [1.0, 2.5, 3.0]
+        assert table.column("target").to_pylist() == [None, "n/a", "120.0"]
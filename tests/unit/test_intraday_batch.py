@@ -0,0 +1,97 @@
+"""
+Unit tests for the vectorized intraday batch scan
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from algorithms.strategies.intraday_orchestrator import IntradayOrchestrator
+
+EVENTS = (None, "gap_up", "gap_down", "breakout", "breakdown")
+COMPARED = ("strategy", "signal_type", "reason", "entry_price", "target_price", "stop_loss",
+            "position_size", "risk_reward_ratio", "priority", "all_signals")
+
+
+def _bars(n, seed, event=None):
+    """Random 5m bars, with a gap or a momentum bar near the end for ``event``"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2025-01-06 09:15", periods=n, freq="5min")
+    close = np.round(100 + np.cumsum(rng.normal(0, 0.35, n)), 1)
+    open_ = np.r_[close[0], close[:-1]] + rng.normal(0, 0.1, n)
+    high = np.maximum(open_, close) + rng.uniform(0, 0.4, n)
+    low = np.minimum(open_, close) - rng.uniform(0, 0.4, n)
+    volume = rng.integers(150000, 400000, n).astype(float)
+
+    if event in ("gap_up", "gap_down"):
+        sign, k = (1 if event == "gap_up" else -1), n - 3
+        open_[k] = close[k - 1] * (1 + sign * 0.03)
+        close[k] = open_[k] * (1 + sign * 0.006)
+        volume[k] *= 4
+        for j in range(k + 1, n):
+            open_[j], close[j] = close[j - 1], close[j - 1] + sign * 0.05
+        high[k:] = np.maximum(open_[k:], close[k:]) + 0.05
+        low[k:] = np.minimum(open_[k:], close[k:]) - 0.05
+    elif event in ("breakout", "breakdown"):
+        sign, j = (1 if event == "breakout" else -1), n - 1
+        level = high[j - 20:j].max() if sign > 0 else low[j - 20:j].min()
+        open_[j], close[j] = close[j - 1], level * (1 + sign * 0.01)
+        high[j], low[j] = max(open_[j], close[j]) + 0.5, min(open_[j], close[j]) - 0.5
+        volume[j] *= 4
+
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+                        index=index)
+
+
+@pytest.fixture
+def stock_data():
+    """Symbols of mixed lengths, with NaN gaps and too-short histories"""
+    data = {f"S{i}.NS": _bars(80 + (i % 3) * 30, i, EVENTS[i % len(EVENTS)]) for i in range(20)}
+    data["NAN.NS"] = _bars(110, 99, "gap_up")
+    data["NAN.NS"].iloc[[30, 31, 60], :] = np.nan
+    data["HOLE.NS"] = _bars(90, 98, "breakout")
+    data["HOLE.NS"].iloc[-30:-20, data["HOLE.NS"].columns.get_loc("Volume")] = np.nan
+    data["SHORT.NS"] = _bars(40, 97, "gap_down")
+    data["EDGE.NS"] = _bars(50, 96, "gap_up")
+    return data
+
+
+def _orchestrator():
+    orchestrator = IntradayOrchestrator(max_positions=100, min_volume=100000)
+    orchestrator.is_trading_time = lambda timestamp=None: True
+    return orchestrator
+
+
+class TestBatchParity:
+    """Test the batch scan returns what the per-symbol scan returns"""
+
+    def test_same_signals_as_per_symbol_scan(self, stock_data):
+        """Test every symbol gets the same signal from both scans"""
+        symbols = list(stock_data) + ["MISSING.NS"]
+        per_symbol = _orchestrator().scan_multiple_symbols(stock_data, symbols)
+        batch = _orchestrator().scan_multiple_symbols_batch(stock_data, symbols)
+
+        per_symbol = {result["symbol"]: result for result in per_symbol}
+        batch = {result["symbol"]: result for result in batch}
+        assert set(batch) == set(per_symbol)
+        assert {result["strategy"] for result in batch.values()} >= {"gap_trading", "support_resistance"}
+        assert "SHORT.NS" not in batch
+
+        for symbol, expected in per_symbol.items():
+            for field in COMPARED:
+                assert batch[symbol][field] == pytest.approx(expected[field]), (symbol, field)
+
+    def test_same_ranking_with_position_limit(self, stock_data):
+        """Test the global top-k picks the same opportunities in the same order"""
+        per_symbol = _orchestrator()
+        per_symbol.max_positions = 5
+        batch = _orchestrator()
+        batch.max_positions = 5
+
+        expected = per_symbol.scan_multiple_symbols(stock_data, list(stock_data))
+        result = batch.scan_multiple_symbols_batch(stock_data, list(stock_data))
+        assert [r["symbol"] for r in result] == [r["symbol"] for r in expected]
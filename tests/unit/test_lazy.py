@@ -0,0 +1,72 @@
+"""
+Unit tests for lazy imports and deferred singletons
+"""
+
+import sys
+import threading
+import types
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils.lazy import LazyModule, LazySingleton, lazy_import, warm
+
+
+class TestLazy:
+    """Test module proxies, singletons and warm-up"""
+
+    def test_module_imports_on_first_use(self, monkeypatch):
+        """Test the proxy imports on access and sees patches on the real module"""
+        fake = types.ModuleType("fake_heavy_lib")
+        fake.download = lambda: "real"
+        proxy = lazy_import("fake_heavy_lib_not_imported")
+        assert isinstance(proxy, LazyModule) and not proxy.loaded
+
+        monkeypatch.setitem(sys.modules, "fake_heavy_lib_not_imported", fake)
+        assert proxy.download() == "real"
+        assert proxy.loaded
+
+        monkeypatch.setattr(fake, "download", lambda: "patched")
+        assert proxy.download() == "patched"
+
+        # Already-imported modules come back as themselves
+        assert lazy_import("json") is sys.modules["json"]
+
+    def test_singleton_builds_once(self):
+        """Test concurrent first use builds one instance and attributes forward"""
+        built = []
+        barrier = threading.Barrier(8)
+
+        class Client:
+            def __init__(self):
+                built.append(self)
+                self.collection = "history"
+
+        singleton = LazySingleton(Client, "client")
+        assert not singleton.initialized
+
+        def use():
+            barrier.wait()
+            assert singleton.collection == "history"
+
+        threads = [threading.Thread(target=use) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(built) == 1 and singleton.get() is built[0]
+
+        singleton.collection = "cache"
+        assert built[0].collection == "cache"
+        singleton.reset()
+        assert singleton.get() is not built[0]
+
+    def test_warm(self):
+        """Test warm builds singletons and skips failures"""
+        good = LazySingleton(dict, "good")
+
+        def broken():
+            raise RuntimeError("no mongo")
+
+        timings = warm(good, LazySingleton(broken, "broken"), "not lazy")
+        assert list(timings) == ["good"]
+        assert good.initialized
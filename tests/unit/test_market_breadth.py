@@ -0,0 +1,161 @@
+"""
+Unit tests for the market breadth engine
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api.models.stock_models import LiveDataUpdate
+from api.services.market_breadth import (
+    WINDOW_BARS,
+    MarketBreadthEngine,
+    compute_indicators,
+    latest_bars,
+    load_universe,
+)
+
+SYMBOLS = ["AAA.NS", "BBB.NS", "CCC.NS", "DDD.NS"]
+
+
+def _bars(slope, bars=80, volume_spike=False):
+    index = pd.bdate_range("2025-01-01", periods=bars)
+    t = np.arange(bars)
+    close = 100 + slope * t + 2 * np.sin(t / 3)
+    volume = np.full(bars, 1e5)
+    if volume_spike:
+        volume[-1] = 5e5
+    return pd.DataFrame({"Open": close - 0.5, "High": close + 1, "Low": close - 1,
+                         "Close": close, "Volume": volume}, index=index)
+
+
+class _BarStore:
+    def __init__(self, frames):
+        self.frames = frames
+
+    def get_period(self, symbol, period, interval):
+        return self.frames.get(symbol, pd.DataFrame())
+
+
+def _engine(frames):
+    engine = MarketBreadthEngine(bar_store=_BarStore(frames), max_workers=2)
+    engine.load(list(frames))
+    return engine
+
+
+def _quote(symbol, price, volume, when):
+    return LiveDataUpdate(symbol=symbol, price=price, change=0.0, change_percent=0.0,
+                          volume=volume, timestamp=when)
+
+
+class TestCompute:
+    """Test the vectorized indicators and the breadth summary"""
+
+    def test_indicators_match_rolling(self):
+        """Test SMA, RSI and volume SMA agree with pandas rolling windows"""
+        frames = {symbol: _bars(slope) for symbol, slope in zip(SYMBOLS, (0.5, -0.3, 0.1, 0.0))}
+        engine = _engine(frames)
+        ind = compute_indicators(engine.panels)
+
+        for i, symbol in enumerate(SYMBOLS):
+            close = frames[symbol]["Close"]
+            delta = close.diff()
+            gain = delta.where(delta > 0, 0.0).rolling(14).mean().iloc[-1]
+            loss = (-delta.where(delta < 0, 0.0)).rolling(14).mean().iloc[-1]
+            assert ind["sma_20"][i] == pytest.approx(close.rolling(20).mean().iloc[-1])
+            assert ind["sma_50"][i] == pytest.approx(close.rolling(50).mean().iloc[-1])
+            assert ind["rsi"][i] == pytest.approx(100 - 100 / (1 + gain / loss))
+            assert ind["volume_sma"][i] == pytest.approx(1e5)
+
+    def test_breadth_summary(self):
+        """Test advancers, decliners and high-volume share over the universe"""
+        frames = {
+            "AAA.NS": _bars(1.0, volume_spike=True),
+            "BBB.NS": _bars(1.0),
+            "CCC.NS": _bars(-1.0),
+            "DDD.NS": _bars(1.0),
+        }
+        snapshot = _engine(frames).compute()
+        changes = [frame["Close"].iloc[-1] - frame["Close"].iloc[-2] for frame in frames.values()]
+
+        assert snapshot.symbols_analyzed == 4
+        assert snapshot.breadth["advancers"] == sum(change > 0 for change in changes)
+        assert snapshot.breadth["decliners"] == sum(change < 0 for change in changes)
+        assert snapshot.breadth["pct_high_volume"] == 25.0
+
+    def test_short_history_symbols_have_no_long_indicators(self):
+        """Test symbols without 50 bars get no SMA 50 instead of a partial mean"""
+        engine = _engine({"AAA.NS": _bars(0.5), "BBB.NS": _bars(0.5, bars=30)})
+        ind = compute_indicators(latest_bars(engine.panels))
+        assert not np.isnan(ind["sma_50"][0])
+        assert np.isnan(ind["sma_50"][1]) and not np.isnan(ind["sma_20"][1])
+
+
+class TestLiveUpdates:
+    """Test quotes folded into the forming bar"""
+
+    def test_quotes_build_the_forming_bar(self):
+        """Test the first quote opens a bar and later quotes move high, low and close"""
+        engine = _engine({symbol: _bars(0.5) for symbol in SYMBOLS})
+        last = engine.panels["Close"].index[-1]
+        new_day = (last + pd.offsets.BDay(1)).to_pydatetime().replace(hour=10)
+
+        assert engine.on_live_update(_quote("AAA.NS", 200.0, 1000, new_day))
+        assert engine.on_live_update(_quote("AAA.NS", 205.0, 3000, new_day))
+        assert engine.on_live_update(_quote("AAA.NS", 198.0, 4000, new_day))
+        assert not engine.on_live_update(_quote("ZZZ.NS", 10.0, 1, new_day))
+
+        row = {field: engine.panels[field]["AAA.NS"].iloc[-1] for field in engine.panels}
+        assert row == {"Open": 200.0, "High": 205.0, "Low": 198.0, "Close": 198.0, "Volume": 4000.0}
+        assert engine.panels["Close"]["BBB.NS"].isna().iloc[-1]
+        assert all(len(frame) == min(WINDOW_BARS, 81) for frame in engine.panels.values())
+
+    def test_unquoted_symbols_keep_their_last_bar(self):
+        """Test one quote on a new bar does not collapse the other symbols' breadth"""
+        frames = {symbol: _bars(1.0, volume_spike=(symbol == "BBB.NS")) for symbol in SYMBOLS}
+        engine = _engine(frames)
+        before = engine.compute()
+        assert before.breadth["advancers"] == 4
+
+        last = engine.panels["Close"].index[-1]
+        new_day = (last + pd.offsets.BDay(1)).to_pydatetime().replace(hour=10)
+        price = frames["AAA.NS"]["Close"].iloc[-1] + 1
+        engine.on_live_update(_quote("AAA.NS", price, 50000, new_day))
+        after = engine.compute()
+
+        assert after.symbols_analyzed == 4
+        assert after.breadth["advancers"] == 4 and after.breadth["decliners"] == 0
+        assert after.breadth["pct_high_volume"] == before.breadth["pct_high_volume"] == 25.0
+        assert after.breadth["pct_above_sma20"] == before.breadth["pct_above_sma20"]
+
+    def test_daily_quotes_share_one_bar(self):
+        """Test quotes on the same day update one daily bar"""
+        engine = _engine({symbol: _bars(0.5) for symbol in SYMBOLS})
+        rows = len(engine.panels["Close"])
+        last = engine.panels["Close"].index[-1]
+        new_day = (last + pd.offsets.BDay(1)).to_pydatetime()
+        engine.on_live_update(_quote("AAA.NS", 150.0, 10, new_day.replace(hour=10)))
+        engine.on_live_update(_quote("BBB.NS", 150.0, 10, new_day.replace(hour=14)))
+        assert len(engine.panels["Close"]) == rows + 1
+        assert engine.panels["Close"].iloc[-1].notna().sum() == 2
+
+
+class TestUniverse:
+    """Test the constituent list is read from the local copy"""
+
+    def test_reads_local_list(self, tmp_path):
+        """Test a fresh local list is used without downloading"""
+        path = tmp_path / "nifty500.csv"
+        path.write_text("Company Name,Industry,Symbol,Series,ISIN Code\n"
+                        "Tata Consultancy,IT,TCS,EQ,INE467B01029\nInfosys,IT,INFY,EQ,INE009A01021\n")
+        assert load_universe(path=path, url="http://127.0.0.1:9/unreachable") == ["TCS.NS", "INFY.NS"]
+
+    def test_missing_list_is_empty(self, tmp_path):
+        """Test an unreachable list with no local copy gives an empty universe"""
+        assert load_universe(path=tmp_path / "none.csv", url="http://127.0.0.1:9/unreachable") == []
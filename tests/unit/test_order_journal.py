@@ -0,0 +1,141 @@
+"""
+Unit tests for the order event journal
+"""
+
+import asyncio
+from decimal import Decimal
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from order.journal import OrderJournal, to_state, from_state
+from order.models import Order, OrderRequest, OrderSide, OrderStatus, OrderType, Trade
+from order.order_manager import OrderManager
+from order.position_manager import PositionManager
+from order.risk_manager import RiskManager
+
+
+class _Notifications:
+    """Collects the notifications the OrderManager sends"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_order_notification(self, order, event, data=None):
+        self.sent.append(event)
+
+    async def send_trade_notification(self, trade):
+        self.sent.append("TRADE")
+
+
+def _manager(directory):
+    position_manager = PositionManager()
+    return OrderManager(
+        execution_engine=None,
+        position_manager=position_manager,
+        risk_manager=RiskManager(position_manager=position_manager),
+        notification_service=_Notifications(),
+        journal=OrderJournal(directory, fsync=False)
+    )
+
+
+def _order(symbol):
+    return Order.from_request(OrderRequest(
+        symbol=symbol, side=OrderSide.BUY, order_type=OrderType.LIMIT,
+        quantity=10, price=Decimal("100.5"), strategy_id="swing"
+    ))
+
+
+def _fill(manager, order, price):
+    return manager.process_trade(Trade(
+        trade_id=f"T-{order.order_id}", order_id=order.order_id, symbol=order.symbol,
+        side=order.side, quantity=order.quantity, price=Decimal(price)
+    ))
+
+
+class TestOrderJournal:
+    """Test journaling, snapshots and tail replay"""
+
+    def test_state_round_trip(self):
+        """Test enums, decimals and datetimes survive encoding"""
+        order = _order("TCS")
+        order.tags = {"source": "test"}
+        assert from_state(Order, to_state(order)) == order
+
+    def test_recover_snapshot_and_tail(self, tmp_path):
+        """Test a restart restores orders, positions and exposure from snapshot + tail"""
+        async def run():
+            manager = _manager(tmp_path)
+            manager.journal.start()
+            first, second = _order("TCS"), _order("INFY")
+
+            await manager._store_order(first)
+            await _fill(manager, first, "101")
+            manager.journal.snapshot(manager.snapshot_state())
+
+            # Tail after the snapshot
+            await manager._store_order(second)
+            await _fill(manager, second, "50")
+            assert manager.journal.flush(timeout=5)
+            manager.journal.close()
+            return manager
+
+        before = asyncio.run(run())
+
+        after = _manager(tmp_path)
+        assert after.recover() == 3  # Second order, its trade and the fill update
+
+        assert after.orders.keys() == before.orders.keys()
+        for order_id, order in before.orders.items():
+            assert after.orders[order_id].status == OrderStatus.FILLED
+            assert after.orders[order_id].average_fill_price == order.average_fill_price
+        assert after.orders_by_strategy["swing"] == set(before.orders)
+        assert after.position_manager.positions["INFY"].quantity == 10
+        assert after.position_manager.positions["TCS"].average_price == Decimal("101")
+        assert after.risk_manager.symbol_exposure == before.risk_manager.symbol_exposure
+        assert after.journal.seq == before.journal.seq
+
+    def test_failed_write_is_retried(self, tmp_path, monkeypatch):
+        """Test a failed write is not reported durable and is retried on a fresh segment"""
+        monkeypatch.setattr("order.journal.ORDER_JOURNAL_RETRY_SECONDS", 0.05)
+        journal = OrderJournal(tmp_path, fsync=False, linger_ms=0)
+        journal.start()
+        journal.record("order", {"n": 1})
+        assert journal.flush(timeout=5)
+
+        class _Torn:
+            """Writes half a line, then fails"""
+            def __init__(self, real):
+                self.real = real
+
+            def write(self, text):
+                self.real.write(text[:len(text) // 2])
+                self.real.flush()
+                raise OSError("disk full")
+
+            def close(self):
+                self.real.close()
+
+        journal._segment = _Torn(journal._segment)
+        journal.record("order", {"n": 2})
+        journal.record("order", {"n": 3})
+        assert not journal.flush(timeout=0.02)
+        assert journal.flush(timeout=5)  # Retried on a new segment
+        journal.record("order", {"n": 4})
+        assert journal.flush(timeout=5)
+        journal.close()
+        assert journal.write_errors == 1
+
+        _, events = OrderJournal(tmp_path).load()
+        assert [event["data"]["n"] for event in events] == [1, 2, 3, 4]
+
+    def test_event_copy_is_isolated(self):
+        """Test queued order events don't see later tag changes"""
+        journal = OrderJournal(Path("unused"))
+        order = _order("TCS")
+        order.tags = {"source": "test"}
+        journal.record_order(order)
+        order.tags["source"] = "changed"
+        _, _, queued = journal._queue.get_nowait()
+        assert queued.tags == {"source": "test"}
@@ -0,0 +1,53 @@
+"""
+Unit tests for the order write-behind batcher
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from domains.orders.repositories import OrderWriteBehind
+
+
+class _Repo:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.updates = []
+        self.inserts = []
+
+    def update_many(self, changes):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("db down")
+        self.updates.append(dict(changes))
+
+    def insert_many(self, rows):
+        self.inserts.extend(rows)
+
+
+class TestOrderWriteBehind:
+    """Test retry on failure and the final flush"""
+
+    def test_failed_flush_is_requeued(self):
+        """Test a failed batch merges back under newer changes and is written on close"""
+        orders, trades = _Repo(failures=1), _Repo()
+        writer = OrderWriteBehind(orders, trades, interval=60)
+        writer.close()  # No background flushes - drive them by hand
+
+        writer.update_order(1, {"status": "SUBMITTED", "broker_order_id": "B1"})
+        writer.insert_trade("T1")
+        assert not writer.flush()
+        writer.update_order(1, {"status": "FILLED"})
+        assert writer.flush()
+
+        assert orders.updates == [{1: {"status": "FILLED", "broker_order_id": "B1"}}]
+        assert trades.inserts == ["T1"]
+
+    def test_close_flushes(self):
+        """Test close writes what the thread has not picked up yet"""
+        orders, trades = _Repo(), _Repo()
+        writer = OrderWriteBehind(orders, trades, interval=60)
+        writer.insert_trade("T1")
+        writer.insert_trade("T2")
+        writer.close()
+        assert trades.inserts == ["T1", "T2"]
@@ -0,0 +1,95 @@
+"""
+Unit tests for the vectorized recommendation outcome evaluator
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api.services.outcome_evaluator import OutcomeEvaluator, evaluate_outcomes
+
+HORIZONS = {"1d": 1, "1w": 5}
+
+
+def _bars(closes, highs=None, lows=None, start="2025-01-01"):
+    index = pd.date_range(start, periods=len(closes), freq="D", tz="Asia/Kolkata")
+    closes = np.asarray(closes, dtype=float)
+    return pd.DataFrame({
+        "Open": closes,
+        "High": closes if highs is None else highs,
+        "Low": closes if lows is None else lows,
+        "Close": closes,
+        "Volume": 1000.0,
+    }, index=index)
+
+
+def _trackers(rows):
+    frame = pd.DataFrame(rows, columns=["recommended_at", "recommended_price", "target_price",
+                                        "stop_loss", "recommendation_action"])
+    frame.insert(0, "_id", range(len(frame)))
+    frame["batch_id"] = "b1"
+    frame["symbol"] = "TCS"
+    return frame
+
+
+class TestOutcomeEvaluator:
+    """Test outcome evaluation over synthetic price paths"""
+
+    def test_target_stop_and_expiry(self):
+        """Test target, stop (stop wins a shared bar), short side and expiry"""
+        bars = _bars([100, 104, 111, 95, 100, 102, 103],
+                     highs=[100, 105, 112, 101, 100, 102, 103],
+                     lows=[100, 99, 103, 89, 100, 102, 103])
+        rec_at = datetime(2025, 1, 1, 10, 0)
+        trackers = _trackers([
+            (rec_at, 100.0, 110.0, 90.0, "buy"),     # target on day 3
+            (rec_at, 100.0, 112.0, 99.0, "buy"),     # stop and nothing else on day 2
+            (rec_at, 100.0, 104.0, 99.5, "buy"),     # both on day 2 -> stop
+            (rec_at, 100.0, 90.0, 115.0, "sell"),    # short: target (low 89) on day 4
+            (rec_at, 100.0, None, None, "buy"),      # no levels -> expires after 5 bars
+        ])
+
+        result = evaluate_outcomes({"TCS": bars}, trackers, HORIZONS)
+
+        assert list(result["outcome"]) == ["target_hit", "stop_loss", "stop_loss", "target_hit", "expired"]
+        assert result["final_return"].tolist()[:4] == pytest.approx([10.0, -1.0, -0.5, 10.0])
+        # Window starts the bar after the recommendation
+        assert result.loc[4, "return_1d"] == pytest.approx(4.0)
+        assert result.loc[4, "return_1w"] == pytest.approx(2.0)
+        assert result.loc[3, "return_1d"] == pytest.approx(-4.0)
+        # Excursions stop at the outcome bar
+        assert result.loc[0, "max_favorable_excursion"] == pytest.approx(12.0)
+        assert result.loc[0, "max_adverse_excursion"] == pytest.approx(-1.0)
+        assert result.loc[4, "max_adverse_excursion"] == pytest.approx(-11.0)
+        assert result.loc[0, "outcome_date"] == pd.Timestamp("2025-01-03", tz="Asia/Kolkata")
+        assert (result["bars_seen"] == 5).all()
+
+    def test_open_and_unpriced_trackers(self):
+        """Test partial windows stay open and unusable rows are skipped"""
+        bars = _bars([100, 101, 102])
+        trackers = _trackers([
+            (datetime(2025, 1, 1, 10), 100.0, 150.0, 50.0, "buy"),
+            (datetime(2025, 1, 1, 10), 0.0, None, None, "buy"),
+            (datetime(2025, 2, 1, 10), 100.0, None, None, "buy"),
+        ])
+
+        result = evaluate_outcomes({"TCS": bars}, trackers, HORIZONS)
+        assert result.loc[0, "outcome"] is None
+        assert np.isnan(result.loc[0, "return_1w"])
+        assert result.loc[0, "current_return"] == pytest.approx(2.0)
+        assert result["bars_seen"].tolist() == [2, 0, 0]
+
+        evaluator = OutcomeEvaluator(storage=object(), bar_store=object(), horizons=HORIZONS)
+        tracker_ops, recommendation_ops = evaluator.build_updates(trackers, result)
+        assert len(tracker_ops) == len(recommendation_ops) == 1
+        update = tracker_ops[0]._doc["$set"]
+        assert update["tracking_periods.1d"] == pytest.approx(1.0)
+        assert "tracking_periods.1w" not in update and "status" not in update
+        assert recommendation_ops[0]._filter == {"batch_id": "b1", "symbol": "TCS"}
+        assert "outcome_notes" not in recommendation_ops[0]._doc["$set"]
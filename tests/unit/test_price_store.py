@@ -0,0 +1,239 @@
+"""
+Unit tests for the market data price store
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.market_data import price_store
+from services.market_data.price_store import (
+    PriceStore,
+    parse_columnar,
+    parse_csv,
+    parse_ndjson,
+    parse_records,
+    source_tier,
+)
+
+
+BAR = {"symbol": "TCS", "timestamp": "2024-01-02T09:15:00", "open": 10, "high": 12,
+       "low": 9, "close": 11, "volume": 1000}
+ROW = ("TCS", "2024-01-02 09:15:00", 10.0, 12.0, 9.0, 11.0, 1000)
+
+
+class _Cursor:
+    def __init__(self, session):
+        self.session = session
+
+    def copy_expert(self, sql, buffer):
+        self.session.copied.append(buffer.getvalue())
+
+    def close(self):
+        pass
+
+
+class _Session:
+    """Records the SQL a PriceStore sends, in place of a Postgres session"""
+
+    def __init__(self):
+        self.statements = []
+        self.copied = []
+        self.commits = 0
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        return type("Result", (), {"rowcount": 1})()
+
+    def connection(self):
+        return type("Connection", (), {"connection": type("Raw", (), {"cursor": lambda _: _Cursor(self)})()})()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+class _TableSession(_Session):
+    """Keeps bar timestamps per table and the rollup watermark in memory"""
+
+    def __init__(self, bars, watermark=None):
+        super().__init__()
+        self.bars = bars
+        self.watermark = watermark
+        self.params = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        self.params.append(params)
+        scalar, rowcount = None, 0
+        if "SELECT rolled_up_through" in sql:
+            scalar = self.watermark
+        elif "SELECT min(timestamp)" in sql:
+            scalar = min(self.bars["market_data.price_data"], default=None)
+        elif "INTO market_data.price_rollup_state" in sql:
+            self.watermark = params["through"]
+        elif sql.startswith("DELETE FROM"):
+            table = sql.split()[2]
+            kept = [ts for ts in self.bars[table] if ts >= params["cutoff"]]
+            rowcount = len(self.bars[table]) - len(kept)
+            self.bars[table] = kept
+        return type("Result", (), {"rowcount": rowcount, "scalar": lambda _: scalar})()
+
+
+def _minute_bars(start, days):
+    return [start + timedelta(hours=h) for h in range(0, days * 24, 6)]
+
+
+class _RecordingStore(PriceStore):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+        self.threads = set()
+
+    def upsert_batch(self, db, rows):
+        self.batches.append(rows)
+        self.threads.add(threading.current_thread())
+        return len(rows)
+
+    def maybe_apply_retention(self, db):
+        return None
+
+
+async def _lines(lines):
+    for line in lines:
+        yield line
+
+
+class TestParsing:
+    """Test every write path normalizes bars the same way"""
+
+    def test_formats_agree(self):
+        """Test NDJSON, CSV, columnar and decoded records give the same rows"""
+        ndjson = [b'{"symbol": "TCS", "timestamp": "2024-01-02T09:15:00", "open": 10, '
+                  b'"high": 12, "low": 9, "close": 11, "volume": 1000}']
+        csv_lines = [b"symbol,timestamp,open,high,low,close,volume",
+                     b"TCS,2024-01-02T09:15:00,10,12,9,11,1000"]
+        columnar = {"symbol": "TCS", **{field: [value] for field, value in BAR.items() if field != "symbol"}}
+
+        assert list(parse_ndjson(ndjson)) == [ROW]
+        assert list(parse_csv(csv_lines)) == [ROW]
+        assert list(parse_columnar(columnar)) == [ROW]
+        assert list(parse_records([BAR])) == [ROW]
+
+    def test_records_are_validated(self):
+        """Test aware timestamps become naive UTC and negative values are rejected"""
+        aware = dict(BAR, timestamp=datetime(2024, 1, 2, 14, 45, tzinfo=timezone.utc).astimezone())
+        assert list(parse_records([aware]))[0][1] == "2024-01-02 14:45:00"
+        with pytest.raises(ValueError):
+            list(parse_records([dict(BAR, low=-1)]))
+
+    def test_source_tier(self):
+        """Test reads use the coarsest tier dividing the interval"""
+        assert source_tier("1m") == ("market_data.price_data", 60)
+        assert source_tier("15m") == ("market_data.price_data_5m", 300)
+        assert source_tier("1w") == ("market_data.price_data_1d", 86400)
+        with pytest.raises(ValueError):
+            source_tier("7m")
+
+
+class TestIngest:
+    """Test batching, ordering and the rollup refresh"""
+
+    def test_last_staged_row_wins(self):
+        """Test repeated bars are resolved by COPY order, not an unordered row_number()"""
+        session = _Session()
+        rows = [ROW, ROW[:5] + (12.0, 2000)]
+        PriceStore().upsert_batch(session, rows)
+
+        staging, upsert = session.statements[0], session.statements[1]
+        assert "seq BIGSERIAL" in staging
+        assert "OVER ()" not in upsert
+        assert "ORDER BY symbol, timestamp, seq DESC" in upsert
+        assert session.copied[0].splitlines()[-1].endswith("12.0,2000")
+        # Both rollup tiers are refreshed in the same transaction
+        assert sum("INTO market_data.price_data_5m " in sql for sql in session.statements) == 1
+        assert sum("INTO market_data.price_data_1d " in sql for sql in session.statements) == 1
+        assert session.commits == 1
+
+    def test_stream_batches_off_the_event_loop(self):
+        """Test streamed CSV is upserted batch by batch on a worker thread"""
+        store = _RecordingStore()
+        lines = [b"symbol,timestamp,open,high,low,close,volume"] + [
+            f"TCS,2024-01-02T09:{15 + i}:00,10,12,9,11,{i}".encode() for i in range(5)
+        ]
+        summary = asyncio.run(store.ingest_stream(None, _lines(lines), fmt="csv", batch_size=2))
+
+        assert summary["rows"] == 5
+        assert [len(batch) for batch in store.batches] == [2, 2, 1]
+        assert [row[-1] for batch in store.batches for row in batch] == [0, 1, 2, 3, 4]
+        assert threading.main_thread() not in store.threads
+
+
+class TestRetention:
+    """Test pruning never outruns the rollups"""
+
+    NOW = datetime(2025, 6, 1)
+
+    def _session(self, watermark=None):
+        start = self.NOW - timedelta(days=90)
+        return _TableSession({
+            "market_data.price_data": _minute_bars(start, 90),
+            "market_data.price_data_5m": _minute_bars(start, 90),
+        }, watermark)
+
+    def test_off_by_default(self):
+        """Test the default configuration deletes nothing"""
+        session = self._session(watermark=self.NOW)
+        assert PriceStore().apply_retention(session, now=self.NOW) == {}
+        assert not any(sql.startswith("DELETE") for sql in session.statements)
+
+    def test_never_prunes_bars_not_rolled_up(self, monkeypatch):
+        """Test nothing is pruned before a backfill, and never past its watermark"""
+        monkeypatch.setattr(price_store, "TIERS", (
+            ("1m", "market_data.price_data", 30),
+            ("5m", "market_data.price_data_5m", 60),
+            ("1d", "market_data.price_data_1d", 0),
+        ))
+        session = self._session()
+        before = list(session.bars["market_data.price_data"])
+        assert PriceStore().apply_retention(session, now=self.NOW) == {}
+        assert session.bars["market_data.price_data"] == before
+
+        watermark = self.NOW - timedelta(days=75)
+        session.watermark = watermark
+        deleted = PriceStore().apply_retention(session, now=self.NOW)
+        assert deleted["1m"] > 0 and deleted["5m"] > 0
+        for table in ("market_data.price_data", "market_data.price_data_5m"):
+            remaining = session.bars[table]
+            assert min(remaining) >= watermark
+            assert [ts for ts in before if ts >= watermark] == remaining
+
+    def test_backfill_walks_history_and_resumes(self):
+        """Test the backfill rolls up day-aligned chunks and records its watermark"""
+        session = _TableSession({"market_data.price_data": [datetime(2025, 5, 20, 9, 15)]})
+        now = datetime(2025, 6, 1, 12)
+        assert PriceStore().backfill_rollups(session, chunk_days=5, now=now) == now
+
+        ranges = [(p["start"], p["end"]) for sql, p in zip(session.statements, session.params)
+                  if "INTO market_data.price_data_5m" in sql]
+        assert ranges == [(datetime(2025, 5, 20), datetime(2025, 5, 25)),
+                          (datetime(2025, 5, 25), datetime(2025, 5, 30)),
+                          (datetime(2025, 5, 30), now)]
+        assert session.watermark == now and session.commits == 3
+
+        # A re-run starts from the watermark
+        later = now + timedelta(hours=1)
+        session.statements.clear()
+        session.params.clear()
+        PriceStore().backfill_rollups(session, chunk_days=5, now=later)
+        assert [p["start"] for sql, p in zip(session.statements, session.params)
+                if "INTO market_data.price_data_1d" in sql] == [now]
@@ -0,0 +1,41 @@
+"""
+Unit tests for order risk checks
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from order.models import OrderRequest, OrderSide, OrderType, Trade
+from order.risk_manager import RiskManager
+
+
+def _limit_order(quantity, price):
+    return OrderRequest(symbol="TCS", side=OrderSide.BUY, order_type=OrderType.LIMIT,
+                        quantity=quantity, price=Decimal(price))
+
+
+class TestDailyLimits:
+    """Test the daily volume checks on priced orders"""
+
+    def test_priced_order_within_limits(self):
+        """Test a priced order under the daily volume limit is approved without warnings"""
+        result = RiskManager()._check_daily_limits(_limit_order(10, "100.5"))
+        assert result.approved
+        assert result.warnings == []
+
+    def test_volume_warning_and_limit(self):
+        """Test orders near the daily volume limit warn and orders over it are rejected"""
+        manager = RiskManager()
+        near = manager._check_daily_limits(_limit_order(1700, "100"))
+        assert near.approved
+        assert near.warnings == ["High daily volume: 170000"]
+
+        manager.daily_trades.append(Trade(trade_id="t1", order_id="o1", symbol="TCS", side=OrderSide.BUY,
+                                          quantity=1500, price=Decimal("100"), timestamp=datetime.now()))
+        over = manager._check_daily_limits(_limit_order(600, "100"))
+        assert not over.approved
+        assert "Daily volume limit" in over.reason
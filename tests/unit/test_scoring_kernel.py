@@ -0,0 +1,100 @@
+"""
+Unit tests for the seed algorithm scoring kernel
+"""
+
+import numpy as np
+import pandas as pd
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from alg_discovery.recommendation.seed_algorithms.intraday.momentum_intraday_v1 import MomentumIntradayV1
+from alg_discovery.recommendation.seed_algorithms.intraday.volume_surge_intraday_v1 import VolumeSurgeIntradayV1
+from alg_discovery.recommendation.seed_algorithms.utils.scoring_kernel import (
+    Cond,
+    Const,
+    Linear,
+    ScoringTable,
+    Step,
+    When,
+    score_side_by_side,
+)
+
+
+class TestScoringKernel:
+    """Test compiled scoring tables"""
+
+    def test_step_bands(self):
+        """Test threshold bands and closed sides"""
+        cols = {'x': np.array([-4.0, -3.0, 0.0, 1.0, 2.5])}
+        at_least = Step('x', [0.0, 1.0], [10.0, 20.0, 30.0]).compile()
+        above = Step('x', [-3.0], [40.0, 30.0], closed='right').compile()
+        assert at_least(cols).tolist() == [10.0, 10.0, 20.0, 30.0, 30.0]
+        assert above(cols).tolist() == [40.0, 40.0, 30.0, 30.0, 30.0]
+
+    def test_table_defaults_guard_and_weights(self):
+        """Test input defaults, derived columns, guard and weighted sum"""
+        table = ScoringTable(
+            inputs={'volume': 0.0, 'avg_volume': 'volume'},
+            derived={'ratio': lambda c: c['volume'] / c['avg_volume']},
+            components=[
+                ('ratio', 0.5, Linear('ratio', [1.0, 3.0], [0.0, 100.0])),
+                ('flat', 0.5, When(Cond('ratio', '>', 1.0), Const(100.0), Const(0.0))),
+            ],
+            guard=Cond('volume', '<=', 0),
+        ).compile()
+
+        scores = table.score([
+            {'volume': 200.0, 'avg_volume': 100.0},
+            {'volume': 300.0},
+            {'volume': 0.0, 'avg_volume': 10.0},
+            {'volume': 'n/a'},
+        ])
+        assert scores.tolist() == [75.0, 0.0, 0.0, 0.0]
+
+    def test_momentum_scores(self):
+        """Test the momentum table against hand-computed scores"""
+        algorithm = MomentumIntradayV1()
+        stocks = [
+            # momentum 70, volume 85, persistence 90, rsi 70
+            {'close': 109.0, 'high': 110.0, 'low': 100.0, 'volume': 2e6, 'avg_volume': 1e6, 'per_chg': 2.0},
+            # avg_volume defaults to volume; flat range: 10, 40, 50, 40
+            {'close': 100.0, 'high': 100.0, 'low': 100.0, 'volume': 1e6, 'per_chg': -3.0},
+            {'close': 0.0, 'volume': 1e6, 'per_chg': 5.0},
+        ]
+        expected = [70 * 0.4 + 85 * 0.3 + 90 * 0.2 + 70 * 0.1, 10 * 0.4 + 40 * 0.3 + 50 * 0.2 + 40 * 0.1, 0.0]
+
+        assert np.allclose(algorithm.calculate_scores(stocks), expected)
+        assert np.allclose([algorithm.calculate_score(s) for s in stocks], expected)
+
+    def test_volume_surge_scores(self):
+        """Test the volume surge table against hand-computed scores"""
+        algorithm = VolumeSurgeIntradayV1()
+        stock = {'close': 109.0, 'high': 110.0, 'low': 100.0, 'volume': 6e6, 'avg_volume': 2e6,
+                 'per_chg': 2.5, 'market_cap': 109.0 * 1e8}
+        # surge 90, correlation 80, breakout 30+40+30, institutional 30+35+25
+        expected = 90 * 0.4 + 80 * 0.25 + 100 * 0.2 + 90 * 0.15
+        assert np.isclose(algorithm.calculate_score(stock), expected)
+
+        # No average volume: surge 0, correlation and breakout 50, institutional 50
+        assert np.isclose(algorithm.calculate_score({**stock, 'avg_volume': 0}), 50 * 0.25 + 50 * 0.2 + 50 * 0.15)
+
+    def test_side_by_side(self):
+        """Test several versions scoring the same candidates"""
+        candidates = pd.DataFrame([
+            {'symbol': 'AAA', 'close': 105.0, 'high': 106.0, 'low': 100.0, 'volume': 3e6, 'avg_volume': 1e6,
+             'per_chg': 4.0},
+            {'symbol': 'BBB', 'close': 101.0, 'high': 106.0, 'low': 100.0, 'volume': 1e6, 'avg_volume': 1e6,
+             'per_chg': 0.2},
+        ])
+        algorithms = [MomentumIntradayV1(), MomentumIntradayV1(momentum_weight=0.0), VolumeSurgeIntradayV1()]
+        result = score_side_by_side(algorithms, candidates)
+
+        assert list(result.index) == ['AAA', 'BBB']
+        assert list(result.columns) == ['momentum_intraday_v1@1.0', 'momentum_intraday_v1@1.0#1',
+                                        'volume_surge_intraday_v1@1.0']
+        assert (result.iloc[:, 0] > result.iloc[:, 1]).all()
+        ranked = algorithms[0].score_stocks(candidates)
+        assert ranked['symbol'].tolist() == ['AAA', 'BBB']
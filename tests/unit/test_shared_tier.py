@@ -0,0 +1,208 @@
+"""
+Unit tests for the shared worker tier (rate limiter and query cache)
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api.services.shared_tier import (
+    RELEASE_LOCK_SCRIPT,
+    RESERVE_SLOT_SCRIPT,
+    SharedQueryCache,
+    SharedRateLimiter,
+    SharedTier,
+)
+
+
+class FakeRedis:
+    """In-memory async Redis with the commands and scripts the tier uses.
+
+    ``eval`` runs Python mirrors of the tier's Lua scripts, one command at a
+    time, the way Redis runs a script atomically.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+
+    def _live(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self.data.pop(key, None)
+            return None
+        return value
+
+    async def get(self, key):
+        self.commands.append("get")
+        return self._live(key)
+
+    async def set(self, key, value, nx=False, px=None, ex=None):
+        self.commands.append("set")
+        if nx and self._live(key) is not None:
+            return None
+        ttl = px / 1000 if px else ex
+        self.data[key] = (str(value), time.monotonic() + ttl if ttl else None)
+        return True
+
+    async def exists(self, key):
+        self.commands.append("exists")
+        return int(self._live(key) is not None)
+
+    async def incr(self, key):
+        self.commands.append("incr")
+        value = int(self._live(key) or 0) + 1
+        self.data[key] = (str(value), None)
+        return value
+
+    async def eval(self, script, numkeys, *args):
+        self.commands.append("eval")
+        keys, argv = args[:numkeys], [str(arg) for arg in args[numkeys:]]
+        if script == RESERVE_SLOT_SCRIPT:
+            now, interval, jitter = (float(value) for value in argv)
+            slot = max(now, float(self._live(keys[0]) or 0) + interval)
+            if slot > now:
+                slot += jitter
+            self.data[keys[0]] = (str(slot), time.monotonic() + 3600)
+            return str(slot)
+        if script == RELEASE_LOCK_SCRIPT:
+            if self._live(keys[0]) == argv[0]:
+                self.data.pop(keys[0])
+                return 1
+            return 0
+        raise AssertionError("unexpected script")
+
+
+class DownRedis:
+    """Redis client whose every command fails like an unreachable server"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __getattr__(self, command):
+        async def fail(*args, **kwargs):
+            self.calls += 1
+            raise ConnectionError("Connection refused")
+        return fail
+
+
+def _tier(client):
+    tier = SharedTier(enabled=True)
+    tier._get_client = lambda: client
+    return tier
+
+
+class TestSharedRateLimiter:
+    """Test request slots are spaced across workers"""
+
+    def test_slots_spaced_across_workers(self):
+        """Test limiters in different workers reserve consecutive slots"""
+        redis = FakeRedis()
+        workers = [SharedRateLimiter("chartink", 10.0, tier=_tier(redis)) for _ in range(3)]
+
+        async def run():
+            return [await limiter._reserve() for limiter in workers]
+
+        started = time.time()
+        slots = asyncio.run(run())
+        assert slots[0] == pytest.approx(started, abs=1)
+        assert slots[1] - slots[0] == pytest.approx(10.0)
+        assert slots[2] - slots[1] == pytest.approx(10.0)
+        assert redis.commands == ["eval"] * 3
+
+    def test_jitter_only_on_waiting_slots(self):
+        """Test jitter is added to a slot that had to wait, not to a free one"""
+        redis = FakeRedis()
+        limiter = SharedRateLimiter("chartink", 5.0, jitter=(1.0, 1.0), tier=_tier(redis))
+
+        async def run():
+            return await limiter._reserve(), await limiter._reserve()
+
+        first, second = asyncio.run(run())
+        assert second - first == pytest.approx(6.0)
+        assert first <= time.time()
+
+    def test_falls_back_to_local_spacing(self):
+        """Test an unreachable Redis spaces slots in process and backs off"""
+        redis = DownRedis()
+        limiter = SharedRateLimiter("chartink", 10.0, tier=_tier(redis))
+
+        async def run():
+            return [await limiter._reserve() for _ in range(3)]
+
+        slots = asyncio.run(run())
+        assert [b - a for a, b in zip(slots, slots[1:])] == pytest.approx([10.0, 10.0])
+        assert redis.calls == 1
+        assert not limiter.tier.available
+
+
+class TestSharedQueryCache:
+    """Test result sets are shared between workers"""
+
+    def test_one_worker_fetches_for_all(self):
+        """Test concurrent workers run a query once and share the result"""
+        redis = FakeRedis()
+        caches = [SharedQueryCache("swing", ttl_seconds=60, tier=_tier(redis)) for _ in range(3)]
+        for cache in caches:
+            cache.POLL_INTERVAL = 0.01
+        fetches = []
+
+        async def fetch():
+            fetches.append(1)
+            await asyncio.sleep(0.05)
+            return [{"nsecode": "TCS"}]
+
+        async def run():
+            return await asyncio.gather(*(cache.get_or_fetch("q", 50, fetch) for cache in caches))
+
+        results = asyncio.run(run())
+        assert len(fetches) == 1
+        assert results == [[{"nsecode": "TCS"}]] * 3
+        assert sum(cache.hits for cache in caches) == 2
+        assert not any(key.endswith(":lock") for key in redis.data)
+
+    def test_empty_results_not_cached_and_invalidate(self):
+        """Test empty results are refetched and invalidate drops cached sets"""
+        redis = FakeRedis()
+        cache = SharedQueryCache("swing", ttl_seconds=60, tier=_tier(redis))
+        answers = [[], [{"nsecode": "INFY"}], [{"nsecode": "ITC"}]]
+
+        async def fetch():
+            return answers.pop(0)
+
+        async def run():
+            first = await cache.get_or_fetch("q", 50, fetch)
+            second = await cache.get_or_fetch("q", 50, fetch)
+            cached = await cache.get_or_fetch("q", 50, fetch)
+            await cache.invalidate()
+            fresh = await cache.get_or_fetch("q", 50, fetch)
+            return first, second, cached, fresh
+
+        first, second, cached, fresh = asyncio.run(run())
+        assert first == []
+        assert second == cached == [{"nsecode": "INFY"}]
+        assert fresh == [{"nsecode": "ITC"}]
+        assert cache.misses == 3 and cache.hits == 1
+
+    def test_falls_back_to_direct_fetch(self):
+        """Test an unreachable Redis makes every call fetch in process"""
+        redis = DownRedis()
+        cache = SharedQueryCache("swing", tier=_tier(redis))
+        fetches = []
+
+        async def fetch():
+            fetches.append(1)
+            return [{"nsecode": "TCS"}]
+
+        async def run():
+            return [await cache.get_or_fetch("q", 50, fetch) for _ in range(3)]
+
+        assert asyncio.run(run()) == [[{"nsecode": "TCS"}]] * 3
+        assert len(fetches) == 3
+        assert redis.calls == 1
+        assert cache.stats()["shared"] is False
@@ -0,0 +1,72 @@
+"""
+Unit tests for the time-decayed signal store
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "patterns"))
+
+from data.signal_store import FREQUENCY_HALF_LIFE_HOURS, SignalStore
+
+
+class TestSignalStore:
+    """Test decayed aggregates, ranking and the append-only log"""
+
+    def test_decay_and_ranking(self, tmp_path):
+        """Test frequency decays by half per half-life and ranking is best first"""
+        store = SignalStore(tmp_path / "signals.bin")
+        start = datetime(2025, 4, 16, 10, 0)
+        store.record_signals(["TCS", "INFY"], when=start, strength=[0.5, 0.1], volume=1e6, reward_risk=2.0)
+        later = start + timedelta(hours=FREQUENCY_HALF_LIFE_HOURS)
+        store.record_signals(["TCS"], when=later, strength=0.5, volume=1e6, reward_risk=2.0, price=3450.0)
+
+        tcs = store.rows[store.index["TCS"]]
+        assert np.isclose(tcs["frequency"], 1.5)
+        assert tcs["buy_signals"] == 2
+        assert np.isclose(tcs["avg_strength"], 0.7 * 0.15 + 0.3 * 0.5)
+
+        top = store.top(1, when=later)
+        assert top["symbol"].tolist() == ["TCS"]
+        assert top["last_price"].iloc[0] == 3450.0
+        assert store.top(10, when=later)["symbol"].tolist() == ["TCS", "INFY"]
+
+    def test_log_reload_and_compaction(self, tmp_path):
+        """Test the last logged row per symbol wins, torn tails are ignored and the log compacts"""
+        path = tmp_path / "signals.bin"
+        store = SignalStore(path)
+        when = datetime(2025, 4, 16, 10, 0)
+        for i in range(100):
+            store.record_signals(["TCS"], when=when + timedelta(minutes=i), price=100.0 + i)
+            store.flush()
+        with open(path, "ab") as f:
+            f.write(b"\x00" * 7)
+
+        reloaded = SignalStore(path)
+        assert reloaded.size == 1
+        assert reloaded.rows[0]["last_price"] == 199.0
+        assert reloaded.rows[0]["buy_signals"] == 100
+        # Compacted along the way instead of keeping all hundred rows
+        assert path.stat().st_size < 100 * reloaded.rows.dtype.itemsize
+
+    def test_torn_tail_truncated_before_append(self, tmp_path):
+        """Test rows appended after a torn write stay aligned"""
+        path = tmp_path / "signals.bin"
+        store = SignalStore(path)
+        when = datetime(2025, 4, 16, 10, 0)
+        store.record_signals(["TCS", "INFY"], when=when, price=100.0)
+        store.flush()
+        with open(path, "ab") as f:
+            f.write(b"\x01" * 37)
+
+        reopened = SignalStore(path)
+        assert path.stat().st_size % reopened.rows.dtype.itemsize == 0
+        reopened.record_signals(["NEWSYM"], when=when, price=50.0)
+        reopened.flush()
+
+        reloaded = SignalStore(path)
+        assert sorted(reloaded.index) == ["INFY", "NEWSYM", "TCS"]
+        assert reloaded.rows[reloaded.index["NEWSYM"]]["last_price"] == 50.0
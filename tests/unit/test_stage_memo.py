@@ -0,0 +1,66 @@
+"""
+Unit tests for cron stage memoization
+"""
+
+from datetime import datetime, time
+from enum import Enum
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from api.services.stage_memo import StageMemo, fingerprint, session_fingerprint
+
+
+class _Session(Enum):
+    PRE_MARKET = "pre_market"
+    REGULAR = "regular"
+    POST_MARKET = "post_market"
+
+
+class _Timer:
+    market_open = time(9, 15)
+
+    def get_market_session(self, now):
+        if now.time() < self.market_open:
+            return _Session.PRE_MARKET
+        return _Session.REGULAR if now.time() < time(15, 30) else _Session.POST_MARKET
+
+
+class TestStageMemo:
+    """Test fingerprints, reuse and expiry"""
+
+    def test_fingerprint_ignores_volatile_fields(self):
+        """Test key order and run timestamps do not change the fingerprint"""
+        first = {"stocks": [{"symbol": "TCS", "score": 80}], "timestamp": "10:00", "count": 1}
+        second = {"count": 1, "timestamp": "10:05", "stocks": [{"score": 80, "symbol": "TCS"}]}
+        assert fingerprint(first) == fingerprint(second)
+        assert fingerprint(first) != fingerprint({**first, "count": 2})
+
+    def test_lookup_store_and_expiry(self):
+        """Test hits need the same fingerprint and a fresh entry"""
+        memo = StageMemo("test", max_age_seconds=60, enabled=True)
+        assert memo.lookup("swing", "a") == (False, None)
+        memo.store("swing", "a", [1, 2])
+        assert memo.lookup("swing", "a") == (True, [1, 2])
+        assert memo.lookup("swing", "b") == (False, None)
+
+        assert memo.changed("short", "x")
+        assert not memo.changed("short", "x")
+        assert memo.changed("short", "y")
+
+        memo.max_age_seconds = -1
+        assert memo.lookup("swing", "a") == (False, None)
+        assert memo.stats()["hits"] == 2
+
+        disabled = StageMemo("off", enabled=False)
+        disabled.store("swing", "a", 1)
+        assert disabled.lookup("swing", "a") == (False, None)
+
+    def test_session_fingerprint(self):
+        """Test one marker per closed stretch and none while trading"""
+        timer = _Timer()
+        assert session_fingerprint(timer, datetime(2025, 1, 6, 11, 0)) is None
+        evening = session_fingerprint(timer, datetime(2025, 1, 6, 16, 0))
+        assert evening == session_fingerprint(timer, datetime(2025, 1, 6, 20, 0))
+        assert evening != session_fingerprint(timer, datetime(2025, 1, 7, 8, 0))
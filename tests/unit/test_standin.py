@@ -0,0 +1,65 @@
+"""
+Unit tests for the ChartInk / Yahoo Finance stand-in server
+"""
+
+import re
+
+from fastapi.testclient import TestClient
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from tests.performance.fixture_store import FixtureStore
+from tests.performance.standin import StandinConfig, create_app
+
+QUERY = "( {cash} ( latest close > latest sma( close,20 ) ) )"
+
+
+def _client(tmp_path, **config):
+    settings = StandinConfig(latency_ms=0, yahoo_latency_ms=0, **config)
+    return TestClient(create_app(FixtureStore(tmp_path), settings, seed=1))
+
+
+def _token(client):
+    page = client.get("/screener/")
+    assert page.status_code == 200
+    return re.search(r'name="csrf-token" content="([^"]+)"', page.text).group(1)
+
+
+class TestStandin:
+    """Test the ChartInk protocol, fault injection and the chart endpoint"""
+
+    def test_screener_requires_csrf_token(self, tmp_path):
+        """Test the scan needs the page's token and session cookie"""
+        client = _client(tmp_path)
+        token = _token(client)
+
+        assert client.post("/screener/process", data={"scan_clause": QUERY}).status_code == 419
+
+        response = client.post("/screener/process", data={"scan_clause": QUERY},
+                               headers={"X-CSRF-TOKEN": token})
+        assert response.status_code == 200
+        body = response.json()
+        assert body["recordsTotal"] == len(body["data"]) > 0
+        assert {"nsecode", "close", "volume"} <= set(body["data"][0])
+
+    def test_throttling(self, tmp_path):
+        """Test throttling answers 429 before the token is checked"""
+        client = _client(tmp_path, throttle_rate=1.0)
+        token = _token(client)
+        response = client.post("/screener/process", data={"scan_clause": QUERY},
+                               headers={"X-CSRF-TOKEN": token})
+        assert response.status_code == 429
+        assert client.get("/standin/stats").json()["counts"]["process 429"] == 1
+
+    def test_chart(self, tmp_path):
+        """Test the chart payload lines up timestamps and quotes"""
+        client = _client(tmp_path)
+        response = client.get("/v8/finance/chart/RELIANCE.NS", params={"range": "1mo", "interval": "1d"})
+        assert response.status_code == 200
+        result = response.json()["chart"]["result"][0]
+        quote = result["indicators"]["quote"][0]
+        assert len(result["timestamp"]) == len(quote["close"]) > 0
+        assert result["timestamp"] == sorted(result["timestamp"])
+        assert result["meta"]["regularMarketPrice"] == quote["close"][-1]
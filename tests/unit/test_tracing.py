@@ -0,0 +1,125 @@
+"""
+Unit tests for stage tracing and the /metrics endpoint
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from utils import tracing
+from utils.tracing import Histogram, install_metrics, span
+
+
+@pytest.fixture
+def enabled():
+    tracing.registry.reset()
+    tracing.set_enabled(True)
+    yield tracing.registry
+    tracing.set_enabled(False)
+    tracing.registry.reset()
+
+
+class TestTracing:
+    """Test spans, histograms and exposition"""
+
+    def test_disabled_is_noop(self):
+        """Test disabled spans share one no-op object and record nothing"""
+        tracing.set_enabled(False)
+        tracing.registry.reset()
+        with span("scoring.merge") as first, span("cache.write") as second:
+            pass
+        assert first is second
+        assert tracing.registry.snapshot() == {}
+
+    def test_nested_spans_inherit_group_and_trace(self, enabled):
+        """Test child spans join the root's trace and group, also across tasks"""
+        seen = {}
+
+        async def child(name):
+            with span(name) as s:
+                seen[name] = (s.trace_id, s.group)
+                await asyncio.sleep(0)
+
+        async def request():
+            with span("http POST /x", group="api") as root:
+                await asyncio.gather(child("chartink.scan_post"), child("chartink.json_decode"))
+            return root.trace_id
+
+        trace_id = asyncio.run(request())
+        assert seen == {"chartink.scan_post": (trace_id, "api"), "chartink.json_decode": (trace_id, "api")}
+        stages = enabled.snapshot()["api"]
+        assert stages["chartink.scan_post"]["count"] == 1
+        assert stages["http POST /x"]["count"] == 1
+
+        with pytest.raises(ValueError):
+            with span("history.store", group="cron"):
+                raise ValueError("boom")
+        assert enabled.snapshot()["cron"]["history.store"]["errors"] == 1
+
+    def test_histogram_quantiles(self):
+        """Test bucket interpolation stays within the observed range"""
+        hist = Histogram()
+        for ms in range(1, 101):
+            hist.observe(ms / 1000)
+        assert hist.count == 100
+        assert 0.025 <= hist.quantile(0.5) <= 0.1
+        assert hist.quantile(0.99) <= 0.1
+        assert hist.quantile(1.0) == pytest.approx(0.1)
+
+    def test_metrics_endpoint(self, enabled):
+        """Test /metrics renders Prometheus text and continues incoming traces"""
+        app = FastAPI()
+        install_metrics(app, "swing")
+
+        @app.get("/work")
+        async def work():
+            with span("scoring.merge"):
+                pass
+            return {"ok": True}
+
+        client = TestClient(app)
+        response = client.get("/work", headers={"X-Trace-Id": "abc123"})
+        assert response.headers["X-Trace-Id"] == "abc123"
+
+        text = client.get("/metrics").text
+        assert 'alg_stage_duration_seconds_count{service="swing",group="api",stage="scoring.merge"} 1' in text
+        assert 'le="+Inf"' in text
+        stages = client.get("/metrics", params={"format": "json"}).json()["stages"]
+        assert stages["api"]["http GET /work"]["count"] == 1
+
+    def test_request_spans_use_route_template(self, enabled):
+        """Test path parameters share one stage and unmatched paths keep their raw path"""
+        app = FastAPI()
+        install_metrics(app, "longterm")
+
+        @app.get("/api/longterm/analyze/{symbol}")
+        async def analyze(symbol: str):
+            return {"symbol": symbol}
+
+        client = TestClient(app)
+        for symbol in ("TCS", "INFY", "RELIANCE"):
+            client.get(f"/api/longterm/analyze/{symbol}")
+        client.get("/missing")
+
+        stages = enabled.snapshot()["api"]
+        assert stages["http GET /api/longterm/analyze/{symbol}"]["count"] == 3
+        assert not any("TCS" in stage for stage in stages)
+        assert stages["http GET /missing"]["count"] == 1
+
+    def test_serve_metrics_binds_localhost(self):
+        """Test the standalone endpoint binds loopback and surfaces bind errors"""
+        server = tracing.serve_metrics(0, "cron")
+        try:
+            host, port = server.server_address
+            assert host == "127.0.0.1"
+            with pytest.raises(OSError):
+                tracing.serve_metrics(port, "cron")
+        finally:
+            server.shutdown()
+            server.server_close()
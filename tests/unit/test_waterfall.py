@@ -0,0 +1,52 @@
+"""
+Unit tests for the speculative query waterfall
+"""
+
+import threading
+import time
+
+import pandas as pd
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "patterns"))
+
+from data.waterfall import iter_waterfall, new_symbols
+
+
+class TestWaterfall:
+    """Test priority order, overlap and early stop"""
+
+    def test_priority_order_and_cancel(self):
+        """Test results come back in priority order and nothing is launched after a stop"""
+        started = []
+        lock = threading.Lock()
+
+        def fetch(query):
+            with lock:
+                started.append(query)
+            # Lower priority queries finish first
+            time.sleep(0.05 * (5 - int(query)))
+            return pd.DataFrame({"nsecode": [f"S{query}"]}) if query == "1" else pd.DataFrame()
+
+        steps = [(f"q{i}", str(i)) for i in range(5)]
+        began = time.perf_counter()
+        seen = []
+        for key, df, error in iter_waterfall(steps, fetch, speculation=2):
+            seen.append(key)
+            if not df.empty:
+                break
+        elapsed = time.perf_counter() - began
+
+        assert seen == ["q0", "q1"]
+        # q0 and q1 overlap instead of running back to back (0.25 + 0.2)
+        assert elapsed < 0.4
+        # Never launched - only two queries run ahead of the consumer
+        assert "4" not in started
+
+    def test_new_symbols(self):
+        """Test dedupe against seen symbols and within the frame"""
+        df = pd.DataFrame({"nsecode": ["TCS", "INFY", "TCS", "SBIN"], "close": [1, 2, 3, 4]})
+        fresh = new_symbols(df, {"INFY"})
+        assert fresh["nsecode"].tolist() == ["TCS", "SBIN"]
+        assert fresh["close"].tolist() == [1, 4]
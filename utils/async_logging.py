@@ -0,0 +1,313 @@
+"""Asynchronous Logging Backend
+=============================
+Queue-based logging pipeline shared by the API servers and cron jobs.
+
+Callers (the asyncio event loop, request handlers, cron workers) only pay for
+building a ``LogRecord``, serialising its (capped) payload and a
+``queue.put``.  Formatting and file I/O happen on one background writer
+thread per process.
+
+Features
+--------
+1. ``enable_async_logging()`` moves the handlers of a logger (root by
+   default) behind a queue drained by a background writer thread.
+2. ``CompactJsonFormatter`` emits one JSON object per line (no indent).
+3. Structured payloads are passed via ``extra={"payload": ...}``, capped at
+   ``LOG_MAX_PAYLOAD_CHARS`` and serialised on the calling thread, so a
+   caller may reuse or mutate the object as soon as the log call returns.
+   Encoding stops once the cap is reached, so a huge payload costs about
+   as much as a capped one.
+4. ``SamplingFilter`` keeps 1-in-N records for high-volume events tagged with
+   ``extra={"sample": "<event-key>"}`` (``LOG_SAMPLE_EVERY``, default 50).
+   It is attached whether or not ``LOG_ASYNC`` is on.
+
+Env
+---
+LOG_ASYNC              true/false (default true)
+LOG_MAX_PAYLOAD_CHARS  max characters of a serialised payload (default 4096)
+LOG_SAMPLE_EVERY       keep every Nth sampled record per key (default 50)
+
+Usage
+-----
+from utils.async_logging import enable_async_logging
+logging.basicConfig(...)
+enable_async_logging()
+
+logger.info("stock scored", extra={"sample": "swing.stock", "payload": row})
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+from collections import defaultdict
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional
+
+# ---------------------------------------------------------------------------
+# Settings
+# ---------------------------------------------------------------------------
+
+ASYNC_ENABLED = os.getenv("LOG_ASYNC", "true").lower() == "true"
+MAX_PAYLOAD_CHARS = int(os.getenv("LOG_MAX_PAYLOAD_CHARS", "4096"))
+SAMPLE_EVERY = max(1, int(os.getenv("LOG_SAMPLE_EVERY", "50")))
+
+_TRUNCATION_MARKER = "...<truncated after {limit} chars>"
+
+# iterencode (not dumps) runs the generator encoder, which can be stopped early
+_ENCODER = json.JSONEncoder(separators=(",", ":"), default=str, ensure_ascii=False)
+
+# ---------------------------------------------------------------------------
+# Payload helpers
+# ---------------------------------------------------------------------------
+
+
+def _encode_capped(data: Any, limit: int) -> str:
+    """Compact JSON for *data*, abandoned once it runs past *limit* characters."""
+    if not limit:
+        return "".join(_ENCODER.iterencode(data))
+    chunks: List[str] = []
+    size = 0
+    for chunk in _ENCODER.iterencode(data):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            break
+    return "".join(chunks)
+
+
+def _serialise(data: Any, limit: int):
+    """``(text, is_json)`` for *data*; ``is_json`` is None for unchecked strings."""
+    if isinstance(data, str):
+        text, is_json = data, None
+    else:
+        try:
+            text, is_json = _encode_capped(data, limit), True
+        except (TypeError, ValueError):
+            text, is_json = repr(data), False
+    if limit and len(text) > limit:
+        return text[:limit] + _TRUNCATION_MARKER.format(limit=limit), False
+    return text, is_json
+
+
+def truncate_payload(data: Any, max_chars: Optional[int] = None) -> str:
+    """Serialise *data* as compact JSON and cap it at *max_chars* characters."""
+    return _serialise(data, MAX_PAYLOAD_CHARS if max_chars is None else max_chars)[0]
+
+
+class _JsonFragment(str):
+    """Payload already rendered as a valid JSON value by :func:`payload_fragment`."""
+
+
+def payload_fragment(data: Any, max_chars: Optional[int] = None) -> str:
+    """Render *data* as a valid JSON value, capped at *max_chars* characters.
+
+    Objects become compact JSON.  A string is embedded as-is only when it is
+    itself a JSON object/array (e.g. a raw response body); any other string,
+    and anything cut short by the cap, becomes a JSON string.
+    """
+    if isinstance(data, _JsonFragment):
+        return data
+    text, is_json = _serialise(data, MAX_PAYLOAD_CHARS if max_chars is None else max_chars)
+    if is_json is None:
+        is_json = text.startswith(("{", "["))
+        if is_json:
+            try:
+                json.loads(text)
+            except ValueError:
+                is_json = False
+    return _JsonFragment(text if is_json else json.dumps(text, ensure_ascii=False))
+
+
+class CompactJsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects.
+
+    The ``payload`` attribute (if any) is rendered via
+    :func:`payload_fragment` and embedded as a raw JSON fragment so large
+    request/response bodies never get pretty-printed, and every line stays
+    valid JSON.
+    """
+
+    def __init__(self, max_payload_chars: Optional[int] = None):
+        super().__init__()
+        self.max_payload_chars = max_payload_chars
+
+    def format(self, record: logging.LogRecord) -> str:  # noqa: D401
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        line = json.dumps(entry, separators=(",", ":"), default=str, ensure_ascii=False)
+
+        payload = getattr(record, "payload", None)
+        if payload is None:
+            return line
+        fragment = payload_fragment(payload, self.max_payload_chars)
+        return line[:-1] + ',"payload":' + fragment + "}"
+
+
+class SamplingFilter(logging.Filter):
+    """Keep 1-in-N records per ``record.sample`` key; untagged records pass."""
+
+    def __init__(self, every: Optional[int] = None):
+        super().__init__()
+        self.every = max(1, every or SAMPLE_EVERY)
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:  # noqa: A003
+        key = getattr(record, "sample", None)
+        if not key or self.every == 1 or record.levelno >= logging.WARNING:
+            return True
+        with self._lock:
+            count = self._counts[key]
+            self._counts[key] = count + 1
+        return count % self.every == 0
+
+
+class DeferredQueueHandler(QueueHandler):
+    """``QueueHandler`` that leaves line formatting to the listener.
+
+    The stock ``QueueHandler.prepare`` formats the record on the calling
+    thread.  For records carrying a ``payload`` we only resolve the message
+    string and render the payload to capped JSON text, so the writer never
+    touches an object the caller may still mutate.  ``route`` names the
+    handler set the background writer dispatches the record to.
+    """
+
+    def __init__(self, log_queue: "queue.SimpleQueue[logging.LogRecord]", route: str):
+        super().__init__(log_queue)
+        self.route = route
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if getattr(record, "payload", None) is None:
+            record = super().prepare(record)
+        else:
+            if record.exc_info:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            msg = record.getMessage()
+            payload = payload_fragment(record.payload)
+            record = copy.copy(record)
+            record.payload = payload
+            record.message = msg
+            record.msg = msg
+            record.args = None
+            record.exc_info = None
+        record.log_route = self.route
+        return record
+
+
+class _RoutingListener(QueueListener):
+    """Single writer thread dispatching each record to its route's handlers."""
+
+    def handle(self, record: logging.LogRecord) -> None:
+        flushed = getattr(record, "flush_event", None)
+        if flushed is not None:
+            flushed.set()
+            return
+        for handler in _routes.get(getattr(record, "log_route", ""), ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide queue + writer thread
+# ---------------------------------------------------------------------------
+
+_lock = threading.Lock()
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_routes: Dict[str, List[logging.Handler]] = {}
+_listener: Optional[_RoutingListener] = None
+
+
+def _register(route: str, handlers: List[logging.Handler]) -> DeferredQueueHandler:
+    """Register *handlers* under *route* and return the queue front-end."""
+    global _listener
+    _routes[route] = list(handlers)
+    if _listener is None:
+        _listener = _RoutingListener(_queue)
+        _listener.start()
+    return _add_sampling(DeferredQueueHandler(_queue, route))
+
+
+def _add_sampling(handler: logging.Handler) -> logging.Handler:
+    """Attach a ``SamplingFilter`` to *handler* unless it already has one."""
+    if not any(isinstance(f, SamplingFilter) for f in handler.filters):
+        handler.addFilter(SamplingFilter())
+    return handler
+
+
+def make_async_handlers(route: str, *handlers: logging.Handler) -> List[logging.Handler]:
+    """Put *handlers* behind the shared queue; return what to attach instead.
+
+    When async logging is disabled (``LOG_ASYNC=false``) the handlers are
+    returned as-is, each with its own ``SamplingFilter``.
+    """
+    if not ASYNC_ENABLED:
+        return [_add_sampling(handler) for handler in handlers]
+    with _lock:
+        return [_register(route, list(handlers))]
+
+
+def enable_async_logging(logger: Optional[logging.Logger] = None) -> bool:
+    """Move *logger*'s handlers (root by default) behind the async queue.
+
+    Idempotent: a logger already fronted by a ``DeferredQueueHandler`` is left
+    alone.  Returns True when the logger is (now) asynchronous; when async
+    logging is disabled the handlers stay in place and only get sampling.
+    """
+    target = logger or logging.getLogger()
+    if not ASYNC_ENABLED:
+        for handler in target.handlers:
+            _add_sampling(handler)
+        return False
+    with _lock:
+        current = list(target.handlers)
+        if any(isinstance(h, DeferredQueueHandler) for h in current):
+            return True
+        if not current:
+            return False
+        for handler in current:
+            target.removeHandler(handler)
+        target.addHandler(_register(target.name, current))
+    return True
+
+
+def flush_async_logging(timeout: float = 5.0) -> bool:
+    """Block until records queued so far are written; False on timeout.
+
+    Unlike :func:`shutdown_async_logging` the writer keeps running.
+    """
+    if _listener is None:
+        return True
+    done = threading.Event()
+    _queue.put(logging.makeLogRecord({"flush_event": done}))
+    return done.wait(timeout)
+
+
+def shutdown_async_logging() -> None:
+    """Flush queued records and stop the background writer."""
+    global _listener
+    with _lock:
+        if _listener is None:
+            return
+        try:
+            _listener.stop()
+        except Exception:  # pragma: no cover - best effort on exit
+            pass
+        _listener = None
+
+
+atexit.register(shutdown_async_logging)
@@ -0,0 +1,286 @@
+"""
+Upstream Health Oracle
+======================
+
+One shared view of upstream reachability (ChartInk, the internet) for the
+API servers, cron jobs and daemons, in place of the blocking ``requests``
+probes each of them used to run on its own.
+
+The prober - whichever process holds the oracle's lock file - probes every
+endpoint of every upstream concurrently with a short timeout once per
+``HEALTH_PROBE_INTERVAL``, keeps a rolling window of outcomes and latencies
+per upstream and publishes the summary as one JSON document in shared memory
+(``/dev/shm`` where available). Readers only stat / read that document, so
+``is_healthy()`` costs no network round trip. An upstream is down after
+``HEALTH_FAILURES_TO_DOWN`` consecutive failed rounds, so a single blip does
+not flip it.
+
+When the document is stale (no prober running, e.g. a one-off script) the
+reader runs one concurrent probe round itself, bounded by the probe timeout.
+
+Env
+---
+HEALTH_PROBE_INTERVAL     seconds between probe rounds (default 15)
+HEALTH_PROBE_TIMEOUT      per-endpoint timeout in seconds (default 2)
+HEALTH_WINDOW             probe rounds kept per upstream (default 20)
+HEALTH_FAILURES_TO_DOWN   consecutive failed rounds before an upstream is down (default 2)
+HEALTH_STATUS_PATH        published status document (default /dev/shm/alg_health.json)
+CHARTINK_BASE_URL         ChartInk base URL (default https://chartink.com)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from utils.lazy import lazy_import
+from utils.tracing import span
+
+aiohttp = lazy_import("aiohttp")
+
+try:
+    import fcntl
+except ImportError:  # Windows - every process probes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "15"))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+HEALTH_WINDOW = int(os.getenv("HEALTH_WINDOW", "20"))
+HEALTH_FAILURES_TO_DOWN = int(os.getenv("HEALTH_FAILURES_TO_DOWN", "2"))
+_SHARED_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+HEALTH_STATUS_PATH = os.getenv("HEALTH_STATUS_PATH", os.path.join(_SHARED_DIR, "alg_health.json"))
+CHARTINK_BASE_URL = os.getenv("CHARTINK_BASE_URL", "https://chartink.com").rstrip("/")
+
+# An upstream is reachable when any of its endpoints answers
+UPSTREAMS: Dict[str, List[str]] = {
+    "chartink": [f"{CHARTINK_BASE_URL}/screener/"],
+    "internet": [
+        "https://www.google.com",
+        "https://1.1.1.1",  # Cloudflare DNS
+        "https://8.8.8.8",  # Google DNS
+        "https://httpbin.org/status/200",
+    ],
+}
+
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36')
+
+
+def summarize(window: List[List[float]], failures_to_down: int) -> Dict[str, object]:
+    """Rolling stats of ``[[ok, latency_ms], ...]`` (oldest first)."""
+    consecutive_failures = 0
+    for ok, _ in reversed(window):
+        if ok:
+            break
+        consecutive_failures += 1
+    latencies = sorted(ms for ok, ms in window if ok)
+    return {
+        "healthy": bool(window) and consecutive_failures < failures_to_down,
+        "success_rate": round(sum(ok for ok, _ in window) / len(window), 3) if window else 0.0,
+        "latency_ms_p50": round(latencies[len(latencies) // 2], 1) if latencies else None,
+        "latency_ms_max": round(latencies[-1], 1) if latencies else None,
+        "consecutive_failures": consecutive_failures,
+        "rounds": len(window),
+    }
+
+
+class HealthOracle:
+    """Probes upstreams in one process, serves their status to all of them."""
+
+    def __init__(self, upstreams: Optional[Dict[str, List[str]]] = None, path: Optional[str] = None,
+                 interval: Optional[float] = None, timeout: Optional[float] = None,
+                 window: Optional[int] = None, failures_to_down: Optional[int] = None):
+        self.upstreams = upstreams or UPSTREAMS
+        self.path = path or HEALTH_STATUS_PATH
+        self.interval = HEALTH_PROBE_INTERVAL if interval is None else interval
+        self.timeout = HEALTH_PROBE_TIMEOUT if timeout is None else timeout
+        self.window = window or HEALTH_WINDOW
+        self.failures_to_down = failures_to_down or HEALTH_FAILURES_TO_DOWN
+        self.stale_after = 3 * self.interval + self.timeout
+
+        self._doc: Optional[dict] = None
+        self._mtime: Optional[int] = None
+        self._refresh_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._lock_fd: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Optional[dict]:
+        """Last published document (re-read only when the file changed)."""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return self._doc
+        if mtime != self._mtime:
+            try:
+                with open(self.path, "r") as f:
+                    self._doc = json.load(f)
+                self._mtime = mtime
+            except (OSError, ValueError):
+                pass
+        return self._doc
+
+    def _is_fresh(self, doc: Optional[dict]) -> bool:
+        return doc is not None and time.time() - doc.get("updated_at", 0) <= self.stale_after
+
+    def status(self, name: str) -> Optional[dict]:
+        """Rolling status of one upstream; probes once if nobody else does."""
+        doc = self.snapshot()
+        if not self._is_fresh(doc):
+            doc = self.refresh()
+        return (doc or {}).get("upstreams", {}).get(name)
+
+    def is_healthy(self, name: str) -> bool:
+        status = self.status(name)
+        return bool(status and status["healthy"])
+
+    def refresh(self) -> Optional[dict]:
+        """Run one probe round now (blocking, at most ``timeout`` seconds)."""
+        with self._refresh_lock:
+            doc = self.snapshot()
+            if self._is_fresh(doc):
+                return doc  # Another thread refreshed while we waited
+
+            def run():
+                try:
+                    asyncio.run(self.probe_round())
+                except Exception as e:
+                    logger.warning(f"⚠️ Health probe failed: {e}")
+
+            # Own thread so this works inside a running event loop too
+            thread = threading.Thread(target=run, name="health-oracle-refresh", daemon=True)
+            thread.start()
+            thread.join()
+            return self._doc
+
+    # ------------------------------------------------------------------
+    # Probing
+    # ------------------------------------------------------------------
+
+    async def _probe_endpoint(self, session, url: str) -> Tuple[bool, float]:
+        start = time.perf_counter()
+        try:
+            async with session.get(url, allow_redirects=True) as response:
+                ok = 200 <= response.status < 400
+        except Exception:
+            ok = False
+        return ok, (time.perf_counter() - start) * 1000
+
+    async def probe_round(self) -> dict:
+        """Probe every endpoint concurrently and publish the results."""
+        names = list(self.upstreams)
+        with span("health.probe"):
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            async with aiohttp.ClientSession(timeout=timeout, headers={"User-Agent": USER_AGENT}) as session:
+                results = await asyncio.gather(*(self._probe_endpoint(session, url)
+                                                 for name in names for url in self.upstreams[name]))
+
+        outcomes = {}
+        offset = 0
+        for name in names:
+            endpoint_results = results[offset:offset + len(self.upstreams[name])]
+            offset += len(endpoint_results)
+            latencies = [ms for ok, ms in endpoint_results if ok]
+            if latencies:
+                outcomes[name] = (True, min(latencies))
+            else:
+                outcomes[name] = (False, max((ms for _, ms in endpoint_results), default=0.0))
+        return self.publish(outcomes)
+
+    def publish(self, outcomes: Dict[str, Tuple[bool, float]], now: Optional[float] = None) -> dict:
+        """Fold one round of ``{upstream: (ok, latency_ms)}`` into the shared document."""
+        now = time.time() if now is None else now
+        previous = self.snapshot() or {}
+        upstreams = dict(previous.get("upstreams", {}))
+
+        for name, (ok, latency_ms) in outcomes.items():
+            before = upstreams.get(name, {})
+            window = (before.get("window", []) + [[int(ok), round(latency_ms, 1)]])[-self.window:]
+            entry = summarize(window, self.failures_to_down)
+            entry.update({
+                "window": window,
+                "last_checked_at": now,
+                "last_ok_at": now if ok else before.get("last_ok_at"),
+            })
+            if before and before.get("healthy") != entry["healthy"]:
+                if entry["healthy"]:
+                    logger.info(f"✅ Upstream {name} reachable again ({latency_ms:.0f} ms)")
+                else:
+                    logger.warning(f"❌ Upstream {name} unreachable "
+                                   f"({entry['consecutive_failures']} failed probe rounds)")
+            upstreams[name] = entry
+
+        doc = {"updated_at": now, "prober_pid": os.getpid(), "upstreams": upstreams}
+        self._doc = doc
+        self._write(doc)
+        return doc
+
+    def _write(self, doc: dict) -> None:
+        # Write-then-rename so readers never see a partial document
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(doc, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+            self._mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            logger.warning(f"⚠️ Could not publish health status to {self.path}: {e}")
+
+    # ------------------------------------------------------------------
+    # Background prober
+    # ------------------------------------------------------------------
+
+    def _hold_prober_lock(self) -> bool:
+        """True if this process is (or just became) the prober."""
+        if fcntl is None or self._lock_fd is not None:
+            return True
+        fd = None
+        try:
+            fd = os.open(f"{self.path}.lock", os.O_CREAT | os.O_RDWR, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            if fd is not None:
+                os.close(fd)
+            return False
+        self._lock_fd = fd
+        logger.info(f"🩺 Health oracle prober started (pid {os.getpid()}, every {self.interval:.0f}s)")
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            if self._hold_prober_lock():
+                try:
+                    await self.probe_round()
+                except Exception as e:
+                    logger.warning(f"⚠️ Health probe round failed: {e}")
+            # Non-probers retry the lock, taking over if the prober exits
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background prober on the running event loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+
+health_oracle = HealthOracle()
@@ -0,0 +1,181 @@
+"""Lazy Imports and Deferred Singletons
+====================================
+Keeps heavy libraries (yfinance, bs4, motor / pymongo, redis) and
+connection-owning module singletons out of import time, so supervisord
+restarts and cron spawns reach "ready" without paying for them up front.
+
+Features
+--------
+1. ``lazy_import("yfinance")`` returns a module proxy.  The real import runs
+   on first attribute access; after that every access goes straight to the
+   module, so patching the real module (tests, replay fixtures) is visible
+   through the proxy.
+2. ``LazySingleton(RecommendationCache)`` stands in for a module-level
+   instance.  The instance is built on first use - or explicitly, from a
+   server's startup hook / lifespan, with ``warm()`` - and attribute access
+   is forwarded to it, so ``await recommendation_cache.get_cached_recommendation(...)``
+   keeps working unchanged.
+3. ``warm(*objects, background=True)`` builds singletons and loads module
+   proxies on a daemon thread once the process is up, so the first request
+   does not pay for them either.
+
+Env
+---
+LAZY_IMPORTS   true/false (default true); false imports and builds everything
+               eagerly, which surfaces missing dependencies at start-up
+
+Usage
+-----
+from utils.lazy import LazySingleton, lazy_import
+
+yf = lazy_import("yfinance")
+recommendation_cache = LazySingleton(RecommendationCache, "recommendation_cache")
+
+@app.on_event("startup")
+async def startup_event():
+    warm(recommendation_cache, yf)
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+LAZY_IMPORTS = os.getenv("LAZY_IMPORTS", "true").lower() == "true"
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule:
+    """Module proxy that imports on first attribute access."""
+
+    __slots__ = ("_lazy_name", "_lazy_module")
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_lazy_name", name)
+        object.__setattr__(self, "_lazy_module", None)
+
+    def _load(self):
+        module = self._lazy_module
+        if module is None:
+            module = importlib.import_module(self._lazy_name)
+            object.__setattr__(self, "_lazy_module", module)
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self._lazy_module is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._lazy_name!r} ({state})>"
+
+
+def lazy_import(name: str):
+    """Return ``name`` as a lazy module proxy (the module itself when already
+    imported or when LAZY_IMPORTS is off)."""
+    module = sys.modules.get(name)
+    if module is not None or not LAZY_IMPORTS:
+        return module or importlib.import_module(name)
+    return LazyModule(name)
+
+
+class LazySingleton:
+    """Module-level instance built on first use (thread-safe)."""
+
+    __slots__ = ("_factory", "_name", "_instance", "_lock")
+
+    def __init__(self, factory: Callable[[], Any], name: Optional[str] = None):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_name", name or getattr(factory, "__name__", repr(factory)))
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+        if not LAZY_IMPORTS:
+            self.get()
+
+    def get(self) -> Any:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    started = time.perf_counter()
+                    instance = self._factory()
+                    object.__setattr__(self, "_instance", instance)
+                    logger.debug(f"Built {self._name} in {(time.perf_counter() - started) * 1000:.1f} ms")
+        return instance
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def reset(self) -> None:
+        """Drop the instance; the next use builds a new one."""
+        with self._lock:
+            object.__setattr__(self, "_instance", None)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.get(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self.get(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self.get(), attr)
+
+    def __repr__(self) -> str:
+        if self._instance is None:
+            return f"<lazy {self._name} (not built)>"
+        return repr(self._instance)
+
+
+def warm(*objects: Any, background: bool = False) -> Dict[str, float]:
+    """Build lazy singletons and load lazy modules.
+
+    Returns the milliseconds each took (empty when run in the background).
+    """
+
+    def _warm() -> Dict[str, float]:
+        timings = {}
+        for obj in objects:
+            if isinstance(obj, LazySingleton):
+                name, load = obj._name, obj.get
+            elif isinstance(obj, LazyModule):
+                name, load = obj._lazy_name, obj._load
+            else:
+                continue
+            started = time.perf_counter()
+            try:
+                load()
+            except Exception as e:
+                logger.warning(f"⚠️ Could not preload {name}: {e}")
+                continue
+            timings[name] = round((time.perf_counter() - started) * 1000, 1)
+        if timings:
+            logger.info(f"🔥 Preloaded {', '.join(f'{n} ({ms} ms)' for n, ms in timings.items())}")
+        return timings
+
+    if background:
+        threading.Thread(target=_warm, name="lazy-warm", daemon=True).start()
+        return {}
+    return _warm()
+
+
+__all__ = ["LAZY_IMPORTS", "LazyModule", "LazySingleton", "lazy_import", "warm"]
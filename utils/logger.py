@@ -18,6 +18,8 @@ Features
 5. Reads LOG_LEVEL, LOG_ROTATION and LOG_RETENTION_DAYS from env
    (already set via shared/config/settings.load_env_files())
 6. Thread-safe singleton handlers (avoid duplicates).
+7. Handlers sit behind a queue drained by a background writer thread
+   (see utils.async_logging; disable with LOG_ASYNC=false).
 
 Usage
 -----
@@ -41,6 +43,7 @@ from datetime import datetime
 from typing import Optional
 import os
 
+from utils.async_logging import CompactJsonFormatter, make_async_handlers
 from shared.config.settings import (
     ENV_CONFIG, API_CONFIG  # loaded via load_env_files()
 )
@@ -130,9 +133,9 @@ def get_logger(
 
             console_formatter = jsonlogger.JsonFormatter(_json_fmt_keys)
             file_formatter = jsonlogger.JsonFormatter(_json_fmt_keys)
-        except ImportError:  # graceful fallback
-            console_formatter = logging.Formatter(_plain_fmt.replace("_", ""), "%H:%M:%S")
-            file_formatter = logging.Formatter(_plain_fmt.replace("_", ""), "%Y-%m-%d %H:%M:%S")
+        except ImportError:  # graceful fallback: built-in compact JSON lines
+            console_formatter = CompactJsonFormatter()
+            file_formatter = CompactJsonFormatter()
     else:
         console_formatter = logging.Formatter(_plain_fmt.replace("_", ""), "%H:%M:%S")
         file_formatter = logging.Formatter(_plain_fmt.replace("_", ""), "%Y-%m-%d %H:%M:%S")
@@ -141,7 +144,6 @@ def get_logger(
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(_LEVEL)
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
 
     # File handler -----------------------------------------------------------
     # file_formatter already defined above based on json/plain
@@ -163,7 +165,10 @@ def get_logger(
 
     file_handler.setLevel(_LEVEL)
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+
+    # Async front-end: callers only enqueue, the writer thread does the I/O
+    for handler in make_async_handlers(name, console_handler, file_handler):
+        logger.addHandler(handler)
 
     logger.propagate = False
     logger._ab_configured = True  # type: ignore[attr-defined]
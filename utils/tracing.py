@@ -0,0 +1,444 @@
+"""Stage Tracing and Metrics
+==========================
+Lightweight spans and per-stage latency histograms for the recommendation
+pipelines (ChartInk CSRF fetch, scan POST, JSON decode, normalization,
+scoring, re-ranking, cache and history writes).
+
+Features
+--------
+1. ``span("chartink.scan_post")`` times a stage.  Spans nest through a
+   ``contextvars`` context, so concurrent requests and asyncio tasks keep
+   their own trace id and the group of their root span.
+2. Every finished span lands in a fixed-bucket histogram keyed by
+   (group, stage); groups are the ``utils.logger`` groups (api, cron, ...).
+3. ``render_prometheus()`` / ``snapshot()`` expose the histograms;
+   ``install_metrics(app, service)`` adds ``GET /metrics`` to a FastAPI app
+   and ``serve_metrics(port, service)`` serves it from a background thread
+   for processes without an HTTP server (cron manager).
+4. ``install_metrics`` also opens a root span per HTTP request and honours
+   an incoming ``X-Trace-Id`` header (see ``trace_headers()``), so a cron
+   job and the server it calls share one trace id in the slow-span logs.
+   Request spans are named after the route template
+   (``http GET /api/longterm/analyze/{symbol}``), so path parameters do not
+   create a stage per symbol.
+5. Spans slower than ``TRACING_SLOW_SPAN_MS`` are logged to their group's log.
+6. Disabled (the default) ``span()`` returns a shared no-op context manager
+   and ``traced`` returns the function unchanged, so instrumented code pays
+   one function call per stage.
+
+Histograms are per process; with several uvicorn workers each worker
+reports its own ``/metrics``.
+
+Env
+---
+TRACING_ENABLED        true/false (default false)
+TRACING_SLOW_SPAN_MS   log spans slower than this (default 0 = never)
+
+Usage
+-----
+from utils.tracing import span, traced
+
+with span("chartink.scan_post", query_length=len(query)):
+    response = await session.post(...)
+
+@traced("history.store")
+async def store_batch(...): ...
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# ---------------------------------------------------------------------------
+# Settings
+# ---------------------------------------------------------------------------
+
+_enabled = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+SLOW_SPAN_MS = float(os.getenv("TRACING_SLOW_SPAN_MS", "0"))
+
+# Seconds; covers cache lookups (ms) through full ChartInk waterfalls (tens of s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_NAME = "alg_stage_duration_seconds"
+TRACE_HEADER = "X-Trace-Id"
+
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn tracing on or off at runtime (``traced`` decides at decoration time)."""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+# ---------------------------------------------------------------------------
+# Histograms
+# ---------------------------------------------------------------------------
+
+class Histogram:
+    """Fixed-bucket latency histogram (cumulative counts rendered on export)."""
+
+    __slots__ = ("buckets", "counts", "count", "sum", "max", "errors", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+            if error:
+                self.errors += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        with self._lock:
+            counts = list(self.counts)
+            total = self.count
+            largest = self.max
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else largest
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, largest)
+            seen += bucket_count
+        return largest
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.50) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class MetricsRegistry:
+    """Histograms keyed by (group, stage)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def histogram(self, group: str, stage: str) -> Histogram:
+        key = (group, stage)
+        hist = self._histograms.get(key)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(key, Histogram(self.buckets))
+        return hist
+
+    def observe(self, group: str, stage: str, seconds: float, error: bool = False) -> None:
+        self.histogram(group, stage).observe(seconds, error)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def _items(self):
+        with self._lock:
+            return sorted(self._histograms.items())
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """``{group: {stage: summary}}`` with estimated quantiles."""
+        result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (group, stage), hist in self._items():
+            result.setdefault(group, {})[stage] = hist.summary()
+        return result
+
+    def render_prometheus(self, service: str = "") -> str:
+        """Prometheus text exposition format."""
+        lines = [
+            f"# HELP {METRIC_NAME} Pipeline stage latency",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        errors = []
+        for (group, stage), hist in self._items():
+            labels = f'service="{service}",group="{group}",stage="{stage}"'
+            with hist._lock:
+                counts = list(hist.counts)
+                total, seconds, failed = hist.count, hist.sum, hist.errors
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_bucket{{{labels},le="+Inf"}} {total}')
+            lines.append(f"{METRIC_NAME}_sum{{{labels}}} {seconds:.6f}")
+            lines.append(f"{METRIC_NAME}_count{{{labels}}} {total}")
+            errors.append(f"alg_stage_errors_total{{{labels}}} {failed}")
+        if errors:
+            lines += ["# HELP alg_stage_errors_total Stages that raised",
+                      "# TYPE alg_stage_errors_total counter"] + errors
+        lines += ["# HELP alg_tracing_enabled Whether spans are being recorded",
+                  "# TYPE alg_tracing_enabled gauge",
+                  f'alg_tracing_enabled{{service="{service}"}} {int(_enabled)}']
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("alg_span", default=None)
+_slow_loggers: Dict[str, Any] = {}
+
+
+def _slow_logger(group: str):
+    logger = _slow_loggers.get(group)
+    if logger is None:
+        from utils.logger import get_logger
+        logger = _slow_loggers[group] = get_logger(f"tracing.{group}", group=group)
+    return logger
+
+
+class Span:
+    """A timed stage; use as a context manager (also inside coroutines)."""
+
+    __slots__ = ("stage", "group", "attrs", "trace_id", "parent", "start", "duration", "_token")
+
+    def __init__(self, stage: str, group: Optional[str] = None, attrs: Optional[Dict[str, Any]] = None,
+                 trace_id: Optional[str] = None):
+        self.stage = stage
+        self.group = group
+        self.attrs = attrs
+        self.trace_id = trace_id
+        self.parent: Optional[Span] = None
+        self.start = 0.0
+        self.duration = 0.0
+        self._token = None
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        self.parent = parent
+        if parent is not None:
+            self.trace_id = parent.trace_id
+            self.group = self.group or parent.group
+        else:
+            self.trace_id = self.trace_id or uuid.uuid4().hex[:16]
+            self.group = self.group or "shared"
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.duration = time.perf_counter() - self.start
+        _current_span.reset(self._token)
+        registry.observe(self.group, self.stage, self.duration, error=exc_type is not None)
+        if SLOW_SPAN_MS and self.duration * 1000 >= SLOW_SPAN_MS:
+            _slow_logger(self.group).warning(
+                f"🐢 slow stage {self.stage}: {self.duration * 1000:.1f} ms "
+                f"(trace {self.trace_id}, parent {self.parent.stage if self.parent else '-'}"
+                f"{', ' + json.dumps(self.attrs, default=str) if self.attrs else ''})"
+            )
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs = {**(self.attrs or {}), **attrs}
+
+
+class _NoopSpan:
+    """Shared stand-in returned while tracing is disabled."""
+
+    __slots__ = ()
+    trace_id = None
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def span(stage: str, group: Optional[str] = None, **attrs: Any):
+    """Time a stage: ``with span("scoring.merge"):``.
+
+    ``group`` defaults to the enclosing span's group (or "shared" at the root).
+    """
+    if not _enabled:
+        return _NOOP
+    return Span(stage, group, attrs or None)
+
+
+def current_trace_id() -> Optional[str]:
+    current = _current_span.get()
+    return current.trace_id if current is not None else None
+
+
+def trace_headers() -> Dict[str, str]:
+    """Headers that let a downstream server continue the current trace."""
+    trace_id = current_trace_id()
+    return {TRACE_HEADER: trace_id} if trace_id else {}
+
+
+def traced(stage: Optional[str] = None, group: Optional[str] = None) -> Callable:
+    """Decorator form of ``span`` for sync and async functions."""
+
+    def decorate(fn: Callable) -> Callable:
+        if not _enabled:
+            return fn
+        name = stage or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with Span(name, group):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with Span(name, group):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def snapshot() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    return registry.snapshot()
+
+
+def render_prometheus(service: str = "") -> str:
+    return registry.render_prometheus(service)
+
+
+# ---------------------------------------------------------------------------
+# Exposition
+# ---------------------------------------------------------------------------
+
+def _route_path(request) -> str:
+    """Template of the matched route, or the raw path when nothing matched."""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or request.url.path
+
+
+def install_metrics(app, service: str, group: str = "api") -> None:
+    """Add ``GET /metrics`` to a FastAPI app and a root span per request.
+
+    ``/metrics`` is Prometheus text; ``/metrics?format=json`` returns the
+    per-stage summaries with estimated p50/p95/p99.
+    """
+    from fastapi import Request
+    from fastapi.responses import JSONResponse, PlainTextResponse
+
+    async def metrics(format: str = "prometheus"):
+        if format == "json":
+            return JSONResponse({
+                "service": service,
+                "tracing_enabled": _enabled,
+                "uptime_seconds": round(time.time() - registry.started_at, 1),
+                "stages": registry.snapshot(),
+            })
+        return PlainTextResponse(registry.render_prometheus(service),
+                                 media_type="text/plain; version=0.0.4")
+
+    app.add_api_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
+
+    if not _enabled:
+        return
+
+    @app.middleware("http")
+    async def trace_requests(request: Request, call_next):
+        if request.url.path == "/metrics":
+            return await call_next(request)
+        # Callers (cron jobs, other servers) may continue their own trace
+        with Span(f"http {request.method} {request.url.path}", group,
+                  trace_id=request.headers.get(TRACE_HEADER)) as root:
+            try:
+                response = await call_next(request)
+            finally:
+                # The router records the matched route in the scope
+                root.stage = f"http {request.method} {_route_path(request)}"
+            root.set(status=response.status_code)
+        response.headers[TRACE_HEADER] = root.trace_id
+        return response
+
+
+def serve_metrics(port: int, service: str, host: str = "127.0.0.1"):
+    """Serve ``/metrics`` from a daemon thread; returns the HTTP server.
+
+    Raises:
+        OSError: If the address cannot be bound (e.g. the port is in use)
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/metrics?format=json"):
+                body = json.dumps({"service": service, "tracing_enabled": _enabled,
+                                   "stages": registry.snapshot()}).encode()
+                content_type = "application/json"
+            elif self.path.startswith("/metrics"):
+                body = registry.render_prometheus(service).encode()
+                content_type = "text/plain; version=0.0.4"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):  # keep scrapes out of the logs
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name=f"metrics-{service}", daemon=True).start()
+    return server
+
+
+__all__ = [
+    "span",
+    "traced",
+    "current_trace_id",
+    "trace_headers",
+    "tracing_enabled",
+    "set_enabled",
+    "snapshot",
+    "render_prometheus",
+    "install_metrics",
+    "serve_metrics",
+    "registry",
+    "Histogram",
+    "MetricsRegistry",
+]
@@ -13,7 +13,8 @@ Commands:
     history       - View execution history
     performance   - Show performance analytics  
     summary       - Display job summaries
-    trends        - Show performance trends
+    trends        - Show daily performance trends
+    rollups       - Rebuild analytics rollups from execution history
     failures      - Show failed executions
     live          - Live monitoring dashboard
     export        - Export data to CSV/JSON
@@ -183,8 +184,16 @@ class CronAnalyticsViewer:
             print(f"⏱️  Performance Metrics:")
             print(f"   • Average Duration: {analytics.get('average_duration_seconds', 0):.2f} seconds")
             print(f"   • Execution Frequency: {analytics.get('execution_frequency_per_day', 0):.1f} per day")
+            print(f"   • Trend: {analytics.get('performance_trend', 'stable')}")
             print()
             
+            histogram = analytics.get('duration_histogram', {})
+            if histogram:
+                print(f"📊 Duration Histogram:")
+                for label in sorted(histogram, key=self._duration_sort_key):
+                    print(f"   • {label:<10} {histogram[label]}")
+                print()
+            
             print(f"📋 Recommendations:")
             print(f"   • Total Generated: {analytics.get('total_recommendations_generated', 0)}")
             print(f"   • Average per Execution: {analytics.get('average_recommendations_per_execution', 0):.1f}")
@@ -255,6 +264,63 @@ class CronAnalyticsViewer:
             except Exception as e:
                 print(f"   ❌ Error: {e}")
     
+    @staticmethod
+    def _duration_sort_key(label: str) -> float:
+        """Order histogram labels like le_5s, le_15s, ..., gt_600s, unknown"""
+        if label.startswith('le_'):
+            return float(label[3:-1])
+        if label.startswith('gt_'):
+            return float(label[3:-1]) + 0.5
+        return float('inf')
+    
+    async def show_trends(self, job_type: Optional[str] = None, days: int = 14) -> None:
+        """Display day-by-day execution trends from the daily rollups"""
+        
+        print(f"📉 Daily Trends (Last {days} days)")
+        print("=" * 80)
+        
+        job_type_enum = None
+        if job_type:
+            try:
+                job_type_enum = CronJobType(job_type.lower() + "_analysis")
+            except ValueError:
+                print(f"❌ Invalid job type: {job_type}")
+                return
+        
+        try:
+            rollups = await self.tracker.get_rollups(
+                job_type=job_type_enum,
+                granularity="day",
+                start_date=datetime.now() - timedelta(days=days)
+            )
+            
+            if not rollups:
+                print("ℹ️  No rollup data found for the specified criteria")
+                return
+            
+            print(f"{'Day':<12} {'Job':<15} {'Runs':<6} {'Fail':<6} {'Success':<9} {'Avg Dur':<9} {'Stocks':<7}")
+            print("-" * 70)
+            
+            for rollup in rollups:
+                count = rollup.get('count', 0)
+                success_rate = (rollup.get('successes', 0) / count * 100) if count else 0
+                duration_count = rollup.get('duration_count', 0)
+                avg_duration = rollup.get('duration_sum', 0) / duration_count if duration_count else 0
+                job_name = rollup.get('job_type', '').replace('_analysis', '')[:14]
+                
+                print(f"{rollup.get('bucket', ''):<12} {job_name:<15} {count:<6} {rollup.get('failures', 0):<6} "
+                      f"{success_rate:<8.1f}% {avg_duration:<8.1f}s {rollup.get('stocks_produced', 0):<7}")
+            
+        except Exception as e:
+            print(f"❌ Error retrieving trends: {e}")
+    
+    async def rebuild_rollups(self) -> None:
+        """Backfill rollups from the raw execution history"""
+        
+        print("🔄 Rebuilding cron rollups from execution history...")
+        buckets = await self.tracker.rebuild_rollups()
+        print(f"✅ Rebuilt {buckets} rollup buckets")
+    
     async def show_failed_executions(self, limit: int = 20, days: int = 7) -> None:
         """Display recent failed executions with details"""
         
@@ -423,6 +489,7 @@ async def main():
 Examples:
   python view_cron_analytics.py history --days 7
   python view_cron_analytics.py performance --job-type shortterm --days 30
+  python view_cron_analytics.py trends --job-type swing --days 14
   python view_cron_analytics.py failures --limit 10
   python view_cron_analytics.py live --refresh 30
   python view_cron_analytics.py export --format csv --days 30
@@ -446,6 +513,14 @@ Examples:
     # Summary command
     subparsers.add_parser('summary', help='Display job summaries')
     
+    # Trends command
+    trends_parser = subparsers.add_parser('trends', help='Show daily performance trends')
+    trends_parser.add_argument('--job-type', choices=['shortterm', 'swing', 'longterm', 'cache'], help='Filter by job type')
+    trends_parser.add_argument('--days', type=int, default=14, help='Number of days to show (default: 14)')
+    
+    # Rollups command
+    subparsers.add_parser('rollups', help='Rebuild analytics rollups from execution history')
+    
     # Failures command
     failures_parser = subparsers.add_parser('failures', help='Show failed executions')
     failures_parser.add_argument('--limit', type=int, default=20, help='Maximum number of failures to show (default: 20)')
@@ -489,6 +564,15 @@ Examples:
         elif args.command == 'summary':
             await viewer.show_job_summaries()
         
+        elif args.command == 'trends':
+            await viewer.show_trends(
+                job_type=args.job_type,
+                days=args.days
+            )
+        
+        elif args.command == 'rollups':
+            await viewer.rebuild_rollups()
+        
         elif args.command == 'failures':
             await viewer.show_failed_executions(
                 limit=args.limit,
@@ -13,14 +13,13 @@ Usage Examples:
     python view_recommendation_history.py symbols --symbol RELIANCE --days 30
     python view_recommendation_history.py performance --top 20
     python view_recommendation_history.py export --format csv --days 7
+    python view_recommendation_history.py export --format jsonl --days 90 --fields symbol,generated_at,overall_score
     python view_recommendation_history.py compare --strategies shortterm,swing
     python view_recommendation_history.py live --refresh 30
 """
 
 import asyncio
 import argparse
-import json
-import csv
 import sys
 import time
 from datetime import datetime, timedelta
@@ -445,78 +444,45 @@ class RecommendationHistoryViewer:
     async def export_data(self, 
                           format: str = 'csv',
                           days: int = 7,
-                          filename: Optional[str] = None):
-        """Export recommendation data to CSV or JSON."""
+                          filename: Optional[str] = None,
+                          fields: Optional[List[str]] = None,
+                          strategy: Optional[str] = None):
+        """Export recommendation data to CSV, JSON, JSON Lines or Parquet.
+        
+        Records stream from the database in batches, so any date range can be
+        exported; ``fields`` limits the export to those columns.
+        """
         
         try:
             print(f"\n💾 Exporting Recommendation Data")
             print("=" * 50)
             
-            # Get data
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             
-            history = await self.storage.get_recommendation_history(
-                start_date=start_date,
-                end_date=end_date,
-                limit=10000  # Large limit for export
-            )
-            
-            if not history:
-                print("❌ No data to export")
-                return
-            
             # Generate filename if not provided
             if not filename:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 filename = f"recommendation_history_{timestamp}.{format}"
             
-            if format.lower() == 'csv':
-                # Export to CSV
-                with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    if history:
-                        fieldnames = history[0].keys()
-                        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                        writer.writeheader()
-                        for row in history:
-                            # Convert datetime objects to strings for CSV
-                            row_copy = row.copy()
-                            for key, value in row_copy.items():
-                                if isinstance(value, datetime):
-                                    row_copy[key] = value.isoformat()
-                            writer.writerow(row_copy)
-                        
-            elif format.lower() == 'json':
-                # Export to JSON
-                with open(filename, 'w', encoding='utf-8') as jsonfile:
-                    # Convert datetime objects to strings for JSON
-                    export_data = []
-                    for rec in history:
-                        rec_copy = rec.copy()
-                        for key, value in rec_copy.items():
-                            if isinstance(value, datetime):
-                                rec_copy[key] = value.isoformat()
-                        export_data.append(rec_copy)
-                    
-                    json.dump({
-                        'export_metadata': {
-                            'export_date': datetime.now().isoformat(),
-                            'date_range': {
-                                'start': start_date.isoformat(),
-                                'end': end_date.isoformat()
-                            },
-                            'total_records': len(export_data)
-                        },
-                        'recommendations': export_data
-                    }, jsonfile, indent=2, default=str)
-            
-            else:
-                print(f"❌ Unsupported format: {format}")
+            exported = await self.storage.export_recommendations(
+                filename,
+                format=format.lower(),
+                fields=fields,
+                strategy=RecommendationStrategy(strategy) if strategy else None,
+                start_date=start_date,
+                end_date=end_date
+            )
+            
+            if not exported:
+                print("❌ No data to export")
                 return
             
-            print(f"✅ Exported {len(history)} recommendations to {filename}")
+            print(f"✅ Exported {exported} recommendations to {filename}")
             print(f"📅 Date Range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
             
+        except ValueError as e:
+            print(f"❌ {e}")
         except Exception as e:
             print(f"❌ Error exporting data: {e}")
     
@@ -595,6 +561,7 @@ Examples:
   %(prog)s performance --top 20 --days 7
   %(prog)s compare --strategies shortterm,swing --days 30
   %(prog)s export --format csv --days 7 --filename recommendations.csv
+  %(prog)s export --format parquet --days 90 --fields symbol,strategy,generated_at,overall_score
   %(prog)s live --refresh 30
         """
     )
@@ -630,9 +597,11 @@ Examples:
     
     # Export command
     export_parser = subparsers.add_parser('export', help='Export data to file')
-    export_parser.add_argument('--format', choices=['csv', 'json'], default='csv', help='Export format (default: csv)')
+    export_parser.add_argument('--format', choices=['csv', 'json', 'jsonl', 'parquet'], default='csv', help='Export format (default: csv)')
     export_parser.add_argument('--days', type=int, default=7, help='Number of days to export (default: 7)')
     export_parser.add_argument('--filename', help='Output filename (auto-generated if not specified)')
+    export_parser.add_argument('--fields', help='Comma-separated fields to export (default: all)')
+    export_parser.add_argument('--strategy', choices=['shortterm', 'swing', 'longterm', 'intraday'], help='Filter by strategy')
     
     # Live monitoring command
     live_parser = subparsers.add_parser('live', help='Live monitoring dashboard')
@@ -688,7 +657,9 @@ Examples:
             await viewer.export_data(
                 format=args.format,
                 days=args.days,
-                filename=args.filename
+                filename=args.filename,
+                fields=[f.strip() for f in args.fields.split(',')] if args.fields else None,
+                strategy=args.strategy
             )
         
         elif args.command == 'live':